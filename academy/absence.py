@@ -0,0 +1,99 @@
+# academy/absence.py
+"""
+자동 결석 처리 (check_absent 커맨드)
+
+오늘 수업이 있는 학생 전체를 한 번에 계산합니다. (학생 수와 무관하게 쿼리 약 6회)
+    1) scheduling 엔진으로 오늘 세션 해석 (보강/이동 반영) -> 학생별 가장 이른 시작 시간
+    2) 시작 + ABSENT_AFTER 가 지난 학생 중 오늘 출석 기록이 없는 학생을 출석부와 한 번에 대조
+    3) ABSENT 행 bulk_create (키오스크 등원과 겹치면 unique 제약으로 무시)
+    4) 결석 알림 수신 학생은 학부모 번호로 발송 대기열(core.notifications)에 넣음
+
+next_due_at() 은 --loop 모드에서 다음에 깨어날 시각(다음 '시작 + 40분')을 계산합니다.
+"""
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from core import notifications
+from core.models import StudentProfile
+from . import scheduling
+from .models import Attendance
+
+ABSENT_AFTER = timedelta(minutes=40)
+ABSENT_MEMO = '시스템 자동 결석 처리 (40분 경과)'
+TEMPLATE_ABSENT = 'WAITING_CODE_ABSENT'  # ⚠️ 승인된 템플릿 코드로 바꿔야 합니다.
+
+
+def local_now():
+    now = timezone.now()
+    return timezone.localtime(now).replace(tzinfo=None) if timezone.is_aware(now) else now
+
+
+def deadlines(date):
+    """date 에 수업이 있는 학생 -> {student_id: (학생, 시작 시간, 결석 기준 시각)}"""
+    # 퇴원(비활성) 계정은 제외, 계정이 없는 학생은 기존처럼 포함
+    candidates = scheduling.students_with_class_on(
+        date, StudentProfile.objects.filter(Q(user__isnull=True) | Q(user__is_active=True))
+    )
+    sessions = scheduling.resolve_sessions(candidates, date)
+    students = {s['student'].id: s['student'] for s in sessions}
+    return {
+        sid: (students[sid], start, datetime.combine(date, start) + ABSENT_AFTER)
+        for (sid, _date), start in scheduling.first_start_times(sessions).items()
+    }
+
+
+def _absence_message(student, start_time):
+    return (
+        f"[블라썸에듀] {student.name} 학생 출결 안내\n\n"
+        f"오늘 {start_time.strftime('%H:%M')} 수업에 아직 등원하지 않아 결석 처리되었습니다.\n"
+        f"사정이 있으시면 학원으로 연락 부탁드립니다."
+    )
+
+
+def mark_absent(now=None):
+    """
+    결석 기준 시각이 지났는데 출석 기록이 없는 학생을 결석 처리
+    -> [(학생, 시작 시간, 알림 요청 여부)] (이번에 새로 처리한 학생만)
+    """
+    now = now or local_now()
+    today = now.date()
+    overdue = {sid: row for sid, row in deadlines(today).items() if row[2] <= now}
+    if not overdue:
+        return []
+
+    checked = set(Attendance.objects.filter(
+        date=today, student_id__in=list(overdue)
+    ).values_list('student_id', flat=True))
+
+    marked, rows, outbox = [], [], {}
+    for sid in sorted(set(overdue) - checked):
+        student, start_time, _deadline = overdue[sid]
+        phones = student.get_parent_phones() if student.send_attendance_alarm else []
+        rows.append(Attendance(
+            student=student, date=today, status='ABSENT', memo=ABSENT_MEMO, message_sent=bool(phones),
+        ))
+        content = _absence_message(student, start_time)
+        outbox[sid] = [{
+            'template_code': TEMPLATE_ABSENT,
+            'recipient': phone,
+            'ref': f'absent:{sid}:{today.isoformat()}',
+            'content': content,
+        } for phone in phones]
+        marked.append((student, start_time, bool(phones)))
+
+    # 그 사이 등원한 학생(키오스크)의 행은 unique(student, date) 로 무시되므로, 실제로 들어간 행만 다시 확인
+    Attendance.objects.bulk_create(rows, ignore_conflicts=True)
+    created = set(Attendance.objects.filter(
+        date=today, student_id__in=list(outbox), status='ABSENT', memo=ABSENT_MEMO,
+    ).values_list('student_id', flat=True))
+    notifications.enqueue_many([item for sid in created for item in outbox[sid]])
+    return [m for m in marked if m[0].id in created]
+
+
+def next_due_at(now=None):
+    """오늘 남은 결석 기준 시각 중 가장 이른 것 (없으면 None)"""
+    now = now or local_now()
+    due = [row[2] for row in deadlines(now.date()).values() if row[2] > now]
+    return min(due) if due else None
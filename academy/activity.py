@@ -0,0 +1,269 @@
+# academy/activity.py
+"""
+학생 활동 타임라인 (ActivityEvent) 기록/조회
+
+원본(ClassLog / AssignmentTask / TestResult)이 저장될 때 (event_type, ref_id) 기준으로
+ActivityEvent 1행을 upsert 합니다. 조회는 (student, timestamp, id) 인덱스를 따라
+keyset(커서) 페이지네이션으로 읽으므로, 기록이 아무리 많아도 첫 페이지 비용은 일정합니다.
+
+- summary: 목록 표시용 스냅샷 (title/content/sub_info/status/raw_date ...)
+- 시간에 따라 달라지는 값은 조회 시 계산합니다.
+    과제 OVERDUE          : 미제출/미완료 + 마감 경과
+    수업일지 진도/연결 과제 : 페이지에 포함된 일지만 모아 한 번에 조회
+"""
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from utils import cursor as keyset
+from .models import ActivityEvent, AssignmentTask, ClassLog, ClassLogEntry
+
+LOG = ActivityEvent.EventType.LOG
+ASM = ActivityEvent.EventType.ASM
+TEST = ActivityEvent.EventType.TEST
+ALL_TYPES = (LOG, ASM, TEST)
+
+DEFAULT_PAGE_SIZE = keyset.DEFAULT_PAGE_SIZE
+MAX_PAGE_SIZE = keyset.MAX_PAGE_SIZE
+
+
+# ------------------------------------------------------------------
+# 원본 -> 이벤트
+# ------------------------------------------------------------------
+def _teacher_display(teacher):
+    if not teacher:
+        return "미지정"
+    profile = getattr(teacher, 'staff_profile', None)
+    return profile.name if profile else teacher.username
+
+
+def log_event(log):
+    return ActivityEvent(
+        student_id=log.student_id,
+        event_type=LOG,
+        ref_id=log.id,
+        timestamp=datetime.combine(log.date, datetime.min.time()),
+        summary={
+            'title': f"{log.get_subject_display()} 수업",
+            'sub_info': _teacher_display(log.teacher),
+            'raw_date': log.date.strftime('%Y-%m-%d'),
+            'comment': log.comment,
+            'test_info': {  # 독해 등 테스트 정보
+                'type': log.reading_test_type,
+                'score': log.reading_test_score,
+            } if log.subject == 'READING' else None,
+        },
+    )
+
+
+def assignment_status(task, submission_status=None):
+    """제출/완료 상태 (OVERDUE 는 조회 시점에 판단하므로 여기서는 PENDING)"""
+    if submission_status == 'APPROVED':
+        return 'COMPLETED'
+    if submission_status == 'REJECTED':
+        return 'REJECTED'
+    if submission_status:
+        return 'SUBMITTED'  # 검사 대기
+    if task.is_completed:
+        return 'COMPLETED'  # 수동 완료 처리 등
+    return 'PENDING'
+
+
+def assignment_event(task, submission_status=None):
+    return ActivityEvent(
+        student_id=task.student_id,
+        event_type=ASM,
+        ref_id=task.id,
+        timestamp=task.due_date,
+        summary={
+            'title': task.title,
+            'content': task.description or '설명 없음',
+            'sub_info': f"마감: {task.due_date.strftime('%m-%d %H:%M')}",
+            'status': assignment_status(task, submission_status),
+            'raw_date': task.due_date.strftime('%Y-%m-%d'),
+        },
+    )
+
+
+def test_event(result):
+    return ActivityEvent(
+        student_id=result.student_id,
+        event_type=TEST,
+        ref_id=result.id,
+        timestamp=result.created_at,
+        summary={
+            'title': f"단어시험 ({result.test_range})",
+            'content': f"결과: {result.score}점",
+            'sub_info': '',
+            'status': 'FAIL' if result.score < 90 else 'PASS',
+            'raw_date': result.created_at.strftime('%Y-%m-%d'),
+        },
+    )
+
+
+# ------------------------------------------------------------------
+# 기록
+# ------------------------------------------------------------------
+def record(events, batch_size=500):
+    """(event_type, ref_id) 기준 upsert"""
+    events = [e for e in events if e is not None and e.student_id and e.timestamp]
+    if not events:
+        return
+    ActivityEvent.objects.bulk_create(
+        events,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['event_type', 'ref_id'],
+        update_fields=['student', 'timestamp', 'summary'],
+    )
+
+
+def remove(event_type, ref_ids):
+    ActivityEvent.objects.filter(event_type=event_type, ref_id__in=list(ref_ids)).delete()
+
+
+def record_logs(logs):
+    record(log_event(log) for log in logs)
+
+
+def record_assignments(tasks):
+    """과제 목록 기록 (제출 상태는 한 번에 조회)"""
+    from .models import AssignmentSubmission
+
+    tasks = [t for t in tasks if t.id]
+    if not tasks:
+        return
+    submission_status = dict(
+        AssignmentSubmission.objects.filter(task_id__in=[t.id for t in tasks])
+        .values_list('task_id', 'status')
+    )
+    record(assignment_event(t, submission_status.get(t.id)) for t in tasks)
+
+
+def refresh_assignments(task_ids):
+    """update() 처럼 시그널 없이 바뀐 과제를 다시 기록"""
+    record_assignments(AssignmentTask.objects.filter(id__in=list(task_ids)))
+
+
+# ------------------------------------------------------------------
+# 조회 (keyset pagination)
+# ------------------------------------------------------------------
+def query_events(student_id, types=ALL_TYPES, start_date=None, end_date=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    최신순 한 페이지 -> (이벤트 목록, 다음 커서 또는 None)
+    (student, [event_type,] timestamp, id) 인덱스를 그대로 따라갑니다.
+    limit=None 이면 전체 (페이지를 쓰지 않는 기존 클라이언트)
+    """
+    qs = ActivityEvent.objects.filter(student_id=student_id)
+    if set(types) != set(ALL_TYPES):
+        qs = qs.filter(event_type__in=list(types))
+    # __date 변환 대신 시각 범위로 비교해야 인덱스를 그대로 탄다
+    if start_date:
+        qs = qs.filter(timestamp__gte=datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        qs = qs.filter(timestamp__lt=datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    if limit is None:
+        return list(qs.order_by('-timestamp', '-id')), None
+    return keyset.paginate(qs, 'timestamp', cursor=cursor, limit=limit, descending=True)
+
+
+def render_events(events, now=None):
+    """이벤트 -> 타임라인 항목 (기존 통합 검색 응답 형식)"""
+    now = now or timezone.now()
+    log_ids = [e.ref_id for e in events if e.event_type == LOG]
+    entries_by_log, assignments_by_log = _load_log_details(log_ids)
+
+    items = []
+    for e in events:
+        s = e.summary
+        item = {
+            'type': e.event_type,
+            'date': s.get('raw_date'),
+            'title': s.get('title'),
+            'content': s.get('content'),
+            'sub_info': s.get('sub_info'),
+            'status': s.get('status'),
+            'id': e.ref_id,
+            'raw_date': s.get('raw_date'),
+        }
+        if e.event_type == LOG:
+            entries = entries_by_log.get(e.ref_id, [])
+            summary_parts = [f"{x['book']} {x['range']}" for x in entries]
+            item['content'] = ", ".join(summary_parts) if summary_parts else "진도 없음"
+            item['status'] = 'COMPLETED'
+            # [NEW] 상세 정보
+            item['details'] = {
+                'comment': s.get('comment'),
+                'entries': entries,
+                'assignments': assignments_by_log.get(e.ref_id, []),
+                'test_info': s.get('test_info'),
+            }
+        elif e.event_type == ASM and item['status'] == 'PENDING' and e.timestamp < now:
+            item['status'] = 'OVERDUE'
+        items.append(item)
+    return items
+
+
+def _load_log_details(log_ids):
+    """페이지에 포함된 일지들의 진도/연결 과제 (쿼리 2회)"""
+    entries_by_log = {}
+    assignments_by_log = {}
+    if not log_ids:
+        return entries_by_log, assignments_by_log
+
+    entries = ClassLogEntry.objects.filter(class_log_id__in=log_ids).select_related(
+        'textbook', 'wordbook'
+    ).order_by('id')
+    for entry in entries:
+        book_name = entry.textbook.title if entry.textbook else (entry.wordbook.title if entry.wordbook else "미지정")
+        entries_by_log.setdefault(entry.class_log_id, []).append({
+            'book': book_name,
+            'range': entry.progress_range,
+            'score': entry.score or '-',
+        })
+
+    tasks = AssignmentTask.objects.filter(origin_log_id__in=log_ids).order_by('due_date', 'id').values_list(
+        'origin_log_id', 'id', 'title', 'is_completed'
+    )
+    for log_id, task_id, title, is_completed in tasks:
+        assignments_by_log.setdefault(log_id, []).append({
+            'title': title,
+            'id': task_id,
+            'is_completed': is_completed,
+        })
+    return entries_by_log, assignments_by_log
+
+
+# ------------------------------------------------------------------
+# 백필
+# ------------------------------------------------------------------
+def backfill(student_ids=None, batch_size=500):
+    """원본 전체를 훑어 이벤트를 upsert (여러 번 실행해도 안전) -> {유형: 건수}"""
+    from vocab.models import TestResult
+
+    counts = {}
+
+    def _scoped(qs):
+        return qs.filter(student_id__in=student_ids) if student_ids else qs
+
+    logs = _scoped(ClassLog.objects.select_related('teacher__staff_profile')).order_by('id')
+    counts[LOG] = _backfill_in_batches(logs, record_logs, batch_size)
+
+    tasks = _scoped(AssignmentTask.objects.all()).order_by('id')
+    counts[ASM] = _backfill_in_batches(tasks, record_assignments, batch_size)
+
+    tests = _scoped(TestResult.objects.defer('archived_details')).order_by('id')
+    counts[TEST] = _backfill_in_batches(tests, lambda rows: record(test_event(r) for r in rows), batch_size)
+    return counts
+
+
+def _backfill_in_batches(qs, writer, batch_size):
+    total = 0
+    last_id = 0
+    while True:
+        batch = list(qs.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return total
+        writer(batch)
+        total += len(batch)
+        last_id = batch[-1].id
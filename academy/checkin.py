@@ -0,0 +1,255 @@
+# academy/checkin.py
+"""
+등/하원 체크 (키오스크 화면, AttendanceViewSet.check / check_batch)
+
+학생 조회는 StudentProfile.phone_digits(유일 인덱스) 또는 attendance_code(인덱스)로 한 번에 하고,
+시간표(3개 수업 FK)를 select_related 로 같이 읽습니다.
+등원 상태 기준은 자동 결석 처리(academy.absence)와 같습니다.
+    - 오늘 가장 이른 수업(보강 반영, 다른 날로 옮긴 수업 제외) 시작 전: PRESENT
+    - 시작 후 ABSENT_AFTER(40분) 이내: LATE / 그 뒤: ABSENT
+    - 오늘 수업이 없으면 PRESENT
+이미 오늘 기록이 있으면 하원(left_at) 처리, checkout=False 면 그대로 둡니다. (키오스크 화면)
+단, 자동 결석 처리(absence.ABSENT_MEMO)로 생긴 기록은 그보다 먼저 찍힌(또는 등원 시각이 없는) 체크가 오면
+등원으로 보고 위 기준의 상태로 바꿉니다. (오프라인 큐가 결석 처리 뒤에 반영되는 경우)
+
+check_batch 는 오프라인 동안 쌓인 체크를 찍힌 시각(checked_at) 순서대로 반영합니다.
+학생/보강 일정/출석 기록을 한 번에 읽고 bulk_create/bulk_update 로 씁니다.
+그 사이 온라인 체크가 먼저 기록을 만들었으면(bulk_create 가 건너뜀) 그 기록 기준으로 ALREADY/OUT 을 돌려줍니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core import student_index
+from core.models import StudentProfile
+from . import scheduling
+from .absence import ABSENT_AFTER, ABSENT_MEMO
+from .models import Attendance
+
+MODE_IN = 'IN'
+MODE_OUT = 'OUT'
+MODE_ALREADY = 'ALREADY'
+MODE_NOT_FOUND = 'NOT_FOUND'
+MODE_AMBIGUOUS = 'AMBIGUOUS'
+MODE_INVALID = 'INVALID'
+
+
+@dataclass
+class CheckResult:
+    mode: str
+    student: StudentProfile = None
+    attendance: Attendance = None
+    late_minutes: int = 0
+    start_time: object = None  # 오늘 첫 수업 시작 시간 (없으면 None)
+
+
+def students():
+    # 상태 판정에는 수업 시간표만 필요 (선생님은 읽지 않음)
+    return StudentProfile.objects.select_related('syntax_class', 'reading_class', 'extra_class')
+
+
+def find_by_phone(phone):
+    digits = student_index.phone_digits(phone)
+    return students().filter(phone_digits=digits).first() if digits else None
+
+
+def find_by_code(code):
+    """출석 코드 -> 학생 목록 (같은 번호를 쓰는 형제 등은 여러 명)"""
+    code = (code or '').strip()
+    return list(students().filter(attendance_code=code)[:5]) if code else []
+
+
+def local(at):
+    """비교용 현지 시각 (naive)"""
+    return timezone.localtime(at).replace(tzinfo=None) if timezone.is_aware(at) else at
+
+
+def entry_status(start_time, at):
+    """(수업 시작 시간, 체크 시각) -> (상태, 지각 분)"""
+    if start_time is None:
+        return 'PRESENT', 0
+    at = local(at)
+    class_start = datetime.combine(at.date(), start_time)
+    if at <= class_start:
+        return 'PRESENT', 0
+    late = at - class_start
+    return ('LATE' if late <= ABSENT_AFTER else 'ABSENT'), int(late.total_seconds() // 60)
+
+
+def replaces_auto_absent(attendance, at):
+    """자동 결석 기록인데 at 이 그 등원 시각보다 이르거나 등원 시각이 없으면 True (등원으로 바꿔야 함)"""
+    if attendance.memo != ABSENT_MEMO:
+        return False
+    return attendance.check_in_time is None or local(at) < local(attendance.check_in_time)
+
+
+def mark_entered(attendance, start_time, at):
+    """자동 결석 기록을 at 에 등원한 기록으로 바꿈 (저장은 호출한 쪽) -> 지각 분"""
+    status, late = entry_status(start_time, at)
+    attendance.status = status
+    attendance.check_in_time = at
+    attendance.memo = ''
+    return late
+
+
+ENTERED_FIELDS = ['status', 'check_in_time', 'memo']
+
+
+def first_starts(student_list, date):
+    """학생 목록의 date 수업 시작 시간 -> {student_id: time} (보강 일정 조회 1회)"""
+    sessions = scheduling.resolve_sessions(student_list, date, with_teachers=False)
+    return {sid: start for (sid, _d), start in scheduling.first_start_times(sessions).items()}
+
+
+def check(student, at=None, checkout=True):
+    """학생 1명 등/하원 -> CheckResult"""
+    at = at or timezone.now()
+    date = local(at).date()
+    attendance = Attendance.objects.filter(student=student, date=date).first()
+    if attendance is None:
+        start_time = first_starts([student], date).get(student.id)
+        status, late = entry_status(start_time, at)
+        try:
+            with transaction.atomic():
+                attendance = Attendance.objects.create(
+                    student=student, date=date, status=status, check_in_time=at,
+                )
+            return CheckResult(MODE_IN, student, attendance, late, start_time)
+        except IntegrityError:
+            # 같은 학생이 동시에 두 번 찍은 경우
+            attendance = Attendance.objects.get(student=student, date=date)
+
+    if replaces_auto_absent(attendance, at):
+        start_time = first_starts([student], date).get(student.id)
+        late = mark_entered(attendance, start_time, at)
+        attendance.save(update_fields=ENTERED_FIELDS)
+        return CheckResult(MODE_IN, student, attendance, late, start_time)
+    if not checkout:
+        return CheckResult(MODE_ALREADY, student, attendance)
+    attendance.left_at = at
+    attendance.save(update_fields=['left_at'])
+    return CheckResult(MODE_OUT, student, attendance)
+
+
+def check_batch(items, checkout=True):
+    """
+    오프라인 큐 반영 -> items 와 같은 순서의 CheckResult 목록
+    items: [{'phone_number' 또는 'attendance_code', 'checked_at': datetime}]
+    """
+    by_phone, by_code = {}, {}
+    digits = {student_index.phone_digits(i.get('phone_number')) for i in items} - {None}
+    codes = {(i.get('attendance_code') or '').strip() for i in items if not i.get('phone_number')} - {''}
+    if digits:
+        by_phone = {s.phone_digits: s for s in students().filter(phone_digits__in=digits)}
+    if codes:
+        for s in students().filter(attendance_code__in=codes):
+            by_code.setdefault(s.attendance_code, []).append(s)
+
+    results = [None] * len(items)
+    resolved = []  # (index, student, at)
+    for index, item in enumerate(items):
+        at = item.get('checked_at')
+        if at is None:
+            results[index] = CheckResult(MODE_INVALID)
+            continue
+        if item.get('phone_number'):
+            student = by_phone.get(student_index.phone_digits(item['phone_number']))
+        else:
+            matches = by_code.get((item.get('attendance_code') or '').strip(), [])
+            if len(matches) > 1:
+                results[index] = CheckResult(MODE_AMBIGUOUS)
+                continue
+            student = matches[0] if matches else None
+        if student is None:
+            results[index] = CheckResult(MODE_NOT_FOUND)
+            continue
+        resolved.append((index, student, at))
+    if not resolved:
+        return results
+
+    resolved.sort(key=lambda r: local(r[2]))
+    dates = {local(at).date() for _i, _s, at in resolved}
+    student_map = {s.id: s for _i, s, _at in resolved}
+    existing = {
+        (a.student_id, a.date): a
+        for a in Attendance.objects.filter(student_id__in=list(student_map), date__in=dates)
+    }
+    starts = {date: first_starts(list(student_map.values()), date) for date in dates}
+
+    created, entered, checked_out = {}, {}, {}
+    indices = {}  # 새로 만들 기록 key -> 그 기록을 가리키는 결과 위치들
+    for index, student, at in resolved:
+        date = local(at).date()
+        key = (student.id, date)
+        attendance = existing.get(key) or created.get(key)
+        if attendance is None:
+            start_time = starts[date].get(student.id)
+            status, late = entry_status(start_time, at)
+            attendance = created[key] = Attendance(student=student, date=date, status=status, check_in_time=at)
+            indices[key] = [index]
+            results[index] = CheckResult(MODE_IN, student, attendance, late, start_time)
+            continue
+        if key in indices:
+            indices[key].append(index)
+        if key in existing and replaces_auto_absent(attendance, at):
+            # 결석 처리 뒤에 반영되는 오프라인 등원
+            start_time = starts[date].get(student.id)
+            late = mark_entered(attendance, start_time, at)
+            entered[key] = attendance
+            results[index] = CheckResult(MODE_IN, student, attendance, late, start_time)
+        elif not checkout:
+            results[index] = CheckResult(MODE_ALREADY, student, attendance)
+        else:
+            attendance.left_at = at
+            if key in existing and key not in entered:
+                checked_out[key] = attendance
+            results[index] = CheckResult(MODE_OUT, student, attendance)
+
+    with transaction.atomic():
+        # 그 사이 온라인으로 먼저 들어온 기록이 있으면 그 기록을 유지 (unique(student, date))
+        Attendance.objects.bulk_create(list(created.values()), ignore_conflicts=True)
+        if created:
+            _resolve_skipped(created, indices, results, checkout, entered, checked_out)
+        if entered:
+            Attendance.objects.bulk_update(list(entered.values()), ENTERED_FIELDS + ['left_at'])
+        if checked_out:
+            Attendance.objects.bulk_update(list(checked_out.values()), ['left_at'])
+    return results
+
+
+def _resolve_skipped(created, indices, results, checkout, entered, checked_out):
+    """
+    bulk_create 가 실제로 넣은 기록인지 다시 읽어 확인
+    - 넣은 기록: pk 를 채움
+    - 그 사이 다른 기록이 먼저 들어가 건너뛴 경우 그 기록에 반영
+      자동 결석 기록이면 등원으로 바꾸고, 아니면 첫 체크를 ALREADY(checkout 이면 하원 처리 후 OUT)로 보고
+    """
+    saved = {
+        (a.student_id, a.date): a
+        for a in Attendance.objects.filter(
+            student_id__in={sid for sid, _d in created}, date__in={d for _sid, d in created},
+        )
+    }
+    for key, mine in created.items():
+        row = saved[key]
+        if (row.check_in_time, row.status, row.memo) == (mine.check_in_time, mine.status, mine.memo):
+            mine.pk = row.pk
+            continue
+        first, rest = indices[key][0], indices[key][1:]
+        result = results[first]
+        if replaces_auto_absent(row, mine.check_in_time):
+            late = mark_entered(row, result.start_time, mine.check_in_time)
+            row.left_at = mine.left_at
+            entered[key] = row
+            results[first] = CheckResult(MODE_IN, result.student, row, late, result.start_time)
+        elif checkout:
+            # 건너뛴 체크 중 마지막 시각을 하원으로
+            row.left_at = mine.left_at or mine.check_in_time
+            checked_out[key] = row
+            results[first] = CheckResult(MODE_OUT, result.student, row)
+        else:
+            results[first] = CheckResult(MODE_ALREADY, result.student, row)
+        for index in rest:
+            results[index].attendance = row
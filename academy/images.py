@@ -0,0 +1,157 @@
+# academy/images.py
+"""
+과제 인증샷 후처리 (Pillow)
+
+휴대폰 원본(3~8MB, EXIF/GPS 포함, 회전은 EXIF 태그로만 표시)을 그대로 내려주지 않도록 업로드 후 정리합니다.
+    1. EXIF 방향대로 회전한 뒤 EXIF 는 버림 (촬영 위치 등 제거, 색 프로파일은 유지)
+    2. 긴 변을 MAX_EDGE 이하로 줄여 JPEG 로 다시 인코딩해 원본 교체
+       (JPEG 원본은 같은 이름으로 교체하므로 이미 저장된 URL - 성적표 스냅샷 등 - 이 그대로 유효)
+    3. 미리보기(PREVIEW_EDGE, 검사 화면/성적표)와 썸네일(THUMB_EDGE, 목록)을 원본 옆에 저장
+       <이름>_preview.jpg / <이름>_thumb.jpg
+
+저장 시그널이 트랜잭션 커밋 후 utils.background.enqueue 로 요청 스레드 밖에서 실행합니다.
+프로세스 재시작 등으로 빠진 파일은 process_submission_images 커맨드로 처리합니다.
+"""
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from utils import background
+
+logger = logging.getLogger(__name__)
+
+MAX_EDGE = 2048
+PREVIEW_EDGE = 1280
+THUMB_EDGE = 320
+JPEG_QUALITY = 85
+PREVIEW_QUALITY = 80
+THUMB_QUALITY = 75
+
+_JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+
+
+# ------------------------------------------------------------------
+# 변환
+# ------------------------------------------------------------------
+def _load(fp, edge):
+    img = Image.open(fp)
+    # JPEG 는 디코딩 단계에서 1/2~1/8 로 줄여 읽음 (목표 크기보다 작아지지 않는 범위에서)
+    ratio = edge / max(img.size)
+    if ratio < 1:
+        img.draft('RGB', (int(img.width * ratio) + 1, int(img.height * ratio) + 1))
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        flat = Image.new('RGB', rgba.size, 'white')
+        flat.paste(rgba, mask=rgba.getchannel('A'))
+        flat.info['icc_profile'] = img.info.get('icc_profile')
+        img = flat
+    elif img.mode != 'RGB':
+        icc = img.info.get('icc_profile')
+        img = img.convert('RGB')
+        img.info['icc_profile'] = icc
+    return img
+
+
+def _encode(img, edge, quality):
+    """긴 변 edge 이하로 줄인 JPEG (EXIF 없이) -> (bytes, 축소된 이미지)"""
+    if max(img.size) > edge:
+        icc = img.info.get('icc_profile')
+        img = img.copy()
+        img.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        img.info['icc_profile'] = icc
+    buf = io.BytesIO()
+    options = {'quality': quality, 'optimize': True, 'progressive': True}
+    if img.info.get('icc_profile'):
+        options['icc_profile'] = img.info['icc_profile']
+    img.save(buf, 'JPEG', **options)
+    return buf.getvalue(), img
+
+
+def render(fp):
+    """원본 파일 객체 -> (정리된 원본, 미리보기, 썸네일) JPEG bytes"""
+    img = _load(fp, MAX_EDGE)
+    full, img = _encode(img, MAX_EDGE, JPEG_QUALITY)
+    preview, img = _encode(img, PREVIEW_EDGE, PREVIEW_QUALITY)
+    thumb, _img = _encode(img, THUMB_EDGE, THUMB_QUALITY)
+    return full, preview, thumb
+
+
+# ------------------------------------------------------------------
+# 저장
+# ------------------------------------------------------------------
+def _replace(storage, name, content):
+    """같은 이름으로 교체 (임시 파일에 먼저 써 두어 중간에 실패해도 원본 또는 사본이 남음)"""
+    tmp = storage.save(f'{name}.tmp', ContentFile(content))
+    storage.delete(name)
+    final = storage.save(name, ContentFile(content))
+    storage.delete(tmp)
+    return final
+
+
+def process_instance(obj):
+    """
+    인증샷 1건 처리 -> {'before', 'after', 'preview', 'thumb'} (bytes) / 처리하지 못하면 None
+    처리 중 새 파일로 교체(재제출)된 경우 만든 파일을 지우고 None
+    """
+    storage = obj.image.storage
+    original = obj.image.name
+    try:
+        before = storage.size(original)
+        with storage.open(original, 'rb') as fp:
+            full, preview, thumb = render(fp)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        logger.warning("submission image %s(%s) not processed: %s", obj._meta.model_name, obj.pk, exc)
+        return None
+
+    stem, ext = os.path.splitext(original)
+    created = [
+        storage.save(f'{stem}_preview.jpg', ContentFile(preview)),
+        storage.save(f'{stem}_thumb.jpg', ContentFile(thumb)),
+    ]
+    same_name = ext.lower() in _JPEG_EXTENSIONS
+    if not same_name:
+        created.append(storage.save(f'{stem}.jpg', ContentFile(full)))
+
+    updated = type(obj).objects.filter(pk=obj.pk, image=original, image_processed_at__isnull=True).update(
+        image=original if same_name else created[2],
+        image_preview=created[0],
+        image_thumb=created[1],
+        image_processed_at=timezone.now(),
+    )
+    if not updated:
+        for name in created:
+            storage.delete(name)
+        return None
+
+    if same_name:
+        _replace(storage, original, full)
+    else:
+        storage.delete(original)
+    return {'before': before, 'after': len(full), 'preview': len(preview), 'thumb': len(thumb)}
+
+
+def process(model_name, pk):
+    """큐 작업 진입점 (모델 이름 + pk 만 넘겨 받음)"""
+    model = apps.get_model('academy', model_name)
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None or not obj.image or obj.image_processed_at:
+        return None
+    return process_instance(obj)
+
+
+def schedule(instance):
+    """커밋 이후 백그라운드 큐에 처리 요청"""
+    model_name = instance._meta.model_name
+    pk = instance.pk
+    transaction.on_commit(lambda: background.enqueue(process, model_name, pk))
+
+
+def unprocessed(model):
+    return model.objects.exclude(image='').filter(image_processed_at__isnull=True).order_by('id')
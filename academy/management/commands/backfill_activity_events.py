@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from academy import activity
+
+
+class Command(BaseCommand):
+    help = "Build/refresh the ActivityEvent timeline from ClassLog, AssignmentTask and TestResult rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student",
+            type=int,
+            action="append",
+            dest="students",
+            help="Only backfill this StudentProfile id (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of source rows upserted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        # (event_type, ref_id) 기준 upsert 이므로 여러 번 실행해도 중복이 생기지 않음
+        counts = activity.backfill(
+            student_ids=options["students"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Backfilled activity events: "
+            + ", ".join(f"{event_type}={count}" for event_type, count in counts.items())
+        ))
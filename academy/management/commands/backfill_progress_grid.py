@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from academy import progress
+
+
+class Command(BaseCommand):
+    help = "Build/refresh the per-student progress grid (ProgressCell) from ClassLogEntry and TestResult rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student",
+            type=int,
+            action="append",
+            dest="students",
+            help="Only backfill this StudentProfile id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        # 학생 단위로 원천에서 다시 계산해 바뀐 칸만 쓰므로 여러 번 실행해도 안전
+        counts = progress.backfill(student_ids=options["students"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled progress grid: students={counts['students']}, "
+            f"written={counts['written']}, deleted={counts['deleted']}"
+        ))
@@ -1,60 +1,55 @@
-from django.core.management.base import BaseCommand
-from django.utils import timezone
+import time
 from datetime import datetime, timedelta
-from core.models import StudentProfile
-from academy.models import Attendance
-from academy.utils import get_today_class_start_time
-# from utils.aligo import send_alimtalk  <-- 아직 파일 없으면 주석 유지
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from academy import absence
+from utils import background
+
 
 class Command(BaseCommand):
     help = '수업 시작 시간이 지났는데 등원하지 않은 학생을 찾아 자동으로 결석 처리하고 알림을 보냅니다.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and wake at each class start + 40 minutes instead of being run from cron.",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=int,
+            default=15 * 60,
+            help="In --loop mode, re-read today's schedule at least this often in seconds "
+                 "(picks up makeups added during the day, default: 900).",
+        )
+
     def handle(self, *args, **options):
-        now = timezone.now()
-        today = now.date()
-        
-        students = StudentProfile.objects.all() 
-        check_count = 0
-        absent_created = 0
-
-        for student in students:
-            if Attendance.objects.filter(student=student, date=today).exists():
-                continue
-
-            start_time = get_today_class_start_time(student)
-            if start_time is None:
-                continue
-
-            # [수정된 부분] 
-            # 1. 일단 단순 시간으로 합칩니다.
-            class_start_dt = datetime.combine(today, start_time)
-            
-            # 2. 만약 now(현재시간)가 '타임존'을 달고 있다면, 수업시간에도 똑같이 달아줍니다.
-            # (이 코드가 없으면 비교할 때 에러가 납니다)
-            if timezone.is_aware(now):
-                class_start_dt = timezone.make_aware(class_start_dt)
-
-            # 4. 비교 시작
-            if now > class_start_dt:
-                diff = now - class_start_dt
-                minutes_passed = diff.total_seconds() / 60
-                
-                if minutes_passed >= 40:
-                    Attendance.objects.create(
-                        student=student,
-                        date=today,
-                        status='ABSENT',
-                        memo='시스템 자동 결석 처리 (40분 경과)'
-                    )
-                    self.stdout.write(self.style.ERROR(f"❌ [결석 처리] {student.name} (수업: {start_time}, {int(minutes_passed)}분 지남)"))
-                    absent_created += 1
-
-                    if student.send_attendance_alarm:
-                        # send_alimtalk(...) # 나중에 주석 해제
-                        pass
-                
-                elif minutes_passed >= 10:
-                    pass
-
-        if absent_created > 0:
-            self.stdout.write(self.style.SUCCESS(f"=== 결과: {absent_created}명 결석 처리 완료 ==="))
\ No newline at end of file
+        # [FIX] 학생별 exists()/create 반복 -> 오늘 세션 일괄 계산 + bulk_create (academy.absence)
+        if not options["loop"]:
+            self.run_once()
+            return
+
+        while True:
+            self.run_once()
+            close_old_connections()
+            time.sleep(self.seconds_until_next(options["max_sleep"]))
+
+    def run_once(self):
+        marked = absence.mark_absent()
+        for student, start_time, notified in marked:
+            suffix = " (알림 요청)" if notified else ""
+            self.stdout.write(self.style.ERROR(f"❌ [결석 처리] {student.name} (수업: {start_time}){suffix}"))
+        if marked:
+            self.stdout.write(self.style.SUCCESS(f"=== 결과: {len(marked)}명 결석 처리 완료 ==="))
+            # 알림 발송(백그라운드 큐)이 끝나기 전에 프로세스가 끝나지 않도록 대기
+            background.wait_idle()
+
+    def seconds_until_next(self, max_sleep):
+        now = absence.local_now()
+        due = absence.next_due_at(now)
+        if due is None:
+            # 오늘 남은 수업이 없으면 자정 직후 (다음 날 일정 계산)
+            due = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return max(1, min(max_sleep, (due - now).total_seconds() + 1))
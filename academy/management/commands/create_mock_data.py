@@ -8,7 +8,7 @@ from faker import Faker
 # [주의] ClassLogEntry가 있다면 추가 import가 필요하지만, 일단 ClassLog만 사용합니다.
 from core.models import StudentProfile, StaffProfile, Branch, School, ClassTime
 from academy.models import Textbook, Attendance, ClassLog
-from vocab.models import WordBook, Word, TestResult
+from vocab.models import WordBook, Word, TestResult, bump_pack_version
 from exam.models import Question, TestPaper, ExamResult, ExamResultDetail
 
 class Command(BaseCommand):
@@ -81,6 +81,9 @@ class Command(BaseCommand):
             for i in range(50):
                 eng = fake.unique.word()
                 words.append(Word(book=word_book, number=i//10+1, english=eng, korean=fake.word()))
+            version = bump_pack_version(word_book.id)
+            for w in words:
+                w.version = version
             Word.objects.bulk_create(words, ignore_conflicts=True)
             self.stdout.write("✅ 단어 데이터 50개 생성")
 
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from academy import images
+from academy.models import AssignmentSubmission, AssignmentSubmissionImage
+
+
+class Command(BaseCommand):
+    help = "Re-encode unprocessed assignment submission photos and build preview/thumbnail derivatives."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Process at most this many photos per model.",
+        )
+
+    def handle(self, *args, **options):
+        # 업로드 후 큐 작업이 유실된 경우(프로세스 재시작 등)와 기존 사진을 현재 프로세스에서 처리
+        for model in (AssignmentSubmission, AssignmentSubmissionImage):
+            qs = images.unprocessed(model)
+            if options["limit"]:
+                qs = qs[:options["limit"]]
+            done = failed = before = after = 0
+            for obj in qs.iterator():
+                result = images.process_instance(obj)
+                if result is None:
+                    failed += 1
+                    continue
+                done += 1
+                before += result["before"]
+                after += result["after"] + result["preview"] + result["thumb"]
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.model_name}: processed={done}, skipped={failed}, "
+                f"bytes {before} -> {after}"
+            ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0012_assignmenttask_related_textbook_and_more'),
+        ('core', '0014_announcement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('LOG', '수업 일지'), ('ASM', '과제'), ('TEST', '단어 시험')], max_length=10, verbose_name='활동 유형')),
+                ('ref_id', models.BigIntegerField(verbose_name='원본 ID')),
+                ('timestamp', models.DateTimeField(verbose_name='활동 시각')),
+                ('summary', models.JSONField(default=dict, verbose_name='요약')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to='core.studentprofile', verbose_name='학생')),
+            ],
+            options={
+                'verbose_name': '학생 활동',
+                'verbose_name_plural': '학생 활동',
+                'indexes': [models.Index(fields=['student', '-timestamp', '-id'], name='activity_student_ts_idx'), models.Index(fields=['student', 'event_type', '-timestamp', '-id'], name='activity_student_type_ts_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event_type', 'ref_id'), name='uniq_activity_event_ref')],
+            },
+        ),
+    ]
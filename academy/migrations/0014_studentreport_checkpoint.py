@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0013_activityevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentreport',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='누적 집계 체크포인트'),
+        ),
+    ]
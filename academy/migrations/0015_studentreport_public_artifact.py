@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0014_studentreport_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentreport',
+            name='public_etag',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='공개 응답 ETag'),
+        ),
+        migrations.AddField(
+            model_name='studentreport',
+            name='public_json',
+            field=models.TextField(blank=True, editable=False, verbose_name='공개 응답(JSON)'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0015_studentreport_public_artifact'),
+        ('core', '0014_announcement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('TEXTBOOK', '교재'), ('VOCAB', '단어장')], max_length=10, verbose_name='책 종류')),
+                ('book_id', models.PositiveIntegerField(verbose_name='교재/단어장 ID')),
+                ('unit', models.PositiveIntegerField(verbose_name='단원/Day')),
+                ('grade', models.CharField(max_length=10, verbose_name='성취도')),
+                ('source_at', models.DateTimeField(verbose_name='최근 기록 시각')),
+                ('source_seq', models.BigIntegerField(default=0, verbose_name='최근 기록 순번')),
+                ('first_at', models.DateTimeField(verbose_name='최초 기록 시각')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_cells', to='core.studentprofile', verbose_name='학생')),
+            ],
+            options={
+                'verbose_name': '학생 진도 그리드',
+                'verbose_name_plural': '학생 진도 그리드',
+                'constraints': [models.UniqueConstraint(fields=('student', 'kind', 'book_id', 'unit'), name='uniq_progress_cell')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-20 04:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0016_progresscell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignmenttask',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='변경 일시'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='assignmenttask',
+            index=models.Index(fields=['student', 'updated_at', 'id'], name='assignment_student_updated_idx'),
+        ),
+    ]
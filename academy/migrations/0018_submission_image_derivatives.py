@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0017_assignmenttask_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignmentsubmission',
+            name='image_preview',
+            field=models.ImageField(blank=True, upload_to='assignments/%Y/%m/%d/', verbose_name='미리보기'),
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmission',
+            name='image_processed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='이미지 처리 일시'),
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmission',
+            name='image_thumb',
+            field=models.ImageField(blank=True, upload_to='assignments/%Y/%m/%d/', verbose_name='썸네일'),
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmissionimage',
+            name='image_preview',
+            field=models.ImageField(blank=True, upload_to='assignments/%Y/%m/%d/', verbose_name='미리보기'),
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmissionimage',
+            name='image_processed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='이미지 처리 일시'),
+        ),
+        migrations.AddField(
+            model_name='assignmentsubmissionimage',
+            name='image_thumb',
+            field=models.ImageField(blank=True, upload_to='assignments/%Y/%m/%d/', verbose_name='썸네일'),
+        ),
+    ]
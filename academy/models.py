@@ -3,6 +3,7 @@ from django.conf import settings
 from django.utils import timezone
 import uuid # [NEW]
 from django.core.exceptions import ValidationError
+from utils.loaded_state import LoadedStateMixin, loaded_values
 
 # ==========================================
 # [1] 출결 및 일정 관리 (Attendance & Schedule)
@@ -163,7 +164,7 @@ class TextbookUnit(models.Model):
 
 
 # [중요] ClassLog(부모)가 먼저 와야 합니다!
-class ClassLog(models.Model):
+class ClassLog(LoadedStateMixin, models.Model):
     """
     하루 수업 일지 (헤더)
     """
@@ -209,12 +210,19 @@ class ClassLog(models.Model):
         verbose_name_plural = "수업 일지"
         ordering = ['-date']
 
+    # [NEW] 과제 재생성 판단용 필드 (로드 시점 값을 보관해 저장 때 재조회하지 않음)
+    HW_TRACKED_FIELDS = ('date', 'hw_due_date', 'hw_vocab_range', 'hw_vocab_book_id', 'hw_main_book_id')
+    LOADED_STATE = {'_loaded_hw': 'hw_state'}
+
+    def hw_state(self):
+        return dict(zip(self.HW_TRACKED_FIELDS, loaded_values(self, self.HW_TRACKED_FIELDS)))
+
     def __str__(self):
         return f"[{self.date}] {self.student.name} {self.get_subject_display()} 수업일지"
 
 
 # [중요] ClassLogEntry(자식)는 그 다음에 와야 합니다!
-class ClassLogEntry(models.Model):
+class ClassLogEntry(LoadedStateMixin, models.Model):
     # Remove the strict choices enforcement on the model level to allow numbers (e.g., "28")
     # We keep the list here just for reference or UI dropdowns for textbooks
     SCORE_CHOICES = [
@@ -233,7 +241,13 @@ class ClassLogEntry(models.Model):
     # [MODIFIED] max_length increased to 10 (to allow "100" or "28/30")
     # removed choices=SCORE_CHOICES to allow arbitrary input
     score = models.CharField(max_length=10, null=True, blank=True, verbose_name="성취도/점수")
-    
+
+    # [NEW] 책이 바뀌면 이전 책의 진도 그리드도 다시 계산해야 하므로 로드 시점 값을 보관
+    LOADED_STATE = {'_loaded_books': 'book_key'}
+
+    def book_key(self):
+        return loaded_values(self, ('textbook_id', 'wordbook_id'))
+
     def clean(self):
         from django.core.exceptions import ValidationError
         if not self.textbook and not self.wordbook:
@@ -336,15 +350,49 @@ class AssignmentTask(models.Model):
     resubmission_deadline = models.DateField(null=True, blank=True, verbose_name="재제출 마감일")
     is_replaced = models.BooleanField(default=False, verbose_name="대체됨")
 
+    # [NEW] 변경 시각 (목록 since 델타 조회 기준, update() 경로는 직접 갱신)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="변경 일시")
+
     class Meta:
         ordering = ['due_date']
         verbose_name = "주간 과제"
         verbose_name_plural = "주간 과제"
+        indexes = [
+            models.Index(fields=['student', 'updated_at', 'id'], name='assignment_student_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # update_fields 로 일부만 저장해도 변경 시각은 함께 기록
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'updated_at' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'updated_at']
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"[{self.assignment_type}] {self.student.name}: {self.title}"
 
-class AssignmentSubmission(models.Model):
+class ProcessedImageMixin(LoadedStateMixin, models.Model):
+    """
+    [NEW] 과제 인증샷 후처리 결과 (academy.images)
+    - 업로드 원본은 방향 보정/EXIF 제거/긴 변 제한으로 다시 인코딩해 교체합니다.
+    - 미리보기(검사 화면/성적표)와 썸네일(목록)은 원본 옆에 저장합니다.
+    """
+    image_preview = models.ImageField(upload_to='assignments/%Y/%m/%d/', blank=True, verbose_name="미리보기")
+    image_thumb = models.ImageField(upload_to='assignments/%Y/%m/%d/', blank=True, verbose_name="썸네일")
+    image_processed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="이미지 처리 일시")
+
+    class Meta:
+        abstract = True
+
+    # 새 파일이 올라왔는지(재제출) 판단용 - 로드 시점 파일 이름
+    LOADED_STATE = {'_loaded_image': 'image_name'}
+
+    def image_name(self):
+        value, = loaded_values(self, ('image',))
+        return getattr(value, 'name', value) or ''
+
+
+class AssignmentSubmission(ProcessedImageMixin):
     task = models.OneToOneField(AssignmentTask, on_delete=models.CASCADE, related_name='submission', verbose_name="관련 과제")
     student = models.ForeignKey('core.StudentProfile', on_delete=models.CASCADE, verbose_name="제출 학생")
     
@@ -365,7 +413,7 @@ class AssignmentSubmission(models.Model):
         verbose_name = "과제 인증"
         verbose_name_plural = "과제 인증"
 
-class AssignmentSubmissionImage(models.Model):
+class AssignmentSubmissionImage(ProcessedImageMixin):
     submission = models.ForeignKey(
         AssignmentSubmission,
         on_delete=models.CASCADE,
@@ -408,6 +456,14 @@ class StudentReport(models.Model):
     # }
     
     teacher_comment = models.TextField(blank=True, verbose_name="선생님 총평")
+
+    # [NEW] 다음 성적표 생성 시 재사용할 누적 집계 상태 (단어 상태/교재 진도 등, 학부모 화면에는 노출하지 않음)
+    # academy/report_builder.py 참고
+    checkpoint = models.JSONField(default=dict, blank=True, editable=False, verbose_name="누적 집계 체크포인트")
+
+    # [NEW] 공개 링크 응답을 저장 시점에 미리 직렬화해 둔 산출물 (ETag = 본문 해시)
+    public_json = models.TextField(blank=True, editable=False, verbose_name="공개 응답(JSON)")
+    public_etag = models.CharField(max_length=64, blank=True, editable=False, verbose_name="공개 응답 ETag")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -419,3 +475,84 @@ class StudentReport(models.Model):
         verbose_name = "성적표"
         verbose_name_plural = "성적표 관리"
         ordering = ['-created_at']
+
+
+# ==========================================
+# [5] 학생 활동 타임라인 (Activity Feed)
+# ==========================================
+class ActivityEvent(models.Model):
+    """
+    학생 활동 타임라인 색인 (수업일지/과제/단어시험 1건당 1행)
+    - 각 원본의 저장 경로에서 (event_type, ref_id) 기준으로 갱신됩니다. (academy.activity)
+    - summary 에는 목록 화면에 필요한 값만 스냅샷으로 저장합니다.
+    - 기존 데이터는 backfill_activity_events 커맨드로 채웁니다.
+    """
+    class EventType(models.TextChoices):
+        LOG = 'LOG', '수업 일지'
+        ASM = 'ASM', '과제'
+        TEST = 'TEST', '단어 시험'
+
+    student = models.ForeignKey(
+        'core.StudentProfile',
+        on_delete=models.CASCADE,
+        related_name='activity_events',
+        verbose_name="학생"
+    )
+    event_type = models.CharField(max_length=10, choices=EventType.choices, verbose_name="활동 유형")
+    ref_id = models.BigIntegerField(verbose_name="원본 ID")
+    timestamp = models.DateTimeField(verbose_name="활동 시각")
+    summary = models.JSONField(default=dict, verbose_name="요약")
+
+    class Meta:
+        verbose_name = "학생 활동"
+        verbose_name_plural = "학생 활동"
+        indexes = [
+            models.Index(fields=['student', '-timestamp', '-id'], name='activity_student_ts_idx'),
+            models.Index(fields=['student', 'event_type', '-timestamp', '-id'], name='activity_student_type_ts_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['event_type', 'ref_id'], name='uniq_activity_event_ref'),
+        ]
+
+    def __str__(self):
+        return f"[{self.event_type}] {self.student_id} {self.timestamp:%Y-%m-%d}"
+
+
+class ProgressCell(models.Model):
+    """
+    학생 진도 그리드 (학생 x 교재/단어장 x 단원 당 1행, 가장 최근 성취도)
+    - ClassLogEntry / TestResult 저장 경로에서 해당 책 단위로 다시 계산됩니다. (academy.progress)
+    - 최근 판단 기준: (source_at, source_seq) 가 큰 값
+        교재   : 수업 날짜, 진도 항목 id
+        단어장 : 일지 작성 시각/시험 응시 시각, 진도 항목 id/시험 id
+    - 기존 데이터는 backfill_progress_grid 커맨드로 채웁니다.
+    """
+    class Kind(models.TextChoices):
+        TEXTBOOK = 'TEXTBOOK', '교재'
+        VOCAB = 'VOCAB', '단어장'
+
+    student = models.ForeignKey(
+        'core.StudentProfile',
+        on_delete=models.CASCADE,
+        related_name='progress_cells',
+        verbose_name="학생"
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices, verbose_name="책 종류")
+    book_id = models.PositiveIntegerField(verbose_name="교재/단어장 ID")
+    unit = models.PositiveIntegerField(verbose_name="단원/Day")
+    grade = models.CharField(max_length=10, verbose_name="성취도")
+    source_at = models.DateTimeField(verbose_name="최근 기록 시각")
+    source_seq = models.BigIntegerField(default=0, verbose_name="최근 기록 순번")
+    first_at = models.DateTimeField(verbose_name="최초 기록 시각")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "학생 진도 그리드"
+        verbose_name_plural = "학생 진도 그리드"
+        constraints = [
+            # 학생별 그리드 조회도 이 인덱스(student 접두)를 그대로 탑니다
+            models.UniqueConstraint(fields=['student', 'kind', 'book_id', 'unit'], name='uniq_progress_cell'),
+        ]
+
+    def __str__(self):
+        return f"[{self.kind}] {self.student_id} {self.book_id}-{self.unit}: {self.grade}"
@@ -0,0 +1,170 @@
+# academy/occupancy.py
+"""
+선생님별/날짜별 '구문(1:1)' 수업 점유 인덱스
+
+보강 시간 선택 화면에서 "이 선생님이 D 날짜 몇 시에 이미 수업이 있는가"를 빠르게 답하기 위한 구조입니다.
+    - 정규 구문 수업 (보강/변경으로 빠진 날은 제외)
+    - 구문 타입 고정 추가 수업
+    - 그 날짜로 잡힌 구문 보강/변경 (담당 = 학생의 구문 선생님)
+
+(teacher_id, date) 하나당 DayOccupancy 1개:
+    bits    하루 1440분 중 수업이 시작되는 분(minute)에 1이 켜진 비트맵 (int)
+    owners  {분: (학생 id, ...)}  - '본인 수업은 제외' 계산용
+
+여러 선생님 x 여러 날짜를 쿼리 2회로 한 번에 만들고 (teacher_id, date) 단위로 캐시합니다.
+TemporarySchedule / StudentProfile 시간표 / ClassTime 이 바뀌면 세대(generation) 키를 올려 전체 무효화합니다.
+"""
+from django.core.cache import cache
+from django.db.models import Q
+
+from core.models import StudentProfile
+from utils import cache_gen
+from .models import TemporarySchedule
+from .scheduling import day_code
+
+OCCUPANCY_CACHE_TIMEOUT = 60 * 10
+_GEN_KEY = 'academy:occupancy:gen'
+
+
+class DayOccupancy:
+    """선생님 한 명의 하루 점유 현황"""
+    __slots__ = ('bits', 'owners')
+
+    def __init__(self):
+        self.bits = 0
+        self.owners = {}
+
+    def __getstate__(self):
+        return (self.bits, self.owners)
+
+    def __setstate__(self, state):
+        self.bits, self.owners = state
+
+    def add(self, start_time, student_id):
+        minute = start_time.hour * 60 + start_time.minute
+        self.bits |= 1 << minute
+        owners = self.owners.get(minute, ())
+        if student_id not in owners:
+            self.owners[minute] = owners + (student_id,)
+
+    def minutes(self, exclude_student_id=None):
+        """점유된 시작 분 목록 (오름차순, exclude_student_id 의 수업만 있는 칸은 제외)"""
+        result = []
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            minute = low.bit_length() - 1
+            bits ^= low
+            if exclude_student_id is None or any(
+                sid != exclude_student_id for sid in self.owners[minute]
+            ):
+                result.append(minute)
+        return result
+
+    def is_booked(self, start_time, exclude_student_id=None):
+        minute = start_time.hour * 60 + start_time.minute
+        if not self.bits >> minute & 1:
+            return False
+        if exclude_student_id is None:
+            return True
+        return any(sid != exclude_student_id for sid in self.owners[minute])
+
+    def labels(self, exclude_student_id=None):
+        """'HH:MM' 문자열 목록"""
+        return ['%02d:%02d' % divmod(m, 60) for m in self.minutes(exclude_student_id)]
+
+
+# ------------------------------------------------------------------
+# 캐시 세대
+# ------------------------------------------------------------------
+def invalidate_occupancy():
+    """보강 일정/학생 시간표/시간표 변경 시 호출 -> 모든 점유 인덱스 무효화"""
+    cache_gen.bump(_GEN_KEY)
+
+
+def _cache_key(gen, teacher_id, date):
+    return f'academy:occupancy:{gen}:{teacher_id}:{date.isoformat()}'
+
+
+# ------------------------------------------------------------------
+# 인덱스 생성/조회
+# ------------------------------------------------------------------
+def build_occupancy(teacher_ids, dates):
+    """DB 에서 직접 계산 (쿼리 2회) -> {(teacher_id, date): DayOccupancy}"""
+    teacher_ids = set(teacher_ids)
+    dates = sorted(set(dates))
+    index = {(t, d): DayOccupancy() for t in teacher_ids for d in dates}
+    if not teacher_ids or not dates:
+        return index
+
+    dates_by_code = {}
+    for d in dates:
+        dates_by_code.setdefault(day_code(d), []).append(d)
+    codes = list(dates_by_code)
+
+    # 해당 날짜에 빠진 정규 구문 수업 / 그 날짜로 들어온 구문 보강
+    moved_away = set()
+    temps = TemporarySchedule.objects.filter(
+        subject='SYNTAX', student__syntax_teacher_id__in=teacher_ids
+    ).filter(
+        Q(new_date__in=dates) | Q(original_date__in=dates)
+    ).values_list('student_id', 'student__syntax_teacher_id', 'original_date', 'new_date', 'new_start_time')
+    for student_id, teacher_id, original_date, new_date, new_start_time in temps:
+        if original_date:
+            moved_away.add((student_id, original_date))
+        occ = index.get((teacher_id, new_date))
+        if occ is not None and new_start_time:
+            occ.add(new_start_time, student_id)
+
+    rows = StudentProfile.objects.filter(
+        Q(syntax_teacher_id__in=teacher_ids, syntax_class__day__in=codes) |
+        Q(extra_class_teacher_id__in=teacher_ids, extra_class_type='SYNTAX', extra_class__day__in=codes)
+    ).values_list(
+        'id',
+        'syntax_teacher_id', 'syntax_class__day', 'syntax_class__start_time',
+        'extra_class_teacher_id', 'extra_class_type', 'extra_class__day', 'extra_class__start_time',
+    )
+    for (student_id, syntax_teacher_id, syntax_day, syntax_start,
+         extra_teacher_id, extra_type, extra_day, extra_start) in rows:
+        # 정규 구문 수업: 보강/변경으로 이동된 날은 점유하지 않음
+        if syntax_teacher_id in teacher_ids and syntax_start is not None:
+            for d in dates_by_code.get(syntax_day, ()):
+                if (student_id, d) not in moved_away:
+                    index[(syntax_teacher_id, d)].add(syntax_start, student_id)
+
+        # 구문 타입 고정 추가 수업: 이동 개념이 없으므로 항상 점유
+        if extra_teacher_id in teacher_ids and extra_type == 'SYNTAX' and extra_start is not None:
+            for d in dates_by_code.get(extra_day, ()):
+                index[(extra_teacher_id, d)].add(extra_start, student_id)
+
+    return index
+
+
+def get_occupancy(teacher_ids, dates):
+    """
+    캐시를 우선 사용하는 점유 인덱스 조회 -> {(teacher_id, date): DayOccupancy}
+    캐시에 없는 조합만 모아서 한 번에 계산합니다.
+    """
+    teacher_ids = set(teacher_ids)
+    dates = set(dates)
+    gen = cache_gen.generation(_GEN_KEY)
+    keys = {_cache_key(gen, t, d): (t, d) for t in teacher_ids for d in dates}
+
+    result = {}
+    for key, occ in cache.get_many(list(keys)).items():
+        result[keys[key]] = occ
+
+    missing = [pair for pair in keys.values() if pair not in result]
+    if missing:
+        built = build_occupancy({t for t, _ in missing}, {d for _, d in missing})
+        to_cache = {}
+        for key, pair in keys.items():
+            if pair not in result and pair in built:
+                result[pair] = built[pair]
+                to_cache[key] = built[pair]
+        cache.set_many(to_cache, OCCUPANCY_CACHE_TIMEOUT)
+    return result
+
+
+def get_day_occupancy(teacher_id, date):
+    return get_occupancy([teacher_id], [date])[(teacher_id, date)]
@@ -0,0 +1,299 @@
+# academy/progress.py
+"""
+학생 진도 그리드 (ProgressCell) 계산/기록/조회
+
+진도 원천
+    ClassLogEntry : 교재 진도 (점수 원문, 없으면 '완료') / 단어장 진도 (등급 변환)
+    TestResult    : 단어장 시험 (등급 변환)
+원천 1건은 진도 범위의 단원마다 (등급, 순서 키) 를 남기고, 한 칸에는 순서 키가 가장 큰 기록이 남습니다.
+    교재   : (수업 날짜 00:00, 진도 항목 id)
+    단어장 : (일지 작성 시각, 진도 항목 id) / (시험 응시 시각, 시험 id)
+적용 순서와 무관하므로 기간을 나눠 계산한 결과를 합쳐도 전체를 한 번에 계산한 것과 같습니다.
+(성적표 누적 계산과 그리드 갱신이 같은 collect/merge 를 사용)
+
+칸(cells) 형식: {(kind, book_id, unit): [grade, source_at, source_seq, first_at]}
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Max, Q
+
+from utils import day_range
+from .models import ClassLogEntry, ProgressCell, Textbook
+
+TEXTBOOK = ProgressCell.Kind.TEXTBOOK
+VOCAB = ProgressCell.Kind.VOCAB
+
+PROGRESS_CATEGORIES = (
+    'VOCABULARY', 'SYNTAX', 'READING', 'GRAMMAR', 'LISTENING', 'SCHOOL_EXAM', 'MOCK_EXAM', 'OTHER',
+)
+# 출력 순서 (MOCK_EXAM 제외)
+PROGRESS_ORDER = ('VOCABULARY', 'SYNTAX', 'GRAMMAR', 'READING', 'SCHOOL_EXAM', 'LISTENING', 'OTHER')
+
+_CELL_FIELDS = ('kind', 'book_id', 'unit', 'grade', 'source_at', 'source_seq', 'first_at')
+
+
+def convert_score_to_grade(val):
+    """진도 점수 -> 등급 (A/B/C/F, 알 수 없으면 P)"""
+    if val is None:
+        return 'P'  # Default to Pass if unknown but entry exists
+
+    # If already a grade letter
+    s_val = str(val).strip().upper()
+    if s_val in ['A', 'B', 'C', 'F']:
+        return s_val
+
+    try:
+        score = float(s_val)
+        if score == 100:
+            return 'A'
+        elif score >= 95:
+            return 'B'
+        elif score >= 90:
+            return 'C'
+        else:
+            return 'F'
+    except ValueError:
+        # Not a number and not a grade (e.g. '완료', 'Pass')
+        return 'P'
+
+
+# ------------------------------------------------------------------
+# 칸 계산
+# ------------------------------------------------------------------
+def _put(cells, key, grade, at, seq, first_at):
+    cell = cells.get(key)
+    if cell is None:
+        cells[key] = [grade, at, seq, first_at]
+        return
+    if (at, seq) >= (cell[1], cell[2]):
+        cell[0], cell[1], cell[2] = grade, at, seq
+    if first_at < cell[3]:
+        cell[3] = first_at
+
+
+def apply(cells, kind, book_id, units, grade, at, seq):
+    for unit in units:
+        _put(cells, (kind, book_id, unit), grade, at, seq, at)
+
+
+def merge(cells, other):
+    for key, (grade, at, seq, first_at) in other.items():
+        _put(cells, key, grade, at, seq, first_at)
+    return cells
+
+
+def collect(student_id, after=None, end=None, textbook_ids=None, wordbook_ids=None):
+    """
+    (after, end] 사이 원천 -> 칸 (쿼리 최대 2회)
+    textbook_ids / wordbook_ids 를 주면 해당 책만 계산합니다.
+    """
+    from vocab.models import TestResult
+
+    cells = {}
+    scoped = textbook_ids is not None or wordbook_ids is not None
+    textbook_ids = list(textbook_ids or [])
+    wordbook_ids = list(wordbook_ids or [])
+
+    entries = ClassLogEntry.objects.filter(class_log__student_id=student_id)
+    tests = TestResult.objects.filter(student_id=student_id)
+    if end:
+        entries = entries.filter(class_log__date__lte=end)
+        tests = tests.filter(created_at__date__lte=end)
+    if after:
+        entries = entries.filter(class_log__date__gt=after)
+        tests = tests.filter(created_at__date__gt=after)
+    if scoped:
+        entries = entries.filter(Q(textbook_id__in=textbook_ids) | Q(wordbook_id__in=wordbook_ids))
+        tests = tests.filter(book_id__in=wordbook_ids)
+    else:
+        entries = entries.filter(Q(textbook__isnull=False) | Q(wordbook__isnull=False))
+
+    rows = entries.values_list(
+        'id', 'textbook_id', 'wordbook_id', 'progress_range', 'score',
+        'class_log__date', 'class_log__created_at',
+    )
+    for entry_id, textbook_id, wordbook_id, progress_range, score, log_date, log_created_at in rows:
+        units = day_range.parse_list(progress_range)
+        if textbook_id and (not scoped or textbook_id in textbook_ids):
+            at = datetime.combine(log_date, datetime.min.time())
+            apply(cells, TEXTBOOK, textbook_id, units, score or '완료', at, entry_id)
+        if wordbook_id and (not scoped or wordbook_id in wordbook_ids):
+            apply(cells, VOCAB, wordbook_id, units, convert_score_to_grade(score), log_created_at, entry_id)
+
+    if not scoped or wordbook_ids:
+        for test_id, book_id, test_range, score, created_at in tests.values_list(
+            'id', 'book_id', 'test_range', 'score', 'created_at'
+        ):
+            apply(cells, VOCAB, book_id, day_range.parse_list(test_range), convert_score_to_grade(score), created_at, test_id)
+    return cells
+
+
+# ------------------------------------------------------------------
+# 그리드 기록
+# ------------------------------------------------------------------
+def load_cells(student_id):
+    """학생 그리드 전체 -> 칸 (인덱스 조회 1회)"""
+    return {
+        (kind, book_id, unit): [grade, source_at, source_seq, first_at]
+        for kind, book_id, unit, grade, source_at, source_seq, first_at in
+        ProgressCell.objects.filter(student_id=student_id).values_list(*_CELL_FIELDS)
+    }
+
+
+def _replace(student_id, cells, scope=None):
+    """scope(Q) 범위의 기존 칸을 cells 로 교체 (바뀐 칸만 쓰고 사라진 칸은 삭제) -> (기록 수, 삭제 수)"""
+    existing_qs = ProgressCell.objects.filter(student_id=student_id)
+    if scope is not None:
+        existing_qs = existing_qs.filter(scope)
+    existing = {}
+    for row in existing_qs.values_list('id', *_CELL_FIELDS):
+        existing[row[1:4]] = (row[0], list(row[4:]))
+
+    stale_ids = [pk for key, (pk, _value) in existing.items() if key not in cells]
+    changed = [
+        ProgressCell(
+            student_id=student_id, kind=kind, book_id=book_id, unit=unit,
+            grade=grade, source_at=at, source_seq=seq, first_at=first_at,
+        )
+        for (kind, book_id, unit), (grade, at, seq, first_at) in cells.items()
+        if (kind, book_id, unit) not in existing or existing[(kind, book_id, unit)][1] != [grade, at, seq, first_at]
+    ]
+    with transaction.atomic():
+        if stale_ids:
+            ProgressCell.objects.filter(id__in=stale_ids).delete()
+        if changed:
+            ProgressCell.objects.bulk_create(
+                changed,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['student', 'kind', 'book_id', 'unit'],
+                update_fields=['grade', 'source_at', 'source_seq', 'first_at', 'updated_at'],
+            )
+    return len(changed), len(stale_ids)
+
+
+def refresh(student_id, textbook_ids=(), wordbook_ids=()):
+    """학생의 해당 교재/단어장 칸을 원천에서 다시 계산"""
+    textbook_ids = {i for i in textbook_ids if i}
+    wordbook_ids = {i for i in wordbook_ids if i}
+    if not student_id or not (textbook_ids or wordbook_ids):
+        return
+    cells = collect(student_id, textbook_ids=textbook_ids, wordbook_ids=wordbook_ids)
+    scope = Q(kind=TEXTBOOK, book_id__in=textbook_ids) | Q(kind=VOCAB, book_id__in=wordbook_ids)
+    _replace(student_id, cells, scope)
+
+
+def refresh_entries(entries):
+    """bulk_create 처럼 시그널 없이 저장된 진도 항목들의 칸 갱신 (학생별 1회)"""
+    books = {}
+    for entry in entries:
+        textbook_ids, wordbook_ids = books.setdefault(entry.class_log.student_id, (set(), set()))
+        textbook_ids.add(entry.textbook_id)
+        wordbook_ids.add(entry.wordbook_id)
+    for student_id, (textbook_ids, wordbook_ids) in books.items():
+        refresh(student_id, textbook_ids, wordbook_ids)
+
+
+def remove_book(kind, book_id):
+    """교재/단어장 삭제 시 해당 칸 정리"""
+    ProgressCell.objects.filter(kind=kind, book_id=book_id).delete()
+
+
+def backfill(student_ids=None):
+    """학생별로 그리드 전체를 다시 계산 (여러 번 실행해도 안전) -> {'students', 'written', 'deleted'}"""
+    from core.models import StudentProfile
+
+    if not student_ids:
+        student_ids = StudentProfile.objects.order_by('id').values_list('id', flat=True)
+    counts = {'students': 0, 'written': 0, 'deleted': 0}
+    for student_id in student_ids:
+        written, deleted = _replace(student_id, collect(student_id))
+        counts['students'] += 1
+        counts['written'] += written
+        counts['deleted'] += deleted
+    return counts
+
+
+def is_current(student_id, end):
+    """
+    그리드가 end 시점 진도와 같은지
+    (end 이후 진도 원천이 없고, 원천이 있다면 그리드가 채워져 있어야 함 - 백필 전 학생 보호)
+    """
+    from vocab.models import TestResult
+
+    entries = ClassLogEntry.objects.filter(class_log__student_id=student_id).filter(
+        Q(textbook__isnull=False) | Q(wordbook__isnull=False)
+    )
+    tests = TestResult.objects.filter(student_id=student_id)
+    if entries.filter(class_log__date__gt=end).exists() or tests.filter(created_at__date__gt=end).exists():
+        return False
+    if ProgressCell.objects.filter(student_id=student_id).exists():
+        return True
+    return not (entries.exists() or tests.exists())
+
+
+# ------------------------------------------------------------------
+# 화면용 변환
+# ------------------------------------------------------------------
+def book_meta(cells):
+    """칸에 등장한 책 정보 -> (교재 {id: {title, total_units, category}}, 단어장 {id: {title, total_units}})"""
+    from vocab.models import Word, WordBook
+
+    textbook_ids = {book_id for kind, book_id, _unit in cells if kind == TEXTBOOK}
+    wordbook_ids = {book_id for kind, book_id, _unit in cells if kind == VOCAB}
+    textbooks = {}
+    if textbook_ids:
+        for tb_id, title, total_units, category in Textbook.objects.filter(
+            id__in=textbook_ids
+        ).values_list('id', 'title', 'total_units', 'category'):
+            textbooks[tb_id] = {'title': title, 'total_units': total_units, 'category': category}
+    wordbooks = {}
+    if wordbook_ids:
+        for wb_id, title in WordBook.objects.filter(id__in=wordbook_ids).values_list('id', 'title'):
+            wordbooks[wb_id] = {'title': title, 'total_units': 0}
+        for row in Word.objects.filter(book_id__in=wordbooks).values('book_id').annotate(m=Max('number')).order_by():
+            wordbooks[row['book_id']]['total_units'] = row['m'] or 0
+    return textbooks, wordbooks
+
+
+def progress_sections(cells, textbooks, wordbooks):
+    """
+    칸 -> {카테고리: [{title, total_units, history}]} (PROGRESS_ORDER 순, history 는 단원순)
+    - 단어장: 처음 기록된 순, 교재: 최근 기록된 순
+    - 정보가 없는 책(삭제됨)은 제외
+    """
+    books = {}
+    for (kind, book_id, unit), (grade, at, seq, first_at) in sorted(cells.items()):
+        book = books.get((kind, book_id))
+        if book is None:
+            book = books[(kind, book_id)] = {'history': {}, 'latest': (at, seq), 'first': first_at}
+        book['history'][unit] = grade
+        book['latest'] = max(book['latest'], (at, seq))
+        book['first'] = min(book['first'], first_at)
+
+    progress = {cat: [] for cat in PROGRESS_CATEGORIES}
+    vocab = sorted(
+        ((key[1], book) for key, book in books.items() if key[0] == VOCAB and key[1] in wordbooks),
+        key=lambda item: (item[1]['first'], item[0]),
+    )
+    for wb_id, book in vocab:
+        progress['VOCABULARY'].append({
+            'title': wordbooks[wb_id]['title'],
+            'total_units': wordbooks[wb_id]['total_units'],
+            'history': book['history'],
+        })
+    textbook_books = sorted(
+        ((key[1], book) for key, book in books.items() if key[0] == TEXTBOOK and key[1] in textbooks),
+        key=lambda item: (item[1]['latest'], item[0]),
+        reverse=True,
+    )
+    for tb_id, book in textbook_books:
+        meta = textbooks[tb_id]
+        cat = meta['category'] if meta['category'] in progress else 'OTHER'
+        progress[cat].append({
+            'title': meta['title'],
+            'total_units': meta['total_units'],
+            'history': book['history'],
+        })
+    return {cat: progress[cat] for cat in PROGRESS_ORDER if progress[cat]}
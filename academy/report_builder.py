@@ -0,0 +1,470 @@
+# academy/report_builder.py
+"""
+성적표(StudentReport) 데이터 스냅샷 생성
+
+기간 데이터(출결/과제/수업일지)는 매번 [start, end] 만 조회하지만,
+누적 데이터(단어 시험 이력/누적 통과 단어, 교재·단어장 진도)는 학생의 전체 이력이 필요합니다.
+그래서 직전 성적표에 누적 상태(checkpoint)를 함께 저장해 두고,
+다음 성적표는 체크포인트 이후 ~ 새 종료일 사이의 활동만 이어서 접어 넣습니다. (월별 발행 비용 = 그 달 활동량)
+
+체크포인트 사용 조건 (하나라도 어긋나면 전체 재계산):
+    - CHECKPOINT_VERSION 일치, 체크포인트 종료일 <= 새 종료일
+    - fingerprint 일치: 체크포인트 종료일까지의 시험/일지/진도 행 수·최대 id·점수 합이 그대로
+      (과거 날짜로 일지를 추가/삭제하거나 시험 점수가 정정되면 달라짐)
+
+[NEW] 교재·단어장 진도는 학생 진도 그리드(academy.progress)와 같은 칸 규칙으로 계산합니다.
+종료일 이후 진도 기록이 없으면(보통 이번 달 성적표) 그리드를 그대로 읽습니다. (인덱스 조회 1회)
+"""
+from datetime import datetime
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Max, Sum
+
+from . import progress
+from .models import AssignmentTask, Attendance, ClassLog, ClassLogEntry, StudentReport, Textbook
+from .progress import convert_score_to_grade  # noqa: F401 (기존 import 경로 유지)
+
+# 2: 진도를 교재/단어장별 목록 대신 그리드 칸으로 저장
+CHECKPOINT_VERSION = 2
+
+
+def _to_date(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
+def _normalize_word(text):
+    return text.strip().lower() if text else ''
+
+
+def recursive_serialize(data):
+    """JSONField 에 넣을 수 있는 형태로 변환 (날짜 -> isoformat, 파일 -> url, 나머지 -> str)"""
+    try:
+        if data is None:
+            return None
+        if isinstance(data, (bool, int, float, str)):
+            return data
+        if isinstance(data, dict):
+            return {k: recursive_serialize(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [recursive_serialize(item) for item in data]
+        elif hasattr(data, 'isoformat'):
+            return data.isoformat()
+        elif hasattr(data, 'url'):
+            try:
+                return data.url
+            except Exception:
+                return None
+        # FORCE STRING
+        return str(data)
+    except Exception:
+        return str(data)
+
+
+# ------------------------------------------------------------------
+# 누적 상태
+# ------------------------------------------------------------------
+class CumulativeState:
+    """
+    체크포인트로 저장되는 누적 집계 상태
+        vocab_tests        단어 시험 이력 (최신순, 직렬화된 형태)
+        word_state         단어 -> 마지막 정답 여부
+        cumulative_passed  누적 통과 단어 수
+        cells              진도 칸 (academy.progress 형식)
+        vocab_max_days     단어장 id -> [pack_version, 마지막 Day]
+    textbook_meta / vocab_titles 는 매번 현재 값으로 채우므로 저장하지 않습니다.
+    """
+
+    def __init__(self):
+        self.end_date = None
+        self.vocab_tests = []
+        self.word_state = {}
+        self.cumulative_passed = 0
+        self.cells = {}
+        self.vocab_max_days = {}
+        self.textbook_meta = {}
+        self.vocab_titles = {}
+
+    def to_checkpoint(self, fingerprint):
+        return {
+            'version': CHECKPOINT_VERSION,
+            'end_date': self.end_date.isoformat(),
+            'fingerprint': fingerprint,
+            'word_state': self.word_state,
+            'cumulative_passed': self.cumulative_passed,
+            # JSON 객체 키는 문자열이 되므로 정수 id 보존을 위해 목록으로 저장
+            'cells': [
+                [kind, book_id, unit, grade, at.isoformat(), seq, first_at.isoformat()]
+                for (kind, book_id, unit), (grade, at, seq, first_at) in self.cells.items()
+            ],
+            'vocab_max_days': [[k, v] for k, v in self.vocab_max_days.items()],
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint, vocab_tests):
+        state = cls()
+        state.end_date = _to_date(checkpoint['end_date'])
+        state.vocab_tests = list(vocab_tests)
+        state.word_state = dict(checkpoint['word_state'])
+        state.cumulative_passed = checkpoint['cumulative_passed']
+        state.cells = {
+            (kind, book_id, unit): [grade, datetime.fromisoformat(at), seq, datetime.fromisoformat(first_at)]
+            for kind, book_id, unit, grade, at, seq, first_at in checkpoint['cells']
+        }
+        state.vocab_max_days = {k: v for k, v in checkpoint['vocab_max_days']}
+        return state
+
+
+def fingerprint(student_id, end):
+    """end 까지의 누적 원천 데이터 요약 (행 수/최대 id/점수 합) - 과거 데이터 변경 감지용"""
+    from vocab.models import TestResult
+
+    tests = TestResult.objects.filter(student_id=student_id, created_at__date__lte=end).aggregate(
+        c=Count('id'), m=Max('id'), s=Sum('score')
+    )
+    logs = ClassLog.objects.filter(student_id=student_id, date__lte=end).aggregate(
+        c=Count('id'), m=Max('id')
+    )
+    entries = ClassLogEntry.objects.filter(
+        class_log__student_id=student_id, class_log__date__lte=end
+    ).aggregate(c=Count('id'), m=Max('id'))
+    return [
+        tests['c'], tests['m'], tests['s'],
+        logs['c'], logs['m'],
+        entries['c'], entries['m'],
+    ]
+
+
+def load_checkpoint(student_id, end):
+    """end 이전에 끝나는 가장 최근 성적표의 체크포인트 -> CumulativeState 또는 None"""
+    report = StudentReport.objects.filter(
+        student_id=student_id, end_date__lte=end
+    ).exclude(checkpoint={}).order_by('-end_date', '-id').only(
+        'id', 'end_date', 'data_snapshot', 'checkpoint'
+    ).first()
+    if report is None:
+        return None
+    checkpoint = report.checkpoint
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+    cp_end = _to_date(checkpoint['end_date'])
+    if fingerprint(student_id, cp_end) != checkpoint.get('fingerprint'):
+        return None
+    try:
+        return CumulativeState.from_checkpoint(checkpoint, report.data_snapshot.get('vocab', []))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# ------------------------------------------------------------------
+# 누적 상태에 새 활동 접어 넣기
+# ------------------------------------------------------------------
+def _fold_vocab_tests(state, student_id, after, end):
+    """(after, end] 사이 단어 시험을 시간순으로 반영 (vocab_tests 는 최신순 유지)"""
+    from vocab.models import TestResult
+
+    vocab_qs = TestResult.objects.filter(
+        student_id=student_id, created_at__date__lte=end
+    ).select_related('book').prefetch_related('details').order_by('created_at')
+    if after:
+        vocab_qs = vocab_qs.filter(created_at__date__gt=after)
+
+    word_state = state.word_state
+    current_total_score = state.cumulative_passed
+    new_tests = []
+    for v in vocab_qs:
+        try:
+            wrong_words = []
+            # prefetch 된 details 재사용 (보관된 결과는 압축 blob 에서 복원)
+            for d in v.get_details():
+                if not d.is_correct:
+                    wrong_words.append({
+                        'word': d.word_question,
+                        'student': d.student_answer,
+                        'answer': d.correct_answer,
+                    })
+
+                # Word-Level State Tracking (대시보드 그리드와 같은 규칙)
+                w_key = _normalize_word(d.word_question)
+                if w_key:
+                    prev = word_state.get(w_key)
+                    if prev is True and not d.is_correct:
+                        current_total_score -= 1
+                    if prev is not True and d.is_correct:
+                        current_total_score += 1
+                    word_state[w_key] = d.is_correct
+
+            # 그래프 포인트는 그 시점의 누적 통과 수
+            new_tests.append(recursive_serialize({
+                'created_at': v.created_at,
+                'score': v.score,
+                'total_count': v.total_count,
+                'wrong_count': v.wrong_count,
+                'book__title': v.book.title,
+                'test_range': v.test_range,
+                'wrong_words': wrong_words,
+                'cumulative_passed': current_total_score,
+            }))
+        except Exception:
+            continue
+
+    new_tests.reverse()  # 최신순
+    state.vocab_tests = new_tests + state.vocab_tests
+    state.cumulative_passed = current_total_score
+
+
+def _fold_progress(state, student_id, after, end):
+    """(after, end] 사이 일지 진도/단어 시험을 진도 칸에 반영 (순서 무관 병합)"""
+    progress.merge(state.cells, progress.collect(student_id, after=after, end=end))
+
+
+def _refresh_book_meta(state):
+    """교재/단어장 제목·단원 수는 현재 값으로 (단어장 마지막 Day 는 pack_version 이 바뀐 책만 재계산)"""
+    from vocab.models import Word, WordBook
+
+    textbook_ids = {book_id for kind, book_id, _unit in state.cells if kind == progress.TEXTBOOK}
+    wordbook_ids = {book_id for kind, book_id, _unit in state.cells if kind == progress.VOCAB}
+    state.textbook_meta = {}
+    if textbook_ids:
+        for tb_id, title, total_units, category in Textbook.objects.filter(
+            id__in=textbook_ids
+        ).values_list('id', 'title', 'total_units', 'category'):
+            state.textbook_meta[tb_id] = {'title': title, 'total_units': total_units, 'category': category}
+
+    state.vocab_titles = {}
+    if not wordbook_ids:
+        return
+    stale = []
+    for wb_id, title, pack_version in WordBook.objects.filter(
+        id__in=wordbook_ids
+    ).values_list('id', 'title', 'pack_version'):
+        state.vocab_titles[wb_id] = title
+        cached = state.vocab_max_days.get(wb_id)
+        if not cached or cached[0] != pack_version:
+            stale.append(wb_id)
+            state.vocab_max_days[wb_id] = [pack_version, 0]
+    if stale:
+        for row in Word.objects.filter(book_id__in=stale).values('book_id').annotate(m=Max('number')).order_by():
+            state.vocab_max_days[row['book_id']][1] = row['m'] or 0
+
+
+def build_cumulative_state(student_id, end, full_rebuild=False):
+    """end 까지의 누적 상태 (가능하면 직전 체크포인트에서 이어서 계산) -> (state, 재사용 여부)"""
+    state = None if full_rebuild else load_checkpoint(student_id, end)
+    reused = state is not None
+    after = state.end_date if reused else None
+    if state is None:
+        state = CumulativeState()
+
+    _fold_vocab_tests(state, student_id, after, end)
+    # 종료일 이후 진도 기록이 없으면 현재 그리드가 곧 end 시점 진도
+    if not full_rebuild and progress.is_current(student_id, end):
+        state.cells = progress.load_cells(student_id)
+    else:
+        _fold_progress(state, student_id, after, end)
+
+    state.end_date = end
+    _refresh_book_meta(state)
+    return state, reused
+
+
+# ------------------------------------------------------------------
+# 기간 데이터
+# ------------------------------------------------------------------
+def _attendances(student_id, start, end):
+    try:
+        return list(Attendance.objects.filter(
+            student_id=student_id,
+            date__range=[start, end]
+        ).values('date', 'status', 'check_in_time'))
+    except Exception:
+        return []
+
+
+def _assignments(student_id, start, end):
+    assignments = []
+    assignments_qs = AssignmentTask.objects.filter(
+        student_id=student_id,
+        due_date__date__range=[start, end]
+    ).select_related('related_textbook', 'related_vocab_book', 'submission').order_by('-due_date')
+
+    for a in assignments_qs:
+        try:
+            feedback = ''
+            status = '미제출'
+            submission_image = None
+
+            try:
+                submission = a.submission
+                feedback = submission.teacher_comment
+                status = submission.get_status_display()
+
+                # 마감 이후 제출은 지각 처리
+                if submission.submitted_at and a.due_date and submission.submitted_at > a.due_date:
+                    status = '지각제출'
+
+                # [FIX] 후처리된 미리보기가 있으면 원본 대신 사용
+                photo = submission.image_preview or submission.image
+                if photo and photo.name:
+                    try:
+                        submission_image = photo.url
+                    except Exception:
+                        pass
+            except ObjectDoesNotExist:
+                if a.is_completed:
+                    status = '완료'
+
+            assignments.append({
+                'title': a.title,
+                'due_date': a.due_date,
+                'is_completed': a.is_completed,
+                'assignment_type': a.get_assignment_type_display(),
+                'status': status,
+                'feedback': feedback,
+                'submission_image': submission_image,
+            })
+        except Exception:
+            continue
+    return assignments
+
+
+def _period_logs(student_id, start, end):
+    logs = []
+    logs_qs = ClassLog.objects.filter(
+        student_id=student_id,
+        date__range=[start, end]
+    ).prefetch_related('entries', 'entries__textbook', 'entries__wordbook', 'generated_assignments').order_by('-date')
+
+    for l in logs_qs:
+        try:
+            details = []
+            for e in l.entries.all():
+                book_name = e.textbook.title if e.textbook else (e.wordbook.title if e.wordbook else '기타')
+                details.append({
+                    'text': f"{book_name} ({e.progress_range})",
+                    'score': e.score or '-',
+                })
+
+            homeworks = []
+            for t in l.generated_assignments.all():
+                homeworks.append({
+                    'title': t.title,
+                    'due_date': t.due_date,
+                    'is_completed': t.is_completed,
+                })
+
+            logs.append({
+                'date': l.date,
+                'subject': l.get_subject_display(),
+                'subject_code': l.subject,
+                'comment': l.comment,
+                'teacher_comment': l.teacher_comment,
+                'details': details,
+                'homeworks': homeworks,
+            })
+        except Exception:
+            continue
+    return logs
+
+
+def _textbook_progress(state):
+    """누적 상태 -> {카테고리: [{title, total_units, history}]} (PROGRESS_ORDER 순)"""
+    wordbooks = {
+        wb_id: {'title': title, 'total_units': state.vocab_max_days.get(wb_id, [0, 0])[1]}
+        for wb_id, title in state.vocab_titles.items()
+    }
+    return progress.progress_sections(state.cells, state.textbook_meta, wordbooks)
+
+
+def _stats(attendances, vocab_tests, assignments, cumulative_passed):
+    total_days = len(attendances)
+    present_days = sum(1 for a in attendances if a['status'] == 'PRESENT')
+
+    # 퍼센트 기준 단어 평균: (score / total_count) * 100
+    vocab_avg = 0
+    if vocab_tests:
+        percentages = []
+        for t in vocab_tests:
+            total = t.get('total_count') or 30  # Default to 30 if 0
+            percentages.append((t['score'] / total) * 100 if total > 0 else 0)
+        vocab_avg = sum(percentages) / len(percentages)
+
+    assign_on_time = 0
+    assign_late = 0
+    assign_missing = 0
+    for a in assignments:
+        status = a.get('status', '미제출')
+        if status in ('제출완료', '승인(완료)', '검사 대기', '완료'):
+            assign_on_time += 1
+        elif status == '지각제출':
+            assign_late += 1
+        else:
+            assign_missing += 1
+
+    return {
+        'attendance_rate': (present_days / total_days * 100) if total_days > 0 else 0,
+        'vocab_avg': round(vocab_avg, 1),
+        'assignment_count': len(assignments),
+        'assignment_completed': (assign_on_time + assign_late),
+        'assignment_breakdown': {
+            'on_time': assign_on_time,
+            'late': assign_late,
+            'missing': assign_missing,
+        },
+        'total_passed_words': cumulative_passed,
+    }
+
+
+def build_report_data(student_id, start, end, full_rebuild=False):
+    """
+    성적표 스냅샷 생성 -> (data_snapshot, checkpoint, 체크포인트 재사용 여부)
+    checkpoint 는 StudentReport.checkpoint 에 저장해 다음 발행 때 재사용합니다.
+    """
+    start = _to_date(start)
+    end = _to_date(end)
+
+    attendances = _attendances(student_id, start, end)
+    try:
+        assignments = _assignments(student_id, start, end)
+    except Exception:
+        assignments = []
+    try:
+        logs = _period_logs(student_id, start, end)
+    except Exception:
+        logs = []
+
+    state, reused = build_cumulative_state(student_id, end, full_rebuild=full_rebuild)
+    checkpoint = state.to_checkpoint(fingerprint(student_id, end))
+
+    snapshot = {
+        'stats': _stats(attendances, state.vocab_tests, assignments, state.cumulative_passed),
+        'attendance': recursive_serialize(attendances),
+        'vocab': state.vocab_tests,
+        'assignments': recursive_serialize(assignments),
+        'logs': recursive_serialize(logs),
+        'textbook_progress': recursive_serialize(_textbook_progress(state)),
+    }
+    return snapshot, checkpoint, reused
+
+
+# ------------------------------------------------------------------
+# 공개 링크 산출물 (public_view)
+# ------------------------------------------------------------------
+def render_public_artifact(report):
+    """공개 응답 본문(JSON 문자열)과 ETag - DRF JSON 응답과 같은 바이트"""
+    from rest_framework.renderers import JSONRenderer
+    from utils.http_cache import content_etag
+    from .serializers import StudentReportSerializer
+
+    body = JSONRenderer().render(StudentReportSerializer(report).data).decode('utf-8')
+    return body, content_etag(body)
+
+
+def refresh_public_artifact(report):
+    """본문이 바뀐 경우에만 저장 (update 로 저장하므로 시그널이 다시 돌지 않음)"""
+    body, etag = render_public_artifact(report)
+    if etag != report.public_etag:
+        StudentReport.objects.filter(pk=report.pk).update(public_json=body, public_etag=etag)
+        report.public_json, report.public_etag = body, etag
+    return body, etag
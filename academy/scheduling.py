@@ -0,0 +1,226 @@
+# academy/scheduling.py
+"""
+수업 일정 해석 엔진 ("D 날짜에 누가, 어떤 과목을, 누구와, 몇 시에 수업하는가")
+
+학생들의 정규 시간표(ClassTime)와 보강/일정변경(TemporarySchedule)을 한 번에 읽어
+날짜별 '세션' 목록으로 풀어줍니다. 학생 수와 무관하게 쿼리 2~3회로 끝납니다.
+    1) 학생 + 시간표 + 담당 선생님(staff_profile) : select_related 1회
+    2) 기간 내 TemporarySchedule                   : 1회
+
+세션(dict) 구성:
+    student      StudentProfile
+    date         수업 날짜
+    subject      'SYNTAX' / 'READING' / 'GRAMMAR' (추가 수업은 extra_class_type)
+    teacher      담당 선생님(User) 또는 None
+    class_time   ClassTime 또는 None
+    start_time   시작 시간 (보강은 new_start_time 우선)
+    source       'regular' / 'makeup' / 'cancelled'
+    is_extra     학생의 추가(특강) 수업 여부
+    schedule     관련 TemporarySchedule (보강/취소일 때)
+
+취소 규칙: original_date 가 D 이고 과목이 같으며 '추가 보충'(is_extra_class)이 아닌
+TemporarySchedule 이 있으면 해당 정규 수업은 cancelled 로 표시됩니다.
+추가(특강) 수업은 이동 개념이 없으므로 취소 처리하지 않습니다.
+"""
+from datetime import timedelta
+
+from django.db.models import Q
+
+from core.models import StudentProfile
+from .models import TemporarySchedule
+
+WEEKDAY_CODES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+SOURCE_REGULAR = 'regular'
+SOURCE_MAKEUP = 'makeup'
+SOURCE_CANCELLED = 'cancelled'
+
+STUDENT_SCHEDULE_RELATED = (
+    'user',
+    'syntax_class', 'reading_class', 'extra_class',
+    'syntax_teacher__staff_profile',
+    'reading_teacher__staff_profile',
+    'extra_class_teacher__staff_profile',
+)
+
+
+def day_code(date):
+    return WEEKDAY_CODES[date.weekday()]
+
+
+def iter_dates(start_date, end_date):
+    current = start_date
+    while current <= end_date:
+        yield current
+        current += timedelta(days=1)
+
+
+def subject_teacher(student, subject):
+    """과목 -> 담당 선생님 (GRAMMAR 등 나머지는 추가 수업 담당)"""
+    if subject == 'SYNTAX':
+        return student.syntax_teacher
+    if subject == 'READING':
+        return student.reading_teacher
+    return student.extra_class_teacher
+
+
+def teacher_name(user, default="미지정"):
+    profile = getattr(user, 'staff_profile', None) if user else None
+    return profile.name if profile else default
+
+
+# ------------------------------------------------------------------
+# 학생 집합
+# ------------------------------------------------------------------
+def students_for_teacher(user, branch=None, active_only=True):
+    qs = StudentProfile.objects.filter(
+        Q(syntax_teacher=user) | Q(reading_teacher=user) | Q(extra_class_teacher=user)
+    )
+    if branch is not None:
+        qs = qs.filter(branch=branch)
+    if active_only:
+        qs = qs.filter(user__is_active=True)
+    return qs
+
+
+def students_for_branch(branch, active_only=True):
+    qs = StudentProfile.objects.filter(branch=branch)
+    if active_only:
+        qs = qs.filter(user__is_active=True)
+    return qs
+
+
+def students_with_class_on(date, base_qs=None):
+    """해당 날짜에 정규/추가 수업 또는 보강이 잡힌 학생 (후보군 축소용)"""
+    code = day_code(date)
+    qs = base_qs if base_qs is not None else StudentProfile.objects.all()
+    return qs.filter(
+        Q(syntax_class__day=code) |
+        Q(reading_class__day=code) |
+        Q(extra_class__day=code) |
+        Q(temp_schedules__new_date=date)
+    ).distinct()
+
+
+# ------------------------------------------------------------------
+# 세션 해석
+# ------------------------------------------------------------------
+def load_students(students):
+    """QuerySet 이면 시간표/선생님까지 select_related 로 한 번에 로드"""
+    if hasattr(students, 'select_related'):
+        return list(students.select_related(*STUDENT_SCHEDULE_RELATED))
+    return list(students)
+
+
+def load_temp_schedules(student_ids, start_date, end_date):
+    """기간 안에서 보강 날짜 또는 원래 수업일이 걸린 TemporarySchedule 을 한 번에 조회"""
+    if not student_ids:
+        return []
+    return list(
+        TemporarySchedule.objects.filter(student_id__in=student_ids).filter(
+            Q(new_date__range=(start_date, end_date)) |
+            Q(original_date__range=(start_date, end_date))
+        ).select_related('target_class').order_by('new_date', 'id')
+    )
+
+
+def _session(student, date, subject, teacher, class_time, start_time, source, is_extra=False, schedule=None):
+    return {
+        'student': student,
+        'date': date,
+        'subject': subject,
+        'teacher': teacher,
+        'class_time': class_time,
+        'start_time': start_time,
+        'source': source,
+        'is_extra': is_extra,
+        'schedule': schedule,
+    }
+
+
+def resolve_sessions(students, start_date, end_date=None, include_cancelled=False, with_teachers=True):
+    """
+    학생 집합의 [start_date, end_date] 기간 세션 목록
+    - students: StudentProfile QuerySet(권장) 또는 이미 로드된 목록
+    - include_cancelled: True 면 이동/취소된 정규 수업도 source='cancelled' 로 포함
+    - with_teachers: False 면 teacher 를 채우지 않음 (시작 시간만 필요할 때, 선생님 조회 생략)
+    반환: 날짜, 시작 시간 순으로 정렬된 세션 dict 목록
+    """
+    end_date = end_date or start_date
+    students = load_students(students)
+    teacher_of = subject_teacher if with_teachers else (lambda student, subject: None)
+    by_id = {s.id: s for s in students}
+    temps = load_temp_schedules(list(by_id), start_date, end_date)
+
+    cancelled = {}  # (student_id, date, subject) -> TemporarySchedule
+    makeups = []
+    for ts in temps:
+        if ts.original_date and not ts.is_extra_class and start_date <= ts.original_date <= end_date:
+            cancelled.setdefault((ts.student_id, ts.original_date, ts.subject), ts)
+        if start_date <= ts.new_date <= end_date:
+            makeups.append(ts)
+
+    sessions = []
+    for date in iter_dates(start_date, end_date):
+        code = day_code(date)
+        for student in students:
+            for subject, class_time in (
+                ('SYNTAX', student.syntax_class),
+                ('READING', student.reading_class),
+            ):
+                if not class_time or class_time.day != code:
+                    continue
+                moved = cancelled.get((student.id, date, subject))
+                if moved and not include_cancelled:
+                    continue
+                sessions.append(_session(
+                    student, date, subject, teacher_of(student, subject), class_time, class_time.start_time,
+                    SOURCE_CANCELLED if moved else SOURCE_REGULAR, schedule=moved,
+                ))
+
+            if student.extra_class and student.extra_class.day == code:
+                sessions.append(_session(
+                    student, date, student.extra_class_type, teacher_of(student, None),
+                    student.extra_class, student.extra_class.start_time, SOURCE_REGULAR,
+                    is_extra=True,
+                ))
+
+    for ts in makeups:
+        student = by_id[ts.student_id]
+        start_time = ts.new_start_time or (ts.target_class.start_time if ts.target_class else None)
+        sessions.append(_session(
+            student, ts.new_date, ts.subject, teacher_of(student, ts.subject),
+            ts.target_class, start_time, SOURCE_MAKEUP, schedule=ts,
+        ))
+
+    sessions.sort(key=_sort_key)
+    return sessions
+
+
+def _sort_key(session):
+    start = session['start_time']
+    # 시작 시간이 없는 세션은 그 날짜의 맨 뒤로
+    return (session['date'], start is None, start)
+
+
+def active_sessions(sessions):
+    return [s for s in sessions if s['source'] != SOURCE_CANCELLED]
+
+
+def first_start_times(sessions):
+    """(student_id, date) -> 가장 이른 수업 시작 시간 (취소된 수업 제외)"""
+    result = {}
+    for s in sessions:
+        if s['source'] == SOURCE_CANCELLED or not s['start_time']:
+            continue
+        key = (s['student'].id, s['date'])
+        if key not in result or s['start_time'] < result[key]:
+            result[key] = s['start_time']
+    return result
+
+
+def group_by_student(sessions):
+    grouped = {}
+    for s in sessions:
+        grouped.setdefault(s['student'].id, []).append(s)
+    return grouped
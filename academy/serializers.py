@@ -1,25 +1,41 @@
 from rest_framework import serializers
 from .models import AssignmentTask, AssignmentSubmission, AssignmentSubmissionImage, ClassLog, ClassLogEntry, TemporarySchedule, Attendance, Textbook, TextbookUnit, StudentReport # [NEW]
 from core.models import StudentProfile
+from utils import day_range
 
-class AssignmentSubmissionImageSerializer(serializers.ModelSerializer):
+class ProcessedImageUrlsMixin(serializers.Serializer):
+    """
+    [NEW] 인증샷 URL (원본/미리보기/썸네일)
+    후처리(academy.images) 전이면 미리보기/썸네일도 원본 URL 을 돌려줍니다.
+    """
     image_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
 
-    class Meta:
-        model = AssignmentSubmissionImage
-        fields = ['id', 'image', 'image_url', 'created_at']
-
-    def get_image_url(self, obj):
-        if not obj.image:
+    def _file_url(self, field_file):
+        if not field_file:
             return ''
         request = self.context.get('request')
         if request is None:
-            return obj.image.url
-        return request.build_absolute_uri(obj.image.url)
+            return field_file.url
+        return request.build_absolute_uri(field_file.url)
+
+    def get_image_url(self, obj):
+        return self._file_url(obj.image)
+
+    def get_preview_url(self, obj):
+        return self._file_url(obj.image_preview or obj.image)
 
-class AssignmentSubmissionSerializer(serializers.ModelSerializer):
+    def get_thumbnail_url(self, obj):
+        return self._file_url(obj.image_thumb or obj.image)
+
+class AssignmentSubmissionImageSerializer(ProcessedImageUrlsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = AssignmentSubmissionImage
+        fields = ['id', 'image', 'image_url', 'preview_url', 'thumbnail_url', 'created_at']
+
+class AssignmentSubmissionSerializer(ProcessedImageUrlsMixin, serializers.ModelSerializer):
     student_name = serializers.ReadOnlyField(source='student.name')
-    image_url = serializers.SerializerMethodField()
     images = AssignmentSubmissionImageSerializer(many=True, read_only=True)
     
     class Meta:
@@ -27,14 +43,6 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['submitted_at', 'status', 'reviewed_at']
 
-    def get_image_url(self, obj):
-        if not obj.image:
-            return ''
-        request = self.context.get('request')
-        if request is None:
-            return obj.image.url
-        return request.build_absolute_uri(obj.image.url)
-
 class AssignmentTaskSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.name', read_only=True)
     submission = AssignmentSubmissionSerializer(read_only=True)
@@ -48,34 +56,49 @@ class AssignmentTaskSerializer(serializers.ModelSerializer):
 
     def get_lecture_links(self, obj):
         """교재 범위에 해당하는 강의 링크 반환"""
-        if not obj.related_textbook or not obj.textbook_range:
+        if not obj.related_textbook_id or not obj.textbook_range:
             return []
         
-        # Parse range (e.g., "1-3" or "5")
-        range_str = obj.textbook_range.strip()
-        try:
-            if '-' in range_str:
-                start, end = map(int, range_str.split('-'))
-            else:
-                start = end = int(range_str)
-        except ValueError:
+        # Parse range (e.g., "1-3", "5" or "1-3,7")
+        intervals = day_range.parse(obj.textbook_range)
+        if not intervals:
             return []
-        
-        # Get units within range
-        units = obj.related_textbook.units.filter(
-            unit_number__gte=start,
-            unit_number__lte=end
-        ).order_by('unit_number')
-        
+
+        # [FIX] 목록 조회는 lecture_units_for 로 미리 읽은 단원을 범위로 잘라 사용 (과제당 쿼리 없음)
+        lecture_units = self.context.get('lecture_units')
+        if lecture_units is not None:
+            units = [
+                (number, url) for number, url in lecture_units.get(obj.related_textbook_id, ())
+                if day_range.contains(intervals, number)
+            ]
+        else:
+            units = TextbookUnit.objects.filter(
+                day_range.as_q(intervals, 'unit_number'), textbook_id=obj.related_textbook_id
+            ).order_by('unit_number').values_list('unit_number', 'link_url')
+
         return [
             {
-                'unit_number': u.unit_number,
-                'link_url': u.link_url,
-                'title': f'{u.unit_number}강'
+                'unit_number': number,
+                'link_url': url,
+                'title': f'{number}강'
             }
-            for u in units if u.link_url
+            for number, url in units if url
         ]
 
+
+def lecture_units_for(tasks):
+    """[목록용] 과제들이 참조하는 교재 단원 링크를 한 번에 조회 -> {교재 id: [(강 번호, 링크)] (강 번호순)}"""
+    textbook_ids = {t.related_textbook_id for t in tasks if t.related_textbook_id and t.textbook_range}
+    units = {}
+    if textbook_ids:
+        for textbook_id, number, url in TextbookUnit.objects.filter(
+            textbook_id__in=textbook_ids
+        ).exclude(link_url='').order_by('textbook_id', 'unit_number').values_list(
+            'textbook_id', 'unit_number', 'link_url'
+        ):
+            units.setdefault(textbook_id, []).append((number, url))
+    return units
+
 class AttendanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Attendance
@@ -104,6 +127,98 @@ class ClassLogEntrySerializer(serializers.ModelSerializer):
             'score',
         ]
 
+def _parse_due_date(due_date_str):
+    """프론트에서 온 ISO 8601 문자열 (e.g. "2024-01-21T22:00:00.000") -> datetime"""
+    if not due_date_str:
+        return None
+    try:
+        from dateutil import parser
+        return parser.parse(due_date_str)
+    except ImportError:
+        # Fallback if dateutil is not available (though it usually is in django env)
+        from datetime import datetime
+        try:
+            return datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+
+def _to_int_or_none(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def build_assignment_from_spec(log, item):
+    """
+    [NEW] 일지 화면의 과제 입력(dict) -> 저장 전 AssignmentTask (마감일이 없으면 None)
+    단건 작성/수정과 일괄 작성에서 같이 사용
+    """
+    from datetime import timedelta
+
+    due_date_obj = _parse_due_date(item.get('due_date'))
+    if not due_date_obj:
+        return None
+
+    # [NEW] Auto-calculate start_date only for VOCAB_TEST (단어 과제만 잠금)
+    assignment_type = item.get('assignment_type', 'MANUAL')
+    start_date_obj = None
+    if assignment_type == 'VOCAB_TEST':
+        start_date_obj = due_date_obj.replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0,
+        ) - timedelta(days=1)
+
+    return AssignmentTask(
+        student_id=log.student_id,
+        teacher_id=log.teacher_id,
+        origin_log=log,
+        title=item.get('title', '과제'),
+        description=item.get('description', ''),
+        assignment_type=assignment_type,
+        due_date=due_date_obj,
+        start_date=start_date_obj,  # [NEW] VOCAB_TEST만 마감 하루 전부터 수행 가능
+        related_vocab_book_id=item.get('related_vocab_book'),
+        vocab_range_start=_to_int_or_none(item.get('vocab_range_start')) or 0,
+        vocab_range_end=_to_int_or_none(item.get('vocab_range_end')) or 0,
+        # [FIX] Support Textbook Links
+        related_textbook_id=item.get('related_textbook'),
+        textbook_range=item.get('textbook_range', ''),
+        is_cumulative=item.get('is_cumulative', False),
+    )
+
+
+def build_log_entries(log, entries_data):
+    """오늘 수업 진도 입력 목록 -> 저장 전 ClassLogEntry 목록 (진도 범위 없는 항목은 제외)"""
+    return [
+        ClassLogEntry(
+            class_log=log,
+            textbook_id=item.get('textbook'),
+            wordbook_id=item.get('wordbook'),
+            progress_range=item.get('progress_range'),
+            score=item.get('score') or '',
+        )
+        for item in entries_data
+        if item.get('progress_range')
+    ]
+
+
+def save_assignments(tasks):
+    """[일괄 작성용] bulk_create 후 단어장 구독 보장 (bulk_create 는 post_save 를 보내지 않음)"""
+    from . import activity
+    from .signals import ensure_subscriptions
+
+    tasks = [t for t in tasks if t is not None]
+    if tasks:
+        AssignmentTask.objects.bulk_create(tasks)
+        ensure_subscriptions(tasks)
+        activity.record_assignments(tasks)
+    return tasks
+
+
 class ClassLogSerializer(serializers.ModelSerializer):
     entries = ClassLogEntrySerializer(many=True, read_only=True)
     subject_display = serializers.CharField(source='get_subject_display', read_only=True)
@@ -163,77 +278,13 @@ class ClassLogSerializer(serializers.ModelSerializer):
         
         # 2. Create AssignmentTasks
         for item in assignments_data:
-            # [Fix] Parse due_date string to datetime object (handling ISO format)
-            due_date_str = item.get('due_date')
-            due_date_obj = None
-            if due_date_str:
-                # Assuming ISO 8601 format from frontend (e.g., "2024-01-21T22:00:00.000")
-                try:
-                    from dateutil import parser
-                    due_date_obj = parser.parse(due_date_str)
-                except ImportError:
-                    # Fallback if dateutil is not available (though it usually is in django env)
-                    from datetime import datetime
-                    try:
-                        due_date_obj = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-                    except ValueError:
-                         pass
-
-            related_vocab_book_id = item.get('related_vocab_book')
-            vocab_range_start = item.get('vocab_range_start')
-            vocab_range_end = item.get('vocab_range_end')
-            try:
-                vocab_range_start = int(vocab_range_start) if vocab_range_start is not None else None
-            except (TypeError, ValueError):
-                vocab_range_start = None
-            try:
-                vocab_range_end = int(vocab_range_end) if vocab_range_end is not None else None
-            except (TypeError, ValueError):
-                vocab_range_end = None
-
-            if due_date_obj:
-                # [NEW] Auto-calculate start_date only for VOCAB_TEST (단어 과제만 잠금)
-                from datetime import timedelta
-                assignment_type = item.get('assignment_type', 'MANUAL')
-                start_date_obj = None
-                if assignment_type == 'VOCAB_TEST':
-                    start_date_obj = due_date_obj.replace(
-                        hour=0,
-                        minute=0,
-                        second=0,
-                        microsecond=0,
-                    ) - timedelta(days=1)
-                
-                AssignmentTask.objects.create(
-                    student=instance.student,
-                    teacher=instance.teacher, 
-                    origin_log=instance,
-                    title=item.get('title', '과제'),
-                    description=item.get('description', ''),
-                    assignment_type=assignment_type,
-                    due_date=due_date_obj,
-                    start_date=start_date_obj,  # [NEW] VOCAB_TEST만 마감 하루 전부터 수행 가능
-                    related_vocab_book_id=related_vocab_book_id,
-                    vocab_range_start=vocab_range_start or 0,
-                    vocab_range_end=vocab_range_end or 0,
-                    # [FIX] Support Textbook Links
-                    related_textbook_id=item.get('related_textbook'),
-                    textbook_range=item.get('textbook_range', ''),
-                    is_cumulative=item.get('is_cumulative', False),
-                )
+            task = build_assignment_from_spec(instance, item)
+            if task is not None:
+                task.save()
 
         # 3. Create ClassLogEntries (Today's Lesson)
-        for item in entries_data:
-            progress_range = item.get('progress_range')
-            if not progress_range:
-                continue
-            ClassLogEntry.objects.create(
-                class_log=instance,
-                textbook_id=item.get('textbook'),
-                wordbook_id=item.get('wordbook'),
-                progress_range=progress_range,
-                score=item.get('score') or '',
-            )
+        for entry in build_log_entries(instance, entries_data):
+            entry.save()
             
         return instance
 
@@ -329,82 +380,55 @@ class ClassLogSerializer(serializers.ModelSerializer):
                 existing_signature = existing_signatures_by_id.get(item_id)
                 if existing_signature == _signature_from_data(item):
                     continue
-            due_date_str = item.get('due_date')
-            due_date_obj = None
-            if due_date_str:
-                try:
-                    from dateutil import parser
-                    due_date_obj = parser.parse(due_date_str)
-                except ImportError:
-                    from datetime import datetime
-                    try:
-                        due_date_obj = datetime.fromisoformat(
-                            due_date_str.replace('Z', '+00:00')
-                        )
-                    except ValueError:
-                        pass
-
-            related_vocab_book_id = item.get('related_vocab_book')
-            vocab_range_start = item.get('vocab_range_start')
-            vocab_range_end = item.get('vocab_range_end')
-            try:
-                vocab_range_start = int(vocab_range_start) if vocab_range_start is not None else None
-            except (TypeError, ValueError):
-                vocab_range_start = None
-            try:
-                vocab_range_end = int(vocab_range_end) if vocab_range_end is not None else None
-            except (TypeError, ValueError):
-                vocab_range_end = None
-
-            if due_date_obj:
-                # [NEW] Auto-calculate start_date only for VOCAB_TEST (단어 과제만 잠금)
-                from datetime import timedelta
-                assignment_type = item.get('assignment_type', 'MANUAL')
-                start_date_obj = None
-                if assignment_type == 'VOCAB_TEST':
-                    start_date_obj = due_date_obj.replace(
-                        hour=0,
-                        minute=0,
-                        second=0,
-                        microsecond=0,
-                    ) - timedelta(days=1)
-                
-                AssignmentTask.objects.create(
-                    student=instance.student,
-                    teacher=instance.teacher,
-                    origin_log=instance,
-                    title=item.get('title', '과제'),
-                    description=item.get('description', ''),
-                    assignment_type=assignment_type,
-                    due_date=due_date_obj,
-                    start_date=start_date_obj,  # [NEW] VOCAB_TEST만 마감 하루 전부터 수행 가능
-                    related_vocab_book_id=related_vocab_book_id,
-                    vocab_range_start=vocab_range_start or 0,
-                    vocab_range_end=vocab_range_end or 0,
-                    # [FIX] Support Textbook Links in update (same as create)
-                    related_textbook_id=item.get('related_textbook'),
-                    textbook_range=item.get('textbook_range', ''),
-                    is_cumulative=item.get('is_cumulative', False),
-                )
+            task = build_assignment_from_spec(instance, item)
+            if task is not None:
+                task.save()
 
         if entries_data is None:
             return instance
 
         instance.entries.all().delete()
-        for item in entries_data:
-            progress_range = item.get('progress_range')
-            if not progress_range:
-                continue
-            ClassLogEntry.objects.create(
-                class_log=instance,
-                textbook_id=item.get('textbook'),
-                wordbook_id=item.get('wordbook'),
-                progress_range=progress_range,
-                score=item.get('score') or '',
-            )
+        for entry in build_log_entries(instance, entries_data):
+            entry.save()
 
         return instance
 
+class ClassLogBulkItemSerializer(serializers.Serializer):
+    """[NEW] 일괄 작성 - 학생별 항목 (코멘트/진도/점수)"""
+    student = serializers.IntegerField()
+    comment = serializers.CharField(required=False, allow_blank=True, default='')
+    reading_test_type = serializers.CharField(required=False, allow_blank=True, default='')
+    reading_test_score = serializers.CharField(required=False, allow_blank=True, default='')
+    entries_input = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+
+
+class ClassLogBulkSerializer(serializers.Serializer):
+    """
+    [NEW] 수업 블록 단위 일지 일괄 작성
+    - 공통: 날짜/과목/과제(교재, 범위, 마감, assignments)
+    - 학생별: items (코멘트, 오늘 진도/점수)
+    """
+    MAX_ITEMS = 50
+
+    date = serializers.DateField()
+    subject = serializers.ChoiceField(choices=ClassLog._meta.get_field('subject').choices)
+    hw_main_book = serializers.PrimaryKeyRelatedField(queryset=Textbook.objects.all(), required=False, allow_null=True)
+    hw_main_range = serializers.CharField(required=False, allow_blank=True, default='')
+    hw_due_date = serializers.DateTimeField(required=False, allow_null=True)
+    assignments = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    items = ClassLogBulkItemSerializer(many=True)
+
+    def validate_items(self, items):
+        if not items:
+            raise serializers.ValidationError("학생을 한 명 이상 선택하세요.")
+        if len(items) > self.MAX_ITEMS:
+            raise serializers.ValidationError(f"한 번에 최대 {self.MAX_ITEMS}명까지 작성할 수 있습니다.")
+        student_ids = [item['student'] for item in items]
+        if len(set(student_ids)) != len(student_ids):
+            raise serializers.ValidationError("같은 학생이 중복되어 있습니다.")
+        return items
+
+
 class TextbookUnitSerializer(serializers.ModelSerializer):
     class Meta:
         model = TextbookUnit
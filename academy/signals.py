@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
 import re
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import AssignmentTask, ClassLog
-from vocab.models import PersonalWordBook
+from core.models import ClassTime, StudentProfile
+from . import activity, images, progress
+from .models import AssignmentSubmission, AssignmentSubmissionImage, AssignmentTask, ClassLog, ClassLogEntry, StudentReport, TemporarySchedule, Textbook
+from .occupancy import invalidate_occupancy
+from vocab.models import PersonalWordBook, TestResult, WordBook
+from utils import day_range
 
 
 def _as_date(value):
@@ -15,17 +19,137 @@ def _as_date(value):
     return value
 
 
+# ------------------------------------------------------------------
+# 과제 생성 헬퍼 (일지 일괄 저장 API 에서도 재사용)
+# ------------------------------------------------------------------
+def get_due_date(log):
+    return log.hw_due_date or (log.date + timedelta(days=7))
+
+
+def get_start_date(log, use_today=False):
+    base_start = log.date + timedelta(days=1)
+    if not use_today:
+        return base_start
+    today = timezone.now().date()
+    return max(base_start, today)
+
+
+def _chunk_days(days, total_days):
+    if not days:
+        return []
+    if total_days < 1:
+        total_days = 1
+    per_day = (len(days) + total_days - 1) // total_days
+    chunks = []
+    idx = 0
+    while idx < len(days):
+        chunks.append(days[idx : idx + per_day])
+        idx += per_day
+    return chunks
+
+
+def build_vocab_tasks(log, days, start_date, due_date):
+    """N-Split 단어 과제 목록 (저장 전 인스턴스)"""
+    due_date_date = _as_date(due_date)
+    start_date_date = _as_date(start_date)
+
+    total_days = (due_date_date - start_date_date).days + 1
+    if total_days < 1:
+        total_days = 1
+        start_date_date = due_date_date
+
+    tasks = []
+    current_date = start_date_date
+    for chunk in _chunk_days(days, total_days):
+        if not chunk:
+            current_date += timedelta(days=1)
+            continue
+        start_ch = min(chunk)
+        end_ch = max(chunk)
+
+        tasks.append(AssignmentTask(
+            student_id=log.student_id,
+            teacher_id=log.teacher_id,
+            origin_log=log,
+            assignment_type=AssignmentTask.AssignmentType.VOCAB_TEST,
+            title=f"[{log.hw_vocab_book.title}] Day {start_ch}~{end_ch} 암기",
+            description=f"{current_date.month}월 {current_date.day}일의 목표입니다. 미루지 마세요!",
+            due_date=current_date,
+            related_vocab_book_id=log.hw_vocab_book_id,
+            vocab_range_start=start_ch,
+            vocab_range_end=end_ch,
+        ))
+        current_date += timedelta(days=1)
+    return tasks
+
+
+def build_initial_tasks(log):
+    """
+    새 일지에서 파생되는 과제 목록 (저장 전 인스턴스)
+    - 단어 과제: 범위가 있으면 N-Split, 없으면 1건
+    - 교재 과제: 1건
+    """
+    due_date = get_due_date(log)
+    tasks = []
+    if log.hw_vocab_book_id:
+        tasks.extend(_build_initial_vocab_tasks(log, due_date))
+    if log.hw_main_book_id:
+        tasks.append(_build_manual_task(log, due_date))
+    return tasks
+
+
+def _build_initial_vocab_tasks(log, due_date):
+    range_str = log.hw_vocab_range or ""
+    days = day_range.parse_list(range_str)
+    if days:
+        return build_vocab_tasks(log, days, get_start_date(log), due_date)
+    return [AssignmentTask(
+        student_id=log.student_id,
+        teacher_id=log.teacher_id,
+        origin_log=log,
+        assignment_type=AssignmentTask.AssignmentType.VOCAB_TEST,
+        title=f"[{log.hw_vocab_book.title}] {range_str} 암기",
+        description="앱 내 단어 시험을 통과하세요.",
+        due_date=due_date,
+        related_vocab_book_id=log.hw_vocab_book_id,
+    )]
+
+
+def _build_manual_task(log, due_date):
+    range_str = log.hw_main_range or "진도 확인"
+    return AssignmentTask(
+        student_id=log.student_id,
+        teacher_id=log.teacher_id,
+        origin_log=log,
+        assignment_type=AssignmentTask.AssignmentType.MANUAL,
+        title=f"[{log.hw_main_book.title}] {range_str} 풀기",
+        description="문제를 풀고 인증샷을 제출하세요.",
+        due_date=due_date,
+    )
+
+
+def ensure_subscriptions(tasks):
+    """단어 과제의 (학생, 단어장) 구독을 한 번에 보장 (bulk_create 는 post_save 를 보내지 않으므로)"""
+    pairs = {
+        (t.student_id, t.related_vocab_book_id)
+        for t in tasks
+        if t.student_id and t.related_vocab_book_id
+    }
+    if pairs:
+        PersonalWordBook.objects.bulk_create(
+            [PersonalWordBook(student_id=s, book_id=b) for s, b in pairs],
+            ignore_conflicts=True,
+        )
+
+
 @receiver(pre_save, sender=ClassLog)
 def capture_prev_state(sender, instance, **kwargs):
     if not instance.pk:
         return
-    prev = ClassLog.objects.filter(pk=instance.pk).values(
-        "date",
-        "hw_due_date",
-        "hw_vocab_range",
-        "hw_vocab_book_id",
-        "hw_main_book_id",
-    ).first()
+    # [FIX] DB 에서 읽어온 인스턴스는 로드 시점 값을 그대로 사용 (재조회 없음)
+    prev = getattr(instance, "_loaded_hw", None)
+    if prev is None:
+        prev = ClassLog.objects.filter(pk=instance.pk).values(*ClassLog.HW_TRACKED_FIELDS).first()
     instance._prev_state = prev
 
 
@@ -33,207 +157,92 @@ def capture_prev_state(sender, instance, **kwargs):
 def create_assignment_from_log(sender, instance, created, **kwargs):
     """
     수업 일지(ClassLog)가 저장될 때, 자동으로 다음 주 과제(AssignmentTask)를 생성/갱신합니다.
+    # [FIX] 과제는 메모리에서 만든 뒤 bulk_create, 마감일 변경은 update() 한 번으로 처리
     """
+    prev = getattr(instance, "_prev_state", None)
+    current = instance.hw_state()
+    instance._loaded_hw = current
 
-    def _get_due_date(log):
-        return log.hw_due_date or (log.date + timedelta(days=7))
-
-    def _get_start_date(log, use_today=False):
-        base_start = log.date + timedelta(days=1)
-        if not use_today:
-            return base_start
-        today = timezone.localdate()
-        return max(base_start, today)
-
-    def _parse_range(range_str):
-        if not range_str:
-            return []
-        days = set()
-        for chunk in range_str.split(","):
-            chunk = chunk.strip()
-            if not chunk:
-                continue
-            if "-" in chunk:
-                try:
-                    s, e = map(int, chunk.split("-"))
-                except ValueError:
-                    continue
-                if s > e:
-                    s, e = e, s
-                days.update(range(s, e + 1))
-            else:
-                try:
-                    days.add(int(chunk))
-                except ValueError:
-                    continue
-        return sorted(days)
-
-    def _is_submitted(task):
-        try:
-            _ = task.submission
-            return True
-        except Exception:
-            return False
-
-    def _chunk_days(days, total_days):
-        if not days:
-            return []
-        if total_days < 1:
-            total_days = 1
-        per_day = (len(days) + total_days - 1) // total_days
-        chunks = []
-        idx = 0
-        while idx < len(days):
-            chunks.append(days[idx : idx + per_day])
-            idx += per_day
-        return chunks
-
-    def _create_vocab_tasks(log, days, start_date, due_date):
-        due_date_date = _as_date(due_date)
-        start_date_date = _as_date(start_date)
-
-        total_days = (due_date_date - start_date_date).days + 1
-        if total_days < 1:
-            total_days = 1
-            start_date_date = due_date_date
-
-        day_chunks = _chunk_days(days, total_days)
-        current_date = start_date_date
-        tasks_created = 0
-
-        for chunk in day_chunks:
-            if not chunk:
-                current_date += timedelta(days=1)
-                continue
-            start_ch = min(chunk)
-            end_ch = max(chunk)
-
-            AssignmentTask.objects.create(
-                student=log.student,
-                teacher=log.teacher,
-                origin_log=log,
-                assignment_type=AssignmentTask.AssignmentType.VOCAB_TEST,
-                title=f"[{log.hw_vocab_book.title}] Day {start_ch}~{end_ch} 암기",
-                description=f"{current_date.month}월 {current_date.day}일의 목표입니다. 미루지 마세요!",
-                due_date=current_date,
-                related_vocab_book=log.hw_vocab_book,
-                vocab_range_start=start_ch,
-                vocab_range_end=end_ch,
-            )
-            current_date += timedelta(days=1)
-            tasks_created += 1
+    if not (instance.hw_vocab_book_id or instance.hw_main_book_id):
+        return
+
+    # 다음 수업일(마감일) 추론: 일단 일주일 뒤로 설정 (실제로는 학생 시간표 조회 필요)
+    due_date = get_due_date(instance)
 
-        print(f"--- [Signal] {log.student.name}: 단어 과제 {tasks_created}개로 분할 생성(N-Split) ---")
+    if created:
+        new_tasks = build_initial_tasks(instance)
+    else:
+        new_tasks = _refresh_tasks(instance, prev, current, due_date)
 
-    def _create_manual_task(log, due_date):
-        range_str = log.hw_main_range or "진도 확인"
-        AssignmentTask.objects.create(
-            student=log.student,
-            teacher=log.teacher,
-            origin_log=log,
-            assignment_type=AssignmentTask.AssignmentType.MANUAL,
-            title=f"[{log.hw_main_book.title}] {range_str} 풀기",
-            description="문제를 풀고 인증샷을 제출하세요.",
-            due_date=due_date,
-        )
-        print(f"--- [Signal] {log.student.name} 학생의 교재 과제 자동 생성 완료 ---")
+    if new_tasks:
+        AssignmentTask.objects.bulk_create(new_tasks)
+        ensure_subscriptions(new_tasks)
+        activity.record_assignments(new_tasks)
+        vocab_count = sum(1 for t in new_tasks if t.assignment_type == AssignmentTask.AssignmentType.VOCAB_TEST)
+        print(f"--- [Signal] 일지 {instance.pk}: 과제 {len(new_tasks)}개 생성 (단어 {vocab_count}개, N-Split) ---")
+
+
+def _changed(prev, current, fields):
+    if not prev:
+        return True
+    return any(prev.get(f) != current.get(f) for f in fields)
 
-    # 다음 수업일(마감일) 추론: 일단 일주일 뒤로 설정 (실제로는 학생 시간표 조회 필요)
-    due_date = _get_due_date(instance)
-    start_date = _get_start_date(instance, use_today=False)
+
+def _refresh_tasks(log, prev, current, due_date):
+    """기존 일지 수정 시: 바뀐 항목의 과제만 마감일 갱신/재분할, 새로 만들 과제 목록 반환"""
+    new_tasks = []
+    existing = list(
+        AssignmentTask.objects.filter(origin_log=log).only(
+            "id", "assignment_type", "is_completed", "due_date",
+            "vocab_range_start", "vocab_range_end",
+        )
+    )
+    vocab_tasks = [t for t in existing if t.assignment_type == AssignmentTask.AssignmentType.VOCAB_TEST]
+    manual_tasks = [t for t in existing if t.assignment_type == AssignmentTask.AssignmentType.MANUAL]
 
     # -------------------------------------------------------
     # A. 단어 과제 생성/갱신 (Type B: VOCAB_TEST) [N-Split 적용]
     # -------------------------------------------------------
-    if instance.hw_vocab_book:
-        vocab_tasks = AssignmentTask.objects.filter(
-            origin_log=instance,
-            assignment_type=AssignmentTask.AssignmentType.VOCAB_TEST,
-        )
+    if log.hw_vocab_book_id:
+        if not vocab_tasks:
+            new_tasks.extend(_build_initial_vocab_tasks(log, due_date))
+        elif _changed(prev, current, ("date", "hw_due_date", "hw_vocab_range", "hw_vocab_book_id")):
+            pending_ids = [t.id for t in vocab_tasks if not t.is_completed]
+            days = day_range.parse_list(log.hw_vocab_range or "")
+            completed_days = set()
+            for task in vocab_tasks:
+                if task.is_completed and task.vocab_range_start and task.vocab_range_end:
+                    completed_days.update(range(task.vocab_range_start, task.vocab_range_end + 1))
+            remaining_days = [d for d in days if d not in completed_days]
 
-        if created or not vocab_tasks.exists():
-            range_str = instance.hw_vocab_range or ""
-            days = _parse_range(range_str)
-            if days:
-                _create_vocab_tasks(instance, days, start_date, due_date)
-            else:
-                AssignmentTask.objects.create(
-                    student=instance.student,
-                    teacher=instance.teacher,
-                    origin_log=instance,
-                    assignment_type=AssignmentTask.AssignmentType.VOCAB_TEST,
-                    title=f"[{instance.hw_vocab_book.title}] {range_str} 암기",
-                    description="앱 내 단어 시험을 통과하세요.",
-                    due_date=due_date,
-                    related_vocab_book=instance.hw_vocab_book,
-                )
-                print(f"--- [Signal] {instance.student.name}: 단어 과제 일반 생성 ---")
-        elif not created:
-            prev = getattr(instance, "_prev_state", None)
-            if prev:
-                changed = (
-                    prev.get("date") != instance.date
-                    or prev.get("hw_due_date") != instance.hw_due_date
-                    or prev.get("hw_vocab_range") != instance.hw_vocab_range
-                    or prev.get("hw_vocab_book_id") != getattr(instance.hw_vocab_book, "id", None)
-                )
+            if not remaining_days:
+                moved = AssignmentTask.objects.filter(id__in=pending_ids).exclude(
+                    due_date=due_date
+                ).update(due_date=due_date, updated_at=timezone.now())
+                if moved:
+                    activity.refresh_assignments(pending_ids)
             else:
-                changed = True
-
-            if changed:
-                days = _parse_range(instance.hw_vocab_range or "")
-                if not days:
-                    for task in vocab_tasks.filter(is_completed=False):
-                        if task.due_date != due_date:
-                            task.due_date = due_date
-                            task.save(update_fields=["due_date"])
-                else:
-                    completed_days = set()
-                    for task in vocab_tasks.filter(is_completed=True):
-                        if task.vocab_range_start and task.vocab_range_end:
-                            completed_days.update(
-                                range(task.vocab_range_start, task.vocab_range_end + 1)
-                            )
-                    remaining_days = [d for d in days if d not in completed_days]
-                    if not remaining_days:
-                        for task in vocab_tasks.filter(is_completed=False):
-                            if task.due_date != due_date:
-                                task.due_date = due_date
-                                task.save(update_fields=["due_date"])
-                    else:
-                        vocab_tasks.filter(is_completed=False).delete()
-                        resplit_start = _get_start_date(instance, use_today=True)
-                        _create_vocab_tasks(instance, remaining_days, resplit_start, due_date)
+                AssignmentTask.objects.filter(id__in=pending_ids).delete()
+                resplit_start = get_start_date(log, use_today=True)
+                new_tasks.extend(build_vocab_tasks(log, remaining_days, resplit_start, due_date))
 
     # -------------------------------------------------------
     # B. 교재/일반 과제 생성/갱신 (Type A: MANUAL)
     # -------------------------------------------------------
-    if instance.hw_main_book:
-        manual_tasks = AssignmentTask.objects.filter(
-            origin_log=instance,
-            assignment_type=AssignmentTask.AssignmentType.MANUAL,
-        )
-
-        if created or not manual_tasks.exists():
-            _create_manual_task(instance, due_date)
-        elif not created:
-            prev = getattr(instance, "_prev_state", None)
-            if prev:
-                changed = (
-                    prev.get("date") != instance.date
-                    or prev.get("hw_due_date") != instance.hw_due_date
-                    or prev.get("hw_main_book_id") != getattr(instance.hw_main_book, "id", None)
-                )
-            else:
-                changed = True
+    if log.hw_main_book_id:
+        if not manual_tasks:
+            new_tasks.append(_build_manual_task(log, due_date))
+        elif _changed(prev, current, ("date", "hw_due_date", "hw_main_book_id")):
+            # 완료/제출된 과제는 건드리지 않음
+            pending_ids = [t.id for t in manual_tasks if not t.is_completed]
+            moved = AssignmentTask.objects.filter(
+                id__in=pending_ids,
+                submission__isnull=True,
+            ).exclude(due_date=due_date).update(due_date=due_date, updated_at=timezone.now())
+            if moved:
+                activity.refresh_assignments(pending_ids)
 
-            if changed:
-                for task in manual_tasks:
-                    if task.is_completed or _is_submitted(task):
-                        continue
-                    if task.due_date != due_date:
-                        task.due_date = due_date
-                        task.save(update_fields=["due_date"])
+    return new_tasks
 
 
 @receiver(post_save, sender=AssignmentTask)
@@ -246,3 +255,172 @@ def ensure_vocab_subscription(sender, instance, **kwargs):
         student_id=instance.student_id,
         book_id=instance.related_vocab_book_id,
     )
+
+
+# ------------------------------------------------------------------
+# [NEW] 선생님 점유 인덱스(occupancy) 캐시 무효화
+# ------------------------------------------------------------------
+@receiver(post_save, sender=TemporarySchedule)
+@receiver(post_delete, sender=TemporarySchedule)
+@receiver(post_save, sender=ClassTime)
+@receiver(post_delete, sender=ClassTime)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_occupancy_on_change(sender, **kwargs):
+    invalidate_occupancy()
+
+
+@receiver(post_save, sender=StudentProfile)
+def invalidate_occupancy_on_schedule_change(sender, instance, created, **kwargs):
+    # User 저장 때마다 프로필도 저장되므로, 시간표/담당이 실제로 바뀐 경우에만 무효화
+    current = instance.schedule_key()
+    if created or getattr(instance, '_loaded_schedule', None) != current:
+        invalidate_occupancy()
+    instance._loaded_schedule = current
+
+
+# ------------------------------------------------------------------
+# [NEW] 학생 활동 타임라인(ActivityEvent) 기록
+# bulk_create / update() 경로는 시그널이 없으므로 호출부에서 activity.record_* 를 직접 호출합니다.
+# ------------------------------------------------------------------
+@receiver(post_save, sender=ClassLog)
+def record_log_activity(sender, instance, **kwargs):
+    activity.record_logs([instance])
+
+
+@receiver(post_save, sender=AssignmentTask)
+def record_assignment_activity(sender, instance, **kwargs):
+    activity.record_assignments([instance])
+
+
+@receiver(post_save, sender=AssignmentSubmission)
+@receiver(post_delete, sender=AssignmentSubmission)
+def record_submission_activity(sender, instance, **kwargs):
+    # 제출/검사 상태가 과제 이벤트의 status 에 반영되어야 함 (과제가 함께 삭제되는 경우는 건너뜀)
+    # 과제 목록 응답에 제출 정보가 포함되므로 과제 변경 시각도 갱신 (since 델타 조회)
+    if AssignmentTask.objects.filter(pk=instance.task_id).update(updated_at=timezone.now()):
+        activity.refresh_assignments([instance.task_id])
+
+
+@receiver(post_save, sender=TestResult)
+def record_test_activity(sender, instance, **kwargs):
+    activity.record([activity.test_event(instance)])
+
+
+@receiver(post_delete, sender=ClassLog)
+def remove_log_activity(sender, instance, **kwargs):
+    activity.remove(activity.LOG, [instance.pk])
+
+
+@receiver(post_delete, sender=AssignmentTask)
+def remove_assignment_activity(sender, instance, **kwargs):
+    activity.remove(activity.ASM, [instance.pk])
+
+
+@receiver(post_delete, sender=TestResult)
+def remove_test_activity(sender, instance, **kwargs):
+    activity.remove(activity.TEST, [instance.pk])
+
+
+# ------------------------------------------------------------------
+# [NEW] 성적표 공개 응답 산출물 갱신 (제목/총평/스냅샷이 바뀌었을 때만 다시 저장)
+# ------------------------------------------------------------------
+@receiver(post_save, sender=StudentReport)
+def refresh_report_public_artifact(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .report_builder import refresh_public_artifact
+    refresh_public_artifact(instance)
+
+
+# ------------------------------------------------------------------
+# [NEW] 학생 진도 그리드(ProgressCell) 갱신 - 바뀐 (학생, 책) 만 원천에서 다시 계산
+# 일괄 작성 API 처럼 bulk_create 로 만든 진도는 progress.refresh_entries 를 직접 호출합니다.
+# ------------------------------------------------------------------
+@receiver(post_save, sender=ClassLogEntry)
+def refresh_progress_on_entry_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    current = instance.book_key()
+    prev = getattr(instance, '_loaded_books', None) or (None, None)
+    instance._loaded_books = current
+    progress.refresh(
+        instance.class_log.student_id,
+        textbook_ids=(current[0], prev[0]),
+        wordbook_ids=(current[1], prev[1]),
+    )
+
+
+def _progress_delete_origin(origin):
+    """일지/진도/시험 자체를 지운 경우만 다시 계산 (학생·단어장 삭제에 딸려 지워지는 경우는 건너뜀)"""
+    model = getattr(origin, 'model', None) or type(origin)
+    return model in (ClassLog, ClassLogEntry, TestResult)
+
+
+@receiver(post_delete, sender=ClassLogEntry)
+def refresh_progress_on_entry_delete(sender, instance, origin=None, **kwargs):
+    if not _progress_delete_origin(origin):
+        return
+    student_id = ClassLog.objects.filter(pk=instance.class_log_id).values_list('student_id', flat=True).first()
+    progress.refresh(student_id, textbook_ids=(instance.textbook_id,), wordbook_ids=(instance.wordbook_id,))
+
+
+@receiver(post_save, sender=ClassLog)
+def refresh_progress_on_log_date_change(sender, instance, created, raw=False, **kwargs):
+    # 교재 칸의 순서 키가 수업 날짜이므로 날짜가 바뀐 일지만 다시 계산
+    prev = getattr(instance, '_prev_state', None)
+    if created or raw or not prev or prev.get('date') == instance.date:
+        return
+    books = list(instance.entries.values_list('textbook_id', 'wordbook_id'))
+    progress.refresh(
+        instance.student_id,
+        textbook_ids=[tb for tb, _wb in books],
+        wordbook_ids=[wb for _tb, wb in books],
+    )
+
+
+@receiver(post_save, sender=TestResult)
+def refresh_progress_on_test_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    progress.refresh(instance.student_id, wordbook_ids=(instance.book_id,))
+
+
+@receiver(post_delete, sender=TestResult)
+def refresh_progress_on_test_delete(sender, instance, origin=None, **kwargs):
+    if _progress_delete_origin(origin):
+        progress.refresh(instance.student_id, wordbook_ids=(instance.book_id,))
+
+
+@receiver(post_delete, sender=Textbook)
+def remove_textbook_progress(sender, instance, **kwargs):
+    progress.remove_book(progress.TEXTBOOK, instance.pk)
+
+
+@receiver(post_delete, sender=WordBook)
+def remove_wordbook_progress(sender, instance, **kwargs):
+    progress.remove_book(progress.VOCAB, instance.pk)
+
+
+# ------------------------------------------------------------------
+# [NEW] 과제 인증샷 후처리 (academy.images) - 새 파일이 저장되면 커밋 후 백그라운드 처리
+# ------------------------------------------------------------------
+@receiver(pre_save, sender=AssignmentSubmission)
+@receiver(pre_save, sender=AssignmentSubmissionImage)
+def reset_image_derivatives(sender, instance, **kwargs):
+    # 재제출로 파일이 바뀌면 이전 파생본 정보는 버리고 다시 처리
+    if instance.pk and instance.image_name() != getattr(instance, '_loaded_image', None):
+        instance.image_preview = ''
+        instance.image_thumb = ''
+        instance.image_processed_at = None
+
+
+@receiver(post_save, sender=AssignmentSubmission)
+@receiver(post_save, sender=AssignmentSubmissionImage)
+def schedule_image_processing(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    name = instance.image_name()
+    changed = name != getattr(instance, '_loaded_image', None)
+    instance._loaded_image = name
+    if name and changed and not instance.image_processed_at:
+        images.schedule(instance)
@@ -0,0 +1,275 @@
+import datetime
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from academy import checkin, scheduling
+from academy.absence import ABSENT_MEMO
+from academy.models import AssignmentTask, Attendance, ClassLog, TemporarySchedule
+from core.models import ClassTime
+
+
+class TeacherDashboardQueryBudgetTest(TestCase):
+    """
+    선생님 대시보드 (academy/views/dashboard.py TeacherDashboardView)
+    쿼리 수는 학생 수와 무관하게 5회: 밀린 과제, 출석, 보강 일정, 수업 일지, 결석
+    """
+    STUDENTS = 30
+    URL = '/academy/api/v1/teacher/dashboard/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user('teacher', is_staff=True)
+        cls.today = timezone.now().date()
+        days = [code for code, _label in ClassTime.DayChoices.choices]
+        syntax = {d: ClassTime.objects.create(
+            name=f'구문_{d}', day=d, start_time=datetime.time(18), end_time=datetime.time(19),
+            class_type=ClassTime.ClassTypeChoices.SYNTAX,
+        ) for d in days}
+        reading = {d: ClassTime.objects.create(
+            name=f'독해_{d}', day=d, start_time=datetime.time(19), end_time=datetime.time(20),
+            class_type=ClassTime.ClassTypeChoices.READING,
+        ) for d in days}
+
+        # 학생마다 구문/독해 요일을 다르게 (주 2회, 14일 안에 수업 4번)
+        cls.students = []
+        attendances, logs, temps, tasks = [], [], [], []
+        for i in range(cls.STUDENTS):
+            profile = User.objects.create_user(f'student{i}').profile
+            profile.name = f'학생{i}'
+            profile.syntax_class = syntax[days[i % 7]]
+            profile.syntax_teacher = cls.teacher
+            profile.reading_class = reading[days[(i + 3) % 7]]
+            profile.reading_teacher = cls.teacher
+            profile.save()
+            cls.students.append(profile)
+
+            for offset in range(1, 15):
+                date = cls.today - timedelta(days=offset)
+                code = scheduling.day_code(date)
+                if code not in (profile.syntax_class.day, profile.reading_class.day):
+                    continue
+                attendances.append(Attendance(student=profile, date=date, status='PRESENT'))
+                # 짝수 학생은 일지를 다 썼고, 홀수 학생은 안 씀
+                if i % 2 == 0:
+                    subject = 'SYNTAX' if code == profile.syntax_class.day else 'READING'
+                    logs.append(ClassLog(student=profile, subject=subject, date=date, teacher=cls.teacher))
+
+            # 3의 배수 학생은 20일 전 결석, 그중 6의 배수는 보강이 잡혀 있음
+            if i % 3 == 0:
+                absent_date = cls.today - timedelta(days=20)
+                attendances.append(Attendance(student=profile, date=absent_date, status='ABSENT'))
+                if i % 6 == 0:
+                    temps.append(TemporarySchedule(
+                        student=profile, subject='SYNTAX', original_date=absent_date,
+                        new_date=cls.today + timedelta(days=2),
+                    ))
+            if i % 5 == 0:
+                tasks.append(AssignmentTask(
+                    student=profile, teacher=cls.teacher, title=f'과제{i}',
+                    due_date=timezone.now() - timedelta(days=2),
+                ))
+        Attendance.objects.bulk_create(attendances)
+        ClassLog.objects.bulk_create(logs)
+        TemporarySchedule.objects.bulk_create(temps)
+        AssignmentTask.objects.bulk_create(tasks)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_query_budget(self):
+        with self.assertNumQueries(5):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(set(data), {'overdue_assignments', 'action_required'})
+        self.assertEqual(len(data['overdue_assignments']), len(range(0, self.STUDENTS, 5)))
+        self.assertEqual(
+            set(data['overdue_assignments'][0]),
+            {'id', 'student_name', 'title', 'task_title', 'due_date', 'd_day_label'},
+        )
+
+        items = data['action_required']
+        self.assertNotIn('ERROR', {item['type'] for item in items})
+        missing = [item for item in items if item['type'] == 'MISSING_LOG']
+        no_makeup = [item for item in items if item['type'] == 'NO_MAKEUP']
+        by_name = {s.name: s for s in self.students}
+
+        # 일지 미작성은 홀수 학생만, 학생마다 14일 안의 수업 4번
+        self.assertTrue(missing)
+        self.assertTrue(all(int(item['student_name'][2:]) % 2 == 1 for item in missing))
+        self.assertEqual(len(missing), 4 * len(range(1, self.STUDENTS, 2)))
+        self.assertEqual(
+            set(missing[0]), {'type', 'student_id', 'student_name', 'date', 'subject', 'label'},
+        )
+        # 보강 미잡힘은 3의 배수 중 6의 배수가 아닌 학생
+        self.assertEqual(
+            {item['student_id'] for item in no_makeup},
+            {by_name[f'학생{i}'].id for i in range(0, self.STUDENTS, 3) if i % 6},
+        )
+
+    def test_query_budget_does_not_grow_with_students(self):
+        # 학생을 더 붙여도 쿼리 수는 그대로
+        for i in range(10):
+            profile = User.objects.create_user(f'extra{i}').profile
+            profile.syntax_class = self.students[i].syntax_class
+            profile.syntax_teacher = self.teacher
+            profile.save()
+            Attendance.objects.create(student=profile, date=self.today - timedelta(days=30), status='ABSENT')
+        with self.assertNumQueries(5):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+
+
+class CheckBatchReplayTest(TestCase):
+    """
+    오프라인 큐 반영 (academy/checkin.py check_batch)
+    자동 결석 기록 뒤에 반영되는 등원, 그 사이 온라인 체크가 먼저 넣은 기록
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.now().date()
+        syntax = ClassTime.objects.create(
+            name='구문', day=scheduling.day_code(cls.today),
+            start_time=datetime.time(18), end_time=datetime.time(19),
+            class_type=ClassTime.ClassTypeChoices.SYNTAX,
+        )
+        cls.student = User.objects.create_user('01012345678').profile
+        cls.student.name = '학생'
+        cls.student.phone_number = '010-1234-5678'
+        cls.student.syntax_class = syntax
+        cls.student.save()
+
+    def at(self, hour, minute=0):
+        return datetime.datetime.combine(self.today, datetime.time(hour, minute))
+
+    def tap(self, hour, minute=0):
+        return {'phone_number': '01012345678', 'checked_at': self.at(hour, minute)}
+
+    def auto_absent(self):
+        return Attendance.objects.create(
+            student=self.student, date=self.today, status='ABSENT', memo=ABSENT_MEMO, message_sent=True,
+        )
+
+    def test_tap_before_auto_absent_replaces_it(self):
+        row = self.auto_absent()
+        results = checkin.check_batch([self.tap(17, 55), self.tap(21)], checkout=True)
+
+        self.assertEqual([r.mode for r in results], [checkin.MODE_IN, checkin.MODE_OUT])
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.memo), ('PRESENT', ''))
+        self.assertEqual(row.check_in_time, self.at(17, 55))
+        self.assertEqual(row.left_at, self.at(21))
+
+    def test_tap_before_auto_absent_without_checkout(self):
+        row = self.auto_absent()
+        results = checkin.check_batch([self.tap(18, 10)], checkout=False)
+
+        self.assertEqual(results[0].mode, checkin.MODE_IN)
+        self.assertEqual(results[0].late_minutes, 10)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.check_in_time, row.left_at), ('LATE', self.at(18, 10), None))
+
+    def test_online_kiosk_tap_replaces_auto_absent(self):
+        row = self.auto_absent()
+        result = checkin.check(self.student, at=self.at(18, 50), checkout=False)
+
+        self.assertEqual(result.mode, checkin.MODE_IN)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.memo, row.check_in_time), ('ABSENT', '', self.at(18, 50)))
+
+    def test_existing_check_in_is_kept(self):
+        row = Attendance.objects.create(
+            student=self.student, date=self.today, status='PRESENT', check_in_time=self.at(17, 50),
+        )
+        results = checkin.check_batch([self.tap(17, 55)], checkout=False)
+        self.assertEqual(results[0].mode, checkin.MODE_ALREADY)
+
+        results = checkin.check_batch([self.tap(21)], checkout=True)
+        self.assertEqual(results[0].mode, checkin.MODE_OUT)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.check_in_time, row.left_at), ('PRESENT', self.at(17, 50), self.at(21)))
+
+    def test_inserted_row_is_reported_with_pk(self):
+        results = checkin.check_batch([self.tap(17, 55)])
+        self.assertEqual(results[0].mode, checkin.MODE_IN)
+        self.assertEqual(results[0].attendance.pk, Attendance.objects.get(student=self.student).pk)
+
+    def bulk_create_after(self, **online):
+        """bulk_create 직전에 다른 요청이 같은 (학생, 날짜) 기록을 먼저 넣은 상황"""
+        original = Attendance.objects.bulk_create
+
+        def racing(objs, **kwargs):
+            Attendance.objects.create(student=self.student, date=self.today, **online)
+            return original(objs, **kwargs)
+        return mock.patch.object(Attendance.objects, 'bulk_create', side_effect=racing)
+
+    def test_skipped_insert_is_reported_against_online_row(self):
+        with self.bulk_create_after(status='PRESENT', check_in_time=self.at(17, 58)):
+            results = checkin.check_batch([self.tap(17, 55), self.tap(20, 30)], checkout=True)
+
+        row = Attendance.objects.get(student=self.student)
+        self.assertEqual([r.mode for r in results], [checkin.MODE_OUT, checkin.MODE_OUT])
+        self.assertTrue(all(r.attendance.pk == row.pk for r in results))
+        self.assertEqual((row.check_in_time, row.left_at), (self.at(17, 58), self.at(20, 30)))
+
+    def test_skipped_insert_without_checkout_is_already(self):
+        with self.bulk_create_after(status='PRESENT', check_in_time=self.at(17, 58)):
+            results = checkin.check_batch([self.tap(17, 55)], checkout=False)
+
+        row = Attendance.objects.get(student=self.student)
+        self.assertEqual(results[0].mode, checkin.MODE_ALREADY)
+        self.assertEqual(results[0].attendance.pk, row.pk)
+        self.assertIsNone(row.left_at)
+
+    def test_skipped_insert_over_auto_absent_enters(self):
+        with self.bulk_create_after(status='ABSENT', memo=ABSENT_MEMO):
+            results = checkin.check_batch([self.tap(17, 55)], checkout=True)
+
+        row = Attendance.objects.get(student=self.student)
+        self.assertEqual(results[0].mode, checkin.MODE_IN)
+        self.assertEqual((row.status, row.memo, row.check_in_time), ('PRESENT', '', self.at(17, 55)))
+
+
+class AssignmentSinceTest(TestCase):
+    """과제 목록 ?since= (academy/views_api.py AssignmentViewSet.list) - 오프셋이 붙은 시각도 현지 시각으로 비교"""
+    URL = '/academy/api/v1/assignments/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student').profile
+        cls.task = AssignmentTask.objects.create(
+            student=cls.student, title='과제', due_date=timezone.now() + timedelta(days=1),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student.user)
+
+    def since(self, offset, tz):
+        """과제 변경 시각 + offset 을 tz 오프셋이 붙은 ISO 문자열로"""
+        aware = timezone.make_aware(self.task.updated_at + offset).astimezone(tz)
+        return aware.isoformat().replace('+00:00', 'Z')
+
+    def ids(self, since, **extra):
+        response = self.client.get(self.URL, {'since': since, **extra})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item['id'] for item in response.json()]
+
+    def test_aware_since_is_compared_in_local_time(self):
+        utc, kst = datetime.timezone.utc, datetime.timezone(timedelta(hours=9))
+        for tz in (utc, kst):
+            self.assertEqual(self.ids(self.since(-timedelta(minutes=1), tz)), [self.task.id])
+            self.assertEqual(self.ids(self.since(timedelta(minutes=1), tz)), [])
+            self.assertEqual(self.ids(self.since(-timedelta(minutes=1), tz), limit=10), [self.task.id])
+
+    def test_invalid_since_is_400(self):
+        response = self.client.get(self.URL, {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
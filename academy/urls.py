@@ -10,6 +10,7 @@ router.register(r'schedules', TemporaryScheduleViewSet, basename='schedules')
 router.register(r'textbooks', TextbookViewSet, basename='textbook')
 
 from .views.log_search import StudentLogSearchView
+from .views.progress import StudentProgressGridView
 from .views.management import DailyStudentStatusView
 from .views.report import StudentReportViewSet
 from .views.dashboard import TeacherDashboardView
@@ -20,6 +21,7 @@ report_router.register(r'reports', StudentReportViewSet, basename='report')
 urlpatterns = [
     path('api/v1/', include(router.urls)),
     path('api/v1/logs/search/', StudentLogSearchView.as_view(), name='log-search'),
+    path('api/v1/progress-grid/', StudentProgressGridView.as_view(), name='progress-grid'),
     path('api/v1/daily-status/', DailyStudentStatusView.as_view(), name='daily-status'),
     path('api/v1/teacher/dashboard/', TeacherDashboardView.as_view(), name='teacher-dashboard'),
     path('api/v1/', include(report_router.urls)),
@@ -6,10 +6,11 @@ from datetime import datetime, time, timedelta
 import json
 import re
 from vocab.models import TestResult
-from utils.aligo import send_alimtalk
+from core import notifications
 from academy.models import TemporarySchedule, Textbook, ClassLog, ClassLogEntry, Attendance
 from vocab.models import WordBook
 from core.models import StudentProfile
+from academy import scheduling
 from django.contrib.auth.decorators import login_required
 
 # ==========================================
@@ -61,96 +62,55 @@ def class_management(request):
         target_date += timedelta(days=1)
         return redirect(f"{request.path}?date={target_date.strftime('%Y-%m-%d')}")
 
-    target_day_code = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}[target_date.weekday()]
-
-    class_list = []
+    # [FIX] 일정 해석은 scheduling 엔진으로 일원화 (학생 수와 무관하게 쿼리 수 고정)
+    student_qs = scheduling.students_for_teacher(user, branch=staff_branch)
+    if search_query:
+        student_qs = student_qs.filter(name__icontains=search_query)
 
-    # 4. 보강 스케줄 조회
-    temp_qs = TemporarySchedule.objects.filter(
-        new_date=target_date,
-        student__branch=staff_branch
-    ).select_related('student')
+    sessions = scheduling.resolve_sessions(student_qs, target_date)
+    student_ids = {s['student'].id for s in sessions}
 
-    if search_query:
-        temp_qs = temp_qs.filter(student__name__icontains=search_query)
+    attendance_map = {
+        a.student_id: a
+        for a in Attendance.objects.filter(student_id__in=student_ids, date=target_date)
+    }
+    logged = set(
+        ClassLog.objects.filter(student_id__in=student_ids, date=target_date)
+        .values_list('student_id', 'subject')
+    )
 
-    for schedule in temp_qs:
-        student = schedule.student
-        
-        # 담당 과목 확인
-        is_my_class = False
-        if schedule.subject == 'SYNTAX' and student.syntax_teacher == user:
-            is_my_class = True
-        elif schedule.subject == 'READING' and student.reading_teacher == user:
-            is_my_class = True
-        elif schedule.subject == 'EXTRA' and student.extra_class_teacher == user:
-            is_my_class = True
-
-        if is_my_class:
-            attendance = Attendance.objects.filter(student=student, date=target_date).first()
-            log = ClassLog.objects.filter(student=student, date=target_date, subject=schedule.subject).first()
-            
-            class_list.append({
-                'student': student,
-                'subject': schedule.subject,
-                'class_time': schedule.target_class,
-                'start_time': schedule.new_start_time,
-                'status': '작성완료' if log else '미작성',
+    class_list = []
+    for session in sessions:
+        student = session['student']
+        if session['teacher'] != user:
+            continue
+
+        schedule = session['schedule']
+        if session['source'] == scheduling.SOURCE_MAKEUP:
+            # 4. 보강 스케줄
+            extra = {
                 'is_extra': schedule.is_extra_class,
                 'note': schedule.note,
                 'schedule_id': schedule.id,
-                'has_attended': attendance is not None,
-                'attendance_status': attendance.status if attendance else 'NONE',
-            })
-    
-    # 5. 정규 수업 조회
-    student_qs = StudentProfile.objects.filter(
-        branch=staff_branch,
-        user__is_active=True 
-    ).filter(
-        Q(syntax_teacher=user) | Q(reading_teacher=user) | Q(extra_class_teacher=user)
-    ).select_related('syntax_class', 'reading_class', 'extra_class')
-    
-    if search_query:
-        student_qs = student_qs.filter(name__icontains=search_query)
-
-    for student in student_qs:
-        attendance = Attendance.objects.filter(student=student, date=target_date).first()
-        
-        item_base = {
-            'student': student, 
-            'is_extra': False, 
-            'note': '',
-            'schedule_id': 0, 
-            'has_attended': attendance is not None, 
+            }
+        elif session['subject'] in ('SYNTAX', 'READING') and not session['is_extra']:
+            # 5. 정규 수업 (추가 수업은 목록에 표시하지 않음)
+            extra = {'is_extra': False, 'note': '', 'schedule_id': 0}
+        else:
+            continue
+
+        attendance = attendance_map.get(student.id)
+        item = {
+            'student': student,
+            'subject': session['subject'],
+            'class_time': session['class_time'],
+            'start_time': session['start_time'],
+            'status': '작성완료' if (student.id, session['subject']) in logged else '미작성',
+            'has_attended': attendance is not None,
             'attendance_status': attendance.status if attendance else 'NONE',
         }
-
-        # [구문]
-        if student.syntax_teacher == user and student.syntax_class and student.syntax_class.day == target_day_code:
-            if not TemporarySchedule.objects.filter(student=student, original_date=target_date, subject='SYNTAX').exists():
-                log = ClassLog.objects.filter(student=student, date=target_date, subject='SYNTAX').first()
-                item = item_base.copy()
-                item.update({
-                    'subject': 'SYNTAX', 
-                    'class_time': student.syntax_class, 
-                    'start_time': student.syntax_class.start_time,
-                    'status': '작성완료' if log else '미작성'
-                })
-                class_list.append(item)
-        
-        # [독해]
-        if student.reading_teacher == user and student.reading_class and student.reading_class.day == target_day_code:
-            if not TemporarySchedule.objects.filter(student=student, original_date=target_date, subject='READING').exists():
-                log = ClassLog.objects.filter(student=student, date=target_date, subject='READING').first()
-                item = item_base.copy()
-                item.update({
-                    'subject': 'READING', 
-                    'class_time': student.reading_class, 
-                    'start_time': student.reading_class.start_time,
-                    'status': '작성완료' if log else '미작성'
-                })
-                class_list.append(item)
+        item.update(extra)
+        class_list.append(item)
 
     # 정렬
     class_list.sort(key=lambda x: x['start_time'] if x['start_time'] else time(23, 59))
@@ -361,10 +321,13 @@ def create_class_log(request, schedule_id):
         class_log.save()
 
         if request.POST.get('send_notification') == 'on':
-            send_homework_notification(class_log)
-            class_log.notification_sent_at = timezone.now()
-            class_log.save()
-            messages.success(request, "일지 저장 및 알림톡 발송 완료!")
+            # [FIX] 알림톡은 발송 대기열에 넣기만 함 (발송 지연/실패가 저장 요청을 막지 않도록)
+            if send_homework_notification(class_log):
+                class_log.notification_sent_at = timezone.now()
+                class_log.save()
+                messages.success(request, "일지 저장 및 알림톡 발송 요청 완료!")
+            else:
+                messages.success(request, "일지가 저장되었습니다. (이미 발송했거나 받을 번호가 없어 알림톡은 보내지 않았습니다)")
         else:
             messages.success(request, "일지가 저장되었습니다.")
 
@@ -429,10 +392,12 @@ def send_homework_notification(class_log):
     # 3. 전송 대상: 학생 본인 우선, 없으면 어머님 번호
     target_phone = student.phone_number or student.parent_phone_mom
     
-    if target_phone:
-        # ⚠️ WAITING_CODE_HOMEWORK 부분은 나중에 승인된 템플릿 코드로 바꿔야 합니다.
-        send_alimtalk(
-            receiver_phone=target_phone,
-            template_code="WAITING_CODE_HOMEWORK", 
-            context_data={'content': message}
-        )
\ No newline at end of file
+    # ⚠️ WAITING_CODE_HOMEWORK 부분은 나중에 승인된 템플릿 코드로 바꿔야 합니다.
+    # 같은 일지로는 1번만 발송 (다시 저장해도 중복 발송 안 됨, 실패했던 건은 다시 발송) -> 대기열에 넣었으면 True
+    _row, queued = notifications.enqueue(
+        template_code="WAITING_CODE_HOMEWORK",
+        recipient=target_phone,
+        ref=f"classlog:{class_log.pk}",
+        content=message,
+    )
+    return queued
\ No newline at end of file
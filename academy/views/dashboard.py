@@ -7,7 +7,7 @@ from datetime import datetime, time, timedelta
 
 from core.models import StudentProfile
 from academy.models import Attendance, TemporarySchedule, ClassLog, AssignmentTask
-from academy.utils import get_today_class_start_time
+from academy import scheduling
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -130,6 +130,35 @@ def class_management(request):
     })
 
 
+REGULAR_SUBJECT_LABELS = {'SYNTAX': '구문', 'READING': '독해'}
+
+
+def _load_day_status(student_ids, date, teacher_ids=None):
+    """
+    [NEW] 대시보드용 출결/일지 일괄 조회
+    반환: ({student_id: Attendance}, {(student_id, subject)} 일지 작성 여부 집합)
+    """
+    attendance_map = {
+        a.student_id: a
+        for a in Attendance.objects.filter(student_id__in=student_ids, date=date).order_by('-id')
+    }
+    logs = ClassLog.objects.filter(student_id__in=student_ids, date=date)
+    if teacher_ids is not None:
+        logs = logs.filter(teacher_id__in=teacher_ids)
+    return attendance_map, set(logs.values_list('student_id', 'subject'))
+
+
+def _vocab_status(last_passed_at, now):
+    """마지막 단어 시험 통과 후 경과일 -> (일수, 상태)"""
+    if not last_passed_at:
+        return 0, 'NONE'
+    vocab_days = (now - last_passed_at).days
+    if vocab_days >= 6: return vocab_days, 'DANGER'
+    elif vocab_days >= 4: return vocab_days, 'WARNING'
+    elif vocab_days >= 2: return vocab_days, 'CAUTION'
+    return vocab_days, 'GOOD'
+
+
 # ==============================================================================
 # 원장님용 대시보드 (수정됨: 보강 로직 추가)
 # ==============================================================================
@@ -142,130 +171,57 @@ def director_dashboard(request):
     else:
         today = timezone.now().date()
 
-    weekday_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-    today_day_code = weekday_map[today.weekday()]
-    
+    # [FIX] 일정 해석은 scheduling 엔진으로 일원화 (학생별 반복 쿼리 제거)
     # 27점 이상 통과 기준
-    students = StudentProfile.objects.filter(
-        Q(syntax_class__day=today_day_code) | 
-        Q(reading_class__day=today_day_code) |
-        Q(extra_class__day=today_day_code) |
-        Q(temp_schedules__new_date=today)
-    ).distinct().annotate(
+    students = scheduling.students_with_class_on(today).annotate(
         last_passed_at=Max('test_results__created_at', filter=Q(test_results__score__gte=27))
     )
-    
+    sessions = scheduling.resolve_sessions(students, today)
+    start_times = scheduling.first_start_times(sessions)
+    attendance_map, logged = _load_day_status({s['student'].id for s in sessions}, today)
+
     dashboard_data = []
     now = timezone.now()
-    
-    for student in students:
-        attendance = Attendance.objects.filter(student=student, date=today).first()
+
+    for session in sessions:
+        student = session['student']
+        attendance = attendance_map.get(student.id)
         if attendance:
             status_code = attendance.status
         else:
-            start_time = get_today_class_start_time(student)
-            if start_time and timezone.now().time() > start_time:
+            start_time = start_times.get((student.id, today))
+            if start_time and now.time() > start_time:
                 status_code = 'NONE'
             else:
                 status_code = 'PENDING'
 
-        def check_log(subj_type):
-            return ClassLog.objects.filter(student=student, subject=subj_type, date=today).exists()
-
-        # [단어 시험 상태]
-        vocab_days = 0
-        vocab_status = 'NONE'
-        
-        if student.last_passed_at:
-            diff = now - student.last_passed_at
-            vocab_days = diff.days
-            if vocab_days >= 6: vocab_status = 'DANGER'
-            elif vocab_days >= 4: vocab_status = 'WARNING'
-            elif vocab_days >= 2: vocab_status = 'CAUTION'
-            else: vocab_status = 'GOOD'
-        else:
-            vocab_status = 'NONE'
+        vocab_days, vocab_status = _vocab_status(student.last_passed_at, now)
 
         # [보강 상태] (단순 결석이면 보강 필요)
-        makeup_status = 'None'
-        if status_code == 'ABSENT':
-            makeup_status = 'Needed'
-            # (선택) 보강이 이미 잡혀있는지 체크하려면 아래 주석 해제 및 로직 추가 가능
-            # if TemporarySchedule.objects.filter(student=student, original_date=today).exists():
-            #     makeup_status = 'Scheduled'
-
-        # [A] 보강 스케줄
-        today_temps = TemporarySchedule.objects.filter(student=student, new_date=today)
-        for ts in today_temps:
-            t_user = None
-            if ts.subject == 'SYNTAX': t_user = student.syntax_teacher
-            elif ts.subject == 'READING': t_user = student.reading_teacher
-            
-            t_profile = t_user.staff_profile if t_user and hasattr(t_user, 'staff_profile') else None
-            t_name = t_profile.name if t_profile else "미지정"
-            
-            dashboard_data.append({
-                'student': student,
-                'subject': f"{ts.get_subject_display()} (보강)",
-                'time': ts.target_class,
-                'start_time_raw': ts.new_start_time,
-                'teacher_name': t_name,
-                'attendance_status': status_code,
-                'log_status': check_log(ts.subject),
-                'vocab_days': vocab_days,
-                'vocab_status': vocab_status,
-                'makeup_status': makeup_status  # [추가됨]
-            })
-
-        # [B] 정규 수업
-        if student.syntax_class and student.syntax_class.day == today_day_code:
-            is_moved = TemporarySchedule.objects.filter(
-                student=student, original_date=today, subject='SYNTAX', is_extra_class=False
-            ).exists()
-            if not is_moved:
-                t_prof = student.syntax_teacher.staff_profile if student.syntax_teacher and hasattr(student.syntax_teacher, 'staff_profile') else None
-                dashboard_data.append({
-                    'student': student, 'subject': '구문', 'time': student.syntax_class, 
-                    'start_time_raw': student.syntax_class.start_time,
-                    'teacher_name': t_prof.name if t_prof else "미지정", 
-                    'attendance_status': status_code, 
-                    'log_status': check_log('SYNTAX'),
-                    'vocab_days': vocab_days,
-                    'vocab_status': vocab_status,
-                    'makeup_status': makeup_status # [추가됨]
-                })
-
-        if student.reading_class and student.reading_class.day == today_day_code:
-            is_moved = TemporarySchedule.objects.filter(
-                student=student, original_date=today, subject='READING', is_extra_class=False
-            ).exists()
-            if not is_moved:
-                t_prof = student.reading_teacher.staff_profile if student.reading_teacher and hasattr(student.reading_teacher, 'staff_profile') else None
-                dashboard_data.append({
-                    'student': student, 'subject': '독해', 'time': student.reading_class, 
-                    'start_time_raw': student.reading_class.start_time,
-                    'teacher_name': t_prof.name if t_prof else "미지정", 
-                    'attendance_status': status_code, 
-                    'log_status': check_log('READING'),
-                    'vocab_days': vocab_days,
-                    'vocab_status': vocab_status,
-                    'makeup_status': makeup_status # [추가됨]
-                })
-
-        if student.extra_class and student.extra_class.day == today_day_code:
-            t_prof = student.extra_class_teacher.staff_profile if student.extra_class_teacher and hasattr(student.extra_class_teacher, 'staff_profile') else None
-            dashboard_data.append({
-                'student': student, 
-                'subject': f"{student.get_extra_class_type_display()} (추가)", 
-                'time': student.extra_class, 
-                'start_time_raw': student.extra_class.start_time,
-                'teacher_name': t_prof.name if t_prof else "미지정", 
-                'attendance_status': status_code, 
-                'log_status': check_log(student.extra_class_type),
-                'vocab_days': vocab_days,
-                'vocab_status': vocab_status,
-                'makeup_status': makeup_status # [추가됨]
-            })
+        makeup_status = 'Needed' if status_code == 'ABSENT' else 'None'
+
+        if session['source'] == scheduling.SOURCE_MAKEUP:
+            # [A] 보강 스케줄
+            subject_label = f"{session['schedule'].get_subject_display()} (보강)"
+        elif session['is_extra']:
+            # [C] 추가 수업
+            subject_label = f"{student.get_extra_class_type_display()} (추가)"
+        else:
+            # [B] 정규 수업
+            subject_label = REGULAR_SUBJECT_LABELS[session['subject']]
+
+        dashboard_data.append({
+            'student': student,
+            'subject': subject_label,
+            'time': session['class_time'],
+            'start_time_raw': session['start_time'],
+            'teacher_name': scheduling.teacher_name(session['teacher']),
+            'attendance_status': status_code,
+            'log_status': (student.id, session['subject']) in logged,
+            'vocab_days': vocab_days,
+            'vocab_status': vocab_status,
+            'makeup_status': makeup_status  # [추가됨]
+        })
 
     # 정렬
     dashboard_data.sort(key=lambda x: x['start_time_raw'] if x['start_time_raw'] else time(23, 59))
@@ -284,68 +240,51 @@ def vice_dashboard(request):
     target_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else timezone.now().date()
     my_teachers = request.user.staff_profile.managed_teachers.all()
     
-    weekday_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-    target_day_code = weekday_map[target_date.weekday()]
-    
+    # [FIX] 관리 선생님들의 정규/추가 수업만 엔진 결과에서 골라 사용
+    my_teacher_ids = set(my_teachers.values_list('id', flat=True))
     students = StudentProfile.objects.filter(
-        Q(syntax_teacher__in=my_teachers, syntax_class__day=target_day_code) |
-        Q(reading_teacher__in=my_teachers, reading_class__day=target_day_code) |
-        Q(extra_class_teacher__in=my_teachers, extra_class__day=target_day_code)
-    ).distinct().annotate(
+        Q(syntax_teacher__in=my_teacher_ids) |
+        Q(reading_teacher__in=my_teacher_ids) |
+        Q(extra_class_teacher__in=my_teacher_ids)
+    ).annotate(
         last_passed_at=Max('test_results__created_at', filter=Q(test_results__score__gte=27))
     )
+    all_sessions = scheduling.resolve_sessions(students, target_date)
+    start_times = scheduling.first_start_times(all_sessions)
+    sessions = [
+        s for s in all_sessions
+        if s['source'] == scheduling.SOURCE_REGULAR
+        and s['teacher'] is not None and s['teacher'].id in my_teacher_ids
+    ]
+    attendance_map, logged = _load_day_status(
+        {s['student'].id for s in sessions}, target_date, teacher_ids=my_teacher_ids
+    )
 
     dashboard_data = []
     now = timezone.now()
+    is_today = target_date == now.date()
 
-    for student in students:
-        attendance = Attendance.objects.filter(student=student, date=target_date).first()
-        status_code = attendance.status if attendance else ('NONE' if target_date == timezone.now().date() and get_today_class_start_time(student) and timezone.now().time() > get_today_class_start_time(student) else 'PENDING')
-
-        def check_log(subj_type, teacher_list):
-            return ClassLog.objects.filter(student=student, subject=subj_type, date=target_date, teacher__in=teacher_list).exists()
-            
-        vocab_days = 0
-        vocab_status = 'NONE'
-        if student.last_passed_at:
-            diff = now - student.last_passed_at
-            vocab_days = diff.days
-            if vocab_days >= 6: vocab_status = 'DANGER'
-            elif vocab_days >= 4: vocab_status = 'WARNING'
-            elif vocab_days >= 2: vocab_status = 'CAUTION'
-            else: vocab_status = 'GOOD'
+    for session in sessions:
+        student = session['student']
+        attendance = attendance_map.get(student.id)
+        start_time = start_times.get((student.id, target_date))
+        status_code = attendance.status if attendance else ('NONE' if is_today and start_time and now.time() > start_time else 'PENDING')
+
+        vocab_days, vocab_status = _vocab_status(student.last_passed_at, now)
+
+        if session['is_extra']:
+            subject_label = f"{student.get_extra_class_type_display()} (추가)"
         else:
-            vocab_status = 'NONE'
-
-        if student.syntax_teacher in my_teachers and student.syntax_class and student.syntax_class.day == target_day_code:
-             dashboard_data.append({
-                 'student': student, 'subject': '구문', 'time': student.syntax_class, 
-                 'teacher': student.syntax_teacher, 
-                 'log_status': check_log('SYNTAX', my_teachers), 
-                 'attendance_status': status_code,
-                 'vocab_days': vocab_days,
-                 'vocab_status': vocab_status
-             })
-
-        if student.reading_teacher in my_teachers and student.reading_class and student.reading_class.day == target_day_code:
-             dashboard_data.append({
-                 'student': student, 'subject': '독해', 'time': student.reading_class, 
-                 'teacher': student.reading_teacher, 
-                 'log_status': check_log('READING', my_teachers), 
-                 'attendance_status': status_code,
-                 'vocab_days': vocab_days,
-                 'vocab_status': vocab_status
-             })
-            
-        if student.extra_class_teacher in my_teachers and student.extra_class and student.extra_class.day == target_day_code:
-             dashboard_data.append({
-                 'student': student, 'subject': f"{student.get_extra_class_type_display()} (추가)", 
-                 'time': student.extra_class, 'teacher': student.extra_class_teacher, 
-                 'log_status': check_log(student.extra_class_type, my_teachers), 
-                 'attendance_status': status_code,
-                 'vocab_days': vocab_days,
-                 'vocab_status': vocab_status
-             })
+            subject_label = REGULAR_SUBJECT_LABELS[session['subject']]
+
+        dashboard_data.append({
+            'student': student, 'subject': subject_label, 'time': session['class_time'],
+            'teacher': session['teacher'],
+            'log_status': (student.id, session['subject']) in logged,
+            'attendance_status': status_code,
+            'vocab_days': vocab_days,
+            'vocab_status': vocab_status
+        })
 
     dashboard_data.sort(key=lambda x: x['time'].start_time if x['time'] else time(23, 59))
     return render(request, 'academy/vice_dashboard.html', {'target_date': target_date, 'dashboard_data': dashboard_data, 'my_teachers': my_teachers})
@@ -413,9 +352,11 @@ class TeacherDashboardView(APIView):
                 })
 
             # 3. Missing Class Logs (Last 14 days)
+            # [FIX] 학생/날짜별 exists() 반복 대신 기간 전체를 한 번씩 읽어 집합으로 비교
             missing_logs = []
             check_start_date = today - timedelta(days=14)
-            
+            absent_check_start = today - timedelta(days=30)
+
             recent_att = Attendance.objects.filter(
                 student__in=my_students,
                 date__gte=check_start_date,
@@ -423,70 +364,62 @@ class TeacherDashboardView(APIView):
                 status__in=['PRESENT', 'LATE']
             ).select_related('student', 'student__syntax_class', 'student__reading_class', 'student__extra_class')
 
-            weekday_map = {0:'Mon', 1:'Tue', 2:'Wed', 3:'Thu', 4:'Fri', 5:'Sat', 6:'Sun'}
-            
+            # 기간 내 보강/변경 일정 (일지 확인 14일 + 결석 확인 30일 범위)
+            moved_away = set()     # (student_id, original_date, subject) : 정규 수업이 다른 날로 이동
+            has_makeup = set()     # (student_id, original_date)          : 결석 보강이 잡힘
+            makeups_by_day = {}    # (student_id, new_date) -> [subject, ...]
+            temp_rows = TemporarySchedule.objects.filter(student__in=my_students).filter(
+                Q(original_date__gte=absent_check_start, original_date__lte=today) |
+                Q(new_date__gte=check_start_date, new_date__lte=today)
+            ).order_by('id').values_list('student_id', 'subject', 'is_extra_class', 'original_date', 'new_date')
+            for student_id, subject, is_extra_class, original_date, new_date in temp_rows:
+                if original_date:
+                    has_makeup.add((student_id, original_date))
+                    if not is_extra_class:
+                        moved_away.add((student_id, original_date, subject))
+                makeups_by_day.setdefault((student_id, new_date), []).append(subject)
+
+            logged = set(ClassLog.objects.filter(
+                student__in=my_students,
+                date__gte=check_start_date,
+                date__lte=today,
+            ).values_list('student_id', 'date', 'subject'))
+
             for att in recent_att:
-                day_str = weekday_map[att.date.weekday()]
+                day_str = scheduling.day_code(att.date)
                 student = att.student
                 subjects_today = []
                 
                 # 1. Regular Schedule Checking
                 # (1) Syntax
-                if student.syntax_class and student.syntax_class.day == day_str and student.syntax_teacher == user:
-                    # Check if moved away
-                    is_moved_away = TemporarySchedule.objects.filter(
-                        student=student, 
-                        original_date=att.date, 
-                        subject='SYNTAX',
-                        is_extra_class=False
-                    ).exists()
-                    if not is_moved_away:
+                if student.syntax_class and student.syntax_class.day == day_str and student.syntax_teacher_id == user.id:
+                    if (student.id, att.date, 'SYNTAX') not in moved_away:
                         subjects_today.append('SYNTAX')
 
                 # (2) Reading
-                if student.reading_class and student.reading_class.day == day_str and student.reading_teacher == user:
-                    is_moved_away = TemporarySchedule.objects.filter(
-                        student=student, 
-                        original_date=att.date, 
-                        subject='READING',
-                        is_extra_class=False
-                    ).exists()
-                    if not is_moved_away:
+                if student.reading_class and student.reading_class.day == day_str and student.reading_teacher_id == user.id:
+                    if (student.id, att.date, 'READING') not in moved_away:
                         subjects_today.append('READING')
 
                 # (3) Extra
-                if student.extra_class and student.extra_class.day == day_str and student.extra_class_teacher == user:
+                if student.extra_class and student.extra_class.day == day_str and student.extra_class_teacher_id == user.id:
                     # Extra class check simplified (usually fixed, but consistent with others)
                      if student.extra_class_type:
                         subjects_today.append(student.extra_class_type)
 
                 # 2. Temporary/Makeup Schedule Checking (Added to Today)
-                today_temps = TemporarySchedule.objects.filter(
-                    student=student,
-                    new_date=att.date
-                )
-                
-                for temp in today_temps:
+                for subject in makeups_by_day.get((student.id, att.date), []):
                     # If I am the teacher for this subject
-                    is_my_subject = False
-                    if temp.subject == 'SYNTAX' and student.syntax_teacher == user: is_my_subject = True
-                    elif temp.subject == 'READING' and student.reading_teacher == user: is_my_subject = True
-                    # Extra handling if needed
-                    
-                    if is_my_subject:
-                        subjects_today.append(temp.subject)
+                    if subject == 'SYNTAX' and student.syntax_teacher_id == user.id:
+                        subjects_today.append(subject)
+                    elif subject == 'READING' and student.reading_teacher_id == user.id:
+                        subjects_today.append(subject)
 
                 # Remove duplicates just in case
                 subjects_today = list(set(subjects_today))
 
                 for subj in subjects_today:
-                    exists = ClassLog.objects.filter(
-                        student=student,
-                        date=att.date,
-                        subject=subj
-                    ).exists()
-                    
-                    if not exists:
+                    if (student.id, att.date, subj) not in logged:
                         missing_logs.append({
                             'type': 'MISSING_LOG',
                             'student_id': student.id,
@@ -498,7 +431,6 @@ class TeacherDashboardView(APIView):
 
             # 4. Unscheduled Absences (Last 30 days)
             unscheduled_absences = []
-            absent_check_start = today - timedelta(days=30)
             recent_absent = Attendance.objects.filter(
                 student__in=my_students,
                 date__gte=absent_check_start,
@@ -507,12 +439,7 @@ class TeacherDashboardView(APIView):
             ).select_related('student')
 
             for att in recent_absent:
-                has_makeup = TemporarySchedule.objects.filter(
-                    student=att.student,
-                    original_date=att.date
-                ).exists()
-                
-                if not has_makeup:
+                if (att.student_id, att.date) not in has_makeup:
                     unscheduled_absences.append({
                         'type': 'NO_MAKEUP',
                         'student_id': att.student.id,
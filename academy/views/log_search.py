@@ -1,15 +1,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
-from django.utils import timezone
-from datetime import datetime, timedelta
-from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from datetime import datetime
+
+from academy import activity
+from utils import cursor as keyset
 
-# Models
-from core.models import StudentProfile
-from academy.models import ClassLog, AssignmentTask
-from vocab.models import TestResult
 
 class StudentLogSearchView(APIView):
     """
@@ -20,6 +16,13 @@ class StudentLogSearchView(APIView):
       - start_date: 'YYYY-MM-DD' (Optional)
       - end_date: 'YYYY-MM-DD' (Optional)
       - types: comma separated string 'LOG,ASM,TEST' (Optional, default all)
+      - limit: int (Optional, max 200)  # [NEW]
+      - cursor: 이전 응답의 X-Next-Cursor 헤더 값 (Optional)  # [NEW]
+    Response: 타임라인 항목 목록
+      - limit / cursor 가 없으면 기존처럼 전체
+      - 있으면 limit(기본 50)개씩, 다음 페이지가 있으면 X-Has-More: 1, X-Next-Cursor 헤더
+
+    # [FIX] 원본 3종을 전부 읽어 파이썬에서 정렬하던 방식 -> ActivityEvent 인덱스 keyset 페이지 조회
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -30,170 +33,38 @@ class StudentLogSearchView(APIView):
 
         # 권한 체크: 나중에 강화 필요 (내 학생인지 확인)
         # student = get_object_or_404(StudentProfile, id=student_id)
-        
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        types_str = request.query_params.get('types', 'LOG,ASM,TEST')
-        types = [t.strip().upper() for t in types_str.split(',')]
-        
-        timeline = []
-
-        # ---------------------------------------------------------
-        # 1. 수업 일지 (ClassLog)
-        # ---------------------------------------------------------
-        if 'LOG' in types:
-            logs = ClassLog.objects.filter(student_id=student_id).select_related('teacher')
-            if start_date_str:
-                logs = logs.filter(date__gte=start_date_str)
-            if end_date_str:
-                logs = logs.filter(date__lte=end_date_str)
-                
-            for log in logs:
-                # 진도 상세 및 평가
-                entries_data = []
-                summary_parts = []
-                for entry in log.entries.all():
-                    book_name = entry.textbook.title if entry.textbook else (entry.wordbook.title if entry.wordbook else "미지정")
-                    entries_data.append({
-                        'book': book_name,
-                        'range': entry.progress_range,
-                        'score': entry.score or '-'
-                    })
-                    summary_parts.append(f"{book_name} {entry.progress_range}")
-                
-                progress_summary = ", ".join(summary_parts) if summary_parts else "진도 없음"
-
-                # 연결된 과제
-                linked_assignments = []
-                for asm in log.generated_assignments.all():
-                    linked_assignments.append({
-                        'title': asm.title,
-                        'id': asm.id,
-                        'is_completed': asm.is_completed
-                    })
-
-                timeline.append({
-                    'type': 'LOG',
-                    'date': log.date, # Date Object (for sorting)
-                    'timestamp': datetime.combine(log.date, datetime.min.time()),
-                    'title': f"{log.get_subject_display()} 수업",
-                    'content': progress_summary,  # 요약 (리스트뷰용)
-                    'sub_info': log.teacher.staff_profile.name if log.teacher and hasattr(log.teacher, 'staff_profile') else (log.teacher.username if log.teacher else "미지정"),
-                    'status': 'COMPLETED',
-                    'id': log.id,
-                    'raw_date': log.date.strftime('%Y-%m-%d'),
-                    # [NEW] 상세 정보
-                    'details': {
-                        'comment': log.comment,
-                        'entries': entries_data,
-                        'assignments': linked_assignments,
-                        'test_info': { # 독해 등 테스트 정보
-                            'type': log.reading_test_type,
-                            'score': log.reading_test_score
-                        } if log.subject == 'READING' else None
-                    }
-                })
-
-        # ---------------------------------------------------------
-        # 2. 과제 (AssignmentTask)
-        # ---------------------------------------------------------
-        if 'ASM' in types:
-            assignments = AssignmentTask.objects.filter(student_id=student_id)
-            if start_date_str:
-                assignments = assignments.filter(due_date__date__gte=start_date_str)
-            if end_date_str:
-                assignments = assignments.filter(due_date__date__lte=end_date_str)
 
-            for asm in assignments:
-                # 상태 결정
-                is_completed = asm.is_completed
-                status_str = 'PENDING'
-                
-                if hasattr(asm, 'submission'):
-                    sub_status = asm.submission.status
-                    if sub_status == 'APPROVED':
-                        status_str = 'COMPLETED'
-                    elif sub_status == 'REJECTED':
-                        status_str = 'REJECTED'
-                    else:
-                        status_str = 'SUBMITTED' # 검사 대기
-                elif is_completed:
-                    status_str = 'COMPLETED' # 수동 완료 처리 등
-                elif asm.due_date < timezone.now():
-                    status_str = 'OVERDUE'
+        try:
+            student_id = int(student_id)
+            start_date = self._parse_date(request.query_params.get('start_date'))
+            end_date = self._parse_date(request.query_params.get('end_date'))
+            # [FIX] 페이지는 요청한 경우에만 (기존 클라이언트는 전체 목록을 기대)
+            paged = bool(request.query_params.get('limit') or request.query_params.get('cursor'))
+            limit = keyset.clamp_limit(request.query_params.get('limit')) if paged else None
+        except ValueError:
+            return Response({'error': 'invalid parameter format'}, status=status.HTTP_400_BAD_REQUEST)
 
-                timeline.append({
-                    'type': 'ASM',
-                    'date': asm.due_date.date(),
-                    'timestamp': asm.due_date,
-                    'title': asm.title,
-                    'content': asm.description or '설명 없음',
-                    'sub_info': f"마감: {asm.due_date.strftime('%m-%d %H:%M')}",
-                    'status': status_str,
-                    'id': asm.id,
-                    'raw_date': asm.due_date.strftime('%Y-%m-%d')
-                })
-
-        # ---------------------------------------------------------
-        # 3. 단어 시험 (TestResult)
-        # ---------------------------------------------------------
-        if 'TEST' in types:
-            # select_related 'book'이 없을 수도 있으니(WordBook) 확인 필요. 
-            # vocab/models.py TestResult에는 book 필드가 없고 range 텍스트 등만 있거나 
-            # 혹은 WordBook과 연결된 필드가 있을 수 있음.
-            # 모델 정의를 다시 보면 TestResult에는 'book' 필드가 없고 'test_range'만 있음.
-            # 하지만 상세 구현에서 book_id 등이 있을 수 있음. 모델 필드를 다시 확인.
-            # TestResult 모델(L198)에는 student, wrong_count, test_range, created_at 만 명시됨.
-            # 하지만 실제로는 추가된 필드가 있을 가능성이 높음 (최근 마이그레이션 등).
-            # 여기서는 안전하게 기본 필드만 사용하거나 try-except 처리.
-            
-            tests = TestResult.objects.filter(student_id=student_id)
-            if start_date_str:
-                tests = tests.filter(created_at__date__gte=start_date_str)
-            if end_date_str:
-                tests = tests.filter(created_at__date__lte=end_date_str)
-
-            for test in tests:
-                # 점수 계산 (모델 필드에 score가 없다면 계산해야 함)
-                # TestResult 모델(outline)에는 wrong_count만 보였음.
-                # 그러나 WordTestScreen.dart 에서는 result['score']를 받고 있음.
-                # 이는 API(Serializer) 레벨에서 계산해서 주거나 모델에 score 필드가 있을 수 있음.
-                # 모델 outline에 score는 안보였음. 
-                # -> 임시로 total_questions 등을 알 수 없으므로, 상세 정보가 없으면 wrong_count만 표시.
-                # 하지만, 만약 score 필드가 있다면 사용.
-                
-                score_display = f"{test.wrong_count}개 틀림"
-                if hasattr(test, 'score'):
-                    score_display = f"{test.score}점"
-                
-                # 책 제목 추론 (어렵다면 test_range 사용)
-                title_display = f"단어시험 ({test.test_range})"
-                
-                status_pass = 'PASS'
-                # 합격 기준 로직이 있다면 적용 (예: 90점 이상)
-                if hasattr(test, 'score') and test.score < 90:
-                    status_pass = 'FAIL'
-
-                timeline.append({
-                    'type': 'TEST',
-                    'date': test.created_at.date(),
-                    'timestamp': test.created_at,
-                    'title': title_display,
-                    'content': f"결과: {score_display}",
-                    'sub_info': '', 
-                    'status': status_pass,
-                    'id': test.id,
-                    'raw_date': test.created_at.strftime('%Y-%m-%d')
-                })
-
-        # ---------------------------------------------------------
-        # 4. 정렬 및 반환
-        # ---------------------------------------------------------
-        # 최신순 정렬
-        timeline.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        # timestamp 객체 제거 (JSON 직렬화 오류 방지)
-        for item in timeline:
-            del item['timestamp']
-
-        return Response(timeline)
\ No newline at end of file
+        types_str = request.query_params.get('types', 'LOG,ASM,TEST')
+        types = [t.strip().upper() for t in types_str.split(',')]
+        types = [t for t in activity.ALL_TYPES if t in types]
+        if not types:
+            return Response([])
+
+        try:
+            events, next_cursor = activity.query_events(
+                student_id, types=types, start_date=start_date, end_date=end_date,
+                cursor=request.query_params.get('cursor'), limit=limit,
+            )
+        except ValueError:
+            return Response({'error': 'invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response(activity.render_events(events))
+        if paged:
+            response['X-Has-More'] = '1' if next_cursor else '0'
+            if next_cursor:
+                response['X-Next-Cursor'] = next_cursor
+        return response
+
+    @staticmethod
+    def _parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 # Models
 from core.models import StudentProfile, StaffProfile
 from academy.models import Attendance, ClassLog, TemporarySchedule
+from academy import scheduling
 
 User = get_user_model()
 
@@ -17,21 +18,41 @@ class DailyStudentStatusView(APIView):
     [담당 강사 관리] 일일 학생 현황 (출결/일지/보강)
     - 원장: 지점 전체
     - 부원장: 담당 강사(managed_teachers) + 본인 반
+    - date_from/date_to: 기간 모드 (날짜별 결과 목록, 쿼리 수는 단일 날짜와 동일)
     """
     permission_classes = [permissions.IsAuthenticated]
+    MAX_RANGE_DAYS = 31
 
     def get(self, request):
         user = request.user
         
         # 1. 권한 체크 및 날짜 파싱
+        # [NEW] date_from/date_to 를 주면 기간 모드 (최대 MAX_RANGE_DAYS 일)
         date_str = request.query_params.get('date')
-        if date_str:
-            try:
+        date_from = request.query_params.get('date_from')
+        date_to = request.query_params.get('date_to')
+        try:
+            if date_from or date_to:
+                date_from = datetime.strptime(date_from or date_to, '%Y-%m-%d').date()
+                date_to = datetime.strptime(date_to or date_from.isoformat(), '%Y-%m-%d').date()
+            if date_str:
                 target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({'error': 'Invalid date format'}, status=status.HTTP_400_BAD_REQUEST)
+            else:
+                target_date = timezone.now().date()
+        except ValueError:
+            return Response({'error': 'Invalid date format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if date_from is not None:
+            if date_from > date_to:
+                date_from, date_to = date_to, date_from
+            if (date_to - date_from).days >= self.MAX_RANGE_DAYS:
+                return Response(
+                    {'error': f'Date range is limited to {self.MAX_RANGE_DAYS} days'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            start_date, end_date = date_from, date_to
         else:
-            target_date = timezone.now().date()
+            start_date = end_date = target_date
 
         if not hasattr(user, 'staff_profile'):
             return Response({'error': 'Permission denied (Not staff)'}, status=status.HTTP_403_FORBIDDEN)
@@ -57,120 +78,146 @@ class DailyStudentStatusView(APIView):
             target_teachers = User.objects.filter(id__in=managed_ids)
 
         if not target_teachers.exists():
+             if date_from is not None:
+                 return Response({'date_from': start_date, 'date_to': end_date, 'days': []})
              return Response({'date': target_date, 'students': []})
 
         # 3. 대상 학생 선정 (Managed Students)
         # 해당 강사들이 담당하는 모든 학생 (일단 범위 넓게 잡고 날짜로 필터링)
         # is_active=True 체크 (퇴원생 제외)
-        students = StudentProfile.objects.filter(
+        # [FIX] 시간표/담당 강사 이름까지 한 번에 로드 (학생별 추가 쿼리 제거)
+        students = list(StudentProfile.objects.filter(
             Q(syntax_teacher__in=target_teachers) |
             Q(reading_teacher__in=target_teachers) |
             Q(extra_class_teacher__in=target_teachers)
-        ).filter(user__is_active=True).distinct().select_related('syntax_teacher', 'reading_teacher', 'school')
+        ).filter(user__is_active=True).distinct().select_related(
+            'syntax_class', 'reading_class', 'extra_class', 'school',
+            'syntax_teacher__staff_profile', 'reading_teacher__staff_profile',
+        ))
 
-        # 4. 오늘 등원해야 하는 학생 필터링
-        weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        today_key = weekdays[target_date.weekday()]
-        
-        results = []
-        
-        # Bulk Fetching Optimization? 
-        # Loop이 많지 않으므로 일단 직관적으로 구현.
-        
-        for student in students:
-            should_attend = False
-            makeup_info = None
-            absent_info = None # 결석 예정 정보 (보강 미정 등)
-            
-            # (1) 정규 수업 확인
-            has_regular = False
-            if student.syntax_class and student.syntax_class.day == today_key: has_regular = True
-            if student.reading_class and student.reading_class.day == today_key: has_regular = True
-            # extra_class logic (if daily) - usually extra class is fixed date or weekly? Assuming weekly for simplicity if it has 'day'
-            if student.extra_class and student.extra_class.day == today_key: has_regular = True
-            
-            # (2) 임시 스케줄 확인 (보강/결석)
-            # 오늘 날짜에 대한 변경 사항 조회
-            # - new_date == today: 오늘로 보강 옴 (등원 O)
-            # - original_date == today: 오늘 수업 빠짐 (등원 X, but 리스트엔 나와야 함)
-            
-            temp_schedules = TemporarySchedule.objects.filter(student=student)
-            
-            # A. 오늘로 보강 잡힌 건 (Add)
-            makeup_today = temp_schedules.filter(new_date=target_date).exists()
-            
-            # B. 오늘 원래 수업인데 빠지는 건 (Cancel/Reschedule)
-            # is_extra_class=False인 경우만 정규 수업 취소로 간주? (모델 확인 필요하지만 보통 cancel은 new_date=null or other)
-            # original_date가 오늘인 스케줄 찾기
-            cancelled_today_qs = temp_schedules.filter(original_date=target_date)
-            is_cancelled = cancelled_today_qs.exists()
-            
-            if makeup_today:
-                should_attend = True
-            elif has_regular:
-                if is_cancelled:
-                    should_attend = False 
-                    # 원래 와야 하는데 안 오는 경우 -> 리스트에는 포함하되 '보강 여부' 표시
-                    # 보강이 잡혔는지 확인: cancelled_item.new_date is not None
-                    makeup_sched = cancelled_today_qs.first()
-                    if makeup_sched and makeup_sched.new_date:
-                        absent_info = f"보강: {makeup_sched.new_date}"
-                    else:
-                        absent_info = "보강 미정"
-                else:
-                    should_attend = True
-            
-            # (3) 리스트 포함 여부 결정
-            # - 등원 예정이거나 (should_attend)
-            # - 원래 등원일인데 결석인 경우 (has_regular and is_cancelled) -> 관리 대상임
-            
-            is_target = should_attend or (has_regular and is_cancelled)
-            
-            if is_target:
-                # 5. 상태 조회
-                attendance = None
-                if should_attend:
-                    att_obj = Attendance.objects.filter(student=student, date=target_date).first()
-                    attendance = att_obj.status if att_obj else 'NONE' # 미등원
-                else:
-                    attendance = 'ABSENT_PLANNED' # 예정된 결석 (보강 등)
-                
-                # 일지 작성 여부
-                # [TODO] 과목별로 체크해야 하나? 하나라도 있으면 OK? -> 일단 하나라도 있으면 OK
-                # 상세는 눌러서 확인
-                has_log = ClassLog.objects.filter(student=student, date=target_date).exists()
-                
-                # 담당 선생님 이름 (대표 1명)
-                teacher_name = "-"
-                if student.syntax_teacher: teacher_name = student.syntax_teacher.staff_profile.name
-                elif student.reading_teacher: teacher_name = student.reading_teacher.staff_profile.name
-                
-                results.append({
-                    'id': student.id,
-                    'name': student.name,
-                    'school': student.school.name if student.school else "-",
-                    'grade': student.current_grade_display,
-                    'teacher': teacher_name,
-                    'attendance': attendance, # PRESENT, LATE, ABSENT, NONE, ABSENT_PLANNED
-                    'has_log': has_log,
-                    'absent_info': absent_info, # 보강 정보 (결석인 경우)
-                    'is_cancelled': is_cancelled and not makeup_today
-                })
-
-        # 6. 정렬 (등원 예정이 위로, 그 다음 결석)
-        results.sort(key=lambda x: (x['is_cancelled'], x['name']))
-        
-        # 7. 통계
-        total_count = len(results)
-        present_count = len([r for r in results if r['attendance'] in ['PRESENT', 'LATE']])
-        log_count = len([r for r in results if r['has_log']])
-        
+        # 4. 기간 내 보강/출결/일지를 한 번씩 읽어 (학생, 날짜) 키로 정리
+        day_status = _DayStatusIndex(students, start_date, end_date)
+
+        if date_from is None:
+            return Response(_build_day(students, target_date, day_status))
+
+        # [NEW] 기간 모드: 날짜별 결과를 같은 쿼리 예산으로 계산
         return Response({
-            'date': target_date,
-            'summary': {
-                'total': total_count,
-                'present': present_count,
-                'log_completed': log_count
-            },
-            'students': results
+            'date_from': start_date,
+            'date_to': end_date,
+            'days': [_build_day(students, d, day_status) for d in scheduling.iter_dates(start_date, end_date)],
         })
+
+
+class _DayStatusIndex:
+    """
+    [NEW] 기간 내 보강/출결/일지 일괄 조회 결과 (쿼리 3회)
+    - makeups    : {(student_id, new_date)}                    보강으로 등원
+    - cancelled  : {(student_id, original_date): 첫 번째 일정}  원래 수업이 빠짐
+    - attendance : {(student_id, date): status}
+    - logged     : {(student_id, date)}                        일지 1건 이상 작성
+    """
+
+    def __init__(self, students, start_date, end_date):
+        student_ids = [s.id for s in students]
+
+        self.makeups = set()
+        self.cancelled = {}
+        temps = TemporarySchedule.objects.filter(student_id__in=student_ids).filter(
+            Q(new_date__range=(start_date, end_date)) |
+            Q(original_date__range=(start_date, end_date))
+        ).order_by('id').only('id', 'student_id', 'original_date', 'new_date')
+        for ts in temps:
+            self.makeups.add((ts.student_id, ts.new_date))
+            if ts.original_date:
+                self.cancelled.setdefault((ts.student_id, ts.original_date), ts)
+
+        self.attendance = {}
+        rows = Attendance.objects.filter(
+            student_id__in=student_ids, date__range=(start_date, end_date)
+        ).order_by('id').values_list('student_id', 'date', 'status')
+        for student_id, date, status_code in rows:
+            self.attendance.setdefault((student_id, date), status_code)
+
+        self.logged = set(ClassLog.objects.filter(
+            student_id__in=student_ids, date__range=(start_date, end_date)
+        ).values_list('student_id', 'date'))
+
+
+def _build_day(students, target_date, day_status):
+    """하루치 학생 현황 + 통계 (DB 조회 없음)"""
+    today_key = scheduling.day_code(target_date)
+    results = []
+
+    for student in students:
+        should_attend = False
+        absent_info = None # 결석 예정 정보 (보강 미정 등)
+
+        # (1) 정규 수업 확인
+        has_regular = any(
+            c is not None and c.day == today_key
+            for c in (student.syntax_class, student.reading_class, student.extra_class)
+        )
+
+        # (2) 임시 스케줄 확인 (보강/결석)
+        # - new_date == today: 오늘로 보강 옴 (등원 O)
+        # - original_date == today: 오늘 수업 빠짐 (등원 X, but 리스트엔 나와야 함)
+        makeup_today = (student.id, target_date) in day_status.makeups
+        makeup_sched = day_status.cancelled.get((student.id, target_date))
+        is_cancelled = makeup_sched is not None
+
+        if makeup_today:
+            should_attend = True
+        elif has_regular:
+            if is_cancelled:
+                # 원래 와야 하는데 안 오는 경우 -> 리스트에는 포함하되 '보강 여부' 표시
+                if makeup_sched.new_date:
+                    absent_info = f"보강: {makeup_sched.new_date}"
+                else:
+                    absent_info = "보강 미정"
+            else:
+                should_attend = True
+
+        # (3) 리스트 포함 여부 결정
+        # - 등원 예정이거나 (should_attend)
+        # - 원래 등원일인데 결석인 경우 (has_regular and is_cancelled) -> 관리 대상임
+        if not (should_attend or (has_regular and is_cancelled)):
+            continue
+
+        # 5. 상태 조회
+        if should_attend:
+            attendance = day_status.attendance.get((student.id, target_date), 'NONE') # 미등원
+        else:
+            attendance = 'ABSENT_PLANNED' # 예정된 결석 (보강 등)
+
+        # 담당 선생님 이름 (대표 1명)
+        teacher_name = "-"
+        if student.syntax_teacher: teacher_name = scheduling.teacher_name(student.syntax_teacher, "-")
+        elif student.reading_teacher: teacher_name = scheduling.teacher_name(student.reading_teacher, "-")
+
+        results.append({
+            'id': student.id,
+            'name': student.name,
+            'school': student.school.name if student.school else "-",
+            'grade': student.current_grade_display,
+            'teacher': teacher_name,
+            'attendance': attendance, # PRESENT, LATE, ABSENT, NONE, ABSENT_PLANNED
+            # 일지 작성 여부 (과목 무관, 하나라도 있으면 OK)
+            'has_log': (student.id, target_date) in day_status.logged,
+            'absent_info': absent_info, # 보강 정보 (결석인 경우)
+            'is_cancelled': is_cancelled and not makeup_today
+        })
+
+    # 6. 정렬 (등원 예정이 위로, 그 다음 결석)
+    results.sort(key=lambda x: (x['is_cancelled'], x['name']))
+
+    # 7. 통계
+    return {
+        'date': target_date,
+        'summary': {
+            'total': len(results),
+            'present': len([r for r in results if r['attendance'] in ['PRESENT', 'LATE']]),
+            'log_completed': len([r for r in results if r['has_log']])
+        },
+        'students': results
+    }
@@ -0,0 +1,34 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+
+from academy import progress
+
+
+class StudentProgressGridView(APIView):
+    """
+    [NEW] 학생 교재/단어장 진도 그리드 (성적표 textbook_progress 와 같은 형식)
+    Endpoint: /academy/api/v1/progress-grid/
+    Params:
+      - student_id: int (Required)
+    Response: {student_id, textbook_progress: {카테고리: [{title, total_units, history: {단원: 성취도}}]}}
+
+    ProgressCell 인덱스 조회 1회 + 책 정보 조회만 수행합니다. (일지/시험 원천을 읽지 않음)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        student_id = request.query_params.get('student_id')
+        if not student_id:
+            return Response({'error': 'student_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            student_id = int(student_id)
+        except ValueError:
+            return Response({'error': 'invalid parameter format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cells = progress.load_cells(student_id)
+        textbooks, wordbooks = progress.book_meta(cells)
+        return Response({
+            'student_id': student_id,
+            'textbook_progress': progress.progress_sections(cells, textbooks, wordbooks),
+        })
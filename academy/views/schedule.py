@@ -9,6 +9,8 @@ import json
 
 from core.models import StudentProfile, ClassTime
 from academy.models import TemporarySchedule
+from academy.occupancy import get_day_occupancy, get_occupancy
+from academy.scheduling import iter_dates
 
 # ... (schedule_change 함수 등 위쪽 코드는 기존과 동일하게 유지) ...
 
@@ -71,6 +73,13 @@ def schedule_change(request, student_id):
             weekday_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
             day_code = weekday_map[new_date.weekday()]
             
+            # [NEW] 구문(1:1)은 선생님 점유 인덱스로 중복 예약을 서버에서도 차단
+            if subject == 'SYNTAX' and student.syntax_teacher_id:
+                occupancy = get_day_occupancy(student.syntax_teacher_id, new_date)
+                if occupancy.is_booked(new_time, exclude_student_id=student.id):
+                    messages.error(request, f"{new_date} {new_time_str} 은(는) 이미 선생님 수업이 있는 시간입니다.")
+                    return redirect(request.path)
+
             target_class_obj = ClassTime.objects.filter(
                 day=day_code, 
                 start_time=new_time,
@@ -101,80 +110,64 @@ def schedule_change(request, student_id):
     })
 
 # ... (check_availability 함수 등 기존 코드 유지) ...
+MAX_AVAILABILITY_DAYS = 31
+
+
 def check_availability(request):
     """
     [AJAX] 특정 날짜, 특정 선생님의 마감된 시간대(String List)를 반환
+    # [FIX] 선생님별/날짜별 점유 인덱스(academy.occupancy) 사용 (캐시, 쿼리 최대 2회)
+
+    - 기본: student_id + subject + date -> {'booked': ['HH:MM', ...]}
+    - [NEW] end_date 를 주면 기간 조회, teacher_ids(콤마 구분)를 주면 여러 선생님 동시 조회
+      -> {'booked': [...], 'availability': {teacher_id: {date: ['HH:MM', ...]}}}
+         ('booked' 는 첫 번째 선생님의 date 당일 값, 기존 화면 호환용)
     """
     student_id = request.GET.get('student_id')
     subject = request.GET.get('subject')
     date_str = request.GET.get('date')
+    end_date_str = request.GET.get('end_date')
+    teacher_ids_str = request.GET.get('teacher_ids')
+    multi = bool(end_date_str or teacher_ids_str)
 
-    if not (student_id and subject and date_str): 
+    if not date_str or not (multi or (student_id and subject)):
         return JsonResponse({'booked': []})
 
     try:
         target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        student = StudentProfile.objects.get(id=student_id)
-        
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else target_date
+        if end_date < target_date or (end_date - target_date).days >= MAX_AVAILABILITY_DAYS:
+            return JsonResponse({'booked': [], 'error': 'invalid date range'}, status=400)
+
         # 구문(SYNTAX)일 때만 1:1 중복 체크 진행 (독해는 중복 허용)
-        if subject != 'SYNTAX': 
+        if subject and subject != 'SYNTAX':
             return JsonResponse({'booked': []})
 
-        teacher = student.syntax_teacher
-        if not teacher: 
+        student = StudentProfile.objects.only('id', 'syntax_teacher_id').get(id=student_id) if student_id else None
+
+        if teacher_ids_str:
+            teacher_ids = [int(t) for t in teacher_ids_str.split(',') if t.strip()]
+        elif student and student.syntax_teacher_id:
+            teacher_ids = [student.syntax_teacher_id]
+        else:
+            teacher_ids = []
+        if not teacher_ids:
             return JsonResponse({'booked': []})
 
-        booked_times = set()
-        weekday_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-        day_code = weekday_map[target_date.weekday()]
-        
-        # ------------------------------------------------------------------
-        # [1-1] 정규 수업(Regular Class) 중복 체크
-        # ------------------------------------------------------------------
-        other_syntax_students = StudentProfile.objects.filter(
-            syntax_teacher=teacher, 
-            syntax_class__day=day_code
-        ).exclude(id=student.id).select_related('syntax_class')
-
-        for s in other_syntax_students:
-            # 해당 날짜에 보강/변경으로 인해 수업이 '이동'되지 않은 경우만 점유
-            if not TemporarySchedule.objects.filter(student=s, original_date=target_date, subject='SYNTAX').exists():
-                booked_times.add(s.syntax_class.start_time.strftime('%H:%M'))
-
-        # ------------------------------------------------------------------
-        # [1-2] 고정 추가 수업(Fixed Extra Class) 중복 체크 (✅ 추가된 부분)
-        # ------------------------------------------------------------------
-        # 선생님이 진행하는 '구문' 타입의 추가 수업도 1:1이므로 겹치면 안 됨
-        other_extra_students = StudentProfile.objects.filter(
-            extra_class_teacher=teacher,
-            extra_class_type='SYNTAX', # 구문 타입만 체크
-            extra_class__day=day_code
-        ).exclude(id=student.id).select_related('extra_class')
-
-        for s in other_extra_students:
-            # 추가 수업은 보통 이동이 드물지만, 혹시 모르니 체크 (일단은 무조건 점유로 처리)
-            if s.extra_class:
-                booked_times.add(s.extra_class.start_time.strftime('%H:%M'))
-
-        # ------------------------------------------------------------------
-        # [2] 임시 보강/변경(Temporary Schedule) 중복 체크
-        # ------------------------------------------------------------------
-        # 해당 날짜에 새로 들어온 스케줄 확인
-        temp_schedules = TemporarySchedule.objects.filter(
-            new_date=target_date, 
-            subject='SYNTAX' # 구문 수업으로 잡힌 것들
-        ).select_related('student')
-
-        for ts in temp_schedules:
-            # 해당 스케줄의 담당 쌤이 '나(teacher)'인 경우
-            # (주의: 임시 스케줄 모델에 teacher 필드가 없다면, 학생의 담당 쌤을 확인)
-            ts_teacher = ts.student.syntax_teacher
-            
-            if ts_teacher == teacher and ts.student.id != student.id:
-                if ts.new_start_time:
-                    booked_times.add(ts.new_start_time.strftime('%H:%M'))
+        # 본인 수업은 '마감'으로 보지 않음
+        exclude_id = student.id if student else None
+        dates = list(iter_dates(target_date, end_date))
+        index = get_occupancy(teacher_ids, dates)
+        booked = index[(teacher_ids[0], target_date)].labels(exclude_id)
+
+        if not multi:
+            return JsonResponse({'booked': booked})
 
-        return JsonResponse({'booked': sorted(list(booked_times))})
+        availability = {
+            str(t): {d.isoformat(): index[(t, d)].labels(exclude_id) for d in dates}
+            for t in teacher_ids
+        }
+        return JsonResponse({'booked': booked, 'availability': availability})
     except Exception as e:
         print(f"Error in check_availability: {e}")
         return JsonResponse({'booked': []})
@@ -197,28 +190,27 @@ def get_occupied_times(request):
         return JsonResponse({'occupied_ids': []})
 
     try:
+        # [FIX] 정규 구문 + 구문 타입 추가 수업을 쿼리 1회로 조회
         # 1. 정규 구문 수업 (Regular Syntax)
-        regular_qs = StudentProfile.objects.filter(syntax_teacher_id=teacher_id)
-        if current_student_id:
-            regular_qs = regular_qs.exclude(id=current_student_id)
-        
-        regular_ids = list(regular_qs.values_list('syntax_class_id', flat=True))
-
         # 2. 보강(추가) 수업 중 '구문' 타입 (Extra Class - Syntax)
         # [조건] extra_class_teacher가 이 선생님이고 + 타입이 'SYNTAX'인 경우
-        extra_qs = StudentProfile.objects.filter(
-            extra_class_teacher_id=teacher_id,
-            extra_class_type='SYNTAX'
+        qs = StudentProfile.objects.filter(
+            Q(syntax_teacher_id=teacher_id) |
+            Q(extra_class_teacher_id=teacher_id, extra_class_type='SYNTAX')
         )
         if current_student_id:
-            extra_qs = extra_qs.exclude(id=current_student_id)
-            
-        extra_ids = list(extra_qs.values_list('extra_class_id', flat=True))
+            qs = qs.exclude(id=current_student_id)
 
         # 3. 합치기 (중복 제거 및 None 제거)
-        all_ids = set(regular_ids + extra_ids)
-        if None in all_ids:
-            all_ids.remove(None)
+        all_ids = set()
+        for syntax_teacher_id, syntax_class_id, extra_teacher_id, extra_type, extra_class_id in qs.values_list(
+            'syntax_teacher_id', 'syntax_class_id', 'extra_class_teacher_id', 'extra_class_type', 'extra_class_id'
+        ):
+            if str(syntax_teacher_id) == str(teacher_id):
+                all_ids.add(syntax_class_id)
+            if str(extra_teacher_id) == str(teacher_id) and extra_type == 'SYNTAX':
+                all_ids.add(extra_class_id)
+        all_ids.discard(None)
 
         # 리스트로 변환하여 반환
         return JsonResponse({'occupied_ids': list(all_ids)})
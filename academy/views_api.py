@@ -2,12 +2,25 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import AssignmentTask, AssignmentSubmission, AssignmentSubmissionImage, Attendance, ClassLog, TemporarySchedule, Textbook
-from .serializers import AssignmentTaskSerializer, AssignmentSubmissionSerializer, AttendanceSerializer, TextbookSerializer
+from . import activity, checkin, progress
+from .models import AssignmentTask, AssignmentSubmission, AssignmentSubmissionImage, Attendance, ClassLog, ClassLogEntry, TemporarySchedule, Textbook
+from .serializers import AssignmentTaskSerializer, AssignmentSubmissionSerializer, AttendanceSerializer, TextbookSerializer, lecture_units_for
 from core.models import StudentProfile # [NEW]
+from utils import cursor as keyset
+from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from datetime import date, datetime, time as dt_time
 
+def _db_datetime(value):
+    """[NEW] 클라이언트가 보낸 시각을 DB 비교용으로 맞춤 (USE_TZ=False 면 현지 naive, True 면 aware)"""
+    if settings.USE_TZ and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    if not settings.USE_TZ and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
 class AssignmentViewSet(viewsets.ModelViewSet):
     """
     과제 관리 API
@@ -20,7 +33,7 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         user = self.request.user
         # 학생이면 본인 과제만
         if hasattr(user, 'profile'):
-            return AssignmentTask.objects.filter(student=user.profile)
+            return self._with_related(AssignmentTask.objects.filter(student=user.profile))
         
         # Teacher: Allow filtering by student_id
         queryset = AssignmentTask.objects.filter(student__user__is_active=True)
@@ -31,7 +44,53 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         student_id = self.request.query_params.get('student_id')
         if student_id:
             queryset = queryset.filter(student_id=student_id)
-        return queryset
+        return self._with_related(queryset)
+
+    @staticmethod
+    def _with_related(queryset):
+        # [FIX] 직렬화에 쓰이는 학생/출처 일지/제출(+학생, 이미지)을 행마다 조회하지 않도록 한 번에 로드
+        return queryset.select_related(
+            'student', 'origin_log', 'submission__student'
+        ).prefetch_related('submission__images')
+
+    def list(self, request, *args, **kwargs):
+        """
+        과제 목록 (파라미터가 없으면 기존처럼 마감일순 전체)
+        [NEW] 선택 파라미터
+          - since: ISO 시각 ('Z', '+09:00' 등 오프셋이 있으면 현지 시각으로 바꿔 비교).
+                   이후 생성/변경된 과제만 변경 시각(updated_at)순으로 반환
+                   (다음 since 는 받은 항목의 최대 updated_at, 삭제된 과제는 포함되지 않음)
+          - limit / cursor: keyset 페이지 (다음 페이지가 있으면 X-Has-More: 1, X-Next-Cursor 헤더)
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        params = request.query_params
+        order_field = 'due_date'
+        try:
+            if params.get('since'):
+                queryset = queryset.filter(updated_at__gt=_db_datetime(datetime.fromisoformat(params['since'])))
+                order_field = 'updated_at'
+            paged = bool(params.get('limit') or params.get('cursor'))
+            limit = keyset.clamp_limit(params.get('limit'))
+        except ValueError:
+            return Response({'error': 'invalid parameter format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_cursor = None
+        if paged:
+            try:
+                tasks, next_cursor = keyset.paginate(queryset, order_field, params.get('cursor'), limit)
+            except ValueError:
+                return Response({'error': 'invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            tasks = list(queryset.order_by(order_field, 'id'))
+
+        context = self.get_serializer_context()
+        context['lecture_units'] = lecture_units_for(tasks)
+        response = Response(self.get_serializer(tasks, many=True, context=context).data)
+        if paged:
+            response['X-Has-More'] = '1' if next_cursor else '0'
+            if next_cursor:
+                response['X-Next-Cursor'] = next_cursor
+        return response
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -214,6 +273,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     """
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    MAX_CHECK_BATCH = 500  # [NEW] 오프라인 큐 일괄 반영 1회 최대 건수
 
     def get_queryset(self):
         user = self.request.user
@@ -269,110 +329,95 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     def check(self, request):
         """
         Smart Kiosk Check-in/out
-        - Input: phone_number (11 digits)
-        - Logic:
-          1. Find student
-          2. Check for today's class schedule
-          3. Determine Status:
-             - Early/On-time: PRESENT
-             - Late (~40min): LATE
-             - Very Late (40min+): ABSENT
-          4. Create or Update Attendance
+        - Input: phone_number (digits, dashes allowed)
+        - [FIX] phone_digits 유일 인덱스로 1회 조회 + 시간표 select_related (academy.checkin)
+        - Status: before first class PRESENT / ~40min LATE / 40min+ ABSENT
+        - 이미 오늘 기록이 있으면 하원 처리
         """
-        phone = request.data.get('phone_number', '').strip().replace('-', '')
+        phone = request.data.get('phone_number', '').strip()
         if not phone:
              return Response({'error': 'Please provide phone_number.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 1. Find Student
-        student = StudentProfile.objects.filter(phone_number=phone).first()
-        if not student:
-            if len(phone) == 11:
-                formatted = f"{phone[:3]}-{phone[3:7]}-{phone[7:]}"
-                student = StudentProfile.objects.filter(phone_number=formatted).first()
-        
+        student = checkin.find_by_phone(phone)
         if not student:
             return Response({'error': '학생을 찾을 수 없습니다. (핸드폰 번호 확인)'}, status=status.HTTP_404_NOT_FOUND)
 
-        today_date = timezone.now().date()
-        now = timezone.now()
-        
-        # 2. Check Record
-        attendance = Attendance.objects.filter(student=student, date=today_date).first()
-        
-        msg = ""
-        mode = ""
+        result = checkin.check(student)
+        return Response({
+            'message': self._check_message(result), 'mode': result.mode, 'student_name': student.name,
+        }, status=status.HTTP_200_OK)
 
-        if not attendance:
-            # Check-in Logic
-            status_val = 'PRESENT' # Default
-            
-            # Find Today's Schedule
-            # Weekday: 0=Mon, 1=Tue, ...
-            # ClassTime DayChoices: 'Mon', 'Tue'...
-            weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            today_day_str = weekdays[today_date.weekday()]
-            
-            # Collect student's classes for today
-            today_classes = []
-            if student.syntax_class and student.syntax_class.day == today_day_str:
-                today_classes.append(student.syntax_class)
-            if student.reading_class and student.reading_class.day == today_day_str:
-                today_classes.append(student.reading_class)
-            if student.extra_class and student.extra_class.day == today_day_str:
-                today_classes.append(student.extra_class)
-            
-            # Sort by start time
-            today_classes.sort(key=lambda c: c.start_time)
-
-
-            if today_classes:
-                target_class = today_classes[0]
-                # Combine today_date + start_time to make timezone-aware datetime
-                # Assuming class time is in local/server time (Seoul).
-                # timezone.now() is usually UTC if USE_TZ=True.
-                # We need to construct class_start_dt carefully.
-                # For safety in limited context, let's use check_in_time's date/tz combined with class time.
-                
-                # Naive combination first
-                class_start_naive = datetime.combine(today_date, target_class.start_time)
-                # Make it aware using 'now's timezone
-                class_start_dt = class_start_naive.replace(tzinfo=now.tzinfo) 
-                
-                # Diff
-                diff = now - class_start_dt
-                diff_minutes = diff.total_seconds() / 60
-                
-                if diff_minutes <= 0:
-                    status_val = 'PRESENT'
-                    msg = f"{student.name} 학생 등원했습니다."
-                elif diff_minutes <= 40:
-                    # Late but within 40 mins
-                    status_val = 'LATE'
-                    msg = f"{student.name} 학생 지각입니다. ({int(diff_minutes)}분 지각)"
-                else:
-                    # Over 40 mins -> ABSENT
-                    status_val = 'ABSENT'
-                    msg = f"{student.name} 학생 결석 처리되었습니다. (40분 초과)"
-            else:
-                # No class today -> Just Present (Extra study)
-                status_val = 'PRESENT'
-                msg = f"{student.name} 학생 등원했습니다. (수업 없음)"
-
-            Attendance.objects.create(
-                student=student,
-                date=today_date,
-                status=status_val,
-                check_in_time=now
+    @action(detail=False, methods=['post'], url_path='check-batch')
+    def check_batch(self, request):
+        """
+        [NEW] 오프라인 동안 쌓인 키오스크 체크 일괄 반영
+        - Input: {"items": [{"phone_number" | "attendance_code", "checked_at": ISO8601, "client_id"}],
+                  "checkout": true}  (checkout=false 면 이미 등원한 학생은 그대로 둠)
+        - Output: {"results": [{"client_id", "mode", "status", "student_name", "message"}]}
+        """
+        if not request.user.is_staff:
+            raise PermissionDenied('출석 일괄 반영은 선생님 계정만 가능합니다.')
+        raw_items = request.data.get('items')
+        if not isinstance(raw_items, list) or len(raw_items) > self.MAX_CHECK_BATCH:
+            return Response(
+                {'error': f'items must be a list of at most {self.MAX_CHECK_BATCH} check-ins.'},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            mode = "IN"
-        else:
-            # Check-out (or Update)
-            attendance.left_at = now
-            attendance.save(update_fields=['left_at'])
-            msg = f"{student.name} 학생 하원했습니다."
-            mode = "OUT"
 
-        return Response({'message': msg, 'mode': mode, 'student_name': student.name}, status=status.HTTP_200_OK)
+        now = timezone.now()
+        items = []
+        for raw in raw_items:
+            raw = raw if isinstance(raw, dict) else {}
+            items.append({
+                'phone_number': str(raw.get('phone_number') or '').strip(),
+                'attendance_code': str(raw.get('attendance_code') or '').strip(),
+                'checked_at': self._checked_at(raw.get('checked_at'), now),
+            })
+        checkout = str(request.data.get('checkout', True)).lower() not in ('false', '0', 'no')
+        results = checkin.check_batch(items, checkout=checkout)
+
+        return Response({'results': [
+            {
+                'client_id': raw.get('client_id') if isinstance(raw, dict) else None,
+                'mode': result.mode,
+                'status': result.attendance.status if result.attendance else None,
+                'student_name': result.student.name if result.student else None,
+                'message': self._check_message(result),
+            }
+            for raw, result in zip(raw_items, results)
+        ]}, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _checked_at(value, now):
+        """클라이언트가 찍은 시각 (없거나 잘못되면 None, 미래 시각은 지금으로)"""
+        try:
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            return None
+        return min(_db_datetime(parsed), now)
+
+    @staticmethod
+    def _check_message(result):
+        if result.mode == checkin.MODE_NOT_FOUND:
+            return '학생을 찾을 수 없습니다. (핸드폰 번호 확인)'
+        if result.mode == checkin.MODE_AMBIGUOUS:
+            return '같은 출석 코드를 쓰는 학생이 여러 명입니다.'
+        if result.mode == checkin.MODE_INVALID:
+            return '체크 시각이 올바르지 않습니다.'
+        name = result.student.name
+        if result.mode == checkin.MODE_OUT:
+            return f"{name} 학생 하원했습니다."
+        if result.mode == checkin.MODE_ALREADY:
+            return f"{name} 학생, 이미 등원 처리되어 있습니다. ({result.attendance.get_status_display()})"
+        if result.start_time is None:
+            return f"{name} 학생 등원했습니다. (수업 없음)"
+        if result.attendance.status == 'LATE':
+            return f"{name} 학생 지각입니다. ({result.late_minutes}분 지각)"
+        if result.attendance.status == 'ABSENT':
+            return f"{name} 학생 결석 처리되었습니다. (40분 초과)"
+        return f"{name} 학생 등원했습니다."
 
 class ClassLogViewSet(viewsets.ModelViewSet):
     """
@@ -443,6 +488,99 @@ class ClassLogViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(teacher=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        [NEW] 수업 블록 일지 일괄 작성 (POST /class-logs/bulk/)
+        - 공통 과제 + 학생별 코멘트/진도를 받아 일지/진도/과제를 한 트랜잭션에서 bulk 로 저장
+        - 권한/결석 확인은 학생 전체를 한 번에 조회
+        """
+        from django.db import transaction
+        from .serializers import (
+            ClassLogBulkSerializer, build_assignment_from_spec, build_log_entries, save_assignments,
+        )
+        from .signals import build_initial_tasks
+
+        user = request.user
+        if not user.is_staff:
+            raise PermissionDenied('수업일지는 선생님만 작성할 수 있습니다.')
+
+        serializer = ClassLogBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        items = data['items']
+        subject = data['subject']
+        target_date = data['date']
+
+        student_ids = [item['student'] for item in items]
+        students = StudentProfile.objects.only(
+            'id', 'name', 'syntax_teacher_id', 'reading_teacher_id', 'extra_class_teacher_id'
+        ).in_bulk(student_ids)
+
+        missing = [sid for sid in student_ids if sid not in students]
+        if missing:
+            return Response({'error': 'Student not found.', 'students': missing}, status=status.HTTP_404_NOT_FOUND)
+
+        denied = [sid for sid in student_ids if not self._is_subject_teacher(user, students[sid], subject)]
+        if denied:
+            return Response({
+                'error': '해당 과목 담당 선생님만 일지를 작성할 수 있습니다.',
+                'students': denied,
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        # [Business Rule] 결석(ABSENT) 상태인 경우 일지 작성 불가
+        absent = list(Attendance.objects.filter(
+            student_id__in=student_ids, date=target_date, status='ABSENT'
+        ).values_list('student_id', flat=True))
+        if absent:
+            return Response({
+                'error': '결석(ABSENT) 처리된 학생은 일지를 작성할 수 없습니다.',
+                'students': absent,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            logs = [
+                ClassLog(
+                    student=students[item['student']],
+                    teacher=user,
+                    date=target_date,
+                    subject=subject,
+                    comment=item['comment'],
+                    reading_test_type=item['reading_test_type'],
+                    reading_test_score=item['reading_test_score'],
+                    hw_main_book=data.get('hw_main_book'),
+                    hw_main_range=data['hw_main_range'],
+                    hw_due_date=data.get('hw_due_date'),
+                )
+                for item in items
+            ]
+            ClassLog.objects.bulk_create(logs)
+            activity.record_logs(logs)
+
+            entries = []
+            tasks = []
+            for log, item in zip(logs, items):
+                entries.extend(build_log_entries(log, item['entries_input']))
+                # bulk_create 는 post_save 를 보내지 않으므로 시그널과 같은 규칙으로 직접 생성
+                tasks.extend(build_initial_tasks(log))
+                tasks.extend(build_assignment_from_spec(log, spec) for spec in data['assignments'])
+
+            ClassLogEntry.objects.bulk_create(entries)
+            progress.refresh_entries(entries)
+            tasks = save_assignments(tasks)
+
+        # bulk_create 는 시그널이 없으므로 해당 월 성적표 HTML 산출물을 직접 무효화
+        from reports.services import invalidate_report_artifacts
+        for student_id in {log.student_id for log in logs}:
+            invalidate_report_artifacts(student_id, target_date.year, target_date.month)
+
+        return Response({
+            'count': len(logs),
+            'logs': [{'id': log.id, 'student': log.student_id, 'student_name': log.student.name} for log in logs],
+            'entries_created': len(entries),
+            'assignments_created': len(tasks),
+        }, status=status.HTTP_201_CREATED)
+
     def update(self, request, *args, **kwargs):
         log = self.get_object()
         self._ensure_write_permission(request.user, log.student, log.subject, log=log)
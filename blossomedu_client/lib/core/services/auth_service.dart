@@ -68,6 +68,12 @@ class AuthService {
   }
 
   Future<void> logout() async {
+    try {
+      // 서버 토큰 삭제 (인증 캐시도 함께 삭제됨)
+      await _api.client.post('/auth/logout/');
+    } catch (e) {
+      print('Logout request failed: $e');
+    }
     await _api.clearToken();
   }
 }
@@ -103,14 +103,14 @@ class _AssignmentDetailScreenState extends State<AssignmentDetailScreen> {
     if (images is List) {
       for (final item in images) {
         if (item is Map) {
-          final raw = item['image_url'] ?? item['image'];
+          final raw = item['preview_url'] ?? item['image_url'] ?? item['image'];
           final resolved = _resolveImageUrl(raw?.toString());
           if (resolved.isNotEmpty) urls.add(resolved);
         }
       }
     }
     if (urls.isEmpty) {
-      final raw = submission?['image_url'] ?? submission?['image'];
+      final raw = submission?['preview_url'] ?? submission?['image_url'] ?? submission?['image'];
       final resolved = _resolveImageUrl(raw?.toString());
       if (resolved.isNotEmpty) urls.add(resolved);
     }
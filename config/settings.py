@@ -58,11 +58,13 @@ ROOT_URLCONF = 'config.urls'
 # [REST Framework]
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # [FIX] 토큰/유저/프로필/지점을 쿼리 1회로 읽고 잠시 캐시 (core.authentication)
+        'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
 }
+AUTH_CACHE_TIMEOUT = 60  # [NEW] 인증 정보 캐시 시간 (초)
 
 TEMPLATES = [
     {
@@ -92,6 +94,19 @@ DATABASES = {
 }
 
 
+# [NEW] 캐시 (gunicorn 워커들과 크론 커맨드가 같이 보는 공유 캐시)
+# 인증 정보 / 폼 메타데이터 / 보강 점유 인덱스 / 단어장 가시성 / 백그라운드 작업 상태가 여기에 있어
+# 프로세스별 LocMemCache 를 쓰면 다른 워커의 무효화(세대 키)나 작업 상태를 보지 못합니다.
+# 테이블은 core 마이그레이션(0018_cache_table)이 만듭니다. (manage.py createcachetable 과 같음)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+}
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -150,4 +165,6 @@ CSRF_TRUSTED_ORIGINS = [
 
 # [NEW] CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
-CORS_ALLOW_CREDENTIALS = True
\ No newline at end of file
+CORS_ALLOW_CREDENTIALS = True
+# [NEW] 웹 빌드(브라우저)에서 읽어야 하는 응답 헤더 (페이지 상태, 캐시 검증)
+CORS_EXPOSE_HEADERS = ['X-Has-More', 'X-Next-Cursor', 'X-Next-Page', 'ETag', 'X-Pack-Version']
\ No newline at end of file
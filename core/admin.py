@@ -7,6 +7,8 @@ from django.http import HttpResponse
 from django.db.models import Case, When, IntegerField
 from .models import School, StudentProfile, ClassTime, Branch, StaffUser, StudentUser, StaffProfile
 from .models.popup import Popup
+from .models.notification import NotificationOutbox
+from . import notifications
 from .models.users import StaffUser, StudentUser, StudentProfile
 
 # ==========================================
@@ -231,4 +233,23 @@ admin.site.unregister(Group)
 class PopupAdmin(admin.ModelAdmin):
     list_display = ('title', 'branch', 'start_date', 'end_date', 'is_active')
     list_filter = ('branch', 'is_active')
-    search_fields = ('title', 'content')
\ No newline at end of file
+    search_fields = ('title', 'content')
+
+
+# [NEW] 알림톡 발송 대기열 (상태 확인 / 실패 건 다시 보내기)
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('template_code', 'recipient', 'ref', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'template_code')
+    search_fields = ('recipient', 'ref')
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_now']
+
+    @admin.action(description="선택한 알림 다시 보내기 (대기 상태로)")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=NotificationOutbox.Status.SENT).update(
+            status=NotificationOutbox.Status.PENDING, attempts=0, next_attempt_at=None, claim_token='',
+        )
+        if updated:
+            notifications.kick()
+        self.message_user(request, f"{updated}건을 발송 대기열에 다시 넣었습니다.")
@@ -1,6 +1,6 @@
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -26,8 +26,7 @@ def _build_user_data(user):
             profile = getattr(user, 'staff_profile', None)
             if profile:
                 position = profile.position
-                if profile.branch:
-                    branch_id = profile.branch.id
+                branch_id = profile.branch_id
         except Exception as e:
             print(f"Profile Fetch Error: {e}")
     else:
@@ -78,7 +77,7 @@ class CustomAuthToken(ObtainAuthToken):
 
 
 class CheckAuthView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -88,3 +87,16 @@ class CheckAuthView(APIView):
             'token': token.key if token else None,
             'user': user_data,
         })
+
+
+class LogoutView(APIView):
+    """
+    [NEW] 로그아웃: 토큰 삭제 (유저당 토큰 1개이므로 모든 기기에서 로그아웃)
+    토큰 삭제 시그널이 인증 캐시도 지웁니다. (core.signals)
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=204)
@@ -0,0 +1,76 @@
+# core/authentication.py
+"""
+토큰 인증 + 인증 정보 캐시 (REST_FRAMEWORK 기본 인증 클래스)
+
+CachedTokenAuthentication
+    토큰 -> 유저 -> 학생/선생님 프로필 -> 지점을 select_related 쿼리 1회로 읽고,
+    결과(Token 객체, 관계 포함)를 AUTH_CACHE_TIMEOUT(기본 60초) 동안 캐시에 둡니다.
+    이후 요청의 request.user.profile / staff_profile / staff_profile.branch 는 추가 쿼리가 없습니다.
+
+무효화 (core.signals)
+    - 유저 저장(비밀번호 변경, 비활성화 포함), 학생/선생님 프로필 저장, 토큰 삭제(로그아웃) 시 invalidate_user()
+    - bulk_update/update() 는 시그널이 없으므로 호출한 쪽이 invalidate_users() 를 부르지 않으면 TTL 이 지나야 반영됩니다.
+      (학생 일괄 등록 core.student_import 는 커밋 후 호출)
+    - 캐시는 settings.CACHES(DatabaseCache)라서 모든 워커 프로세스가 같은 항목을 보고 함께 무효화됩니다.
+
+저장 주의
+    request.user / profile / staff_profile 은 최대 TTL 만큼 오래된 값일 수 있습니다. (위 bulk_update 등)
+    이 객체를 저장할 때는 save(update_fields=[...]) 로 바꾼 필드만 쓰거나 다시 읽은 뒤 저장합니다.
+    (전체 save() 는 그 사이 다른 곳에서 바꾼 시간표/전화번호/search_key 를 예전 값으로 덮어씀)
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+DEFAULT_TIMEOUT = 60  # 초
+
+RELATED = (
+    'user',
+    'user__profile', 'user__profile__branch',
+    'user__staff_profile', 'user__staff_profile__branch',
+)
+
+
+def _token_key(key):
+    return f'core:auth:token:{key}'
+
+
+def _user_key(user_id):
+    return f'core:auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    """유저의 캐시된 인증 정보 삭제 (DB 조회 없음)"""
+    key = cache.get(_user_key(user_id))
+    if key:
+        cache.delete_many([_token_key(key), _user_key(user_id)])
+
+
+def invalidate_users(user_ids):
+    """[NEW] 여러 유저를 한 번에 invalidate_user (bulk_update 등 시그널 없는 일괄 변경 후 호출)"""
+    user_keys = [_user_key(user_id) for user_id in set(user_ids)]
+    if not user_keys:
+        return
+    tokens = cache.get_many(user_keys)
+    if tokens:
+        cache.delete_many([_token_key(key) for key in tokens.values()] + list(tokens))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        token = cache.get(_token_key(key))
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related(*RELATED).get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            timeout = getattr(settings, 'AUTH_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+            cache.set_many({_token_key(key): token, _user_key(token.user_id): key}, timeout)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core import student_index
+from core.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = "Recompute StudentProfile lookup columns (phone_digits, search_key) for rows changed without save()."
+
+    def handle(self, *args, **options):
+        # 원천(phone_number)에서 다시 계산해 바뀐 행만 쓰므로 여러 번 실행해도 안전
+        counts = student_index.fill_phone_digits(StudentProfile)
+        search_keys = student_index.fill_search_keys(StudentProfile)
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled student index: phone_digits updated={counts['updated']}, "
+            f"search_key updated={search_keys}, "
+            f"shared numbers left unindexed={counts['conflicts']}"
+        ))
+        if counts['conflicts']:
+            self.stdout.write(self.style.WARNING(
+                "Students sharing a phone number can still check in with their attendance code."
+            ))
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import notifications
+
+
+class Command(BaseCommand):
+    help = "Send queued Alimtalk notifications (NotificationOutbox) with a bounded thread pool, rate limit and retry backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=f"Concurrent senders (default: NOTIFICATION_DISPATCH_WORKERS or {notifications.DEFAULT_WORKERS}).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=None,
+            help=f"Max sends per second across all workers, 0 = unlimited "
+                 f"(default: NOTIFICATION_RATE_PER_SECOND or {notifications.DEFAULT_RATE}).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Send at most this many notifications per pass.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=None,
+            help=f"Give up after this many attempts (default: {notifications.DEFAULT_MAX_ATTEMPTS}).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the outbox every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10,
+            help="Polling interval in seconds for --loop (default: 10).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            counts = notifications.dispatch(
+                limit=options["limit"],
+                workers=options["workers"],
+                rate=options["rate"],
+                max_attempts=options["max_attempts"],
+            )
+            if any(counts.values()) or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Dispatched notifications: sent={counts['sent']}, "
+                    f"retry={counts['retry']}, failed={counts['failed']}"
+                ))
+            if not options["loop"]:
+                break
+            # 오래 도는 프로세스이므로 끊긴 DB 연결 정리
+            close_old_connections()
+            time.sleep(options["interval"])
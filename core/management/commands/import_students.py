@@ -10,7 +10,8 @@
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from core.models import StudentProfile, StaffProfile, Branch, School, ClassTime
+from core import student_import
+from core.models import StaffProfile, Branch
 import openpyxl
 import re
 import datetime
@@ -24,6 +25,8 @@ class Command(BaseCommand):
         parser.add_argument('branch', type=str, help='분원 이름 (예: 동탄)')
         parser.add_argument('file', type=str, help='엑셀 파일 경로')
         parser.add_argument('--dry-run', action='store_true', help='실제 저장 없이 미리보기')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes used to hash new passwords (default: CPU count)')
 
     def handle(self, *args, **options):
         branch_name = options['branch']
@@ -63,35 +66,45 @@ class Command(BaseCommand):
 
         self.stdout.write(f'📊 총 {len(rows)}개 행 발견')
 
-        created_count = 0
-        updated_count = 0
+        # [FIX] 행마다 저장하던 방식 -> 시트 전체를 StudentRow 로 읽은 뒤 core.student_import 로 일괄 저장
+        self._teachers = {}
+        student_rows = []
         skipped_count = 0
-
         for row_idx, row in enumerate(rows, start=2):
             try:
-                result = self.process_row(row, branch, dry_run, row_idx)
-                if result == 'created':
-                    created_count += 1
-                elif result == 'updated':
-                    updated_count += 1
-                else:
+                student_row = self.parse_row(row, branch, dry_run, row_idx)
+                if student_row is None:
                     skipped_count += 1
+                else:
+                    student_rows.append(student_row)
             except Exception as e:
                 self.stdout.write(self.style.WARNING(f'⚠️ 행 {row_idx} 오류: {e}'))
                 skipped_count += 1
 
+        report = student_import.import_students(
+            student_rows, branch=branch, create_classes=True, dry_run=dry_run, workers=options['workers'],
+        )
+        prefix = '[DRY] ' if dry_run else ''
+        for entry in report.created:
+            self.stdout.write(self.style.SUCCESS(f"  {prefix}✅ 생성: {entry['name']} ({entry['username']})"))
+        for entry in report.updated:
+            changes = ', '.join(f'{k}: {old} → {new}' for k, (old, new) in entry['changes'].items())
+            self.stdout.write(f"  {prefix}🔄 업데이트: {entry['name']} ({changes})")
+        for entry in report.skipped:
+            self.stdout.write(self.style.WARNING(f"  ⏭️ 행 {entry['row']} 스킵: {entry['reason']}"))
+
         # 4. 결과 출력
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS(f'=== 완료 ==='))
-        self.stdout.write(f'  ✅ 생성: {created_count}명')
-        self.stdout.write(f'  🔄 업데이트: {updated_count}명')
-        self.stdout.write(f'  ⏭️ 스킵: {skipped_count}개')
+        self.stdout.write(f'  ✅ 생성: {len(report.created)}명')
+        self.stdout.write(f'  🔄 업데이트: {len(report.updated)}명 (변경 없음 {len(report.unchanged)}명)')
+        self.stdout.write(f'  ⏭️ 스킵: {skipped_count + len(report.skipped)}개')
         
         if dry_run:
             self.stdout.write(self.style.WARNING('⚡ DRY-RUN 모드: 실제 저장되지 않았습니다.'))
 
-    def process_row(self, row, branch, dry_run, row_idx):
-        """한 행 처리"""
+    def parse_row(self, row, branch, dry_run, row_idx):
+        """한 행 -> StudentRow (이름/전화번호가 없으면 None)"""
         # 컬럼 매핑 (0-indexed) based on actual headers:
         # 0:담당선생님, 1:수업요일, 2:수업시간, 3:독해선생님, 4:독해수업요일, 5:독해수업시간
         # 6:입/퇴원, 7:학생이름, 8:학교, 9:학년, 10:수업시작일, 11:학생 H.P, 
@@ -117,7 +130,7 @@ class Command(BaseCommand):
         mom_phone = self.clean_phone(row[15])
 
         if not name:
-            return 'skipped'
+            return None
 
         # 전화번호가 없으면 가짜 번호 생성 (필수 필드)
         if not student_phone:
@@ -125,7 +138,7 @@ class Command(BaseCommand):
             # 일단 경고하고 스킵
             if dry_run:
                 print(f"  ⚠️ [SKIP] {name}: 전화번호 없음")
-            return 'skipped'
+            return None
 
         # 시작일 처리
         start_date = None
@@ -139,83 +152,45 @@ class Command(BaseCommand):
         # 활성 상태
         is_active = (status == '입학')
 
-        # 학년 파싱
-        grade = self.parse_grade(grade_str)
-
-        # School 조회/생성
-        school = None
-        if school_name:
-            # grade_type, branch 필드 없음
-            school, created = School.objects.get_or_create(name=school_name)
-            if created:
-                # branches M2M 필드에 분원 추가
-                school.branches.add(branch)
-            elif not school.branches.filter(id=branch.id).exists():
-                school.branches.add(branch)
-
-        # 선생님 조회/생성
-        syntax_teacher = self.get_or_create_teacher(syntax_teacher_name, branch, is_syntax=True) if syntax_teacher_name else None
-        reading_teacher = self.get_or_create_teacher(reading_teacher_name, branch, is_reading=True) if reading_teacher_name else None
-
-        # 시간표 조회/생성
-        syntax_class = self.get_or_create_class_time(syntax_day, syntax_time, branch, '구문') if syntax_day and syntax_time else None
-        reading_class = self.get_or_create_class_time(reading_day, reading_time, branch, '독해') if reading_day and reading_time else None
-
-        if dry_run:
-            self.stdout.write(f'  [DRY] {name} ({student_phone}) - {school_name} {grade_str}')
-            return 'created'
-
-        # 유저 조회/생성 (전화번호 전체 = 아이디)
-        # [FIX] 전화번호 전체(숫자만)를 아이디로 사용
-        username = student_phone  
-        user, user_created = User.objects.get_or_create(
-            username=username,
-            defaults={'is_active': is_active}
-        )
-        if not user_created:
-            user.is_active = is_active
-            user.save(update_fields=['is_active'])
-
-        # 학생 프로필 조회/생성
-        profile, profile_created = StudentProfile.objects.get_or_create(
-            user=user,
-            defaults={
-                'name': name,
-                'branch': branch,
-                'school': school,
-                'base_grade': grade,
-                'phone_number': student_phone,
-                'parent_phone_mom': mom_phone,
-                'parent_phone_dad': dad_phone,
-                'syntax_teacher': syntax_teacher,
-                'reading_teacher': reading_teacher,
-                'syntax_class': syntax_class,
-                'reading_class': reading_class,
-                'start_date': start_date or datetime.date.today(), # [NEW]
-            }
+        # 선생님 조회/생성 (같은 이름은 한 번만)
+        syntax_teacher = self.cached_teacher(syntax_teacher_name, branch, is_syntax=True) if syntax_teacher_name else None
+        reading_teacher = self.cached_teacher(reading_teacher_name, branch, is_reading=True) if reading_teacher_name else None
+
+        fields = {
+            'name': name,
+            'branch': branch,
+            'school': None,  # 학교명이 있으면 import_students 가 채움
+            'base_grade': self.parse_grade(grade_str),
+            'phone_number': student_phone,
+            'parent_phone_mom': mom_phone,
+            'parent_phone_dad': dad_phone,
+            'syntax_teacher': syntax_teacher,
+            'reading_teacher': reading_teacher,
+            'syntax_class': None,
+            'reading_class': None,
+        }
+        if start_date: # [NEW] 엑셀에 날짜 있으면 업데이트 (새 학생은 없으면 오늘)
+            fields['start_date'] = start_date
+
+        # 시간표는 키만 모아 두고 import_students 가 한 번에 조회 (없으면 생성)
+        classes = {}
+        if syntax_day and syntax_time:
+            classes['syntax_class'] = self.class_time_key(syntax_day, syntax_time, 'SYNTAX')
+        if reading_day and reading_time:
+            classes['reading_class'] = self.class_time_key(reading_day, reading_time, 'READING')
+
+        # 유저 아이디 = 전화번호 전체(숫자만), 새 계정 초기 비밀번호 = 뒤 4자리 (엑셀 업로드 API 와 같음)
+        return student_import.StudentRow(
+            row=row_idx, username=student_phone, is_active=is_active, fields=fields,
+            school_name=school_name, classes=classes,
+            password=student_phone[-4:] if len(student_phone) >= 4 else '1234',
         )
 
-        if not profile_created:
-            # 업데이트
-            profile.name = name
-            profile.branch = branch
-            profile.school = school
-            profile.base_grade = grade
-            profile.phone_number = student_phone
-            profile.parent_phone_mom = mom_phone
-            profile.parent_phone_dad = dad_phone
-            profile.syntax_teacher = syntax_teacher
-            profile.reading_teacher = reading_teacher
-            profile.syntax_class = syntax_class
-            profile.reading_class = reading_class
-            if start_date: # [NEW] 엑셀에 날짜 있으면 업데이트
-                profile.start_date = start_date
-            profile.save()
-            self.stdout.write(f'  🔄 업데이트: {name}')
-            return 'updated'
-        else:
-            self.stdout.write(self.style.SUCCESS(f'  ✅ 생성: {name} ({username})'))
-            return 'created'
+    def cached_teacher(self, teacher_name, branch, **flags):
+        key = (teacher_name, tuple(sorted(flags)))
+        if key not in self._teachers:
+            self._teachers[key] = self.get_or_create_teacher(teacher_name, branch, **flags)
+        return self._teachers[key]
 
     def clean_str(self, value):
         """빈 문자열 처리"""
@@ -285,8 +260,8 @@ class Command(BaseCommand):
         self.stdout.write(f'  👨‍🏫 선생님 생성: {clean_name}')
         return user
 
-    def get_or_create_class_time(self, day_str, time_str, branch, class_type_prefix):
-        """시간표 조회/생성"""
+    def class_time_key(self, day_str, time_str, class_type):
+        """시간표 키 (요일, 수업 유형, 시작 시간)"""
         # 요일 매핑
         day_map = {
             '월요일': 'Mon', '화요일': 'Tue', '수요일': 'Wed', 
@@ -308,26 +283,5 @@ class Command(BaseCommand):
         except:
             start_time = time(18, 0)  # 기본값
 
-        # 종료 시간 (2시간 후)
-        end_hour = (start_time.hour + 2) % 24
-        end_time = time(end_hour, start_time.minute)
-
-        # ClassTime 조회/생성 (분원별로 이름이 같아도 따로 관리됨)
-        name = f'{class_type_prefix} {day_code} {start_time.strftime("%H:%M")}'
-        
-        # day_of_week -> day 필드명 수정
-        # end_time 필드 추가
-        # [FIX] branch를 defaults가 아닌 lookup 조건에 포함
-        class_time, created = ClassTime.objects.get_or_create(
-            name=name,
-            branch=branch,
-            defaults={
-                'day': day_code,       # day_of_week -> day
-                'start_time': start_time,
-                'end_time': end_time,  # Added end_time
-                'class_type': 'SYNTAX' if class_type_prefix == '구문' else 'READING',
-            }
-        )
-        if created:
-            self.stdout.write(f'  🕐 시간표 생성: {name}')
-        return class_time
+        # 없으면 import_students 가 '구문 Mon 17:30' 이름, 2시간 수업으로 이 분원에 생성
+        return (day_code, class_type, start_time)
@@ -0,0 +1,169 @@
+# core/metadata.py
+"""
+등록/수정 폼 메타데이터 캐시
+(StudentRegistrationViewSet.metadata, StaffRegistrationViewSet.metadata, SchoolViewSet.list, MetadataViewSet)
+
+지점/학교/시간표/선생님 목록은 관리자가 바꿀 때만 달라지므로 세대(generation) 키로 캐시합니다.
+    - 무효화: core.signals 가 Branch / School / ClassTime / StaffProfile / 선생님 계정 저장·삭제,
+      학생의 학교·지점 변경 시 invalidate() (bulk 경로는 호출부에서 직접 호출)
+    - 캐시 값: (데이터, ETag). ETag 는 본문 해시라 워커 프로세스가 달라도 내용이 같으면 같음
+    - 세대 키는 공유 캐시(settings.CACHES)에 있으므로 무효화는 모든 워커 프로세스에 바로 반영
+1:1 수업 잠금용 booked_syntax_slots 는 학생 배정마다 바뀌므로 캐시하지 않고 매번 읽습니다. (쿼리 1회)
+"""
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+
+from utils import cache_gen
+from utils.http_cache import content_etag, etag_matches
+from .models import Branch, ClassTime, School, StaffProfile, StudentProfile
+
+_GEN_KEY = 'core:metadata:gen'
+DEFAULT_TIMEOUT = 300  # 초
+
+
+# ------------------------------------------------------------------
+# 캐시 세대
+# ------------------------------------------------------------------
+def invalidate():
+    """지점/학교/시간표/선생님 변경 시 호출 -> 모든 메타데이터 캐시 무효화"""
+    cache_gen.bump(_GEN_KEY)
+
+
+def _cached(name, scope, build):
+    """-> (데이터, ETag)"""
+    key = f'core:metadata:{cache_gen.generation(_GEN_KEY)}:{name}:{scope}'
+    hit = cache.get(key)
+    if hit is None:
+        data = build()
+        hit = (data, content_etag(_dumps(data)))
+        cache.set(key, hit, getattr(settings, 'METADATA_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+    return hit
+
+
+def _dumps(data):
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def respond(request, data, etag):
+    """If-None-Match 가 일치하면 304, 아니면 데이터 + ETag"""
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# ------------------------------------------------------------------
+# 메타데이터
+# ------------------------------------------------------------------
+def user_branch(user):
+    staff_profile = getattr(user, 'staff_profile', None)
+    return staff_profile.branch if staff_profile else None
+
+
+def _build_registration(branch):
+    # 1. Schools
+    schools = School.objects.prefetch_related('branches')
+    if branch:
+        schools = schools.filter(branches=branch)
+
+    # 2. Teachers (Syntax, Reading, Extra)
+    teachers = User.objects.filter(is_active=True, staff_profile__isnull=False).select_related('staff_profile')
+    if branch:
+        teachers = teachers.filter(staff_profile__branch=branch)
+
+    # 3. ClassTimes
+    classes = ClassTime.objects.all().order_by('day', 'start_time')
+    if branch:
+        classes = classes.filter(Q(branch=branch) | Q(branch__isnull=True))
+
+    classes_data = []
+    seen_keys = set()
+    for c in classes:
+        time_str = c.start_time.strftime('%H:%M') if c.start_time else ''
+        key = (c.branch_id, c.day, time_str, c.class_type)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        classes_data.append({
+            'id': c.id,
+            'name': str(c),
+            'branch_id': c.branch_id,
+            'day': c.day,
+            'time': time_str,
+            'type': c.class_type,
+        })
+
+    # 5. Branches
+    branches = Branch.objects.all()
+    if branch:
+        branches = branches.filter(id=branch.id)
+
+    return {
+        'branches': [{'id': b.id, 'name': b.name} for b in branches],
+        'schools': [{'id': s.id, 'name': s.name, 'branches': [b.id for b in s.branches.all()]} for s in schools],
+        'teachers': [{
+            'id': t.id,
+            'name': t.staff_profile.name or t.username,
+            'is_syntax': t.staff_profile.is_syntax_teacher,
+            'is_reading': t.staff_profile.is_reading_teacher,
+            'position': t.staff_profile.position,
+        } for t in teachers],
+        'classes': classes_data,
+        'default_branch_id': branch.id if branch else None,
+        'default_branch_name': branch.name if branch else "지점 미정",
+    }
+
+
+def booked_syntax_slots():
+    # 4. Booked Syntax Slots (For 1:1 locking)
+    return list(StudentProfile.objects.filter(
+        syntax_teacher__isnull=False,
+        syntax_class__isnull=False,
+    ).values('syntax_teacher_id', 'syntax_class_id', 'syntax_class__day'))
+
+
+def student_registration(branch):
+    """학생 등록/수정 폼 -> (데이터, ETag)"""
+    data, etag = _cached('registration', branch.id if branch else 'all', lambda: _build_registration(branch))
+    slots = booked_syntax_slots()
+    data = {**data, 'booked_syntax_slots': slots}
+    return data, content_etag(etag + _dumps(slots))
+
+
+def staff_registration():
+    """선생님 등록 폼 -> (데이터, ETag)"""
+    return _cached('staff', 'all', lambda: {
+        'branches': list(Branch.objects.all().values('id', 'name')),
+        'positions': [{'value': code, 'label': label} for code, label in StaffProfile.POSITION_CHOICES],
+    })
+
+
+def schools(branch_id):
+    """학교 목록 (branch_id 가 있으면 그 지점 학생이 다니는 학교만) -> (데이터, ETag)"""
+    def build():
+        queryset = School.objects.all().order_by('name')
+        if branch_id:
+            queryset = queryset.filter(studentprofile__branch_id=branch_id).distinct()
+        return [{'id': s.id, 'name': s.name} for s in queryset]
+    return _cached('schools', branch_id or 'all', build)
+
+
+def bundle(user, branch_id=None):
+    """폼 메타데이터 전체 (요청 1회) -> (데이터, ETag)"""
+    branch = user_branch(user)
+    parts = {
+        'student_registration': student_registration(branch),
+        'staff_registration': staff_registration(),
+        'schools': schools(branch_id or (branch.id if branch else None)),
+    }
+    data = {name: part[0] for name, part in parts.items()}
+    return data, content_etag(''.join(part[1] for part in parts.values()))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_announcement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('template_code', models.CharField(max_length=50, verbose_name='템플릿 코드')),
+                ('recipient', models.CharField(max_length=20, verbose_name='수신 번호')),
+                ('ref', models.CharField(help_text='예: classlog:12, report:34', max_length=100, verbose_name='참조 키')),
+                ('payload', models.JSONField(default=dict, help_text='content / button / fallback', verbose_name='내용')),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('SENDING', '발송 중'), ('SENT', '발송 완료'), ('FAILED', '실패')], default='PENDING', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True, verbose_name='다음 시도 시각')),
+                ('claim_token', models.CharField(blank=True, default='', editable=False, max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청 시각')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='발송 시각')),
+            ],
+            options={
+                'verbose_name': '알림 발송 대기열',
+                'verbose_name_plural': '알림 발송 대기열',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx')],
+                'constraints': [models.UniqueConstraint(fields=('template_code', 'recipient', 'ref'), name='uniq_notification_outbox')],
+            },
+        ),
+    ]
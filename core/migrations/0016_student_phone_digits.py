@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-20 04:05
+
+from django.db import migrations, models
+
+from core.student_index import fill_phone_digits
+
+
+def backfill_phone_digits(apps, schema_editor):
+    fill_phone_digits(apps.get_model('core', 'StudentProfile'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='phone_digits',
+            field=models.CharField(blank=True, editable=False, max_length=20, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='attendance_code',
+            field=models.CharField(blank=True, db_index=True, max_length=8, null=True, verbose_name='출석 코드'),
+        ),
+        migrations.RunPython(backfill_phone_digits, migrations.RunPython.noop),
+    ]
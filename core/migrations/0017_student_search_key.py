@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-20 04:35
+
+from django.db import migrations, models
+
+from core.student_index import fill_search_keys
+
+
+def backfill_search_keys(apps, schema_editor):
+    fill_search_keys(apps.get_model('core', 'StudentProfile'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_student_phone_digits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='search_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # settings.CACHES 의 DatabaseCache 테이블 (이미 있으면 건너뜀)
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0017_student_search_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
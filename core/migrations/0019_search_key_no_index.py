@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-20 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_cache_table'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from .organization import Branch, School, ClassTime
 from .users import StaffProfile, StudentProfile, StaffUser, StudentUser
 from .popup import Popup
-from .message import Message  # 👈 [NEW] 메시지 모델 추가
\ No newline at end of file
+from .message import Message  # 👈 [NEW] 메시지 모델 추가
+from .notification import NotificationOutbox  # [NEW] 알림톡 발송 대기열
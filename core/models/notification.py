@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class NotificationOutbox(models.Model):
+    """
+    [NEW] 알림톡/문자 발송 대기열
+    요청 처리 중에는 여기에 쌓기만 하고, 실제 발송은 dispatch_notifications 커맨드(또는 백그라운드 큐)가 합니다.
+    (템플릿, 수신 번호, ref) 조합당 1건만 저장되어 같은 알림이 두 번 나가지 않습니다.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', '대기'
+        SENDING = 'SENDING', '발송 중'
+        SENT = 'SENT', '발송 완료'
+        FAILED = 'FAILED', '실패'
+
+    template_code = models.CharField(max_length=50, verbose_name="템플릿 코드")
+    recipient = models.CharField(max_length=20, verbose_name="수신 번호")
+    ref = models.CharField(max_length=100, verbose_name="참조 키", help_text="예: classlog:12, report:34")
+    payload = models.JSONField(default=dict, verbose_name="내용", help_text="content / button / fallback")
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name="상태")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="시도 횟수")
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name="다음 시도 시각")
+    claim_token = models.CharField(max_length=32, blank=True, default='', editable=False)
+    claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_error = models.TextField(blank=True, default='', verbose_name="마지막 오류")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="요청 시각")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="발송 시각")
+
+    class Meta:
+        verbose_name = "알림 발송 대기열"
+        verbose_name_plural = "알림 발송 대기열"
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['template_code', 'recipient', 'ref'], name='uniq_notification_outbox'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.template_code} -> {self.recipient} ({self.ref})"
@@ -5,9 +5,14 @@ from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 import datetime
+import logging
 
 # 방금 만든 organization 파일에서 조직 정보를 가져옵니다
 from .organization import Branch, School, ClassTime
+from core import student_index
+from utils.loaded_state import LoadedStateMixin, loaded_values
+
+logger = logging.getLogger(__name__)
 
 # ==========================================
 # 1. 선생님 프로필 (담당 과목 설정용)
@@ -51,7 +56,7 @@ class StaffProfile(models.Model):
             if not user.is_superuser: # 무한 루프 방지 조건
                 user.is_superuser = True
                 user.is_staff = True
-                user.save()
+                user.save(update_fields=['is_superuser', 'is_staff'])  # [FIX] 권한 필드만 저장
 
     def __str__(self):
         roles = []
@@ -66,7 +71,7 @@ class StaffProfile(models.Model):
 # ==========================================
 # 2. 학생 프로필
 # ==========================================
-class StudentProfile(models.Model):
+class StudentProfile(LoadedStateMixin, models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='profile')
     branch = models.ForeignKey(Branch, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="소속 지점")
 
@@ -82,8 +87,13 @@ class StudentProfile(models.Model):
 
 
     address = models.CharField(max_length=200, verbose_name="주소", blank=True, null=True)
-    attendance_code = models.CharField(max_length=8, null=True, blank=True, verbose_name="출석 코드")
+    attendance_code = models.CharField(max_length=8, null=True, blank=True, db_index=True, verbose_name="출석 코드")
     phone_number = models.CharField(max_length=20, blank=True, verbose_name="전화번호")
+    # [NEW] 숫자만 남긴 전화번호 (키오스크/API 출석 조회용 유일 인덱스, save() 에서 자동 채움)
+    phone_digits = models.CharField(max_length=20, null=True, blank=True, unique=True, editable=False)
+    # [NEW] 검색 키 '|이름|초성|아이디|전화번호 숫자|' (학생 검색/OMR 조회용, save() 에서 자동 채움)
+    # [FIX] 인덱스 없음: 검색은 LIKE '%검색어%' 라 B-tree 인덱스를 쓰지 못하고 이 컬럼 하나를 훑음 (core.student_index)
+    search_key = models.CharField(max_length=student_index.SEARCH_KEY_LENGTH, blank=True, editable=False)
     parent_phone_mom = models.CharField(max_length=15, verbose_name="어머님 연락처", blank=True, null=True)
     parent_phone_dad = models.CharField(max_length=15, verbose_name="아버님 연락처", blank=True, null=True)
     
@@ -152,6 +162,24 @@ class StudentProfile(models.Model):
     last_failed_at = models.DateTimeField(null=True, blank=True)
     last_wrong_failed_at = models.DateTimeField(null=True, blank=True)
     
+    # [NEW] 시간표/담당 변경 감지용 (academy 점유 인덱스 캐시 무효화)
+    SCHEDULE_FIELDS = (
+        'syntax_class_id', 'syntax_teacher_id',
+        'reading_class_id', 'reading_teacher_id',
+        'extra_class_id', 'extra_class_teacher_id', 'extra_class_type',
+    )
+
+    # [NEW] 학교/지점 변경 감지용 (core.metadata 학교 목록 캐시 무효화)
+    SCHOOL_FIELDS = ('school_id', 'branch_id')
+
+    LOADED_STATE = {'_loaded_schedule': 'schedule_key', '_loaded_school': 'school_key'}
+
+    def schedule_key(self):
+        return loaded_values(self, self.SCHEDULE_FIELDS)
+
+    def school_key(self):
+        return loaded_values(self, self.SCHOOL_FIELDS)
+
     @property
     def current_grade(self):
         return min(self.base_grade + (timezone.now().year - self.base_year), 13)
@@ -165,6 +193,32 @@ class StudentProfile(models.Model):
     def current_grade_display(self):
         return self.GradeChoices(self.current_grade).label
 
+    def sync_phone_digits(self):
+        """
+        [NEW] phone_digits 를 phone_number 에 맞춤 -> 바뀌었으면 True
+        다른 학생이 이미 같은 번호를 쓰고 있으면 비워 둠 (형제가 같은 번호를 쓰는 경우 등, 저장은 막지 않음)
+        """
+        digits = student_index.phone_digits(self.phone_number)
+        if digits == self.phone_digits:
+            return False
+        if digits and StudentProfile.objects.filter(phone_digits=digits).exclude(pk=self.pk).exists():
+            logger.warning("student %s phone %s already indexed for another student", self.pk, digits)
+            digits = None
+        changed = digits != self.phone_digits
+        self.phone_digits = digits
+        return changed
+
+    # [NEW] search_key 에 들어가는 필드 (update_fields 에 이 중 하나라도 있을 때만 다시 계산)
+    SEARCH_FIELDS = {'name', 'phone_number', 'user'}
+
+    def sync_search_key(self):
+        """[NEW] search_key 를 이름/아이디/전화번호에 맞춤 -> 바뀌었으면 True"""
+        username = self.user.username if self.user_id else ''
+        key = student_index.search_key(self.name, username, self.phone_number)
+        changed = key != self.search_key
+        self.search_key = key
+        return changed
+
     def save(self, *args, **kwargs):
         # [수정 2] 휴대폰 번호 변경 시 출석 코드 갱신
         previous_phone = None
@@ -175,13 +229,16 @@ class StudentProfile(models.Model):
                 .first()
             )
         if self.phone_number:
-            clean_number = self.phone_number.replace('-', '').strip()
             phone_changed = previous_phone is not None and previous_phone != self.phone_number
             if not self.attendance_code or phone_changed:
-                if len(clean_number) >= 8:
-                    self.attendance_code = clean_number[-8:]
-                else:
-                    self.attendance_code = clean_number
+                self.attendance_code = student_index.attendance_code(self.phone_number)
+        if self.sync_phone_digits() and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'phone_digits'}
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.sync_search_key()
+        elif self.SEARCH_FIELDS & set(update_fields) and self.sync_search_key():
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -235,7 +292,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def save_user_profile(sender, instance, **kwargs):
     """
-    유저 저장 시 프로필도 함께 저장
+    유저 저장 시 프로필도 함께 저장 (아이디가 들어가는 search_key 갱신)
+    [FIX] instance.profile 은 인증 캐시에서 온 오래된 객체일 수 있으므로 다시 읽고, 유저에서 오는 값만 저장
     """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+    profile = StudentProfile.objects.filter(user_id=instance.pk).first()
+    if profile is not None:
+        profile.user = instance
+        profile.save(update_fields=['user'])
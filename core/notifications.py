@@ -0,0 +1,250 @@
+# core/notifications.py
+"""
+알림톡 발송 대기열 (NotificationOutbox)
+
+enqueue(template_code, recipient, ref, content, ...)
+    요청 처리 중에는 대기열에 넣기만 합니다. (HTTP 호출 없음, 여러 건은 enqueue_many)
+    (템플릿, 수신 번호, ref) 가 같은 행이 대기/발송 중/발송 완료면 그대로 두고 queued=False 를 돌려줍니다.
+    실패(FAILED)한 행은 새 내용으로 다시 대기(PENDING)시키고 queued=True 를 돌려줍니다.
+    커밋 후 utils.background.enqueue 로 이 프로세스에서 바로 한 번 발송을 시도합니다.
+
+dispatch(...)
+    발송할 행을 claim_token 으로 선점한 뒤 스레드 풀(workers)에서 보내고,
+    결과 기록(DB 쓰기)은 호출한 스레드에서만 합니다.
+    - rate: 초당 최대 발송 수 (모든 워커 합산)
+    - 통신 오류/5xx 는 BACKOFF_BASE * 2^(시도-1) 뒤에 재시도, max_attempts 를 넘기면 FAILED
+    - 알리고가 거절한 요청(code != 0)은 재시도하지 않고 FAILED
+    - 선점 후 CLAIM_TIMEOUT 동안 결과가 없으면(프로세스 중단) 다시 발송 대상이 됨 (최소 1회 발송)
+
+프로세스 재시작으로 빠진 건과 재시도 건은 dispatch_notifications 커맨드(cron 또는 --loop)가 처리합니다.
+"""
+import logging
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from utils import aligo, background
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 10          # 초당 발송 수
+DEFAULT_MAX_ATTEMPTS = 5
+BATCH_SIZE = 100
+BACKOFF_BASE = 30          # 초
+BACKOFF_MAX = 60 * 60
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+Status = NotificationOutbox.Status
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def normalize_phone(phone):
+    return re.sub(r'\D', '', phone or '')
+
+
+# ------------------------------------------------------------------
+# 대기열에 넣기
+# ------------------------------------------------------------------
+def _payload(content, button=None, fallback=''):
+    payload = {'content': content}
+    if button:
+        payload['button'] = button
+    if fallback:
+        payload['fallback'] = fallback
+    return payload
+
+
+def _requeue(row, payload):
+    """실패한 행을 새 내용으로 다시 대기시킴 -> 다시 넣었으면 True (그 사이 다른 요청이 먼저 넣었으면 False)"""
+    reset = {
+        'status': Status.PENDING, 'payload': payload, 'attempts': 0,
+        'next_attempt_at': None, 'last_error': '', 'claim_token': '',
+    }
+    if not NotificationOutbox.objects.filter(pk=row.pk, status=Status.FAILED).update(**reset):
+        row.refresh_from_db()
+        return False
+    for field, value in reset.items():
+        setattr(row, field, value)
+    return True
+
+
+def enqueue(template_code, recipient, ref, content, button=None, fallback=''):
+    """
+    -> (NotificationOutbox | None, queued) / 수신 번호가 없으면 (None, False)
+    queued: 이번 호출로 발송 대상이 되었으면 True (새 행, 또는 실패했던 행을 다시 넣음)
+    False 면 row.status 로 이유를 구분합니다. (SENT: 이미 발송 / PENDING, SENDING: 발송 대기 중)
+    """
+    recipient = normalize_phone(recipient)
+    if not recipient:
+        return None, False
+    payload = _payload(content, button, fallback)
+    row, queued = NotificationOutbox.objects.get_or_create(
+        template_code=template_code, recipient=recipient, ref=ref,
+        defaults={'payload': payload},
+    )
+    if not queued and row.status == Status.FAILED:
+        queued = _requeue(row, payload)
+    if queued and _setting('NOTIFICATION_DISPATCH_ON_ENQUEUE', True):
+        kick()
+    return row, queued
+
+
+def enqueue_many(items):
+    """
+    여러 건을 한 번에 넣기 (bulk_create, 이미 있는 조합은 무시하되 실패한 행은 다시 대기) -> 넣으려 한 건수
+    items: enqueue 와 같은 키워드 dict 목록
+    """
+    rows = {}
+    for item in items:
+        recipient = normalize_phone(item.get('recipient'))
+        if not recipient:
+            continue
+        key = (item['template_code'], recipient, item['ref'])
+        rows[key] = NotificationOutbox(
+            template_code=key[0], recipient=recipient, ref=key[2],
+            payload=_payload(item['content'], item.get('button'), item.get('fallback')),
+        )
+    if rows:
+        NotificationOutbox.objects.bulk_create(list(rows.values()), ignore_conflicts=True)
+        keys = Q()
+        for template_code, recipient, ref in rows:
+            keys |= Q(template_code=template_code, recipient=recipient, ref=ref)
+        for failed in NotificationOutbox.objects.filter(keys, status=Status.FAILED):
+            _requeue(failed, rows[(failed.template_code, failed.recipient, failed.ref)].payload)
+        if _setting('NOTIFICATION_DISPATCH_ON_ENQUEUE', True):
+            kick()
+    return len(rows)
+
+
+_kick_lock = threading.Lock()
+_kick_queued = False
+
+
+def _run_kicked():
+    global _kick_queued
+    with _kick_lock:
+        _kick_queued = False
+    dispatch()
+
+
+def kick():
+    """커밋 후 백그라운드 큐에 발송 1회 요청 (이미 요청되어 있으면 합침)"""
+    def _schedule():
+        global _kick_queued
+        with _kick_lock:
+            if _kick_queued:
+                return
+            _kick_queued = True
+        background.enqueue(_run_kicked)
+
+    transaction.on_commit(_schedule)
+
+
+# ------------------------------------------------------------------
+# 발송
+# ------------------------------------------------------------------
+class RateLimiter:
+    """초당 rate 건으로 간격을 맞추는 스레드 안전 제한기 (rate <= 0 이면 제한 없음)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(attempts - 1, 0)))
+
+
+def _due(now):
+    pending = Q(status=Status.PENDING) & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    stale = Q(status=Status.SENDING, claimed_at__lt=now - CLAIM_TIMEOUT)
+    return pending | stale
+
+
+def claim(limit):
+    """발송할 행을 최대 limit 건 선점 -> 선점한 행 목록 (다른 발송기와 겹치지 않음)"""
+    now = timezone.now()
+    ids = list(
+        NotificationOutbox.objects.filter(_due(now)).order_by('id').values_list('id', flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    NotificationOutbox.objects.filter(_due(now), pk__in=ids).update(
+        status=Status.SENDING, claim_token=token, claimed_at=now, attempts=F('attempts') + 1,
+    )
+    return list(NotificationOutbox.objects.filter(claim_token=token, status=Status.SENDING).order_by('id'))
+
+
+def _send(row, limiter):
+    limiter.wait()
+    payload = row.payload or {}
+    return aligo.deliver(row.recipient, row.template_code, payload, payload.get('fallback', ''))
+
+
+def record(row, result, max_attempts):
+    """발송 결과 반영 -> 'sent' / 'retry' / 'failed'"""
+    now = timezone.now()
+    mine = NotificationOutbox.objects.filter(pk=row.pk, claim_token=row.claim_token)
+    if result.ok:
+        mine.update(status=Status.SENT, sent_at=now, last_error='', claim_token='')
+        return 'sent'
+    if result.retryable and row.attempts < max_attempts:
+        mine.update(
+            status=Status.PENDING, next_attempt_at=now + backoff(row.attempts),
+            last_error=result.message, claim_token='',
+        )
+        return 'retry'
+    mine.update(status=Status.FAILED, last_error=result.message, claim_token='')
+    logger.warning("notification %s to %s failed: %s", row.pk, row.recipient, result.message)
+    return 'failed'
+
+
+def dispatch(limit=None, workers=None, rate=None, max_attempts=None):
+    """발송 대상이 없어질 때까지(또는 limit 건) 보냄 -> {'sent', 'retry', 'failed'}"""
+    workers = workers or _setting('NOTIFICATION_DISPATCH_WORKERS', DEFAULT_WORKERS)
+    rate = _setting('NOTIFICATION_RATE_PER_SECOND', DEFAULT_RATE) if rate is None else rate
+    max_attempts = max_attempts or _setting('NOTIFICATION_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    limiter = RateLimiter(rate)
+    counts = {'sent': 0, 'retry': 0, 'failed': 0}
+    remaining = limit
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='notify') as executor:
+        while remaining is None or remaining > 0:
+            rows = claim(BATCH_SIZE if remaining is None else min(BATCH_SIZE, remaining))
+            if not rows:
+                break
+            if remaining is not None:
+                remaining -= len(rows)
+            futures = {executor.submit(_send, row, limiter): row for row in rows}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:  # deliver 는 예외를 던지지 않지만 방어
+                    result = aligo.SendResult(ok=False, retryable=True, message=str(exc))
+                counts[record(futures[future], result, max_attempts)] += 1
+    return counts
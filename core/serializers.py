@@ -156,7 +156,13 @@ class StudentProfileSerializer(serializers.ModelSerializer):
             })
         return times
 
+    TEMP_SCHEDULE_FIELDS = ('id', 'subject', 'is_extra_class', 'original_date', 'new_date', 'new_start_time', 'note')
+
     def get_temp_schedules(self, obj):
+        # [FIX] 목록 조회는 뷰에서 기간 내 일정만 prefetch (recent_temp_schedules) -> 학생당 쿼리 없음
+        recent = getattr(obj, 'recent_temp_schedules', None)
+        if recent is not None:
+            return [{f: getattr(ts, f) for f in self.TEMP_SCHEDULE_FIELDS} for ts in recent]
         if not hasattr(obj, 'temp_schedules'):
             return []
         qs = obj.temp_schedules.all()
@@ -172,10 +178,7 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         #     qs = qs.filter(subject__in=allowed_subjects)
             
         # Return specific fields needed for planner
-        return list(qs.values(
-            'id', 'subject', 'is_extra_class', 'original_date', 
-            'new_date', 'new_start_time', 'note'
-        ))
+        return list(qs.values(*self.TEMP_SCHEDULE_FIELDS))
 
     # [NEW] Log History for Planner Indicator
     log_history = serializers.SerializerMethodField()
@@ -185,10 +188,52 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         # Optimize: Filter only recent logs (e.g. last 3 months) if needed, 
         # but for now all logs or last 30 days might be enough for planner view.
         # Let's get all distinct dates for simplicity ensuring planner sees them.
+        # [FIX] 목록 조회는 log_dates_for 로 기간 내 날짜를 한 번에 읽어 context 로 전달
+        log_dates = self.context.get('log_dates')
+        if log_dates is not None:
+            return log_dates.get(obj.id, [])
         from academy.models import ClassLog
         logs = ClassLog.objects.filter(student=obj).values_list('date', flat=True).distinct()
         return [d.strftime('%Y-%m-%d') for d in logs]
 
+
+class StudentListSerializer(StudentProfileSerializer):
+    """
+    [NEW] 학생 목록용 (읽기 전용, 목록 화면이 쓰는 필드만)
+    - 관계는 StudentManagementViewSet 에서 select_related/prefetch 로 미리 읽음
+    - temp_schedules / log_history 는 기간(log_from 이후)으로 제한
+    전체 필드는 상세 조회(retrieve)의 StudentProfileSerializer 를 사용합니다.
+    """
+    new_username = None
+
+    class Meta(StudentProfileSerializer.Meta):
+        fields = [
+            'id', 'username', 'name', 'phone_number', 'attendance_code',
+            'school_name', 'grade_display', 'base_grade', 'branch', 'branch_name', 'start_date',
+            'is_active', 'class_times', 'temp_schedules', 'log_history',
+        ]
+        read_only_fields = fields
+
+
+STUDENT_LIST_RELATED = (
+    'user', 'branch', 'school',
+    'syntax_class', 'reading_class', 'extra_class',
+    'syntax_teacher__staff_profile',
+    'reading_teacher__staff_profile',
+    'extra_class_teacher__staff_profile',
+)
+
+
+def log_dates_for(student_ids, since):
+    """[목록용] 학생별 수업 일지 날짜 (since 이후, 쿼리 1회) -> {학생 id: ['YYYY-MM-DD', ...]}"""
+    from academy.models import ClassLog
+    dates = {}
+    for student_id, day in ClassLog.objects.filter(
+        student_id__in=student_ids, date__gte=since
+    ).values_list('student_id', 'date').distinct().order_by('student_id', '-date'):
+        dates.setdefault(student_id, []).append(day.strftime('%Y-%m-%d'))
+    return dates
+
 from .models.users import StaffProfile
 
 class StaffProfileSerializer(serializers.ModelSerializer):
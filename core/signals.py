@@ -97,3 +97,67 @@ def create_schedules_for_new_branch(sender, instance, created, **kwargs):
                     name=f"독해 {start.strftime('%H:%M')}"
                 )
 
+
+
+# ------------------------------------------------------------------
+# [NEW] 인증 캐시 무효화 (core.authentication.CachedTokenAuthentication)
+# ------------------------------------------------------------------
+from django.conf import settings
+from django.db.models.signals import post_delete
+from rest_framework.authtoken.models import Token
+from .authentication import invalidate_user
+from .models import StaffProfile, StudentProfile
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_auth_on_user_change(sender, instance, **kwargs):
+    # 비밀번호 변경(set_password + save), 비활성화 등
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_save, sender=StaffProfile)
+@receiver(post_delete, sender=StaffProfile)
+@receiver(post_delete, sender=Token)
+def invalidate_auth_on_profile_change(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+# ------------------------------------------------------------------
+# [NEW] 폼 메타데이터 캐시 무효화 (core.metadata)
+# ------------------------------------------------------------------
+from django.db.models.signals import m2m_changed
+from . import metadata
+from .models import School
+
+
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+@receiver(m2m_changed, sender=School.branches.through)
+@receiver(post_save, sender=ClassTime)
+@receiver(post_delete, sender=ClassTime)
+@receiver(post_save, sender=StaffProfile)
+@receiver(post_delete, sender=StaffProfile)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_metadata_on_change(sender, **kwargs):
+    metadata.invalidate()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_metadata_on_staff_user_change(sender, instance, **kwargs):
+    # 선생님 목록은 계정의 활성 여부/아이디도 사용
+    if instance.is_staff:
+        metadata.invalidate()
+
+
+@receiver(post_save, sender=StudentProfile)
+def invalidate_metadata_on_student_school_change(sender, instance, created, **kwargs):
+    # 지점별 학교 목록은 학생의 학교/지점으로 정해짐 (User 저장 때마다 프로필도 저장되므로 실제 변경만)
+    current = instance.school_key()
+    if created or getattr(instance, '_loaded_school', None) != current:
+        metadata.invalidate()
+    instance._loaded_school = current
@@ -0,0 +1,363 @@
+# core/student_import.py
+"""
+학생 일괄 등록 (StudentManagementViewSet.upload_excel / import_students 커맨드)
+
+호출부는 시트를 StudentRow 목록으로 바꾸기만 하고, 저장은 import_students() 가 한 번에 합니다.
+    1) 검증: 시트 전체를 먼저 확인 (아이디 중복, 이름 길이, 선생님/관리자 계정과 겹치는 번호)
+    2) 조회: 기존 계정+프로필 / 학교 / 수업 시간표를 각각 쿼리 1회로 읽음
+    3) 새 계정 비밀번호 해시(PBKDF2)는 utils.background.run_parallel 로 병렬 계산
+    4) User / StudentProfile 을 bulk_create / bulk_update (트랜잭션 1개)
+    5) 행마다 save() 시그널이 하던 일은 모아서 한 번에
+       - 출석 코드 / phone_digits / search_key 계산 (core.student_index)
+       - 담당 선생님과의 대화방 생성 (messaging.signals 와 같은 규칙)
+       - 선생님 점유 캐시 / 폼 메타데이터 캐시 / 인증 캐시 무효화 (academy.occupancy, core.metadata, core.authentication)
+결과는 행 단위 diff(ImportReport)이며, dry_run 이면 4~5 를 건너뛰고 보고서만 만듭니다.
+"""
+import datetime
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models import Q
+
+from core import authentication, metadata, student_index
+from utils import background
+from .models import ClassTime, School, StudentProfile
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+PARALLEL_MIN = 8        # 새 계정이 이보다 적으면 프로세스 풀 없이 해시
+NAME_MAX_LENGTH = StudentProfile._meta.get_field('name').max_length
+TEACHER_FIELDS = ('syntax_teacher', 'reading_teacher', 'extra_class_teacher')
+# 변경 내역(diff)에 이전 값을 표시할 때 행마다 조회하지 않도록 함께 읽는 관계
+PROFILE_RELATED = (
+    'profile', 'profile__branch', 'profile__school', 'profile__syntax_class', 'profile__reading_class',
+    'profile__syntax_teacher', 'profile__reading_teacher',
+)
+
+
+@dataclass
+class StudentRow:
+    row: int                    # 시트 행 번호 (보고용)
+    username: str               # 전화번호 숫자 (= 아이디)
+    is_active: bool
+    fields: dict                # StudentProfile 에 넣을 값 (넣은 필드만 갱신)
+    school_name: str = ''       # 있으면 학교 조회/생성 후 fields['school']
+    classes: dict = field(default_factory=dict)  # {'syntax_class': (요일, 수업 유형, 시작 시간)}
+    password: str = ''          # 새 계정 초기 비밀번호 (없으면 로그인 불가 계정)
+
+
+@dataclass
+class ImportReport:
+    created: list = field(default_factory=list)    # [{'row', 'username', 'name'}]
+    updated: list = field(default_factory=list)    # [{'row', 'username', 'name', 'changes': {필드: [이전, 이후]}}]
+    unchanged: list = field(default_factory=list)  # [{'row', 'username', 'name'}]
+    skipped: list = field(default_factory=list)    # [{'row', 'username', 'reason'}]
+    dry_run: bool = False
+
+    def as_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        return (f"Created: {len(self.created)}, Updated: {len(self.updated)}, "
+                f"Unchanged: {len(self.unchanged)}, Skipped: {len(self.skipped)}")
+
+
+# ------------------------------------------------------------------
+# 비밀번호 해시 (CPU 작업 -> run_parallel 프로세스 풀)
+# ------------------------------------------------------------------
+def _hash_chunk(chunk):
+    """(시작 위치, 평문 튜플) -> 해시 목록 (run_parallel 워커에서 실행, 모듈 최상위 함수여야 pickle 가능)"""
+    _start, passwords = chunk
+    return [make_password(p) for p in passwords]
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    평문 목록 -> make_password 결과 목록 (같은 순서)
+    여러 건을 묶어 utils.background.run_parallel 로 나눠 계산 (spawn 워커, 부모 DB 연결은 먼저 닫음)
+    """
+    passwords = list(passwords)
+    workers = workers or getattr(settings, 'STUDENT_IMPORT_WORKERS', None) or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < PARALLEL_MIN:
+        return [make_password(p) for p in passwords]
+    size = max(1, len(passwords) // (workers * 4))
+    chunks = [(i, tuple(passwords[i:i + size])) for i in range(0, len(passwords), size)]
+    hashed = [None] * len(passwords)
+    for (start, _chunk), result, error in background.run_parallel(_hash_chunk, chunks, workers=workers):
+        if error is not None:
+            raise error
+        hashed[start:start + len(result)] = result
+    return hashed
+
+
+# ------------------------------------------------------------------
+# 검증 / 조회
+# ------------------------------------------------------------------
+def validate(rows, report):
+    """저장 가능한 행만 돌려주고 나머지는 report.skipped 에 사유와 함께 기록"""
+    valid, seen = [], {}
+    max_username = User._meta.get_field('username').max_length
+    for r in rows:
+        name = r.fields.get('name') or ''
+        reason = None
+        if not r.username:
+            reason = '전화번호 없음'
+        elif len(r.username) > max_username:
+            reason = '전화번호가 너무 김'
+        elif r.username in seen:
+            reason = f'{seen[r.username]}행과 같은 전화번호'
+        elif not name:
+            reason = '이름 없음'
+        elif len(name) > NAME_MAX_LENGTH:
+            reason = f'이름이 {NAME_MAX_LENGTH}자를 넘음'
+        if reason:
+            report.skipped.append({'row': r.row, 'username': r.username, 'reason': reason})
+            continue
+        seen[r.username] = r.row
+        valid.append(r)
+    return valid
+
+
+def _resolve_schools(names, branch, dry_run):
+    """학교 이름 -> School (쿼리 1회, 없는 학교는 한 번에 생성)"""
+    schools = {}
+    for school in School.objects.filter(name__in=names).order_by('-id'):
+        schools[school.name] = school  # 같은 이름이 여러 개면 기존처럼 id 가 가장 작은 학교
+    missing = [School(name=n) for n in sorted(set(names) - set(schools))]
+    if missing and not dry_run:
+        School.objects.bulk_create(missing)
+        if any(s.pk is None for s in missing):
+            missing = list(School.objects.filter(name__in=[s.name for s in missing]).order_by('id'))
+    schools.update({s.name: s for s in missing if s.name not in schools})
+    if branch is not None and not dry_run:
+        through = School.branches.through
+        through.objects.bulk_create(
+            [through(school_id=s.pk, branch_id=branch.pk) for s in schools.values()],
+            ignore_conflicts=True,
+        )
+    return schools
+
+
+def _resolve_classes(keys, branch, create, dry_run):
+    """(요일, 수업 유형, 시작 시간) -> ClassTime (쿼리 1회). branch 가 있으면 그 지점 시간표만"""
+    if not keys:
+        return {}
+    qs = ClassTime.objects.filter(
+        day__in={k[0] for k in keys}, class_type__in={k[1] for k in keys}, start_time__in={k[2] for k in keys},
+    )
+    if branch is not None:
+        qs = qs.filter(branch=branch)
+    found = {}
+    for ct in qs.order_by('-id'):
+        found[(ct.day, ct.class_type, ct.start_time)] = ct
+    classes = {k: found[k] for k in keys if k in found}
+    if create:
+        for day, class_type, start_time in sorted(set(keys) - set(found)):
+            label = ClassTime.ClassTypeChoices(class_type).label
+            ct = ClassTime(
+                branch=branch, day=day, class_type=class_type, start_time=start_time,
+                name=f'{label} {day} {start_time.strftime("%H:%M")}',
+                end_time=datetime.time((start_time.hour + 2) % 24, start_time.minute),
+            )
+            if not dry_run:
+                ct.save()  # 독해 -> 모의고사 시간표 자동 생성 시그널 유지 (새 시간표는 드묾)
+            classes[(day, class_type, start_time)] = ct
+    return classes
+
+
+def _differs(profile, name, value):
+    model_field = StudentProfile._meta.get_field(name)
+    if not model_field.is_relation:
+        return getattr(profile, name) != value
+    # FK 는 id 로 비교 (관계 객체를 읽지 않음), 아직 저장 전인 객체(dry_run 의 새 학교 등)는 변경
+    if value is not None and value.pk is None:
+        return True
+    return getattr(profile, model_field.attname) != (value.pk if value is not None else None)
+
+
+def _display(value):
+    if isinstance(value, models.Model):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+# ------------------------------------------------------------------
+# 저장
+# ------------------------------------------------------------------
+def _ensure_conversations(profiles):
+    """담당 선생님과의 대화방이 없으면 생성 (messaging.signals.auto_create_teacher_conversations 와 같은 규칙)"""
+    from messaging.models import Conversation
+    pairs = set()
+    for p in profiles:
+        for f in TEACHER_FIELDS:
+            teacher_id = getattr(p, f'{f}_id')
+            if teacher_id and teacher_id != p.user_id:
+                pairs.add((p.user_id, teacher_id))
+    if not pairs:
+        return 0
+    students = {s for s, _t in pairs}
+    existing = {
+        frozenset(pair) for pair in Conversation.objects.filter(
+            Q(participant1_id__in=students) | Q(participant2_id__in=students)
+        ).values_list('participant1_id', 'participant2_id')
+    }
+    missing = [Conversation(participant1_id=s, participant2_id=t) for s, t in sorted(pairs)
+               if frozenset((s, t)) not in existing]
+    Conversation.objects.bulk_create(missing, batch_size=BATCH_SIZE)
+    return len(missing)
+
+
+def _assign_phone_digits(profiles):
+    """phone_digits 계산 (이미 다른 학생이 쓰는 번호는 비움, StudentProfile.sync_phone_digits 와 같은 규칙)"""
+    wanted = [(p, student_index.phone_digits(p.phone_number)) for p in profiles]  # 새 프로필은 pk 가 없어 dict 키로 못 씀
+    owners = dict(StudentProfile.objects.filter(
+        phone_digits__in={d for _p, d in wanted if d}
+    ).values_list('phone_digits', 'id'))
+    taken = set()
+    for p, digits in wanted:
+        if digits and (owners.get(digits, p.pk) != p.pk or digits in taken):
+            logger.warning("student %s phone %s already indexed for another student", p.pk, digits)
+            digits = None
+        if digits:
+            taken.add(digits)
+        p.phone_digits = digits
+
+
+def import_students(rows, branch=None, create_classes=False, dry_run=False, workers=None):
+    """
+    StudentRow 목록 저장 -> ImportReport
+    branch: 새/기존 학교를 이 지점에 연결하고, 수업 시간표는 이 지점에서만 찾음 (None 이면 전체)
+    create_classes: 시간표가 없으면 생성 (import_students 커맨드)
+    """
+    report = ImportReport(dry_run=dry_run)
+    rows = validate(rows, report)
+    if not rows:
+        return report
+
+    users = {
+        u.username: u for u in
+        User.objects.filter(username__in=[r.username for r in rows]).select_related(*PROFILE_RELATED)
+    }
+    schools = _resolve_schools({r.school_name for r in rows if r.school_name}, branch, dry_run)
+    classes = _resolve_classes(
+        {key for r in rows for key in r.classes.values()}, branch, create_classes, dry_run,
+    )
+
+    new_users, active_changed = [], []
+    plans = []  # (행, 계정, 프로필, 새 프로필 여부, 변경 내역)
+    for r in rows:
+        values = dict(r.fields)
+        if r.school_name:
+            values['school'] = schools[r.school_name]
+        for attr, key in r.classes.items():
+            if key in classes:
+                values[attr] = classes[key]
+
+        user = users.get(r.username)
+        if user is not None and (user.is_staff or user.is_superuser):
+            report.skipped.append({'row': r.row, 'username': r.username, 'reason': '선생님/관리자 계정 번호'})
+            continue
+        if user is None:
+            user = User(username=r.username, is_active=r.is_active)
+            new_users.append((user, r.password))
+        profile = getattr(user, 'profile', None) if user.pk else None
+
+        changes = {}
+        if user.pk and user.is_active != r.is_active:
+            changes['is_active'] = [user.is_active, r.is_active]
+            user.is_active = r.is_active
+            active_changed.append(user)
+
+        if profile is None:
+            profile = StudentProfile(**values)
+            profile.attendance_code = student_index.attendance_code(profile.phone_number) or None
+            plans.append((r, user, profile, True, changes))
+            continue
+        previous_phone = profile.phone_number
+        for name, value in values.items():
+            if not _differs(profile, name, value):
+                continue
+            changes[name] = [_display(getattr(profile, name)), _display(value)]
+            setattr(profile, name, value)
+        if profile.phone_number and (not profile.attendance_code or previous_phone != profile.phone_number):
+            code = student_index.attendance_code(profile.phone_number)
+            if code != profile.attendance_code:
+                changes['attendance_code'] = [profile.attendance_code, code]
+                profile.attendance_code = code
+        plans.append((r, user, profile, False, changes))
+
+    for r, user, profile, created, changes in plans:
+        entry = {'row': r.row, 'username': r.username, 'name': profile.name}
+        if created:
+            report.created.append(entry)
+        elif changes:
+            report.updated.append({**entry, 'changes': changes})
+        else:
+            report.unchanged.append(entry)
+    if dry_run:
+        return report
+
+    hashes = iter(hash_passwords([pw for _u, pw in new_users if pw], workers))
+    for user, password in new_users:
+        if password:
+            user.password = next(hashes)
+        else:
+            user.set_unusable_password()
+    new_users = [u for u, _pw in new_users]
+
+    created_profiles = [p for _r, _u, p, created, _c in plans if created]
+    updated = [(p, c) for _r, _u, p, created, c in plans if not created and c]
+    with transaction.atomic():
+        if new_users:
+            User.objects.bulk_create(new_users, batch_size=BATCH_SIZE)
+            if any(u.pk is None for u in new_users):
+                ids = dict(User.objects.filter(
+                    username__in=[u.username for u in new_users]
+                ).values_list('username', 'id'))
+                for u in new_users:
+                    u.pk = ids[u.username]
+        if active_changed:
+            User.objects.bulk_update(active_changed, ['is_active'], batch_size=BATCH_SIZE)
+
+        for _r, user, profile, created, _c in plans:
+            if created:
+                profile.user = user
+                profile.sync_search_key()
+        renamed = [p for p, c in updated if {'name', 'phone_number'} & set(c) and p.sync_search_key()]
+        moved = [p for p, c in updated if 'phone_number' in c]
+        _assign_phone_digits(moved + created_profiles)
+        if moved:
+            # 번호가 서로 바뀌는 경우에도 유일 제약에 걸리지 않도록 먼저 비운 뒤 채움
+            StudentProfile.objects.filter(pk__in=[p.pk for p in moved]).update(phone_digits=None)
+        StudentProfile.objects.bulk_create(created_profiles, batch_size=BATCH_SIZE)
+        if updated:
+            changed_fields = {f for _p, c in updated for f in c if f != 'is_active'}
+            if moved:
+                changed_fields.add('phone_digits')
+            if renamed:
+                changed_fields.add('search_key')
+            if changed_fields:
+                StudentProfile.objects.bulk_update(
+                    [p for p, c in updated if set(c) - {'is_active'}], sorted(changed_fields), batch_size=BATCH_SIZE,
+                )
+
+        written = created_profiles + [p for p, _c in updated]
+        _ensure_conversations(written)
+        if created_profiles or any(p.schedule_key() != getattr(p, '_loaded_schedule', None) for p, _c in updated):
+            from academy.occupancy import invalidate_occupancy
+            transaction.on_commit(invalidate_occupancy)
+        # 새 학교(bulk_create)와 학생의 학교/지점 변경은 폼 메타데이터 캐시에 반영
+        transaction.on_commit(metadata.invalidate)
+        # 비활성화/프로필 수정은 시그널이 없으므로 인증 캐시(core.authentication)도 직접 비움
+        stale_users = [u.pk for u in active_changed] + [p.user_id for p, _c in updated]
+        if stale_users:
+            transaction.on_commit(lambda: authentication.invalidate_users(stale_users))
+    return report
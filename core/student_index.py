@@ -0,0 +1,131 @@
+# core/student_index.py
+"""
+학생 조회용 파생 컬럼 (StudentProfile)
+
+phone_digits : 숫자만 남긴 전화번호 (유일). 출석 체크(키오스크/API)가 인덱스로 바로 찾습니다.
+    - 평소에는 StudentProfile.save() 가 채움
+    - update()/bulk_update 등 save() 를 거치지 않은 변경은 backfill_student_index 커맨드로 다시 맞춤
+    - 같은 번호를 여러 학생이 쓰면 먼저 가지고 있던(없으면 id 가 작은) 학생만 인덱스에 올림
+
+attendance_code : 전화번호 뒤 8자리 (키오스크 입력용, 인덱스). 번호가 바뀌거나 비어 있을 때 save() 가 다시 계산
+
+search_key : 학생 검색용 문자열. '|이름|초성|아이디|전화번호 숫자|' 형태
+    - 학생 관리 검색(StudentManagementViewSet ?search=)과 OMR 수험번호 조회가 이 컬럼 하나만 봄 (조인 없음)
+    - 찾는 방식은 부분 일치(LIKE '%검색어%', OMR 은 '%끝자리|%')라 인덱스를 쓸 수 없어 인덱스를 두지 않음
+      학생 테이블을 한 번 훑지만 유저 테이블 조인과 여러 컬럼 OR 비교가 없어서 예전 icontains 검색보다 빠름
+      (FTS5 trigram 은 3글자 이상만 찾을 수 있어 두 글자 이름/초성 검색에 맞지 않음)
+    - 검색어는 search_terms() 로 같은 규칙으로 정규화: 숫자/대시만 있으면 숫자만, 초성이 섞이면 초성으로
+    - 이름/전화번호는 save(), 아이디 변경은 유저 저장 시그널(save_user_profile)의 프로필 save() 가 다시 계산
+    - save() 를 거치지 않은 변경은 phone_digits 와 같이 backfill_student_index 커맨드로 맞춤
+
+모델 클래스를 인자로 받으므로 마이그레이션(역사 모델)에서도 그대로 사용합니다.
+"""
+import re
+
+BATCH_SIZE = 500
+SEARCH_KEY_LENGTH = 200
+
+# 한글 음절(가~힣) = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+JAMO_CONSONANTS = set('ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ')
+PHONE_QUERY = re.compile(r'[\d\-().+]+')
+
+
+def phone_digits(value):
+    return re.sub(r'\D', '', value or '') or None
+
+
+def attendance_code(phone):
+    clean_number = (phone or '').replace('-', '').strip()
+    return clean_number[-8:] if len(clean_number) >= 8 else clean_number
+
+
+def fill_phone_digits(model):
+    """전체 학생 phone_digits 재계산 -> {'updated', 'conflicts'}"""
+    rows = list(model.objects.order_by('id').values_list('id', 'phone_number', 'phone_digits'))
+    desired = {pk: phone_digits(phone) for pk, phone, _current in rows}
+    current = {pk: digits for pk, _phone, digits in rows}
+
+    owners = {}
+    for pk, digits in current.items():
+        if digits and desired[pk] == digits:
+            owners[digits] = pk
+    for pk, digits in desired.items():
+        if digits:
+            owners.setdefault(digits, pk)
+
+    final = {pk: digits if digits and owners[digits] == pk else None for pk, digits in desired.items()}
+    changed = [pk for pk in final if final[pk] != current[pk]]
+    if changed:
+        # 값이 서로 바뀌는 경우에도 유일 제약에 걸리지 않도록 먼저 비운 뒤 채움
+        model.objects.filter(pk__in=changed).update(phone_digits=None)
+        objs = [model(pk=pk, phone_digits=final[pk]) for pk in changed if final[pk]]
+        model.objects.bulk_update(objs, ['phone_digits'], batch_size=BATCH_SIZE)
+    return {
+        'updated': len(changed),
+        'conflicts': sum(1 for pk, digits in desired.items() if digits and final[pk] is None),
+    }
+
+
+# ------------------------------------------------------------------
+# 검색 키
+# ------------------------------------------------------------------
+def choseong(text):
+    """'김철수' -> 'ㄱㅊㅅ' (음절이 아닌 글자는 빼고, 이미 자음인 글자는 그대로)"""
+    out = []
+    for ch in text or '':
+        code = ord(ch)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_FIRST) // 588])
+        elif ch in JAMO_CONSONANTS:
+            out.append(ch)
+    return ''.join(out)
+
+
+def _normalize(text):
+    return ''.join((text or '').split()).lower()
+
+
+def search_key(name, username, phone):
+    """'|이름|초성|아이디|전화번호 숫자|' (구분자 | 때문에 검색어가 두 칸에 걸쳐 맞지 않음)"""
+    parts = []
+    for part in (_normalize(name), choseong(name), _normalize(username), phone_digits(phone)):
+        if part and part not in parts:
+            parts.append(part.replace('|', ''))
+    return ('|' + '|'.join(parts) + '|')[:SEARCH_KEY_LENGTH] if parts else ''
+
+
+def search_terms(query):
+    """
+    검색어 -> search_key 에서 찾을 문자열 목록 (모두 포함해야 일치, 공백/쉼표로 구분)
+      '010-1234' -> '0101234' / 'ㄱㅊ', '김ㅊ' -> 'ㄱㅊ' / 그 밖에는 소문자
+    """
+    terms = []
+    for term in re.split(r'[\s,]+', (query or '').lower()):
+        if PHONE_QUERY.fullmatch(term) and any(c.isdigit() for c in term):
+            term = phone_digits(term)
+        elif any(c in JAMO_CONSONANTS for c in term):
+            term = choseong(term)
+        term = term.replace('|', '')
+        if term:
+            terms.append(term)
+    return terms
+
+
+def number_suffix(number):
+    """OMR 수험번호(전화번호 뒤 자리) -> 아이디/전화번호 칸 끝과 맞출 문자열"""
+    digits = phone_digits(number)
+    return f'{digits}|' if digits else None
+
+
+def fill_search_keys(model):
+    """전체 학생 search_key 재계산 -> 바뀐 행 수"""
+    rows = model.objects.order_by('id').values_list('id', 'name', 'user__username', 'phone_number', 'search_key')
+    objs = []
+    for pk, name, username, phone, current in rows.iterator(chunk_size=BATCH_SIZE):
+        key = search_key(name, username, phone)
+        if key != current:
+            objs.append(model(pk=pk, search_key=key))
+    model.objects.bulk_update(objs, ['search_key'], batch_size=BATCH_SIZE)
+    return len(objs)
@@ -0,0 +1,453 @@
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import notifications, student_import, student_index
+from core.authentication import CachedTokenAuthentication
+from core.models import NotificationOutbox, StudentProfile
+from utils import cache_gen
+from utils.aligo import SendResult
+from vocab import services as vocab_services, wordpack
+from vocab.models import MasterWord, Word, WordBook, WordMeaning
+
+Status = NotificationOutbox.Status
+
+
+class StubAligo:
+    """
+    알리고 발송 API 흉내 (스레드에서 도는 http.server)
+    responses 에 (HTTP 상태, 응답 JSON 또는 None) 을 쌓아 두면 요청마다 하나씩 꺼내 돌려주고,
+    비어 있으면 성공(code 0)을 돌려줍니다. 응답 대신 'timeout' 을 넣으면 응답하지 않고 잠시 멈춥니다.
+    """
+    TIMEOUT_SLEEP = 0.5
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []      # (도착 시각, 폼 데이터)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+                with stub._lock:
+                    stub.requests.append((time.monotonic(), {k: v[0] for k, v in parse_qs(body).items()}))
+                    response = stub.responses.pop(0) if stub.responses else (200, {'code': 0, 'message': 'success'})
+                if response == 'timeout':
+                    time.sleep(stub.TIMEOUT_SLEEP)
+                    return
+                status, data = response
+                payload = json.dumps(data or {}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}/akv10/alimtalk/send/'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def receivers(self):
+        return [data['receiver_1'] for _at, data in self.requests]
+
+
+class NotificationDispatchTest(TestCase):
+    """
+    알림톡 발송 대기열 (core/notifications.py) - 알리고 대신 스텁 서버로 발송
+    중복 방지, 재시도/백오프, 영구 실패, 초당 발송 제한, 선점 겹침 없음
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = StubAligo()
+        cls.stub.start()
+        cls.settings_override = override_settings(
+            ALIGO_API_URL=cls.stub.url,
+            ALIGO_TIMEOUT=(1, 0.2),
+            NOTIFICATION_DISPATCH_ON_ENQUEUE=False,
+            NOTIFICATION_RATE_PER_SECOND=0,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.stub.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.stub.responses = []
+        self.stub.requests = []
+
+    def enqueue(self, recipient='010-1234-5678', ref='report:1', content='성적표'):
+        return notifications.enqueue('TPL_REPORT', recipient, ref, content)
+
+    # ------------------------------------------------------------------
+    # 중복 방지
+    # ------------------------------------------------------------------
+    def test_enqueue_dedupes_same_template_recipient_ref(self):
+        row, queued = self.enqueue()
+        self.assertTrue(queued)
+        self.assertEqual(row.recipient, '01012345678')
+
+        again, queued = self.enqueue(recipient='01012345678')
+        self.assertFalse(queued)
+        self.assertEqual(again.pk, row.pk)
+        self.assertEqual(again.status, Status.PENDING)
+
+        # ref 가 다르면 별도 발송
+        _other, queued = self.enqueue(ref='report:2')
+        self.assertTrue(queued)
+
+        self.assertEqual(notifications.dispatch(), {'sent': 2, 'retry': 0, 'failed': 0})
+        self.assertEqual(len(self.stub.requests), 2)
+
+        # 이미 보낸 건은 다시 넣어도 발송하지 않음
+        sent, queued = self.enqueue()
+        self.assertFalse(queued)
+        self.assertEqual(sent.status, Status.SENT)
+        self.assertEqual(notifications.dispatch(), {'sent': 0, 'retry': 0, 'failed': 0})
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_enqueue_requeues_failed_row(self):
+        row, _queued = self.enqueue(content='예전 내용')
+        self.stub.responses = [(200, {'code': -99, 'message': '템플릿 없음'})]
+        self.assertEqual(notifications.dispatch()['failed'], 1)
+
+        again, queued = self.enqueue(content='새 내용')
+        self.assertTrue(queued)
+        self.assertEqual(again.pk, row.pk)
+        row.refresh_from_db()
+        self.assertEqual(row.status, Status.PENDING)
+        self.assertEqual(row.attempts, 0)
+        self.assertEqual(row.last_error, '')
+        self.assertEqual(row.payload['content'], '새 내용')
+
+        self.assertEqual(notifications.dispatch(), {'sent': 1, 'retry': 0, 'failed': 0})
+        self.assertEqual(self.stub.requests[-1][1]['message_1'], '새 내용')
+
+    def test_enqueue_many_skips_existing_and_requeues_failed(self):
+        items = [
+            {'template_code': 'TPL_ABSENT', 'recipient': phone, 'ref': 'absent:1:2026-10-19', 'content': '결석'}
+            for phone in ('010-1111-1111', '010-2222-2222', '010-2222-2222', '')
+        ]
+        self.assertEqual(notifications.enqueue_many(items), 2)
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+
+        self.stub.responses = [(200, {'code': 0}), (200, {'code': -99, 'message': '수신 거부'})]
+        self.assertEqual(notifications.dispatch(workers=1), {'sent': 1, 'retry': 0, 'failed': 1})
+
+        notifications.enqueue_many(items)
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+        self.assertEqual(
+            dict(NotificationOutbox.objects.values_list('recipient', 'status')),
+            {'01011111111': Status.SENT, '01022222222': Status.PENDING},
+        )
+        self.assertEqual(notifications.dispatch(), {'sent': 1, 'retry': 0, 'failed': 0})
+        self.assertEqual(self.stub.receivers, ['01011111111', '01022222222', '01022222222'])
+
+    # ------------------------------------------------------------------
+    # 재시도 / 실패
+    # ------------------------------------------------------------------
+    def test_server_error_and_timeout_retry_with_backoff(self):
+        row, _queued = self.enqueue()
+        self.stub.responses = [(500, None), 'timeout', (503, None)]
+
+        started = timezone.now()
+        self.assertEqual(notifications.dispatch(max_attempts=3), {'sent': 0, 'retry': 1, 'failed': 0})
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Status.PENDING, 1))
+        self.assertEqual(row.last_error, 'HTTP 500')
+        self.assertGreaterEqual(row.next_attempt_at, started + notifications.backoff(1))
+
+        # 백오프 시각 전에는 다시 보내지 않음
+        self.assertEqual(notifications.dispatch(max_attempts=3), {'sent': 0, 'retry': 0, 'failed': 0})
+        self.assertEqual(len(self.stub.requests), 1)
+
+        # 시각이 지나면 다시 시도 -> 타임아웃도 재시도, 간격은 두 배로
+        NotificationOutbox.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+        started = timezone.now()
+        self.assertEqual(notifications.dispatch(max_attempts=3)['retry'], 1)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Status.PENDING, 2))
+        self.assertTrue(row.last_error.startswith('통신 오류'))
+        self.assertGreaterEqual(row.next_attempt_at, started + notifications.backoff(2))
+        self.assertEqual(notifications.backoff(2), 2 * notifications.backoff(1))
+
+        # max_attempts 를 다 쓰면 FAILED
+        NotificationOutbox.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(notifications.dispatch(max_attempts=3)['failed'], 1)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Status.FAILED, 3))
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_retry_then_success(self):
+        row, _queued = self.enqueue()
+        self.stub.responses = [(502, None)]
+        notifications.dispatch()
+        NotificationOutbox.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(notifications.dispatch(), {'sent': 1, 'retry': 0, 'failed': 0})
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts, row.last_error), (Status.SENT, 2, ''))
+        self.assertIsNotNone(row.sent_at)
+
+    def test_rejected_request_fails_without_retry(self):
+        row, _queued = self.enqueue()
+        self.stub.responses = [(200, {'code': -101, 'message': '인증 오류'})]
+
+        self.assertEqual(notifications.dispatch(), {'sent': 0, 'retry': 0, 'failed': 1})
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Status.FAILED, 1))
+        self.assertEqual(row.last_error, '-101: 인증 오류')
+        self.assertIsNone(row.next_attempt_at)
+
+        self.assertEqual(notifications.dispatch(), {'sent': 0, 'retry': 0, 'failed': 0})
+        self.assertEqual(len(self.stub.requests), 1)
+
+    # ------------------------------------------------------------------
+    # 초당 발송 제한
+    # ------------------------------------------------------------------
+    def test_rate_limit_spaces_requests_across_workers(self):
+        for i in range(6):
+            self.enqueue(recipient=f'010-0000-000{i}')
+        rate = 20   # 0.05초 간격
+
+        self.assertEqual(notifications.dispatch(workers=4, rate=rate)['sent'], 6)
+        arrivals = sorted(at for at, _data in self.stub.requests)
+        self.assertEqual(len(arrivals), 6)
+        # 워커 4개가 동시에 보내도 전체 간격은 (건수 - 1) / rate 이상
+        self.assertGreaterEqual(arrivals[-1] - arrivals[0], (len(arrivals) - 1) / rate * 0.9)
+
+    def test_rate_limiter_without_rate_does_not_wait(self):
+        limiter = notifications.RateLimiter(0)
+        started = time.monotonic()
+        for _ in range(100):
+            limiter.wait()
+        self.assertLess(time.monotonic() - started, 0.05)
+
+    # ------------------------------------------------------------------
+    # 선점
+    # ------------------------------------------------------------------
+    def test_claims_do_not_overlap(self):
+        for i in range(10):
+            self.enqueue(recipient=f'010-0000-00{i:02d}')
+
+        first = notifications.claim(6)
+        second = notifications.claim(10)
+        self.assertEqual(len(first), 6)
+        self.assertEqual(len(second), 4)
+        self.assertFalse({r.pk for r in first} & {r.pk for r in second})
+        self.assertEqual(notifications.claim(10), [])
+        self.assertNotEqual(first[0].claim_token, second[0].claim_token)
+        self.assertTrue(all(r.status == Status.SENDING and r.attempts == 1 for r in first + second))
+
+    def test_stale_claim_is_reclaimed_and_old_result_ignored(self):
+        self.enqueue()
+        stale = notifications.claim(1)[0]
+        NotificationOutbox.objects.filter(pk=stale.pk).update(
+            claimed_at=timezone.now() - notifications.CLAIM_TIMEOUT - timedelta(seconds=1),
+        )
+
+        fresh = notifications.claim(1)[0]
+        self.assertEqual(fresh.pk, stale.pk)
+        self.assertNotEqual(fresh.claim_token, stale.claim_token)
+        self.assertEqual(fresh.attempts, 2)
+
+        # 먼저 선점했던 발송기가 늦게 결과를 써도 반영되지 않음
+        notifications.record(stale, SendResult(ok=False, message='늦은 결과'), max_attempts=5)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, Status.SENDING)
+
+        notifications.record(fresh, SendResult(ok=True), max_attempts=5)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, Status.SENT)
+
+
+class CachedAuthStaleSaveTest(TestCase):
+    """
+    인증 캐시(core/authentication.py)에서 꺼낸 오래된 프로필을 저장해도
+    그 사이 bulk_update/update() 로 바뀐 값이 예전 값으로 덮어써지지 않음
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('student01')
+        profile = self.user.profile
+        profile.name = '김학생'
+        profile.phone_number = '010-1111-2222'
+        profile.save()
+        self.profile_id = profile.pk
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+        # 캐시에 올린 뒤, 시그널 없는 update() 로 변경 (일괄 등록의 bulk_update 와 같음)
+        self.auth.authenticate_credentials(self.token.key)
+        StudentProfile.objects.filter(pk=self.profile_id).update(
+            phone_number='010-3333-4444',
+            phone_digits='01033334444',
+            search_key=student_index.search_key('김학생', 'student01', '010-3333-4444'),
+        )
+        self.cached_user, _token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(self.cached_user.profile.phone_number, '010-1111-2222')  # 캐시는 아직 예전 값
+
+    def assertFreshRowKept(self):
+        row = StudentProfile.objects.get(pk=self.profile_id)
+        self.assertEqual(row.phone_number, '010-3333-4444')
+        self.assertEqual(row.phone_digits, '01033334444')
+        self.assertEqual(row.search_key, student_index.search_key('김학생', 'student01', '010-3333-4444'))
+        return row
+
+    def test_update_cooldown_writes_only_cooldown_fields(self):
+        vocab_services.update_cooldown(self.cached_user.profile, 'challenge', 0)
+        row = self.assertFreshRowKept()
+        self.assertIsNotNone(row.last_failed_at)
+
+    def test_user_save_does_not_write_cached_profile(self):
+        self.cached_user.username = 'student02'
+        self.cached_user.save()
+        row = StudentProfile.objects.get(pk=self.profile_id)
+        self.assertEqual(row.phone_number, '010-3333-4444')
+        self.assertEqual(row.phone_digits, '01033334444')
+        # 아이디가 바뀐 search_key 는 다시 읽은 이름/전화번호로 계산
+        self.assertEqual(row.search_key, student_index.search_key('김학생', 'student02', '010-3333-4444'))
+
+
+class CacheGenerationTest(TestCase):
+    """세대 키 (utils/cache_gen.py) - 커밋 후에만, 매번 새 값으로 바뀜"""
+    KEY = 'test:cache_gen:gen'
+
+    def test_bump_waits_for_commit(self):
+        gen = cache_gen.generation(self.KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                cache_gen.bump(self.KEY)
+                # 커밋 전에는 다른 워커가 새 세대로 커밋 전 데이터를 캐시하지 않도록 그대로
+                self.assertEqual(cache_gen.generation(self.KEY), gen)
+        self.assertNotEqual(cache_gen.generation(self.KEY), gen)
+
+    def test_bumps_never_repeat(self):
+        seen = {cache_gen.generation(self.KEY)}
+        for _ in range(20):
+            with self.captureOnCommitCallbacks(execute=True):
+                cache_gen.bump(self.KEY)
+            seen.add(cache_gen.generation(self.KEY))
+        self.assertEqual(len(seen), 21)
+
+
+class ImportInvalidatesAuthCacheTest(TestCase):
+    """학생 일괄 등록(bulk_update, 시그널 없음) 뒤 인증 캐시가 비워져 비활성화/수정이 바로 반영됨"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('01011112222')
+        profile = self.user.profile
+        profile.name = '김학생'
+        profile.save()
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+        self.auth.authenticate_credentials(self.token.key)   # 캐시에 올림
+
+    def run_import(self, is_active, name):
+        row = student_import.StudentRow(row=2, username='01011112222', is_active=is_active, fields={'name': name})
+        with self.captureOnCommitCallbacks(execute=True):
+            report = student_import.import_students([row])
+        self.assertEqual(len(report.updated), 1)
+
+    def test_deactivated_student_is_rejected(self):
+        self.run_import(is_active=False, name='김학생')
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_profile_edit_is_visible(self):
+        self.run_import(is_active=True, name='이학생')
+        user, _token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user.profile.name, '이학생')
+
+
+class WordPackMeaningVersionTest(TestCase):
+    """단어팩 pos 는 WordMeaning 에서 오므로 뜻이 추가/변경/삭제되면 그 단어를 쓰는 책의 팩 버전이 올라야 함"""
+
+    def setUp(self):
+        admin = User.objects.create_user('packadmin', is_staff=True)
+        self.master = MasterWord.objects.create(text='run')
+        self.books = [WordBook.objects.create(title=f'book{i}', uploaded_by=admin) for i in range(2)]
+        for book in self.books:
+            Word.objects.create(book=book, master_word=self.master, english='run', korean='달리다')
+        self.other = WordBook.objects.create(title='other', uploaded_by=admin)
+
+    def versions(self):
+        return [WordBook.objects.get(pk=b.pk).pack_version for b in self.books]
+
+    def test_new_meaning_changes_pack_and_delta(self):
+        book = WordBook.objects.get(pk=self.books[0].pk)
+        raw, _gz = wordpack.get_pack_bytes(book)
+        self.assertEqual(json.loads(raw)['pos'], ['v'])   # 등록된 뜻이 없으면 추정 품사
+        before = self.versions()
+
+        vocab_services.sync_master_meanings(self.master, 'adj. 달리다')
+
+        after = self.versions()
+        self.assertTrue(all(a > b for a, b in zip(after, before)))
+        book.refresh_from_db()
+        raw, _gz = wordpack.get_pack_bytes(book)
+        self.assertEqual(json.loads(raw)['pos'], ['adj'])
+        delta = wordpack.build_pack(book, since_version=before[0])
+        self.assertEqual(delta['english'], ['run'])
+        self.assertEqual(delta['pos'], ['adj'])
+
+    def test_pos_change_and_delete_bump(self):
+        wm = WordMeaning.objects.create(master_word=self.master, meaning='달리다', pos='n')
+        before = self.versions()
+        wm.pos = 'v'
+        wm.save(update_fields=['pos'])
+        mid = self.versions()
+        self.assertTrue(all(a > b for a, b in zip(mid, before)))
+        wm.delete()
+        self.assertTrue(all(a > b for a, b in zip(self.versions(), mid)))
+
+    def test_unrelated_book_untouched(self):
+        version = WordBook.objects.get(pk=self.other.pk).pack_version
+        WordMeaning.objects.create(master_word=self.master, meaning='운영하다', pos='v')
+        self.assertEqual(WordBook.objects.get(pk=self.other.pk).pack_version, version)
+
+
+class BranchReportJobInputTest(TestCase):
+    """지점 성적표 일괄 생성: 잘못된 branch_id 는 500 이 아니라 400"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('jobadmin', is_staff=True))
+        self.url = reverse('reports:branch_report_job-list')
+
+    def test_non_numeric_branch_id(self):
+        res = self.client.post(self.url, {'branch_id': 'abc', 'dry_run': '1'}, format='json')
+        self.assertEqual(res.status_code, 400)
+
+    def test_missing_or_unknown_branch_id(self):
+        for data in ({'dry_run': '1'}, {'branch_id': 999999, 'dry_run': '1'}):
+            res = self.client.post(self.url, data, format='json')
+            self.assertEqual(res.status_code, 400)
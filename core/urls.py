@@ -1,7 +1,7 @@
 from django.urls import path, include
 from . import views
 from rest_framework.routers import DefaultRouter
-from .views_api import MessageViewSet, SchoolViewSet, StudentRegistrationViewSet, StaffRegistrationViewSet, StudentManagementViewSet, StaffManagementViewSet, BranchManagementViewSet, SchoolManagementViewSet, AnnouncementViewSet
+from .views_api import MessageViewSet, SchoolViewSet, StudentRegistrationViewSet, StaffRegistrationViewSet, StudentManagementViewSet, StaffManagementViewSet, BranchManagementViewSet, SchoolManagementViewSet, AnnouncementViewSet, MetadataViewSet
 
 router = DefaultRouter()
 router.register(r'messages', MessageViewSet, basename='message')
@@ -13,6 +13,7 @@ router.register(r'management/staff', StaffManagementViewSet, basename='managemen
 router.register(r'management/branches', BranchManagementViewSet, basename='management-branch')
 router.register(r'management/schools', SchoolManagementViewSet, basename='management-school')
 router.register(r'announcements', AnnouncementViewSet, basename='announcement')
+router.register(r'metadata', MetadataViewSet, basename='metadata') # [NEW] 폼 메타데이터 묶음
 
 app_name = 'core'  # [중요] 나중에 'core:login' 처럼 부르기 위해 필요
 
@@ -16,6 +16,7 @@ from datetime import timedelta, time
 from .models import StudentProfile, ClassTime, Popup 
 # academy 앱의 모델들
 from academy.models import Attendance, TemporarySchedule, ClassLog
+from academy import scheduling
 
 def login_view(request):
     """로그인 페이지 처리"""
@@ -120,74 +121,36 @@ def student_home(request):
     # ==========================================
     # [1] 오늘 수업 시간표 구하기 (복잡한 로직)
     # ==========================================
-    weekday_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-    today_code = weekday_map[today.weekday()]
-    
+    # [FIX] 정규/추가/보강 해석은 academy.scheduling 엔진에 위임 (쿼리 1회)
     schedules = []
-
-    # 1-1. 정규 수업 (구문/독해/추가)
-    # (A) 구문 수업
-    if profile.syntax_class and profile.syntax_class.day == today_code:
-        is_moved = TemporarySchedule.objects.filter(
-            student=profile, original_date=today, subject='SYNTAX'
-        ).exists()
-        if not is_moved:
+    for session in scheduling.resolve_sessions([profile], today):
+        ts = session['schedule']
+        if session['source'] == scheduling.SOURCE_MAKEUP:
+            # 1-2. 보강/일정변경 (오늘 날짜로 새로 잡힌 수업)
             schedules.append({
-                'type': '정규',
-                'subject': '구문',
-                'time': profile.syntax_class,
-                'teacher': profile.syntax_teacher
+                'type': "보강" if ts.is_extra_class else "변경됨",
+                'subject': ts.get_subject_display(),
+                'time_obj': ts,
+                'start_time': session['start_time'],
+                'teacher': session['teacher']
             })
-
-    # (B) 독해 수업
-    if profile.reading_class and profile.reading_class.day == today_code:
-        is_moved = TemporarySchedule.objects.filter(
-            student=profile, original_date=today, subject='READING'
-        ).exists()
-        if not is_moved:
+        elif session['is_extra']:
+            # 1-1. (C) 추가 수업
+            schedules.append({
+                'type': '추가',
+                'subject': f"{profile.get_extra_class_type_display()} (추가)",
+                'time': session['class_time'],
+                'teacher': session['teacher']
+            })
+        else:
+            # 1-1. (A)(B) 구문/독해 정규 수업
             schedules.append({
                 'type': '정규',
-                'subject': '독해',
-                'time': profile.reading_class,
-                'teacher': profile.reading_teacher
+                'subject': '구문' if session['subject'] == 'SYNTAX' else '독해',
+                'time': session['class_time'],
+                'teacher': session['teacher']
             })
-
-    # (C) 추가 수업
-    if profile.extra_class and profile.extra_class.day == today_code:
-        # 추가 수업은 보통 이동 개념이 없으므로 그대로 표시
-        label = f"{profile.get_extra_class_type_display()} (추가)"
-        schedules.append({
-            'type': '추가',
-            'subject': label,
-            'time': profile.extra_class,
-            'teacher': profile.extra_class_teacher
-        })
-
-    # 1-2. 보강/일정변경 (오늘 날짜로 새로 잡힌 수업)
-    temp_schedules = TemporarySchedule.objects.filter(student=profile, new_date=today)
-    for ts in temp_schedules:
-        # 선생님 정보 찾기
-        teacher = None
-        if ts.subject == 'SYNTAX': teacher = profile.syntax_teacher
-        elif ts.subject == 'READING': teacher = profile.reading_teacher
-        
-        # 라벨 설정 (보강 vs 일정변경)
-        label_type = "보강" if ts.is_extra_class else "변경됨"
-        
-        schedules.append({
-            'type': label_type,
-            'subject': ts.get_subject_display(),
-            'time_obj': ts,
-            'start_time': ts.new_start_time,
-            'teacher': teacher
-        })
-
-    # 1-3. 시간순 정렬
-    def get_start_time(item):
-        if 'start_time' in item: return item['start_time']
-        return item['time'].start_time
-    
-    schedules.sort(key=get_start_time)
+    # (엔진 결과가 이미 시작 시간 순으로 정렬되어 있음)
 
     # [2] 출석 현황 (오늘)
     attendance = Attendance.objects.filter(student=profile, date=today).first()
@@ -6,7 +6,12 @@ from .models import Message, School, StudentProfile, StaffProfile
 from .models import Message, School, StudentProfile, StaffProfile
 from .models.announcement import Announcement # [NEW]
 from .serializers import MessageSerializer, StudentProfileSerializer, StaffProfileSerializer, AnnouncementSerializer # [NEW]
+from .serializers import StudentListSerializer, STUDENT_LIST_RELATED, log_dates_for
+from . import metadata, student_import, student_index
+from django.db.models import Prefetch
 from django.utils import timezone
+from datetime import date, timedelta
+from utils import cursor as keyset
 
 class MessageViewSet(viewsets.ModelViewSet):
     """
@@ -61,19 +66,36 @@ class SchoolViewSet(viewsets.ViewSet):
 
     def list(self, request):
         branch_id = request.query_params.get('branch_id')
-        queryset = School.objects.all().order_by('name')
 
         # [Auto-Detect logic]
-        if not branch_id and hasattr(request.user, 'staff_profile') and request.user.staff_profile.branch:
-             branch_id = request.user.staff_profile.branch.id
+        if not branch_id:
+            branch = metadata.user_branch(request.user)
+            branch_id = branch.id if branch else None
 
-        if branch_id:
-            # 해당 지점의 학생이 재학 중인 학교만 필터링
-            # related_name이 명시되지 않았을 수 있으므로 'studentprofile' 사용
-            queryset = queryset.filter(studentprofile__branch_id=branch_id).distinct()
-        
-        data = [{'id': s.id, 'name': s.name} for s in queryset]
-        return Response(data)
+        # 해당 지점의 학생이 재학 중인 학교만 필터링
+        # [FIX] 지점별로 캐시 (core.metadata, ETag/304 지원)
+        try:
+            branch_id = int(branch_id) if branch_id else None
+        except ValueError:
+            return Response({'error': 'branch_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        data, etag = metadata.schools(branch_id)
+        return metadata.respond(request, data, etag)
+
+
+class MetadataViewSet(viewsets.ViewSet):
+    """
+    [NEW] 폼 메타데이터 묶음 API (요청 1회)
+    student_registration / staff_registration / schools 를 한 번에 반환 (ETag/304 지원)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        try:
+            branch_id = int(request.query_params['branch_id']) if request.query_params.get('branch_id') else None
+        except ValueError:
+            return Response({'error': 'branch_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        data, etag = metadata.bundle(request.user, branch_id)
+        return metadata.respond(request, data, etag)
 
 from django.contrib.auth.models import User
 from .models import StaffProfile, StudentProfile, ClassTime, Branch
@@ -91,71 +113,10 @@ class StudentRegistrationViewSet(viewsets.ViewSet):
         등록 폼에 필요한 메타데이터 반환 (학교, 선생님, 시간표 등)
         """
 
-        user = request.user
-        branch = None
-        if hasattr(user, 'staff_profile') and user.staff_profile.branch:
-            branch = user.staff_profile.branch
-
+        # [FIX] 지점/학교/선생님/시간표는 캐시 (core.metadata, ETag/304 지원), 잠긴 구문 슬롯만 매번 조회
         try:
-            # 1. Schools
-            schools = School.objects.all()
-            if branch:
-                schools = schools.filter(branches=branch)
-
-            # 2. Teachers (Syntax, Reading, Extra)
-            teachers = User.objects.filter(is_active=True, staff_profile__isnull=False)
-            if branch:
-                teachers = teachers.filter(staff_profile__branch=branch)
-
-            # 3. ClassTimes
-            classes = ClassTime.objects.all().order_by('day', 'start_time')
-            if branch:
-                classes = classes.filter(Q(branch=branch) | Q(branch__isnull=True))
-
-            # 4. Booked Syntax Slots (For 1:1 locking)
-            booked_slots = StudentProfile.objects.filter(
-                syntax_teacher__isnull=False, 
-                syntax_class__isnull=False
-            ).values('syntax_teacher_id', 'syntax_class_id', 'syntax_class__day') # Added day for easier debugging if needed
-
-            classes_data = []
-            seen_keys = set()
-            for c in classes:
-                time_str = c.start_time.strftime('%H:%M') if c.start_time else ''
-                key = (c.branch_id, c.day, time_str, c.class_type)
-                if key in seen_keys:
-                    continue
-                seen_keys.add(key)
-                classes_data.append({
-                    'id': c.id,
-                    'name': str(c),
-                    'branch_id': c.branch_id,
-                    'day': c.day,
-                    'time': time_str,
-                    'type': c.class_type # Use actual DB field
-                })
-
-            # 5. Branches
-            branches = Branch.objects.all()
-            if branch: # user specific branch
-                 branches = branches.filter(id=branch.id)
-            
-            data = {
-                'branches': [{'id': b.id, 'name': b.name} for b in branches],
-                'schools': [{'id': s.id, 'name': s.name, 'branches': list(s.branches.values_list('id', flat=True))} for s in schools],
-                'teachers': [{
-                    'id': t.id,
-                    'name': t.staff_profile.name or t.username,
-                    'is_syntax': t.staff_profile.is_syntax_teacher,
-                    'is_reading': t.staff_profile.is_reading_teacher,
-                    'position': t.staff_profile.position
-                } for t in teachers],
-                'classes': classes_data,
-                'booked_syntax_slots': list(booked_slots), # [NEW]
-                'default_branch_id': branch.id if branch else None,
-                'default_branch_name': branch.name if branch else "지점 미정",
-            }
-            return Response(data)
+            data, etag = metadata.student_registration(metadata.user_branch(request.user))
+            return metadata.respond(request, data, etag)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -227,19 +188,9 @@ class StaffRegistrationViewSet(viewsets.ViewSet):
         선생님 등록 폼 메타데이터 (지점, 직책 옵션 등)
         """
         try:
-            # 1. Branches
-            branches = Branch.objects.all().values('id', 'name')
-            
-            # 2. Position Choices
-            positions = [
-                {'value': code, 'label': label} 
-                for code, label in StaffProfile.POSITION_CHOICES
-            ]
-
-            return Response({
-                'branches': list(branches),
-                'positions': positions,
-            })
+            # [FIX] 지점 목록/직책 옵션은 캐시 (core.metadata, ETag/304 지원)
+            data, etag = metadata.staff_registration()
+            return metadata.respond(request, data, etag)
         except Exception as e:
              return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -279,14 +230,25 @@ class StaffRegistrationViewSet(viewsets.ViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class StudentSearchFilter(filters.SearchFilter):
+    """
+    [NEW] ?search= 를 StudentProfile.search_key 컬럼 하나에서 부분 일치로 찾음 (유저 테이블 조인 없이 학생 테이블만 훑음)
+    이름/아이디/전화번호에 더해 대시가 들어간 번호 일부('010-1234'), 이름 초성('ㄱㅊㅅ')도 찾음
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for term in student_index.search_terms(request.query_params.get(self.search_param, '')):
+            queryset = queryset.filter(search_key__contains=term)
+        return queryset
+
+
 class StudentManagementViewSet(viewsets.ModelViewSet):
     """
     학생 관리 API (전체 목록, 검색)
     """
     serializer_class = StudentProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['name', 'user__username', 'phone_number']
+    filter_backends = [StudentSearchFilter]
 
     def get_queryset(self):
         user = self.request.user
@@ -346,6 +308,62 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
             
         return queryset.order_by('-user__is_active', 'base_grade', 'name')
 
+    LOG_HISTORY_DAYS = 90  # [NEW] 목록의 log_history / temp_schedules 기본 기간
+
+    def get_serializer_class(self):
+        # [FIX] 목록은 가벼운 StudentListSerializer, 상세/수정은 전체 필드
+        if self.action == 'list':
+            return StudentListSerializer
+        return StudentProfileSerializer
+
+    def list(self, request, *args, **kwargs):
+        """
+        학생 목록 (파라미터가 없으면 기존처럼 전체 배열)
+        [NEW] 선택 파라미터
+          - log_from: YYYY-MM-DD. log_history / temp_schedules 기간 시작 (기본: 오늘 - 90일)
+          - limit / page: 페이지 (page 는 1부터, 다음 페이지가 있으면 X-Has-More: 1, X-Next-Page 헤더)
+        """
+        from academy.models import TemporarySchedule
+        queryset = self.filter_queryset(self.get_queryset())
+        params = request.query_params
+        try:
+            log_from = date.fromisoformat(params['log_from']) if params.get('log_from') else (
+                timezone.now().date() - timedelta(days=self.LOG_HISTORY_DAYS)
+            )
+            paged = bool(params.get('limit') or params.get('page'))
+            limit = keyset.clamp_limit(params.get('limit'))
+            page = max(1, int(params.get('page') or 1))
+        except ValueError:
+            return Response({'error': 'invalid parameter format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 정렬(재원 여부, 학년, 이름)이 복합이라 keyset 대신 offset 페이지, 같은 값은 id 로 고정
+        queryset = queryset.order_by(*queryset.query.order_by, 'id').select_related(*STUDENT_LIST_RELATED).prefetch_related(
+            Prefetch(
+                'temp_schedules',
+                queryset=TemporarySchedule.objects.filter(
+                    Q(new_date__gte=log_from) | Q(original_date__gte=log_from)
+                ).order_by('id'),
+                to_attr='recent_temp_schedules',
+            )
+        )
+        has_more = False
+        if paged:
+            offset = (page - 1) * limit
+            students = list(queryset[offset:offset + limit + 1])
+            has_more = len(students) > limit
+            students = students[:limit]
+        else:
+            students = list(queryset)
+
+        context = self.get_serializer_context()
+        context['log_dates'] = log_dates_for([s.id for s in students], log_from)
+        response = Response(self.get_serializer(students, many=True, context=context).data)
+        if paged:
+            response['X-Has-More'] = '1' if has_more else '0'
+            if has_more:
+                response['X-Next-Page'] = str(page + 1)
+        return response
+
     def perform_destroy(self, instance):
         # Profile 삭제 시 User도 함께 삭제 (Cascade로 Profile도 자동 삭제됨)
         instance.user.delete()
@@ -388,8 +406,6 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
             # Column Mapping (Excel Col -> Variable)
             # 이름(학교), 담당선생님, 수업요일, 수업시간, 독해선생님, 독해수업요일, 독해수업시간, 입/퇴원, 학생이름, 학교, 학년, 학생 H.P, 어머니 H.P, 아버지 H.P, 주소
             
-            created_count = 0
-            updated_count = 0
             errors = []
             
             # Grade Mapping
@@ -405,6 +421,12 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
                 '월': 'Mon', '화': 'Tue', '수': 'Wed', '목': 'Thu', '금': 'Fri', '토': 'Sat', '일': 'Sun'
             }
 
+            # [FIX] 행마다 get_or_create/set_password/save 하던 방식 -> 시트 전체를 StudentRow 로 읽은 뒤
+            #       core.student_import 가 검증 후 일괄 저장 (비밀번호 해시는 프로세스 풀)
+            staff_profile = getattr(request.user, 'staff_profile', None)
+            uploader_branch = staff_profile.branch if staff_profile else None
+            rows = []
+
             for index, row in df.iterrows():
                 try:
                     # 1. Basic Validation
@@ -427,65 +449,43 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
                     clean_phone = re.sub(r'[^0-9]', '', phone)
                     if not clean_phone: continue
 
-                    username = clean_phone
-                    
-                    user, created = User.objects.get_or_create(username=username)
-                    if created:
-                        # Default Password: Last 4 digits or '1234'
-                        pw = clean_phone[-4:] if len(clean_phone) >= 4 else '1234'
-                        user.set_password(pw)
-                        created_count += 1
-                    else:
-                        updated_count += 1
-                    
-                    user.is_active = is_active # Sync status
-                    user.save()
+                    # Default Password: Last 4 digits or '1234' (새 계정만)
+                    pw = clean_phone[-4:] if len(clean_phone) >= 4 else '1234'
+                    fields = {'name': name, 'phone_number': phone}
 
-                    # 3. Create/Update Profile
-                    # Ensure profile exists (signal should create it, but safe to get_or_create)
-                    if not hasattr(user, 'profile'):
-                        StudentProfile.objects.create(user=user, name=name)
-                    
-                    profile = user.profile
-                    profile.name = name
-                    profile.phone_number = phone
-                    
                     # 4. School
                     school_name = str(row['학교']).strip()
-                    if school_name and school_name != 'nan':
-                        school, _ = School.objects.get_or_create(name=school_name)
-                        profile.school = school
-                        # Branch assignment? We can infer from Staff who is uploading? 
-                        # For now, if user has branch assignment, use that?
-                        # Or if school has branch?
-                        if hasattr(request.user, 'staff_profile') and request.user.staff_profile.branch:
-                             profile.branch = request.user.staff_profile.branch
+                    if school_name == 'nan':
+                        school_name = ''
+                    if school_name and uploader_branch:
+                        # Branch assignment: 업로드한 선생님의 지점
+                        fields['branch'] = uploader_branch
                     
                     # 5. Grade
                     grade_str = str(row['학년']).strip()
                     # Extract grade part if mixed (e.g. '고1(휴학)')
                     # Simple map check
                     if grade_str in GRADE_MAP:
-                        profile.base_grade = GRADE_MAP[grade_str]
-                        profile.base_year = timezone.now().year # Reset base year to now for correct calculation
+                        fields['base_grade'] = GRADE_MAP[grade_str]
+                        fields['base_year'] = timezone.now().year # Reset base year to now for correct calculation
                     
                     # 6. Parents
                     mom_phone = str(row['어머니 H.P']).strip()
                     if mom_phone and mom_phone != 'nan':
-                        profile.parent_phone_mom = mom_phone
+                        fields['parent_phone_mom'] = mom_phone
                         
                     dad_phone = str(row['아버지 H.P']).strip()
                     if dad_phone and dad_phone != 'nan':
-                        profile.parent_phone_dad = dad_phone
+                        fields['parent_phone_dad'] = dad_phone
                         
                     # 7. Address & Memo
                     addr = str(row['주소']).strip()
                     if addr and addr != 'nan':
-                        profile.address = addr
+                        fields['address'] = addr
                         
                     memo = str(row['특이사항']).strip()
                     if memo and memo != 'nan':
-                        profile.memo = memo
+                        fields['memo'] = memo
 
                     # 8. Start Date
                     start_date_val = row['수업시작일']
@@ -493,7 +493,7 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
                          # Timestamp to Date
                          try:
                             if hasattr(start_date_val, 'date'):
-                                profile.start_date = start_date_val.date()
+                                fields['start_date'] = start_date_val.date()
                          except:
                             pass
 
@@ -534,51 +534,34 @@ class StudentManagementViewSet(viewsets.ModelViewSet):
                         except:
                             return None
 
-                    # Syntax
-                    syntax_day_str = str(row['수업요일']).strip()
-                    
-                    if syntax_day_str in DAY_MAP:
-                        day_code = DAY_MAP[syntax_day_str]
-                        is_weekend = day_code in ['Sat', 'Sun']
-                        
-                        time_obj = parse_time_custom(row['수업시간'], is_weekend)
-                        
-                        if time_obj:
-                            # Find ClassTime
-                            cts = ClassTime.objects.filter(
-                                day=day_code,
-                                class_type='SYNTAX',
-                                start_time=time_obj
-                            )
-                            if cts.exists():
-                                profile.syntax_class = cts.first()
-
-                    # Reading
-                    reading_day_str = str(row['독해수업요일']).strip()
-                    
-                    if reading_day_str in DAY_MAP:
-                        day_code = DAY_MAP[reading_day_str]
-                        is_weekend = day_code in ['Sat', 'Sun']
-
-                        time_obj = parse_time_custom(row['독해수업시간'], is_weekend)
-
-                        if time_obj:
-                            cts = ClassTime.objects.filter(
-                                day=day_code,
-                                class_type='READING',
-                                start_time=time_obj
-                            )
-                            if cts.exists():
-                                profile.reading_class = cts.first()
-
-                    profile.save()
+                    # 시간표는 (요일, 유형, 시작 시간) 키만 모아 두고 import_students 가 한 번에 찾음 (없으면 그대로 둠)
+                    classes = {}
+                    for attr, day_col, time_col, class_type in (
+                        ('syntax_class', '수업요일', '수업시간', 'SYNTAX'),
+                        ('reading_class', '독해수업요일', '독해수업시간', 'READING'),
+                    ):
+                        day_str = str(row[day_col]).strip()
+                        if day_str in DAY_MAP:
+                            day_code = DAY_MAP[day_str]
+                            time_obj = parse_time_custom(row[time_col], day_code in ['Sat', 'Sun'])
+                            if time_obj:
+                                classes[attr] = (day_code, class_type, time_obj)
+
+                    rows.append(student_import.StudentRow(
+                        row=index, username=clean_phone, is_active=is_active, fields=fields,
+                        school_name=school_name, classes=classes, password=pw,
+                    ))
 
                 except Exception as row_e:
                     errors.append(f"Row {index}: {str(row_e)}")
 
+            # [NEW] ?dry_run=1 이면 저장하지 않고 변경 내역(report)만 반환
+            report = student_import.import_students(rows, dry_run=request.query_params.get('dry_run') == '1')
+            errors += [f"Row {s['row']}: {s['reason']}" for s in report.skipped]
             return Response({
-                'message': f'Upload Complete. Created: {created_count}, Updated: {updated_count}',
-                'errors': errors[:10] # Return first 10 errors
+                'message': f'Upload Complete. {report.summary()}',
+                'errors': errors[:10], # Return first 10 errors
+                'report': report.as_dict(),
             })
         except Exception as e:
             try:
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import MockExam, MockExamInfo, MockExamQuestion
+from core import student_index
 from core.models import StudentProfile
 from .serializers import (
     MockExamSerializer, MockExamInfoSerializer, 
@@ -107,6 +108,21 @@ class MockExamViewSet(viewsets.ReadOnlyModelViewSet):
             return MockExam.objects.filter(student=user.profile).order_by('-exam_date')
         return MockExam.objects.none()
 
+def find_student_by_number(number):
+    """
+    [NEW] OMR 수험번호 -> 학생 (없으면 None)
+    출석 코드(인덱스)가 먼저, 없으면 아이디/전화번호 끝자리를 search_key 컬럼 하나에서 부분 일치로 찾음 (인덱스 없이 훑지만 유저 조인 없음)
+    """
+    students = StudentProfile.objects.select_related('school', 'user')
+    student = students.filter(attendance_code=number).first()
+    if student is None:
+        suffix = student_index.number_suffix(number)
+        candidates = list(students.filter(search_key__contains=suffix).order_by('id')[:10]) if suffix else []
+        # 기존 순서대로 아이디 끝자리 일치를 전화번호보다 먼저
+        student = next((s for s in candidates if s.user.username.endswith(number)), None) or next(iter(candidates), None)
+    return student
+
+
 class OMRScanView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -153,17 +169,9 @@ class OMRScanView(views.APIView):
                 else:
 
                     try:
-                        # [Modified] 1. Try Attendance Code
-                        student = StudentProfile.objects.filter(attendance_code=student_id_str).first()
-
-                        # 2. Fallback: Try Username (Phone) EndsWith
-                        if not student:
-                            # If student_id_str is 8 digits (e.g. 12345678), matched against 01012345678
-                            student = StudentProfile.objects.filter(user__username__endswith=student_id_str).first()
-                        
-                        # 3. Fallback: Try Phone Number EndsWith
-                        if not student:
-                             student = StudentProfile.objects.filter(phone_number__endswith=student_id_str).first()
+                        # [Modified] 출석 코드 -> 아이디(전화번호) 끝자리 -> 전화번호 끝자리
+                        # If student_id_str is 8 digits (e.g. 12345678), matched against 01012345678
+                        student = find_student_by_number(student_id_str)
 
                         if not student:
                             raise StudentProfile.DoesNotExist
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import Branch
+from reports import services
+from utils.background import default_workers
+
+
+class Command(BaseCommand):
+    help = "Generate monthly reports (MonthlyReport + StudentReport) for every active student in a branch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("branch", type=int, help="Branch id.")
+        parser.add_argument("--year", type=int, help="Report year (default: current year).")
+        parser.add_argument("--month", type=int, help="Report month (default: current month).")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=default_workers(),
+            help="Worker processes (1 = sequential in this process).",
+        )
+        parser.add_argument(
+            "--teacher",
+            type=int,
+            help="User id recorded as the issuing teacher on StudentReport.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate even if the student already has reports for the month.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show which students would be generated or skipped.",
+        )
+
+    def handle(self, *args, **options):
+        if not Branch.objects.filter(pk=options["branch"]).exists():
+            raise CommandError(f"Branch {options['branch']} does not exist.")
+
+        now = timezone.now()
+        year = options["year"] or now.year
+        month = options["month"] or now.month
+        dry_run = options["dry_run"]
+        started = time.perf_counter()
+        done = 0
+
+        def on_result(student_id, status, error):
+            # 완료 순서대로 진행 상황 출력 (중단되어도 다시 실행하면 이미 만든 학생은 건너뜀)
+            nonlocal done
+            done += 1
+            if error:
+                self.stderr.write(f"[{done}] student {student_id}: FAILED ({error})")
+            elif options["verbosity"] >= 2 or (dry_run and status == services.STATUS_PLANNED):
+                self.stdout.write(f"[{done}] student {student_id}: {status}")
+            elif done % 50 == 0:
+                self.stdout.write(f"[{done}] {time.perf_counter() - started:.1f}s")
+
+        summary = services.generate_branch_reports(
+            options["branch"], year, month,
+            teacher_id=options["teacher"],
+            workers=options["workers"],
+            force=options["force"],
+            dry_run=dry_run,
+            on_result=on_result,
+        )
+
+        elapsed = time.perf_counter() - started
+        prefix = "[DRY RUN] " if dry_run else ""
+        message = (
+            f"{prefix}{year}-{month:02d}: total {summary['total']}, created {summary['created']}, "
+            f"planned {summary['planned']}, skipped {summary['skipped']}, failed {summary['failed']} "
+            f"({elapsed:.1f}s, workers={1 if dry_run else options['workers']})"
+        )
+        self.stdout.write(self.style.ERROR(message) if summary["failed"] else self.style.SUCCESS(message))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_reportshare'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlyreport',
+            name='rendered_etag',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='렌더링 ETag'),
+        ),
+        migrations.AddField(
+            model_name='monthlyreport',
+            name='rendered_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='렌더링된 성적표 HTML'),
+        ),
+    ]
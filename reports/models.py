@@ -62,6 +62,10 @@ class MonthlyReport(models.Model):
     # 선생님의 종합 코멘트 (가장 상단에 뜰 편지)
     overall_comment = models.TextField(blank=True, verbose_name="선생님 총평")
 
+    # [NEW] 학부모 화면 HTML 을 미리 렌더링해 둔 산출물 (비어 있으면 다음 조회 때 렌더링)
+    rendered_html = models.TextField(blank=True, editable=False, verbose_name="렌더링된 성적표 HTML")
+    rendered_etag = models.CharField(max_length=64, blank=True, editable=False, verbose_name="렌더링 ETag")
+
     def __str__(self):
         return f"{self.year}년 {self.month}월 - {self.student.name}"
 
@@ -0,0 +1,303 @@
+# reports/services.py
+"""
+월간 성적표 생성 서비스
+
+- build_monthly_report      : MonthlyReport(학생, 연, 월) 집계 생성/갱신 (create_monthly_report 뷰와 동일 규칙)
+- generate_student_reports  : 학생 1명의 월간 성적표 + 웹 성적표(academy.StudentReport) 발행
+- generate_branch_reports   : 지점 재원생 전체를 utils.background.run_parallel 로 분산 발행
+    · 이미 같은 기간 성적표가 모두 있는 학생은 건너뜀 (중단 후 다시 실행하면 이어서 진행, force 로 무시)
+      건너뛸 학생은 워커로 보내기 전에 부모 프로세스에서 한 번에 판별
+    · dry_run 이면 대상/건너뛸 학생만 계산 (워커를 띄우지 않음)
+- refresh_report_artifact / get_report_artifact : 학부모 화면 HTML 을 미리 렌더링해 저장 (ETag = 본문 해시)
+- record_share_view / flush_share_views         : 공유 링크 조회수를 프로세스 메모리에 모았다가 주기적으로 한 번에 반영
+"""
+import atexit
+import calendar
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.template.loader import render_to_string
+
+from academy.models import Attendance, StudentReport
+from core.models import StudentProfile
+from exam.models import ExamResult
+from utils import background
+from utils.background import run_parallel
+from utils.http_cache import content_etag
+from vocab.models import MonthlyTestResult, TestResult
+from .models import MonthlyReport, ReportShare
+
+logger = logging.getLogger(__name__)
+
+STATUS_CREATED = 'created'
+STATUS_SKIPPED = 'skipped'
+STATUS_PLANNED = 'planned'
+STATUS_FAILED = 'failed'
+
+
+def month_range(year, month):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def build_monthly_report(student_id, year, month):
+    """학생의 (year, month) MonthlyReport 생성/갱신"""
+    report, _ = MonthlyReport.objects.get_or_create(student_id=student_id, year=year, month=month)
+
+    # Part 1. 출결 (집계 1회)
+    att = Attendance.objects.filter(
+        student_id=student_id, date__year=year, date__month=month
+    ).aggregate(
+        total=Count('id'),
+        present=Count('id', filter=Q(status='PRESENT')),
+        late=Count('id', filter=Q(status='LATE')),
+        absent=Count('id', filter=Q(status='ABSENT')),
+    )
+    report.total_days = att['total']
+    report.present_days = att['present']
+    report.late_days = att['late']
+    report.absent_days = att['absent']
+
+    # Part 2. 어휘 (집계 1회)
+    vocab = TestResult.objects.filter(
+        student_id=student_id, created_at__year=year, created_at__month=month
+    ).aggregate(
+        count=Count('id'),
+        passed=Count('id', filter=Q(score__gte=27)),
+        avg=Avg('score'),
+    )
+    report.vocab_test_count = vocab['count']
+    report.vocab_pass_count = vocab['passed']
+    report.vocab_fail_count = vocab['count'] - vocab['passed']
+    report.vocab_average_score = round(vocab['avg'], 1) if vocab['avg'] else 0.0
+
+    # Part 3. 월말평가
+    monthly_vocab = MonthlyTestResult.objects.filter(
+        student_id=student_id, created_at__year=year, created_at__month=month
+    ).last()
+    if monthly_vocab:
+        report.exam_score_vocab = monthly_vocab.score
+
+    exams = ExamResult.objects.filter(
+        student_id=student_id, date__year=year, date__month=month
+    ).select_related('paper')
+    for exam in exams:
+        title = exam.paper.title
+        if '구문' in title or 'Syntax' in title:
+            report.exam_score_syntax = exam.score
+        elif '독해' in title or 'Reading' in title:
+            report.exam_score_reading = exam.score
+
+    report.save()
+    return report
+
+
+def students_with_reports(student_ids, year, month):
+    """이미 해당 월 MonthlyReport 와 StudentReport 를 모두 가진 학생 id 집합 (쿼리 2회)"""
+    start, end = month_range(year, month)
+    monthly = set(MonthlyReport.objects.filter(
+        student_id__in=student_ids, year=year, month=month
+    ).values_list('student_id', flat=True))
+    web = set(StudentReport.objects.filter(
+        student_id__in=student_ids, start_date=start, end_date=end
+    ).values_list('student_id', flat=True))
+    return monthly & web
+
+
+def generate_student_reports(task):
+    """
+    학생 1명 발행 (run_parallel 워커에서 호출되므로 인자는 dict 하나)
+    task: {student_id, year, month, teacher_id} -> student_id
+    """
+    from academy import report_builder
+
+    student_id = task['student_id']
+    year, month = task['year'], task['month']
+    build_monthly_report(student_id, year, month)
+
+    start, end = month_range(year, month)
+    snapshot, checkpoint, _reused = report_builder.build_report_data(student_id, start, end)
+    # 같은 기간 성적표가 이미 있으면(force) 가장 최근 것을 갱신
+    report = StudentReport.objects.filter(
+        student_id=student_id, start_date=start, end_date=end
+    ).order_by('-id').first() or StudentReport(student_id=student_id, start_date=start, end_date=end)
+    report.teacher_id = task.get('teacher_id') or report.teacher_id
+    report.title = report.title or f"{year}년 {month}월 학습 리포트"
+    report.data_snapshot = snapshot
+    report.checkpoint = checkpoint
+    report.save()
+    return student_id
+
+
+def branch_student_ids(branch_id):
+    return list(
+        StudentProfile.objects.filter(branch_id=branch_id, user__is_active=True)
+        .order_by('id').values_list('id', flat=True)
+    )
+
+
+def generate_branch_reports(branch_id, year, month, teacher_id=None, workers=None,
+                            force=False, dry_run=False, progress=None, on_result=None):
+    """
+    지점 재원생 전체 발행 -> {'total', 'created', 'skipped', 'planned', 'failed', 'failures'}
+    - progress: utils.background.JobProgress (API 작업용)
+    - on_result(student_id, status, error): 명령어 진행 출력용 콜백
+    """
+    student_ids = branch_student_ids(branch_id)
+    done = set() if force else students_with_reports(student_ids, year, month)
+    summary = {
+        'total': len(student_ids),
+        STATUS_CREATED: 0, STATUS_SKIPPED: len(done), STATUS_PLANNED: 0, STATUS_FAILED: 0,
+        'failures': [],
+    }
+    if progress:
+        progress.start(len(student_ids))
+        for _ in done:
+            progress.step(STATUS_SKIPPED)
+    if on_result:
+        for sid in sorted(done):
+            on_result(sid, STATUS_SKIPPED, None)
+
+    pending = [sid for sid in student_ids if sid not in done]
+    if dry_run:
+        summary[STATUS_PLANNED] = len(pending)
+        if on_result:
+            for sid in pending:
+                on_result(sid, STATUS_PLANNED, None)
+        return summary
+
+    tasks = [
+        {'student_id': sid, 'year': year, 'month': month, 'teacher_id': teacher_id}
+        for sid in pending
+    ]
+    for task, _result, error in run_parallel(generate_student_reports, tasks, workers=workers):
+        student_id = task['student_id']
+        status = STATUS_FAILED if error else STATUS_CREATED
+        summary[status] += 1
+        if error:
+            summary['failures'].append({'student_id': student_id, 'error': str(error)})
+        if progress:
+            progress.step(status, error=f"{student_id}: {error}" if error else None)
+        if on_result:
+            on_result(student_id, status, error)
+    return summary
+
+
+# ------------------------------------------------------------------
+# [NEW] 학부모 화면 HTML 산출물
+# ------------------------------------------------------------------
+def report_context(report):
+    """report_card.html 컨텍스트 (해당 월 수업 일지 + 전체 모의고사 추이)"""
+    from academy.models import ClassLog
+    from mock.models import MockExam
+
+    student = report.student
+    logs = ClassLog.objects.filter(
+        student=student, date__year=report.year, date__month=report.month
+    ).select_related('teacher__staff_profile').prefetch_related(
+        'entries__textbook', 'entries__wordbook'
+    ).order_by('-date')
+
+    # 해당 월뿐만 아니라 전체적인 흐름을 보여주기 위해 전체 모의고사를 사용
+    mock_exams = list(MockExam.objects.filter(student=student).order_by('exam_date'))
+    return {
+        'report': report,
+        'student': student,
+        'logs': logs,
+        'mock_exams': mock_exams[::-1],  # 리스트는 최신순 표시
+        'graph_dates': json.dumps([e.exam_date.strftime("%m/%d") for e in mock_exams]),
+        'graph_scores': json.dumps([e.score for e in mock_exams]),
+        'graph_grades': json.dumps([e.grade for e in mock_exams]),
+        'graph_titles': json.dumps([e.title for e in mock_exams]),
+    }
+
+
+def refresh_report_artifact(report):
+    """성적표 HTML 을 렌더링해 저장 -> (html, etag)"""
+    html = render_to_string('reports/report_card.html', report_context(report))
+    etag = content_etag(html)
+    if etag != report.rendered_etag:
+        MonthlyReport.objects.filter(pk=report.pk).update(rendered_html=html, rendered_etag=etag)
+        report.rendered_html, report.rendered_etag = html, etag
+    return html, etag
+
+
+def get_report_artifact(report):
+    """저장된 HTML 산출물 (비어 있으면 지금 렌더링)"""
+    if report.rendered_etag:
+        return report.rendered_html, report.rendered_etag
+    return refresh_report_artifact(report)
+
+
+def invalidate_report_artifacts(student_id, year=None, month=None):
+    """수업 일지/모의고사가 바뀌면 해당 성적표 HTML 을 비워 다음 조회 때 다시 렌더링"""
+    qs = MonthlyReport.objects.filter(student_id=student_id).exclude(rendered_etag='')
+    if year is not None:
+        qs = qs.filter(year=year, month=month)
+    qs.update(rendered_html='', rendered_etag='')
+
+
+# ------------------------------------------------------------------
+# [NEW] 공유 링크 조회수 (프로세스 메모리에 모았다가 반영)
+# ------------------------------------------------------------------
+# 조회 요청은 메모리 카운터만 올리고(DB 쓰기 없음), SHARE_VIEW_FLUSH_INTERVAL 이 지난 뒤의 첫 조회가
+# 백그라운드 큐(utils.background.enqueue)에 반영을 맡깁니다. 프로세스 종료 시에도 남은 값을 반영합니다.
+# 버퍼가 프로세스마다 따로라서 크론 커맨드로는 비울 수 없고, 강제 종료되면 마지막 간격의 조회수는 빠집니다.
+SHARE_VIEW_FLUSH_INTERVAL = 30  # 초
+
+_share_views = Counter()
+_share_views_lock = threading.Lock()
+_share_flush_at = time.monotonic() + SHARE_VIEW_FLUSH_INTERVAL
+_share_flush_queued = False
+
+
+def record_share_view(share_id):
+    """조회 1회 기록 (DB 쓰기 없음)"""
+    global _share_flush_queued
+    with _share_views_lock:
+        _share_views[share_id] += 1
+        due = not _share_flush_queued and time.monotonic() >= _share_flush_at
+        if due:
+            _share_flush_queued = True
+    if due:
+        background.enqueue(flush_share_views)
+
+
+def pending_share_views(share_id):
+    with _share_views_lock:
+        return _share_views.get(share_id, 0)
+
+
+def flush_share_views():
+    """모아 둔 조회수를 ReportShare.access_count 에 더함 (링크당 UPDATE 1회) -> 반영한 조회 수 합계"""
+    global _share_flush_at, _share_flush_queued
+    with _share_views_lock:
+        pending = dict(_share_views)
+        _share_views.clear()
+        _share_flush_at = time.monotonic() + SHARE_VIEW_FLUSH_INTERVAL
+        _share_flush_queued = False
+    if not pending:
+        return 0
+    try:
+        with transaction.atomic():
+            for share_id, count in pending.items():
+                ReportShare.objects.filter(pk=share_id).update(access_count=F('access_count') + count)
+    except Exception:
+        # 반영하지 못한 값은 다음 반영 때 다시 시도
+        with _share_views_lock:
+            _share_views.update(pending)
+        raise
+    return sum(pending.values())
+
+
+@atexit.register
+def _flush_share_views_at_exit():
+    try:
+        flush_share_views()
+    except Exception:
+        logger.exception("could not flush %s buffered share views", sum(_share_views.values()))
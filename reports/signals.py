@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from academy.models import ClassLog
+from mock.models import MockExam
+from .models import MonthlyReport
+from .services import invalidate_report_artifacts, refresh_report_artifact
+
+
+@receiver(post_save, sender=MonthlyReport)
+def refresh_monthly_report_artifact(sender, instance, raw=False, **kwargs):
+    # 성적표/총평이 저장되면 학부모 화면 HTML 을 다시 렌더링 (본문이 같으면 저장하지 않음)
+    if raw:
+        return
+    refresh_report_artifact(instance)
+
+
+@receiver(post_save, sender=ClassLog)
+@receiver(post_delete, sender=ClassLog)
+def invalidate_report_on_log_change(sender, instance, **kwargs):
+    if hasattr(instance.date, 'year'):
+        invalidate_report_artifacts(instance.student_id, instance.date.year, instance.date.month)
+
+
+@receiver(post_save, sender=MockExam)
+@receiver(post_delete, sender=MockExam)
+def invalidate_report_on_mock_change(sender, instance, **kwargs):
+    # 모의고사 추이는 모든 달 성적표에 들어감
+    invalidate_report_artifacts(instance.student_id)
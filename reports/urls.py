@@ -2,11 +2,12 @@
 from django.urls import path, include
 from . import views
 from rest_framework.routers import DefaultRouter
-from .views_api import ReportShareViewSet, MonthlyReportViewSet
+from .views_api import ReportShareViewSet, MonthlyReportViewSet, BranchReportJobViewSet
 
 router = DefaultRouter()
 router.register(r'share', ReportShareViewSet, basename='report_share')
 router.register(r'monthly', MonthlyReportViewSet, basename='monthly_report')
+router.register(r'branch-jobs', BranchReportJobViewSet, basename='branch_report_job') # [NEW]
 
 app_name = 'reports'
 
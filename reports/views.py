@@ -1,16 +1,13 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Q
+from django.db.models import Q
 from django.utils import timezone
 from .models import MonthlyReport
-from core.models import StudentProfile
-from academy.models import Attendance, ClassLog
-from vocab.models import TestResult, MonthlyTestResult
-from exam.models import ExamResult
-from mock.models import MockExam
+from core.models import NotificationOutbox, StudentProfile
 from django.contrib import messages
-from utils.aligo import send_alimtalk
-import json
+from core import notifications
+from .services import build_monthly_report, get_report_artifact, record_share_view
+from utils.http_cache import artifact_response
 
 @login_required
 def create_monthly_report(request, student_id):
@@ -24,71 +21,8 @@ def create_monthly_report(request, student_id):
     year = now.year
     month = now.month
 
-    # 1. 이미 생성된 게 있으면 가져오고, 없으면 새로 만듦
-    report, created = MonthlyReport.objects.get_or_create(
-        student=student_profile,
-        year=year,
-        month=month
-    )
-
-    # ==========================================
-    # Part 1. 출결 데이터 집계 (Attendance)
-    # ==========================================
-    # [수정] student=student_profile (User 객체 아님)
-    attendances = Attendance.objects.filter(
-        student=student_profile, 
-        date__year=year, 
-        date__month=month
-    )
-    
-    report.total_days = attendances.count()
-    report.present_days = attendances.filter(status='PRESENT').count()
-    report.late_days = attendances.filter(status='LATE').count()
-    report.absent_days = attendances.filter(status='ABSENT').count()
-    
-    # ==========================================
-    # Part 2. 어휘 학습 데이터 (Vocab)
-    # ==========================================
-    # [수정] student=student_profile
-    vocab_results = TestResult.objects.filter(
-        student=student_profile,
-        created_at__year=year,
-        created_at__month=month
-    )
-    
-    report.vocab_test_count = vocab_results.count()
-    report.vocab_pass_count = vocab_results.filter(score__gte=27).count() 
-    report.vocab_fail_count = report.vocab_test_count - report.vocab_pass_count
-    
-    avg_score = vocab_results.aggregate(Avg('score'))['score__avg']
-    report.vocab_average_score = round(avg_score, 1) if avg_score else 0.0
-
-    # ==========================================
-    # Part 3. 월말평가 점수 (Exam & Vocab Monthly)
-    # ==========================================
-    # 1) 단어 월말평가 (student=student_profile)
-    monthly_vocab = MonthlyTestResult.objects.filter(
-        student=student_profile, created_at__year=year, created_at__month=month
-    ).last()
-    
-    if monthly_vocab:
-        report.exam_score_vocab = monthly_vocab.score
-
-    # 2) 구문/독해 월말평가 (ExamResult)
-    # [수정] ExamResult도 student가 Profile입니다.
-    monthly_exams = ExamResult.objects.filter(
-        student=student_profile, date__year=year, date__month=month
-    )
-    
-    # 여러 번 봤을 수 있으므로, 가장 최근 것 중 '구문', '독해' 타이틀로 구분
-    for exam in monthly_exams:
-        title = exam.paper.title
-        if '구문' in title or 'Syntax' in title:
-            report.exam_score_syntax = exam.score
-        elif '독해' in title or 'Reading' in title:
-            report.exam_score_reading = exam.score
-            
-    report.save()
+    # [FIX] 집계 로직은 reports/services.py 로 이동 (지점 일괄 발행과 공용)
+    report = build_monthly_report(student_profile.id, year, month)
     
     return redirect('reports:view', access_code=report.access_code)
 
@@ -96,39 +30,11 @@ def create_monthly_report(request, student_id):
 def report_view(request, access_code):
     """
     [학부모/학생용] 로그인 없이 UUID 코드로 성적표 보기
+    # [FIX] 미리 렌더링해 둔 HTML 산출물을 ETag 와 함께 전달 (일지/모의고사가 바뀌면 다시 렌더링)
     """
-    report = get_object_or_404(MonthlyReport, access_code=access_code)
-    student = report.student
-    
-    # 1. 수업 일지 가져오기
-    logs = ClassLog.objects.filter(
-        student=student,
-        date__year=report.year,
-        date__month=report.month
-    ).order_by('-date')
-
-    # 2. [추가] 모의고사 데이터 가져오기 (최근 6개월 추세 확인용)
-    # 해당 월뿐만 아니라 전체적인 흐름을 보여주기 위해 기간을 넉넉히 잡거나 전체를 가져옵니다.
-    mock_exams = MockExam.objects.filter(student=student).order_by('exam_date')
-    
-    # 그래프용 데이터 가공 (JSON 변환)
-    dates = [e.exam_date.strftime("%m/%d") for e in mock_exams]
-    scores = [e.score for e in mock_exams]
-    grades = [e.grade for e in mock_exams]
-    titles = [e.title for e in mock_exams]
-
-    context = {
-        'report': report,
-        'student': student,
-        'logs': logs,
-        # [추가] 모의고사 데이터
-        'mock_exams': mock_exams.reverse(), # 리스트는 최신순 표시
-        'graph_dates': json.dumps(dates),
-        'graph_scores': json.dumps(scores),
-        'graph_grades': json.dumps(grades),
-        'graph_titles': json.dumps(titles),
-    }
-    return render(request, 'reports/report_card.html', context)
+    report = get_object_or_404(MonthlyReport.objects.select_related('student'), access_code=access_code)
+    html, etag = get_report_artifact(report)
+    return artifact_response(request, html, etag, 'text/html; charset=utf-8', 'public, max-age=300')
 
 def shared_report_view(request, uuid):
     """
@@ -142,48 +48,22 @@ def shared_report_view(request, uuid):
     if timezone.now() > share.expires_at:
         return render(request, 'reports/expired.html', {'message': '만료된 링크입니다.'})
         
-    # 2. 조회수 증가
-    share.access_count += 1
-    share.save()
+    # 2. 조회수 증가 [FIX] 메모리 카운터만 올리고 주기적으로 한 번에 반영 (조회 요청은 DB 쓰기 없음)
+    record_share_view(share.id)
     
-    # 3. 이번 달 리포트 찾기 (없으면 지난달?)
+    # 3. 이번 달 리포트 찾기 (없으면 가장 최근 것)
     today = timezone.now()
-    report = MonthlyReport.objects.filter(
-        student=share.student, 
-        year=today.year, 
-        month=today.month
-    ).first()
-    
-    # 이번 달 게 없으면 가장 최근 것
+    reports = MonthlyReport.objects.filter(student_id=share.student_id).select_related('student')
+    report = reports.filter(year=today.year, month=today.month).first()
     if not report:
-        report = MonthlyReport.objects.filter(student=share.student).order_by('-created_at').first()
+        report = reports.order_by('-created_at').first()
         
     if not report:
         return render(request, 'reports/no_data.html', {'message': '생성된 성적표가 없습니다.'})
         
-    # 기존 report_view 로직 활용 (함수 호출 대신 로직 위임이 깔끔하지만, 간단히 redirect하거나 로직 복사)
-    # 여기서는 report_view가 사용하는 Context를 그대로 구성합니다.
-    
-    student = share.student
-    logs = ClassLog.objects.filter(student=student, date__year=report.year, date__month=report.month).order_by('-date')
-    mock_exams = MockExam.objects.filter(student=student).order_by('exam_date')
-    
-    dates = [e.exam_date.strftime("%m/%d") for e in mock_exams]
-    scores = [e.score for e in mock_exams]
-    grades = [e.grade for e in mock_exams]
-    titles = [e.title for e in mock_exams]
-
-    context = {
-        'report': report,
-        'student': student,
-        'logs': logs,
-        'mock_exams': mock_exams.reverse(),
-        'graph_dates': json.dumps(dates),
-        'graph_scores': json.dumps(scores),
-        'graph_grades': json.dumps(grades),
-        'graph_titles': json.dumps(titles),
-    }
-    return render(request, 'reports/report_card.html', context)
+    # 만료 체크/조회수 집계를 위해 매번 서버를 거치되, 변경 없으면 304
+    html, etag = get_report_artifact(report)
+    return artifact_response(request, html, etag, 'text/html; charset=utf-8', 'private, no-cache')
 
 @login_required
 def report_dashboard(request):
@@ -268,20 +148,34 @@ def send_report_notification(request, report_id):
 
     # 수신자(부모님) 가져오기
     target_phones = student.get_parent_phones()
-    success_count = 0
-    
+    queued_count = waiting_count = sent_count = 0
+
+    # [FIX] 발송 대기열에 넣기만 함 (같은 성적표는 번호당 1번만 발송, 실패했던 번호는 다시 발송)
     for phone in target_phones:
         # ⚠️ WAITING_CODE_REPORT 부분은 나중에 승인된 템플릿 코드로 바꿔야 합니다.
-        if send_alimtalk(
-            receiver_phone=phone,
+        row, queued = notifications.enqueue(
             template_code="WAITING_CODE_REPORT",
-            context_data={'content': msg_content, 'button': [button_data]}
-        ):
-            success_count += 1
-            
-    if success_count > 0:
-        messages.success(request, f"✅ {student.name} 학생 학부모님께 성적표를 전송했습니다.")
+            recipient=phone,
+            ref=f"report:{report.pk}",
+            content=msg_content,
+            button=[button_data],
+        )
+        if row is None:
+            continue
+        if queued:
+            queued_count += 1
+        elif row.status == NotificationOutbox.Status.SENT:
+            sent_count += 1
+        else:
+            waiting_count += 1
+
+    if queued_count > 0:
+        messages.success(request, f"✅ {student.name} 학생 학부모님께 성적표 발송을 요청했습니다.")
+    elif waiting_count > 0:
+        messages.info(request, f"{student.name} 학생 학부모님께 보낼 성적표가 이미 발송 대기 중입니다.")
+    elif sent_count > 0:
+        messages.info(request, f"{student.name} 학생 학부모님께는 이미 이 성적표를 보냈습니다.")
     else:
-        messages.error(request, "❌ 전송 실패: 등록된 학부모님 번호가 없거나 통신 오류입니다.")
+        messages.error(request, "❌ 전송 실패: 등록된 학부모님 번호가 없습니다.")
         
     return redirect('reports:dashboard')
\ No newline at end of file
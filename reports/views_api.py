@@ -47,3 +47,49 @@ class MonthlyReportViewSet(viewsets.ReadOnlyModelViewSet):
         if hasattr(user, 'profile'):
             return MonthlyReport.objects.filter(student=user.profile).order_by('-year', '-month')
         return MonthlyReport.objects.none()
+
+
+class BranchReportJobViewSet(viewsets.ViewSet):
+    """
+    [NEW] 지점 월간 성적표 일괄 발행 API (관리자 전용)
+    POST /reports/api/v1/branch-jobs/  {branch_id, year, month, force, dry_run}
+        -> dry_run 이면 바로 요약 반환, 아니면 202 + job_id (백그라운드 실행)
+    GET  /reports/api/v1/branch-jobs/<job_id>/  -> 진행 상황 (total/done/failed/counts/errors)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def create(self, request):
+        from core.models import Branch
+        from utils.background import start_job
+        from .services import generate_branch_reports
+
+        now = timezone.now()
+        try:
+            branch_id = int(request.data.get('branch_id') or 0)
+            year = int(request.data.get('year') or now.year)
+            month = int(request.data.get('month') or now.month)
+            datetime.date(year, month, 1)
+        except (TypeError, ValueError):
+            return Response({'error': 'invalid branch_id/year/month'}, status=status.HTTP_400_BAD_REQUEST)
+        if not branch_id or not Branch.objects.filter(pk=branch_id).exists():
+            return Response({'error': 'branch_id required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        force = str(request.data.get('force', '')).lower() in ('1', 'true', 'yes')
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        if dry_run:
+            summary = generate_branch_reports(branch_id, year, month, force=force, dry_run=True)
+            return Response(summary)
+
+        job_id = start_job(
+            'branch_reports', generate_branch_reports, branch_id, year, month,
+            teacher_id=request.user.id, force=force,
+        )
+        return Response({'job_id': job_id}, status=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, pk=None):
+        from utils.background import get_job
+
+        job = get_job(pk)
+        if job is None:
+            return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
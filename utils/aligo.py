@@ -1,35 +1,56 @@
 # utils/aligo.py
 
-import requests
 import json
+import threading
+from dataclasses import dataclass
+
+import requests
 from django.conf import settings
 
-# [설정] 알리고 API 정보 (나중에 settings.py로 옮기세요)
+# [설정] 알리고 API 정보 (settings 에 ALIGO_* 가 있으면 그 값을 사용)
 ALIGO_API_KEY = "여기에_알리고_API키_입력"
 ALIGO_USER_ID = "여기에_알리고_아이디_입력"
-SENDER_KEY = "여기에_카카오_발신프로필키_입력" 
+SENDER_KEY = "여기에_카카오_발신프로필키_입력"
 SENDER_PHONE = "010-0000-0000" # 알리고에 등록된 발신번호
 
-def send_alimtalk(receiver_phone, template_code, context_data, fallback_msg=""):
-    """
-    알림톡 전송 함수
-    - 템플릿 코드가 유효하지 않으면 전송 실패할 수 있음.
-    - 실패 시 문자로 대체 발송(failover) 설정됨.
-    """
-    if not receiver_phone:
-        return False
-        
-    url = "https://kakaoapi.aligo.in/akv10/alimtalk/send/"
-    
+# [NEW] 주소/타임아웃도 settings 로 바꿀 수 있음 (로컬 점검 시 스텁 서버 주소 지정)
+DEFAULT_API_URL = "https://kakaoapi.aligo.in/akv10/alimtalk/send/"
+DEFAULT_TIMEOUT = (3, 10)  # (연결, 응답) 초
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+@dataclass
+class SendResult:
+    """발송 결과 - retryable: 통신 오류/서버 오류처럼 다시 보내면 될 수 있는 실패"""
+    ok: bool
+    retryable: bool = False
+    message: str = ''
+
+
+# 스레드마다 세션 1개 (발송 워커가 연결을 재사용)
+_local = threading.local()
+
+
+def _session():
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def build_payload(receiver_phone, template_code, context_data, fallback_msg=""):
     # context_data['content']에 완성된 메시지 본문을 넣어서 호출한다고 가정
     content = context_data.get('content', '')
-    
+
     payload = {
-        'apikey': ALIGO_API_KEY,
-        'userid': ALIGO_USER_ID,
-        'senderkey': SENDER_KEY,
+        'apikey': _setting('ALIGO_API_KEY', ALIGO_API_KEY),
+        'userid': _setting('ALIGO_USER_ID', ALIGO_USER_ID),
+        'senderkey': _setting('ALIGO_SENDER_KEY', SENDER_KEY),
         'tpl_code': template_code,
-        'sender': SENDER_PHONE,
+        'sender': _setting('ALIGO_SENDER_PHONE', SENDER_PHONE),
         'receiver_1': receiver_phone,
         'subject_1': '블라썸에듀 알림',
         'message_1': content,
@@ -37,22 +58,51 @@ def send_alimtalk(receiver_phone, template_code, context_data, fallback_msg=""):
         'fsubject_1': '블라썸에듀 알림',
         'fmessage_1': fallback_msg or content
     }
-    
+
     # 버튼 정보가 있다면 추가 (JSON 문자열 변환 필요)
-    if 'button' in context_data:
+    if context_data.get('button'):
         payload['button_1'] = json.dumps(context_data['button'])
+    return payload
+
+
+def deliver(receiver_phone, template_code, context_data, fallback_msg=""):
+    """[NEW] 알림톡 1건 전송 -> SendResult (타임아웃 적용, 예외를 밖으로 던지지 않음)"""
+    if not receiver_phone:
+        return SendResult(ok=False, message='수신 번호 없음')
+
+    payload = build_payload(receiver_phone, template_code, context_data, fallback_msg)
+    try:
+        response = _session().post(
+            _setting('ALIGO_API_URL', DEFAULT_API_URL),
+            data=payload,
+            timeout=_setting('ALIGO_TIMEOUT', DEFAULT_TIMEOUT),
+        )
+    except requests.RequestException as e:
+        return SendResult(ok=False, retryable=True, message=f'통신 오류: {e}')
 
+    if response.status_code >= 500 or response.status_code == 429:
+        return SendResult(ok=False, retryable=True, message=f'HTTP {response.status_code}')
     try:
-        # 실제 전송 (테스트 중에는 주석 처리하고 print만 해도 됨)
-        response = requests.post(url, data=payload)
         res_json = response.json()
-        
-        if res_json['code'] == 0:
-            print(f"✅ 알림톡 전송 성공: {receiver_phone}")
-            return True
-        else:
-            print(f"❌ 알림톡 전송 실패({res_json['message']}): {receiver_phone}")
-            return False
-    except Exception as e:
-        print(f"❌ 알림톡 통신 에러: {e}")
-        return False
\ No newline at end of file
+    except ValueError:
+        return SendResult(ok=False, retryable=True, message=f'HTTP {response.status_code}: 응답 해석 불가')
+
+    # 알리고 응답 코드가 0 이 아니면 인증/템플릿 등 요청 자체의 문제 -> 다시 보내도 같은 결과
+    if res_json.get('code') == 0:
+        return SendResult(ok=True, message=str(res_json.get('message', '')))
+    return SendResult(ok=False, message=f"{res_json.get('code')}: {res_json.get('message', '')}")
+
+
+def send_alimtalk(receiver_phone, template_code, context_data, fallback_msg=""):
+    """
+    알림톡 전송 함수 (즉시 전송, 성공 여부만 반환)
+    - 템플릿 코드가 유효하지 않으면 전송 실패할 수 있음.
+    - 실패 시 문자로 대체 발송(failover) 설정됨.
+    - 요청 처리 중에는 core.notifications.enqueue 로 발송 대기열에 넣으세요.
+    """
+    result = deliver(receiver_phone, template_code, context_data, fallback_msg)
+    if result.ok:
+        print(f"✅ 알림톡 전송 성공: {receiver_phone}")
+    else:
+        print(f"❌ 알림톡 전송 실패({result.message}): {receiver_phone}")
+    return result.ok
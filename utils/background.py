@@ -0,0 +1,194 @@
+# utils/background.py
+"""
+오래 걸리는 일괄 작업 실행 도우미
+
+run_parallel(func, items, workers)
+    ProcessPoolExecutor 로 items 를 분산 처리합니다.
+    - 워커는 spawn 방식으로 새로 띄우고 django.setup() 후 자기 DB 연결을 따로 엽니다.
+      (fork 로 부모의 DB 소켓/락을 물려받지 않도록)
+    - func 는 모듈 최상위 함수여야 합니다 (pickle 가능)
+    - workers <= 1 이면 현재 프로세스에서 순서대로 실행
+    결과는 완료되는 순서대로 (item, result, error) 로 yield 됩니다.
+
+start_job(name, func, *args) / get_job(job_id)
+    요청 스레드를 막지 않도록 데몬 스레드에서 func(*args, progress=...) 를 실행하고,
+    진행 상황을 캐시에 기록합니다. settings.CACHES 가 공유 캐시(DatabaseCache)라서
+    작업을 시작한 워커가 아닌 다른 gunicorn 워커/프로세스도 같은 상태를 읽습니다.
+    (작업 스레드는 시작한 프로세스 안에서 돌므로 그 프로세스가 재시작되면 RUNNING 상태로 남음)
+
+enqueue(func, *args)
+    짧은 후처리(이미지 변환 등)를 프로세스당 워커 스레드 1개에서 순서대로 실행합니다.
+    메모리 큐이므로 프로세스가 재시작되면 남은 작업은 사라집니다. (호출부에서 복구 커맨드 제공)
+    settings.BACKGROUND_QUEUE_SYNC = True 이면 호출 즉시 현재 스레드에서 실행합니다.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+JOB_CACHE_TIMEOUT = 60 * 60 * 24
+MAX_JOB_ERRORS = 20
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def default_workers():
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def run_parallel(func, items, workers=None):
+    items = list(items)
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            try:
+                yield item, func(item), None
+            except Exception as exc:
+                yield item, None, exc
+        return
+
+    # 부모 연결은 워커와 공유하지 않음 (필요하면 다음 쿼리에서 다시 열림)
+    connections.close_all()
+    settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(items)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(settings_module,),
+    ) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as exc:
+                yield item, None, exc
+
+
+# ------------------------------------------------------------------
+# 진행 상황 추적 작업 (API 용)
+# ------------------------------------------------------------------
+def _job_key(job_id):
+    return f'background:job:{job_id}'
+
+
+def get_job(job_id):
+    return cache.get(_job_key(job_id))
+
+
+class JobProgress:
+    """작업 진행 상황을 캐시에 기록 (total/done/failed/errors)"""
+
+    def __init__(self, job_id, name):
+        self.job_id = job_id
+        self.state = {
+            'id': job_id,
+            'name': name,
+            'status': 'PENDING',
+            'total': 0,
+            'done': 0,
+            'failed': 0,
+            'counts': {},
+            'errors': [],
+            'started_at': timezone.now().isoformat(),
+            'finished_at': None,
+            'result': None,
+        }
+        self._save()
+
+    def _save(self):
+        cache.set(_job_key(self.job_id), self.state, JOB_CACHE_TIMEOUT)
+
+    def start(self, total):
+        self.state.update(status='RUNNING', total=total)
+        self._save()
+
+    def step(self, label=None, error=None):
+        self.state['done'] += 1
+        if label:
+            self.state['counts'][label] = self.state['counts'].get(label, 0) + 1
+        if error:
+            self.state['failed'] += 1
+            if len(self.state['errors']) < MAX_JOB_ERRORS:
+                self.state['errors'].append(str(error))
+        self._save()
+
+    def finish(self, result=None, error=None):
+        self.state.update(
+            status='FAILED' if error else 'DONE',
+            finished_at=timezone.now().isoformat(),
+            result=result,
+        )
+        if error:
+            self.state['errors'].append(str(error))
+        self._save()
+
+
+def start_job(name, func, *args, **kwargs):
+    """func(*args, progress=JobProgress, **kwargs) 를 데몬 스레드에서 실행 -> job_id"""
+    job_id = uuid.uuid4().hex
+    progress = JobProgress(job_id, name)
+
+    def _run():
+        try:
+            result = func(*args, progress=progress, **kwargs)
+            progress.finish(result=result)
+        except Exception as exc:
+            progress.finish(error=exc)
+        finally:
+            close_old_connections()
+            connections.close_all()
+
+    threading.Thread(target=_run, name=f'job-{name}-{job_id[:8]}', daemon=True).start()
+    return job_id
+
+
+# ------------------------------------------------------------------
+# [NEW] 로컬 작업 큐
+# ------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _drain():
+    while True:
+        func, args = _queue.get()
+        try:
+            func(*args)
+        except Exception:
+            logger.exception("background task %s failed", getattr(func, '__name__', func))
+        finally:
+            close_old_connections()
+            _queue.task_done()
+
+
+def enqueue(func, *args):
+    if getattr(settings, 'BACKGROUND_QUEUE_SYNC', False):
+        func(*args)
+        return
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain, name='background-queue', daemon=True)
+            _worker.start()
+    _queue.put((func, args))
+
+
+def wait_idle():
+    """큐에 들어간 작업이 모두 끝날 때까지 대기 (커맨드/점검용)"""
+    _queue.join()
@@ -0,0 +1,37 @@
+# utils/cache_gen.py
+"""
+세대(generation) 키 기반 캐시 무효화
+
+    gen = generation('academy:occupancy:gen')        # 캐시 키에 넣어 사용
+    bump('academy:occupancy:gen')                    # 원천 데이터 변경 시 -> 이전 세대 키 전부 무효
+
+캐시 항목을 하나하나 지우는 대신 세대 값을 바꿔 이전 키를 버립니다. (남은 항목은 TTL 로 사라짐)
+여러 워커 프로세스가 같은 세대를 보려면 공유 캐시(settings.CACHES, DatabaseCache)여야 합니다.
+
+bump 는
+    - 세대를 읽어서 올리지 않고 매번 새 고유 값으로 덮어씀 (DatabaseCache 의 incr 는 읽고-쓰기라
+      동시에 두 번 올리면 같은 값이 되어 한쪽 무효화가 사라짐)
+    - 호출한 트랜잭션이 커밋된 뒤에 바꿈 (커밋 전에 바꾸면 다른 워커가 커밋 전 데이터로
+      새 세대 항목을 만들어 TTL 동안 남음). 트랜잭션 밖이면 바로 바꿉니다.
+세대 키가 컬링/재시작으로 사라져도 새 고유 값으로 시작하므로 예전 세대 항목을 다시 읽는 일이 없습니다.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _fresh():
+    return uuid.uuid4().hex
+
+
+def generation(key):
+    gen = cache.get(key)
+    if gen is None:
+        cache.add(key, _fresh(), None)
+        gen = cache.get(key)
+    return gen
+
+
+def bump(key):
+    transaction.on_commit(lambda: cache.set(key, _fresh(), None))
@@ -0,0 +1,50 @@
+# utils/cursor.py
+"""
+keyset(커서) 페이지네이션 공용 도우미
+
+(정렬 필드, id) 순서로 자르므로 OFFSET 없이 인덱스를 따라 다음 페이지를 읽습니다.
+커서는 마지막 행의 "정렬값|id" 를 base64 로 감싼 문자열입니다. (정렬 필드는 날짜/시각)
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode(value, pk):
+    raw = f"{value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode(cursor):
+    """잘못된 커서는 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value_str, id_str = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(value_str), int(id_str)
+    except Exception as exc:
+        raise ValueError('invalid cursor') from exc
+
+
+def clamp_limit(value, default=DEFAULT_PAGE_SIZE):
+    """limit 파라미터 -> 1 ~ MAX_PAGE_SIZE (숫자가 아니면 ValueError)"""
+    limit = int(value) if value not in (None, '') else default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(qs, field, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False):
+    """qs 를 (field, id) 순서로 한 페이지 -> (목록, 다음 커서 또는 None)"""
+    op = 'lt' if descending else 'gt'
+    if cursor:
+        value, last_id = decode(cursor)
+        qs = qs.filter(Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': last_id}))
+    prefix = '-' if descending else ''
+    rows = list(qs.order_by(f'{prefix}{field}', f'{prefix}id')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode(getattr(last, field), last.id)
+    return rows[:limit], next_cursor
@@ -0,0 +1,84 @@
+# utils/day_range.py
+"""
+Day/Unit 범위 문자열 파서 (단어장 Day, 교재 강(unit) 공용)
+
+"1-5,7", "Day 3~6", "10-8, 2" 같은 입력을 정렬/병합된 구간 튜플로 정규화합니다.
+    parse("1-5,7,6,10-8")  ->  ((1, 8), (10, 10))  ※ 10-8 은 8-10 으로 뒤집어 처리 후 병합
+
+- 숫자가 아닌 조각은 건너뜁니다. (전부 실패하면 빈 튜플 -> 호출부에서 '전체'로 취급)
+- 결과는 문자열 단위로 캐시됩니다. (같은 범위가 목록/채점/리포트에서 반복 파싱되므로)
+- DB 조회에는 number__in 대신 구간별 BETWEEN OR 조건(as_q)을 사용합니다.
+"""
+import re
+from functools import lru_cache
+
+from django.db.models import Q
+
+_PREFIX_RE = re.compile(r'day', re.IGNORECASE)
+_CHUNK_RE = re.compile(r'^(\d+)(?:[-~](\d+))?$')
+
+
+@lru_cache(maxsize=2048)
+def _parse(range_str):
+    spans = []
+    for chunk in range_str.split(','):
+        chunk = _PREFIX_RE.sub('', chunk).replace(' ', '')
+        if not chunk:
+            continue
+        match = _CHUNK_RE.match(chunk)
+        if not match:
+            continue
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) is not None else start
+        if start > end:
+            start, end = end, start
+        spans.append((start, end))
+
+    spans.sort()
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+def parse(range_str):
+    """범위 문자열 -> 병합된 (start, end) 구간 튜플 (양 끝 포함)"""
+    if range_str is None:
+        return ()
+    return _parse(str(range_str).strip())
+
+
+def expand(intervals):
+    """구간 튜플 -> 정렬된 정수 목록"""
+    values = []
+    for start, end in intervals:
+        values.extend(range(start, end + 1))
+    return values
+
+
+def parse_list(range_str):
+    """범위 문자열 -> 정렬된 정수 목록 (parse + expand)"""
+    return expand(parse(range_str))
+
+
+def contains(intervals, value):
+    return any(start <= value <= end for start, end in intervals)
+
+
+def as_q(intervals, field='number'):
+    """
+    구간 튜플 -> Q 객체 (단일 값은 =, 구간은 __range)
+    빈 구간이면 아무것도 매칭하지 않는 조건을 반환하므로, '전체' 처리는 호출부에서 먼저 분기하세요.
+    """
+    q = None
+    for start, end in intervals:
+        if start == end:
+            cond = Q(**{field: start})
+        else:
+            cond = Q(**{f'{field}__range': (start, end)})
+        q = cond if q is None else q | cond
+    return q if q is not None else Q(pk__in=[])
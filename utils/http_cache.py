@@ -0,0 +1,37 @@
+# utils/http_cache.py
+"""
+미리 만들어 둔 응답 본문(산출물)을 ETag 와 함께 내려주는 도우미
+
+    etag = content_etag(body)                      # 본문 해시 기반 강한(strong) ETag
+    return artifact_response(request, body, etag, 'text/html; charset=utf-8', 'public, max-age=300')
+
+If-None-Match 가 일치하면 본문 없이 304 를 돌려줍니다.
+"""
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+
+
+def content_etag(body):
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return '"%s"' % hashlib.sha1(body).hexdigest()
+
+
+def etag_matches(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+
+def artifact_response(request, body, etag, content_type, cache_control):
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,31 @@
+# utils/loaded_state.py
+"""
+모델 인스턴스의 '로드 시점 값' 보관 (저장 시그널이 무엇이 바뀌었는지 다시 조회하지 않고 판단)
+
+    class StudentProfile(LoadedStateMixin, models.Model):
+        LOADED_STATE = {'_loaded_schedule': 'schedule_key'}     # 보관할 속성 -> 값을 만드는 메서드
+
+        def schedule_key(self):
+            return loaded_values(self, self.SCHEDULE_FIELDS)
+
+시그널은 저장 후 getattr(instance, '_loaded_schedule', None) 과 현재 값을 비교하고 새 값으로 바꿔 둡니다.
+"""
+
+
+def loaded_values(instance, fields):
+    """
+    이미 읽혀 있는 필드 값 튜플
+    __dict__ 를 직접 읽으므로 only()/defer() 로 빠진 필드는 None 이 되고, 그 필드 때문에 추가 쿼리가 나가지 않습니다.
+    """
+    return tuple(instance.__dict__.get(f) for f in fields)
+
+
+class LoadedStateMixin:
+    LOADED_STATE = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        for attr, method in cls.LOADED_STATE.items():
+            setattr(instance, attr, getattr(instance, method)())
+        return instance
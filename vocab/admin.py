@@ -134,7 +134,9 @@ class TestResultAdmin(admin.ModelAdmin):
     def recalculate_scores(self, request, queryset):
         success_count = 0
         for result in queryset:
-            details = result.details.all()
+            # [FIX] 보관된 결과는 읽기 전용이므로 행으로 복원한 뒤 채점 (review_result / request_correction 과 같음)
+            result.restore_details()
+            details = list(result.details.order_by('id'))
             details_data = []
             for d in details:
                 details_data.append({
@@ -0,0 +1,99 @@
+"""
+시험 문항 상세(TestResultDetail) 콜드 보관 유틸
+
+오래된 TestResult 의 문항 상세 행들을 결과 1건당 하나의 zlib 압축 JSON 으로 묶어
+TestResult.archived_details 에 저장합니다. (archive_test_details 커맨드)
+읽는 쪽은 TestResult.get_details() / archived_detail_values() 를 통해
+보관 여부와 관계없이 동일한 형태로 데이터를 받습니다.
+"""
+import json
+import zlib
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# 컬럼 키 -> TestResultDetail 필드명 (JSON 크기를 줄이기 위해 짧은 키 사용)
+_COLUMNS = (
+    ('id', 'id'),
+    ('q', 'word_question'),
+    ('s', 'student_answer'),
+    ('a', 'correct_answer'),
+    ('c', 'is_correct'),
+    ('r', 'is_correction_requested'),
+    ('d', 'is_resolved'),
+    ('p', 'question_pos'),
+)
+_BOOL_FIELDS = {'is_correct', 'is_correction_requested', 'is_resolved'}
+
+
+class ArchivedDetail:
+    """보관본에서 복원한 문항 (TestResultDetail 과 같은 속성을 제공, 읽기 전용)"""
+    is_archived = True
+
+    def __init__(self, result_id, **values):
+        self.result_id = result_id
+        for _, field in _COLUMNS:
+            setattr(self, field, values.get(field))
+        self.pk = self.id
+
+    def __str__(self):
+        return f"{self.word_question} ({'O' if self.is_correct else 'X'})"
+
+
+def pack_details(details):
+    """문항 상세 목록(모델 인스턴스 또는 dict) -> 압축 blob (컬럼 배열 형태)"""
+    payload = {'v': ARCHIVE_FORMAT_VERSION}
+    for key, _ in _COLUMNS:
+        payload[key] = []
+
+    for d in details:
+        for key, field in _COLUMNS:
+            value = d[field] if isinstance(d, dict) else getattr(d, field)
+            if field in _BOOL_FIELDS:
+                value = 1 if value else 0
+            payload[key].append(value)
+
+    raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(raw, 9)
+
+
+def unpack_rows(blob):
+    """압축 blob -> 필드명 dict 목록 (id 순)"""
+    if not blob:
+        return []
+    payload = json.loads(zlib.decompress(bytes(blob)).decode('utf-8'))
+    columns = [(field, payload.get(key) or []) for key, field in _COLUMNS]
+    size = len(payload.get('id') or [])
+
+    rows = []
+    for i in range(size):
+        row = {}
+        for field, values in columns:
+            value = values[i] if i < len(values) else None
+            if field in _BOOL_FIELDS:
+                value = bool(value)
+            row[field] = value
+        rows.append(row)
+    return rows
+
+
+def unpack_details(result_id, blob):
+    return [ArchivedDetail(result_id, **row) for row in unpack_rows(blob)]
+
+
+def archived_detail_values(result_qs, *result_fields):
+    """
+    보관된 결과들의 문항을 TestResultDetail.values(...) 와 같은 모양으로 반환
+    - result_fields: 'created_at', 'student__name' 처럼 TestResult 기준 경로
+      (반환 dict 에는 'result__created_at' 처럼 접두어가 붙습니다)
+    - 통계/랭킹 쿼리에서 활성 테이블 결과와 합쳐 쓰기 위한 용도
+    """
+    rows = result_qs.filter(archived_details__isnull=False).values(
+        'archived_details', *result_fields
+    )
+    values = []
+    for r in rows:
+        extra = {f'result__{f}': r[f] for f in result_fields}
+        for d in unpack_rows(r['archived_details']):
+            d.update(extra)
+            values.append(d)
+    return values
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from vocab.archive import pack_details
+from vocab.models import TestResult, TestResultDetail
+
+
+class Command(BaseCommand):
+    help = "Move old TestResultDetail rows into a compressed per-result archive blob."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=180,
+            help="Archive results older than this many days (default: 180).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of results processed per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show how many results/rows would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        cutoff = timezone.now() - timedelta(days=days)
+
+        # 처리 대기 중인 정답 정정 요청이 남아 있는 결과는 보관하지 않음
+        pending_ids = TestResultDetail.objects.filter(
+            is_correction_requested=True, is_resolved=False
+        ).values("result_id")
+
+        candidates = (
+            TestResult.objects.filter(
+                created_at__lt=cutoff,
+                archived_details__isnull=True,
+                details__isnull=False,
+            )
+            .exclude(id__in=pending_ids)
+            .values_list("id", flat=True)
+            .distinct()
+            .order_by("id")
+        )
+        result_ids = list(candidates)
+
+        if dry_run:
+            row_count = TestResultDetail.objects.filter(result_id__in=result_ids).count()
+            self.stdout.write(
+                self.style.WARNING(
+                    "[DRY RUN] {} results ({} detail rows) would be archived.".format(
+                        len(result_ids), row_count
+                    )
+                )
+            )
+            return
+
+        archived_results = 0
+        archived_rows = 0
+        now = timezone.now()
+
+        for i in range(0, len(result_ids), batch_size):
+            chunk = result_ids[i:i + batch_size]
+            rows_by_result = {}
+            for d in TestResultDetail.objects.filter(result_id__in=chunk).order_by("id"):
+                rows_by_result.setdefault(d.result_id, []).append(d)
+
+            with transaction.atomic():
+                for result_id, rows in rows_by_result.items():
+                    TestResult.objects.filter(pk=result_id).update(
+                        archived_details=pack_details(rows),
+                        details_archived_at=now,
+                    )
+                    archived_rows += len(rows)
+                archived_results += len(rows_by_result)
+                # 원본 행 제거 (점수/오답 수는 TestResult 에 이미 반영되어 있음)
+                TestResultDetail.objects.filter(result_id__in=list(rows_by_result)).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Archived {} results ({} detail rows).".format(archived_results, archived_rows)
+            )
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocab', '0013_wordbook_cover_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testresult',
+            name='archived_details',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='details_archived_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='상세 보관 일시'),
+        ),
+    ]
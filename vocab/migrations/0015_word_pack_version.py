@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-20 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocab', '0014_testresult_archived_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='wordbook',
+            name='pack_version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='단어팩 버전'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['book', 'version'], name='vocab_word_book_id_5a1a80_idx'),
+        ),
+    ]
@@ -3,11 +3,13 @@ from io import TextIOWrapper
 from django.db import models
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_save, post_delete
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from core.models import Branch, School # School import added 
 from datetime import timedelta
+from utils.loaded_state import LoadedStateMixin, loaded_values
 
 # ==========================================
 # [1] 단어장 관리 (WordBook & Word)
@@ -56,7 +58,7 @@ class WordMeaning(models.Model):
         return f"{self.master_word.text}: {self.meaning}"
 
 
-class WordBook(models.Model):
+class WordBook(LoadedStateMixin, models.Model):
     publisher = models.ForeignKey(Publisher, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="출판사")
     title = models.CharField(max_length=100, verbose_name="단어장 제목")
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, verbose_name="등록자")
@@ -69,6 +71,9 @@ class WordBook(models.Model):
     target_school = models.ForeignKey(School, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="대상 학교")
     target_grade = models.IntegerField(null=True, blank=True, verbose_name="대상 학년 (전체=NULL)")
 
+    # [NEW] 단어팩 버전 (단어 추가/수정/삭제 시 증가, 클라이언트 캐시 검증용)
+    pack_version = models.PositiveIntegerField(default=1, editable=False, verbose_name="단어팩 버전")
+
     def __str__(self):
         return self.title
 
@@ -76,6 +81,14 @@ class WordBook(models.Model):
         verbose_name = "단어장"
         verbose_name_plural = "단어장"
 
+    # 노출 대상 판단에 쓰이는 필드 (변경 시 가시성 캐시 무효화)
+    TARGETING_FIELDS = ('target_branch_id', 'target_school_id', 'target_grade', 'publisher_id')
+
+    LOADED_STATE = {'_loaded_targeting': 'targeting_key'}
+
+    def targeting_key(self):
+        return loaded_values(self, self.TARGETING_FIELDS)
+
     def _infer_pos(self, meaning):
         """한글 뜻을 분석하여 품사를 추론하는 휴리스틱 함수 (8품사 지원)"""
         m = meaning.strip()
@@ -167,6 +180,10 @@ class WordBook(models.Model):
             ))
 
         if entries_to_create:
+            # bulk_create 는 pre_save 를 타지 않으므로 버전을 한 번만 올려 일괄 지정
+            version = bump_pack_version(self.pk)
+            for entry in entries_to_create:
+                entry.version = version
             Word.objects.bulk_create(entries_to_create)
             print(f"--- [성공] {len(entries_to_create)}개 단어 등록 및 마스터 DB 연동 완료 ---")
 
@@ -182,15 +199,85 @@ class Word(models.Model):
     english = models.CharField(max_length=100) # 캐싱/검색용으로 유지 (MasterWord.text와 동일)
     korean = models.CharField(max_length=100) # 이 책에서 채택한 대표 뜻
     example_sentence = models.TextField(null=True, blank=True)
+    # [NEW] 마지막으로 변경된 시점의 단어팩 버전 (since_version 델타 조회용)
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         # unique_together = ('book', 'english') # REMOVED: Allow duplicates (polysemy/review)
         ordering = ['number', 'id']
+        indexes = [
+            models.Index(fields=['book', 'version']),
+        ]
 
     def __str__(self):
         return f"{self.english} ({self.korean})"
 
 
+@receiver(post_save, sender=WordBook)
+def invalidate_visibility_on_book_save(sender, instance, created, raw=False, **kwargs):
+    current = instance.targeting_key()
+    if created or getattr(instance, '_loaded_targeting', None) != current:
+        from .services import invalidate_book_visibility
+        invalidate_book_visibility()
+    instance._loaded_targeting = current
+
+
+@receiver(post_delete, sender=WordBook)
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+def invalidate_visibility_on_change(sender, **kwargs):
+    from .services import invalidate_book_visibility
+    invalidate_book_visibility()
+
+
+def bump_pack_version(book_id):
+    """[NEW] 단어장의 단어팩 버전을 1 올리고 새 버전을 반환"""
+    WordBook.objects.filter(pk=book_id).update(pack_version=F('pack_version') + 1)
+    return WordBook.objects.filter(pk=book_id).values_list('pack_version', flat=True).first() or 0
+
+
+@receiver(pre_save, sender=Word)
+def stamp_word_pack_version(sender, instance, raw=False, **kwargs):
+    if raw or not instance.book_id:
+        return
+    instance.version = bump_pack_version(instance.book_id)
+
+
+@receiver(post_delete, sender=Word)
+def bump_pack_version_on_delete(sender, instance, origin=None, **kwargs):
+    # 단어장 자체가 삭제되는 경우(cascade)는 버전 관리가 의미 없으므로 생략
+    if isinstance(origin, WordBook):
+        return
+    bump_pack_version(instance.book_id)
+
+
+def bump_pack_versions_for_master_words(master_word_ids):
+    """
+    [NEW] 뜻/품사(WordMeaning)가 바뀐 MasterWord 를 쓰는 단어장마다 버전을 올림
+    단어팩의 pos 는 WordMeaning 에서 오므로, 해당 단어의 version 도 새 버전으로 맞춰 델타(since_version)에 포함
+    (update() 라 Word pre_save 를 타지 않아 단어장당 버전은 한 번만 오름)
+    """
+    book_ids = set(Word.objects.filter(master_word_id__in=master_word_ids).values_list('book_id', flat=True))
+    for book_id in book_ids:
+        version = bump_pack_version(book_id)
+        Word.objects.filter(book_id=book_id, master_word_id__in=master_word_ids).update(version=version)
+
+
+@receiver(post_save, sender=WordMeaning)
+def bump_pack_version_on_meaning_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (not created and update_fields is not None and 'pos' not in update_fields):
+        return
+    bump_pack_versions_for_master_words([instance.master_word_id])
+
+
+@receiver(post_delete, sender=WordMeaning)
+def bump_pack_version_on_meaning_delete(sender, instance, origin=None, **kwargs):
+    # 마스터 단어째 삭제되면 그 단어(Word)도 함께 지워지며 버전이 오름
+    if isinstance(origin, MasterWord):
+        return
+    bump_pack_versions_for_master_words([instance.master_word_id])
+
+
 # ==========================================
 # [2] 시험 결과 관리 (Test Result)
 # ==========================================
@@ -210,6 +297,10 @@ class TestResult(models.Model):
     wrong_count = models.IntegerField(default=0)
     test_range = models.CharField(max_length=50, blank=True, verbose_name="시험 범위")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="응시 일시")
+
+    # [NEW] 오래된 문항 상세 압축 보관본 (archive_test_details 커맨드가 채움)
+    archived_details = models.BinaryField(null=True, blank=True, editable=False)
+    details_archived_at = models.DateTimeField(null=True, blank=True, verbose_name="상세 보관 일시")
     
     class Meta:
         verbose_name = "도전모드 결과"
@@ -219,6 +310,42 @@ class TestResult(models.Model):
         # self.student.profile.name -> self.student.name 으로 단축됨
         return f"[{self.created_at.date()}] {self.student.name} - {self.score}점"
 
+    @property
+    def is_details_archived(self):
+        return self.archived_details is not None
+
+    def get_details(self):
+        """
+        [NEW] 문항 상세 조회 (보관 여부와 무관하게 id 순 목록 반환)
+        - 활성 결과: details (prefetch 되어 있으면 캐시 사용)
+        - 보관 결과: 압축본을 풀어 ArchivedDetail 목록으로 반환 (읽기 전용)
+        """
+        if self.is_details_archived:
+            from .archive import unpack_details
+            return unpack_details(self.pk, self.archived_details)
+        return sorted(self.details.all(), key=lambda d: d.id)
+
+    def restore_details(self):
+        """
+        [NEW] 보관본을 다시 TestResultDetail 행으로 복원 (정정/채점 등 쓰기 작업 전에 호출)
+        - 원래 id 를 그대로 유지하므로 기존 detail_id 참조가 깨지지 않습니다.
+        """
+        if not self.is_details_archived:
+            return False
+        from .archive import unpack_rows
+
+        with transaction.atomic():
+            TestResultDetail.objects.bulk_create([
+                TestResultDetail(result_id=self.pk, **row)
+                for row in unpack_rows(self.archived_details)
+            ])
+            self.archived_details = None
+            self.details_archived_at = None
+            TestResult.objects.filter(pk=self.pk).update(
+                archived_details=None, details_archived_at=None
+            )
+        return True
+
 class TestResultDetail(models.Model):
     result = models.ForeignKey(TestResult, on_delete=models.CASCADE, related_name='details')
     word_question = models.CharField(max_length=100)
@@ -312,7 +439,7 @@ def auto_reset_cooldown(sender, instance, **kwargs):
         if not recent_wrong_fails.exists():
             profile.last_wrong_failed_at = None
 
-        profile.save()
+        profile.save(update_fields=['last_failed_at', 'last_wrong_failed_at'])  # [FIX] 쿨타임 필드만 저장
     except Exception:
         # Student deletion cascade or other race condition
         pass
@@ -26,7 +26,7 @@ class WordBookSerializer(serializers.ModelSerializer):
     target_grade = serializers.IntegerField(required=False, allow_null=True)
 
     publisher_name = serializers.CharField(source='publisher.name', read_only=True, default=None)
-    total_words = serializers.IntegerField(source='words.count', read_only=True)
+    total_words = serializers.SerializerMethodField()
     total_days = serializers.SerializerMethodField()
     
     class Meta:
@@ -37,7 +37,15 @@ class WordBookSerializer(serializers.ModelSerializer):
             'created_at'
         ]
 
+    def get_total_words(self, obj):
+        # [NEW] 목록 조회 시 annotate(words_count) 된 값 우선 사용
+        if hasattr(obj, 'words_count'):
+            return obj.words_count
+        return obj.words.count()
+
     def get_total_days(self, obj):
+        if hasattr(obj, 'max_day'):
+            return obj.max_day or 0
         max_day = obj.words.aggregate(Max('number'))['number__max']
         return max_day or 0
 
@@ -85,51 +93,16 @@ class WordSerializer(serializers.ModelSerializer):
         if not obj.korean:
             return []
 
-        entries = services.parse_meaning_tokens(obj.korean)
-        if not entries:
-            return []
-
-        meaning_list = [e['meaning'] for e in entries]
+        # [NEW] 목록 조회 시 뷰에서 미리 읽어 둔 품사 맵(meaning_pos_maps) 사용 -> 단어별 쿼리 제거
         meaning_pos_map = {}
         if obj.master_word_id:
-            meanings = WordMeaning.objects.filter(
-                master_word=obj.master_word,
-                meaning__in=meaning_list,
-            )
-            meaning_pos_map = {
-                m.meaning: services._normalize_pos_tag(m.pos)
-                for m in meanings
-            }
-
-        grouped = {}
-        for entry in entries:
-            pos = entry['pos']
-            if not entry['manual']:
-                pos = meaning_pos_map.get(entry['meaning'], pos)
-            pos = services._normalize_pos_tag(pos) or 'n'
-            if pos not in grouped:
-                grouped[pos] = []
-            grouped[pos].append(entry['meaning'])
-
-        # Sort Order
-        order = ['v', 'adj', 'adv', 'n', 'pron', 'prep', 'conj', 'interj']
-        result = []
-        for tag in order:
-            if tag in grouped:
-                result.append({
-                    'pos': tag,
-                    'meaning': ', '.join(grouped[tag])
-                })
-
-        # Add any remaining tags not in order (unlikely with current logic but for safety)
-        for tag in grouped:
-            if tag not in order:
-                result.append({
-                    'pos': tag,
-                    'meaning': ', '.join(grouped[tag])
-                })
-
-        return result
+            maps = self.context.get('meaning_pos_maps')
+            if maps is not None:
+                meaning_pos_map = maps.get(obj.master_word_id, {})
+            else:
+                meaning_pos_map = services.load_meaning_pos_maps([obj]).get(obj.master_word_id, {})
+
+        return services.group_meanings_by_pos(obj.korean, meaning_pos_map)
 
 
 class TestResultDetailSerializer(serializers.ModelSerializer):
@@ -149,12 +122,16 @@ class TestResultSerializer(serializers.ModelSerializer):
     book_title = serializers.CharField(source='book.title', read_only=True)
     student_name = serializers.CharField(source='student.name', read_only=True)
     assignment = serializers.CharField(source='assignment_id', read_only=True)
-    details = TestResultDetailSerializer(many=True, read_only=True)
+    # [NEW] 보관(archive)된 결과도 같은 형태로 내려주기 위해 get_details() 사용
+    details = serializers.SerializerMethodField()
     
     class Meta:
         model = TestResult
         fields = ['id', 'student_name', 'book_title', 'score', 'wrong_count', 'test_range', 'created_at', 'details', 'assignment']
 
+    def get_details(self, obj):
+        return TestResultDetailSerializer(obj.get_details(), many=True).data
+
 class PersonalWrongWordSerializer(serializers.ModelSerializer):
     english = serializers.CharField(source='word.english', read_only=True)
     korean = serializers.CharField(source='word.korean', read_only=True)
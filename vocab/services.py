@@ -144,6 +144,55 @@ def get_primary_pos(meaning_text):
     entries = parse_meaning_tokens(meaning_text)
     return entries[0]['pos'] if entries else None
 
+MEANING_POS_ORDER = ['v', 'adj', 'adv', 'n', 'pron', 'prep', 'conj', 'interj']
+
+def load_meaning_pos_maps(words):
+    """
+    [NEW] 여러 단어의 WordMeaning 품사를 한 번에 조회
+    - 반환: {master_word_id: {meaning: pos}}
+    """
+    from .models import WordMeaning
+
+    master_ids = {w.master_word_id for w in words if w.master_word_id}
+    maps = {}
+    if not master_ids:
+        return maps
+    rows = WordMeaning.objects.filter(master_word_id__in=master_ids).values_list(
+        'master_word_id', 'meaning', 'pos'
+    )
+    for master_id, meaning, pos in rows:
+        maps.setdefault(master_id, {})[meaning] = _normalize_pos_tag(pos)
+    return maps
+
+def group_meanings_by_pos(meaning_text, meaning_pos_map=None):
+    """
+    "일치하다, 일치, 협정" -> [{'pos': 'v', 'meaning': '일치하다'}, {'pos': 'n', 'meaning': '일치, 협정'}]
+    - meaning_pos_map: {meaning: pos} (MasterWord 에 등록된 품사, 수동 표기가 없을 때 우선)
+    """
+    entries = parse_meaning_tokens(meaning_text)
+    if not entries:
+        return []
+    meaning_pos_map = meaning_pos_map or {}
+
+    grouped = {}
+    for entry in entries:
+        pos = entry['pos']
+        if not entry['manual']:
+            pos = meaning_pos_map.get(entry['meaning'], pos)
+        pos = _normalize_pos_tag(pos) or 'n'
+        if pos not in grouped:
+            grouped[pos] = []
+        grouped[pos].append(entry['meaning'])
+
+    result = []
+    for tag in MEANING_POS_ORDER:
+        if tag in grouped:
+            result.append({'pos': tag, 'meaning': ', '.join(grouped[tag])})
+    for tag in grouped:
+        if tag not in MEANING_POS_ORDER:
+            result.append({'pos': tag, 'meaning': ', '.join(grouped[tag])})
+    return result
+
 def sync_master_meanings(master_word, meaning_text):
     from .models import WordMeaning
 
@@ -304,8 +353,9 @@ def update_cooldown(profile, mode, score, test_range=None, total_count=None):
             profile.last_wrong_failed_at = None
         else: 
             profile.last_wrong_failed_at = timezone.now()
-            
-    profile.save()
+
+    # [FIX] 쿨타임 필드만 저장 (request.user.profile 은 인증 캐시에서 온 오래된 값일 수 있어 전체 저장하면 덮어씀)
+    profile.save(update_fields=['last_failed_at', 'last_wrong_failed_at'])
 
 def process_snowball_results(student_profile, processed_details):
     """
@@ -368,18 +418,10 @@ def generate_test_questions(student_profile, book_id, day_range, total_count=30,
 
     # 범위 필터링 (예: "1-5", "1,3,5")
     if day_range != 'ALL':
-        try:
-            targets = []
-            for chunk in str(day_range).split(','):
-                chunk = chunk.replace('Day', '').replace('day', '').replace(' ', '')
-                if '-' in chunk:
-                    s, e = map(int, chunk.split('-'))
-                    targets.extend(range(s, e + 1))
-                else:
-                    targets.append(int(chunk))
-            word_qs = word_qs.filter(number__in=targets)
-        except: 
-            pass
+        from utils import day_range as day_range_util
+        intervals = day_range_util.parse(day_range)
+        if intervals:
+            word_qs = word_qs.filter(day_range_util.as_q(intervals))
         
     # 랜덤 추출
     candidates = list(word_qs)
@@ -404,3 +446,51 @@ def generate_test_questions(student_profile, book_id, day_range, total_count=30,
         })
     
     return questions
+
+
+# ==========================================
+# [NEW] 학생별 노출 단어장 (branch, school, grade) 캐시
+# ==========================================
+HIDDEN_PUBLISHERS = ['SYSTEM', '개인단어장']
+VISIBILITY_CACHE_TIMEOUT = 60 * 60 * 6
+_VISIBILITY_GEN_KEY = 'vocab:visibility:gen'
+
+
+def invalidate_book_visibility():
+    """단어장 대상(지점/학교/학년/출판사) 변경 시 호출 -> 모든 가시성 캐시 무효화"""
+    from utils import cache_gen
+
+    cache_gen.bump(_VISIBILITY_GEN_KEY)
+
+
+def get_visible_book_ids(branch_id, school_id, grade):
+    """
+    [NEW] (지점, 학교, 학년) 조합에서 보이는 단어장 id 집합 (SYSTEM/개인단어장 제외)
+    - 학년은 current_grade(연도 기준 계산값)라 SQL 로 미리 계산할 수 없어 조합 단위로 캐시
+    - 연도가 바뀌면(학년 진급) 키가 달라져 자연스럽게 새로 계산됨
+    """
+    from django.core.cache import cache
+    from django.db.models import Q
+    from utils import cache_gen
+    from .models import WordBook
+
+    key = 'vocab:visible:{}:{}:{}:{}:{}'.format(
+        cache_gen.generation(_VISIBILITY_GEN_KEY), timezone.now().year, branch_id, school_id, grade
+    )
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            WordBook.objects.filter(
+                Q(target_branch__isnull=True) | Q(target_branch_id=branch_id),
+                Q(target_school__isnull=True) | Q(target_school_id=school_id),
+                Q(target_grade__isnull=True) | Q(target_grade=grade),
+            ).exclude(
+                publisher__name__in=HIDDEN_PUBLISHERS
+            ).values_list('id', flat=True)
+        )
+        cache.set(key, ids, VISIBILITY_CACHE_TIMEOUT)
+    return ids
+
+
+def get_profile_visible_book_ids(profile):
+    return get_visible_book_ids(profile.branch_id, profile.school_id, profile.current_grade)
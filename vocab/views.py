@@ -18,6 +18,7 @@ from core.models import StudentProfile
 # 분리한 파일들 가져오기
 from . import utils
 from . import services
+from utils import day_range
 
 def is_monthly_test_period():
      now = timezone.now()
@@ -171,18 +172,9 @@ def exam(request):
 
         test_range = request.GET.get('day_range', '전체')
         
-        if test_range != '전체':
-            try:
-                targets = []
-                for chunk in test_range.split(','):
-                    if '-' in chunk:
-                        s, e = map(int, chunk.split('-'))
-                        targets.extend(range(s, e + 1))
-                    else:
-                        targets.append(int(chunk))
-                raw_candidates = list(Word.objects.filter(book=book, number__in=targets))
-            except:
-                raw_candidates = list(Word.objects.filter(book=book))
+        intervals = day_range.parse(test_range) if test_range != '전체' else ()
+        if intervals:
+            raw_candidates = list(Word.objects.filter(day_range.as_q(intervals), book=book))
         else:
             raw_candidates = list(Word.objects.filter(book=book))
             
@@ -320,6 +312,7 @@ def save_result(request):
                     result_obj.save()
                     ModelDetail = MonthlyTestResultDetail
                 else:
+                    result_obj.restore_details()  # [FIX] 보관된 결과를 새 결과로 보고 문항을 다시 저장하지 않도록
                     if TestResultDetail.objects.filter(result=result_obj).exists():
                         saved_objs = TestResultDetail.objects.filter(result=result_obj).order_by('id')
                         detail_ids = [d.id for d in saved_objs]
@@ -361,6 +354,18 @@ def save_result(request):
 # ==========================================
 # [API] 정답 인정 (관리자용)
 # ==========================================
+def restore_archived_result(result_id):
+    """
+    [FIX] 보관된 결과면 문항 행을 먼저 복원 (원래 id 를 유지하므로 화면의 detail_id 로 그대로 찾을 수 있음)
+    레거시 채점/정정 화면은 detail_id 와 함께 result_id 를 보냅니다. (월말평가는 보관 대상 아님)
+    """
+    if not result_id:
+        return
+    result = TestResult.objects.filter(id=result_id).first()
+    if result is not None:
+        result.restore_details()
+
+
 @csrf_exempt
 @login_required
 def approve_answer(request):
@@ -369,6 +374,7 @@ def approve_answer(request):
             data = json.loads(request.body)
             detail_id = data.get('detail_id')
             is_monthly_detail = False
+            restore_archived_result(data.get('result_id'))
             
             try: 
                 detail = TestResultDetail.objects.select_for_update().get(id=detail_id)
@@ -436,6 +442,8 @@ def request_correction(request):
             # [수정] detail_id와 is_monthly 가져오기
             detail_id = data.get('detail_id')
             is_monthly = data.get('is_monthly', False)
+            if not is_monthly:
+                restore_archived_result(data.get('result_id'))
 
             if is_monthly: detail = get_object_or_404(MonthlyTestResultDetail, id=detail_id)
             else: detail = get_object_or_404(TestResultDetail, id=detail_id)
@@ -462,8 +470,7 @@ def test_result_list(request):
 @login_required
 def test_result_detail(request, result_id):
     result = get_object_or_404(TestResult, id=result_id)
-    try: details = result.details.all().order_by('id')
-    except AttributeError: details = result.testresultdetail_set.all().order_by('id')
+    details = result.get_details()
     return render(request, 'vocab/admin_result_detail.html', {'result': result, 'details': details})
 
 @staff_member_required
@@ -590,7 +597,7 @@ def grading_list(request):
 def grading_detail(request, test_type, result_id):
     if test_type == 'monthly': exam = get_object_or_404(MonthlyTestResult, id=result_id)
     else: exam = get_object_or_404(TestResult, id=result_id)
-    details = exam.details.all().order_by('id')
+    details = exam.details.all().order_by('id') if test_type == 'monthly' else exam.get_details()
     student_name = exam.student.name 
     return render(request, 'vocab/grading_detail.html', {'exam': exam, 'details': details, 'test_type': test_type, 'student_name': student_name})
 
@@ -602,6 +609,8 @@ def reject_answer(request):
             data = json.loads(request.body)
             detail_id = data.get('detail_id')
             q_type = data.get('type')
+            if q_type != 'monthly':
+                restore_archived_result(data.get('result_id'))
             if q_type == 'monthly': detail = get_object_or_404(MonthlyTestResultDetail, id=detail_id)
             else: detail = get_object_or_404(TestResultDetail, id=detail_id)
             detail.is_resolved = True; detail.is_correction_requested = False; detail.save()
@@ -738,7 +747,7 @@ def api_date_history(request):
 
     data = []
     for r in results:
-        wrong_details = r.details.filter(is_correct=False)
+        wrong_details = [d for d in r.get_details() if not d.is_correct]
         wrong_words = []
         for d in wrong_details:
             wrong_words.append({'word': d.word_question, 'answer': d.correct_answer})
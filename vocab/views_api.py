@@ -12,10 +12,14 @@ from .serializers import (
     RankingEventSerializer,
 )
 from . import services, utils # 기존 로직 재사용
+from . import wordpack
+from utils import day_range
+from .archive import archived_detail_values
+from django.http import HttpResponse
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Count, Max
 from collections import defaultdict
 from datetime import timedelta, datetime
 import random
@@ -50,31 +54,32 @@ class VocabViewSet(viewsets.ModelViewSet):
         
         # 1. 선생님/관리자: 전체 조회 (시스템/개인 단어장 제외)
         if user.is_staff or user.is_superuser:
+            if self.action == 'list':
+                return self._with_word_stats(qs)
             return qs
         
         # 2. 학생: Action에 따른 분기
         if hasattr(user, 'profile'):
             profile = user.profile
+            subscribed_ids = PersonalWordBook.objects.filter(student=profile).values('book_id')
             
             # (1) 목록 조회 (My Books): 내가 구독한 책만
             if self.action == 'list':
-                return qs.filter(subscribers__student=profile)
+                return self._with_word_stats(qs.filter(id__in=subscribed_ids))
             
             # (2) 상세 조회/구독 등 (Retrieve, Subscribe): 구독 안했어도 볼 수 있는 책이면 OK
-            # available 로직과 동일한 가시성 필터 적용
-            branch_filter = Q(target_branch__isnull=True) | Q(target_branch=profile.branch)
-            school_filter = Q(target_school__isnull=True) | Q(target_school=profile.school)
-            grade_filter = Q(target_grade__isnull=True) | Q(target_grade=profile.current_grade)
-            
+            # [NEW] 가시성은 (지점, 학교, 학년) 단위로 캐시된 id 집합으로 판단 (available 과 동일 기준)
             # 이미 구독한 책도 접근 가능해야 하므로, (가시성 필터) OR (이미 구독함)
             # 사실 이미 구독한 책은 가시성 필터에 포함 안 될 수도 있음(전학 등으로?) -> 그래도 내 책이면 보여야 함.
-            my_sub = Q(subscribers__student=profile)
-            visible = (branch_filter & school_filter & grade_filter)
-            
-            return qs.filter(visible | my_sub).distinct()
+            visible_ids = services.get_profile_visible_book_ids(profile)
+            return qs.filter(Q(id__in=visible_ids) | Q(id__in=subscribed_ids))
             
         return qs.none()
 
+    def _with_word_stats(self, qs):
+        """목록 응답용: 단어 수/최대 Day 를 한 번에 집계 (책마다 count/aggregate 쿼리 방지)"""
+        return qs.annotate(words_count=Count('words'), max_day=Max('words__number'))
+
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
@@ -91,24 +96,17 @@ class VocabViewSet(viewsets.ModelViewSet):
              
         profile = user.profile
         
-        # 1. 지점 필터: 전사(None) 또는 내 지점
-        branch_filter = Q(target_branch__isnull=True) | Q(target_branch=profile.branch)
-        
-        # 2. 학교 필터: 전체(None) 또는 내 학교
-        school_filter = Q(target_school__isnull=True) | Q(target_school=profile.school)
-        
-        # 3. 학년 필터: 전체(None) 또는 내 학년
-        grade_filter = Q(target_grade__isnull=True) | Q(target_grade=profile.current_grade)
+        # [NEW] 지점/학교/학년 가시성 + 시스템/개인 단어장 제외는 캐시된 id 집합으로 처리
+        visible_ids = services.get_profile_visible_book_ids(profile)
+        subscribed_ids = set(
+            PersonalWordBook.objects.filter(student=profile).values_list('book_id', flat=True)
+        )
         
         qs = WordBook.objects.filter(
-             branch_filter & school_filter & grade_filter
-        ).exclude(
-            subscribers__student=profile # 이미 추가한 것 제외
-        ).exclude(
-            publisher__name__in=['SYSTEM', '개인단어장'] # [NEW] 시스템/개인 단어장 제외
+            id__in=visible_ids - subscribed_ids # 이미 추가한 것 제외
         ).order_by('-created_at')
         
-        serializer = self.get_serializer(qs, many=True)
+        serializer = self.get_serializer(self._with_word_stats(qs), many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
@@ -162,26 +160,56 @@ class VocabViewSet(viewsets.ModelViewSet):
         words = Word.objects.filter(book=book)
         
         if range_str != 'ALL':
-            try:
-                targets = []
-                for chunk in range_str.split(','):
-                    if '-' in chunk:
-                        s, e = map(int, chunk.split('-'))
-                        targets.extend(range(s, e + 1))
-                    else:
-                        targets.append(int(chunk))
-                words = words.filter(number__in=targets)
-            except:
-                pass # 파싱 실패 시 전체 반환
+            intervals = day_range.parse(range_str)
+            if intervals: # 파싱 실패 시 전체 반환
+                words = words.filter(day_range.as_q(intervals))
         
         # 랜덤 셔플 옵션
+        words = list(words)
         if request.query_params.get('shuffle') == 'true':
-            words = list(words)
             random.shuffle(words)
             
-        serializer = WordSerializer(words, many=True)
+        serializer = WordSerializer(
+            words, many=True,
+            context={'meaning_pos_maps': services.load_meaning_pos_maps(words)},
+        )
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def pack(self, request, pk=None):
+        """
+        [NEW] 단어팩 다운로드 (오프라인 학습/시험용)
+        - 컬럼 배열 JSON (ids, english, korean, day, pos), gzip 지원
+        - ETag / If-None-Match 로 변경 없으면 304
+        - ?since_version=N : N 이후 변경분만 (삭제 반영용 live_ids 포함)
+        """
+        book = self.get_object()
+
+        since_version = request.query_params.get('since_version')
+        if since_version is not None:
+            try:
+                since_version = max(int(since_version), 0)
+            except (TypeError, ValueError):
+                return Response({'error': 'since_version must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        etag = wordpack.pack_etag(book, since_version)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            raw, gzipped = wordpack.get_pack_bytes(book, since_version)
+            if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+                response = HttpResponse(gzipped, content_type='application/json; charset=utf-8')
+                response['Content-Encoding'] = 'gzip'
+            else:
+                response = HttpResponse(raw, content_type='application/json; charset=utf-8')
+
+        response['ETag'] = etag
+        response['X-Pack-Version'] = str(book.pack_version)
+        response['Cache-Control'] = 'private, no-cache'
+        response['Vary'] = 'Accept-Encoding, Authorization'
+        return response
+
 
 class PublisherViewSet(viewsets.ModelViewSet):
     serializer_class = PublisherSerializer
@@ -314,9 +342,14 @@ class TestViewSet(viewsets.ModelViewSet):
                 result__created_at__date__lte=end_date,
             ).values('word_question', 'is_correct', 'result__created_at')
         )
+        # [NEW] 보관(archive)된 오래된 결과도 누적 곡선에 포함
+        archived = archived_detail_values(
+            TestResult.objects.filter(student=profile, created_at__date__lte=end_date),
+            'created_at',
+        )
 
         details_by_day = defaultdict(list)
-        for item in details + monthly_details:
+        for item in details + monthly_details + archived:
             created_at = item.get('result__created_at')
             if not created_at:
                 continue
@@ -375,9 +408,17 @@ class TestViewSet(viewsets.ModelViewSet):
             result__created_at__date__gte=start_date,
             result__created_at__date__lte=end_date,
         ).values('word_question', 'result__created_at')
+        archived = archived_detail_values(
+            TestResult.objects.filter(
+                student=profile,
+                created_at__date__gte=start_date,
+                created_at__date__lte=end_date,
+            ),
+            'created_at',
+        )
 
         day_words = defaultdict(set)
-        for item in list(details) + list(monthly_details):
+        for item in list(details) + list(monthly_details) + archived:
             created_at = item.get('result__created_at')
             if not created_at:
                 continue
@@ -430,10 +471,18 @@ class TestViewSet(viewsets.ModelViewSet):
             'word_question',
         )
 
+        archived = [
+            item for item in archived_detail_values(
+                TestResult.objects.filter(created_at__date__gte=start_date),
+                'student_id', 'student__name', 'student__user__username', 'student__school__name',
+            )
+            if item['is_correct']
+        ]
+
         student_words = defaultdict(set)
         student_meta = {}
 
-        for item in list(details) + list(monthly_details):
+        for item in list(details) + list(monthly_details) + archived:
             student_id = item.get('result__student_id')
             if not student_id:
                 continue
@@ -494,9 +543,21 @@ class TestViewSet(viewsets.ModelViewSet):
                 'word_question',
             )
 
+            archived = [
+                item for item in archived_detail_values(
+                    TestResult.objects.filter(
+                        book=event.target_book,
+                        created_at__date__gte=event.start_date,
+                        created_at__date__lte=event.end_date,
+                    ),
+                    'student_id', 'student__name', 'student__user__username', 'student__school__name',
+                )
+                if item['is_correct']
+            ]
+
             student_words = defaultdict(set)
             student_meta = {}
-            for item in list(details) + list(monthly_details):
+            for item in list(details) + list(monthly_details) + archived:
                 student_id = item.get('result__student_id')
                 if not student_id:
                     continue
@@ -888,6 +949,8 @@ class TestViewSet(viewsets.ModelViewSet):
         corrections = request.data.get('corrections', [])
         
         with transaction.atomic():
+            # [NEW] 보관된 결과면 문항 행을 먼저 복원 후 정정
+            result.restore_details()
             changed_count = 0
             
             for item in corrections:
@@ -970,6 +1033,7 @@ class TestViewSet(viewsets.ModelViewSet):
         if not word:
             return Response({'error': 'Word required'}, status=status.HTTP_400_BAD_REQUEST)
             
+        test_result.restore_details()
         # [FIX] Use filter() instead of get() to handle potential duplicates from old tests
         details = TestResultDetail.objects.filter(result=test_result, word_question=word)
         if not details.exists():
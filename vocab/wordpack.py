@@ -0,0 +1,84 @@
+"""
+단어팩(word pack) 빌더
+
+책 한 권의 단어를 컬럼 배열(ids/english/korean/day/pos)로 묶어 내려줍니다.
+- 전체 팩은 (book_id, pack_version) 단위로 캐시되어 버전이 바뀔 때까지 재사용
+- since_version 을 주면 그 이후 변경된 단어만 담은 델타 팩을 생성
+  (삭제 반영을 위해 델타에는 현재 살아있는 id 목록 live_ids 를 함께 포함)
+"""
+import gzip
+import json
+
+from django.core.cache import cache
+
+from . import services
+from .models import Word
+
+PACK_FORMAT_VERSION = 1
+PACK_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def pack_etag(book, since_version=None):
+    if since_version is None:
+        return f'W/"wp{PACK_FORMAT_VERSION}-{book.pk}-{book.pack_version}"'
+    return f'W/"wp{PACK_FORMAT_VERSION}-{book.pk}-{book.pack_version}-{since_version}"'
+
+
+def build_pack(book, since_version=None):
+    """책의 단어팩 dict 생성 (since_version 이 있으면 델타)"""
+    words = Word.objects.filter(book=book).only(
+        'id', 'english', 'korean', 'number', 'master_word_id'
+    ).order_by('number', 'id')
+    if since_version is not None:
+        words = words.filter(version__gt=since_version)
+    words = list(words)
+
+    meaning_maps = services.load_meaning_pos_maps(words)
+
+    pack = {
+        'format': PACK_FORMAT_VERSION,
+        'book_id': book.pk,
+        'version': book.pack_version,
+        'since_version': since_version,
+        'count': len(words),
+        'ids': [],
+        'english': [],
+        'korean': [],
+        'day': [],
+        'pos': [],
+    }
+    for w in words:
+        groups = services.group_meanings_by_pos(w.korean, meaning_maps.get(w.master_word_id))
+        pack['ids'].append(w.id)
+        pack['english'].append(w.english)
+        pack['korean'].append(w.korean)
+        pack['day'].append(w.number)
+        pack['pos'].append(','.join(sorted({g['pos'] for g in groups})))
+
+    if since_version is not None:
+        pack['live_ids'] = list(
+            Word.objects.filter(book=book).order_by('id').values_list('id', flat=True)
+        )
+    return pack
+
+
+def get_pack_bytes(book, since_version=None):
+    """
+    직렬화 + gzip 압축된 단어팩 (json_bytes, gzip_bytes)
+    - 전체 팩만 캐시합니다 (델타는 since_version 조합이 다양해 캐시 이득이 적음)
+    """
+    cache_key = None
+    if since_version is None:
+        cache_key = f'vocab:wordpack:{PACK_FORMAT_VERSION}:{book.pk}:{book.pack_version}'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    raw = json.dumps(
+        build_pack(book, since_version), ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+    result = (raw, gzip.compress(raw, compresslevel=6))
+
+    if cache_key:
+        cache.set(cache_key, result, PACK_CACHE_TIMEOUT)
+    return result